@@ -0,0 +1,39 @@
+"""Random bodies for benchmarks."""
+
+import numpy as np
+from revolve2.modular_robot.body import Module, RightAngles
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2
+
+_ROTATIONS = [
+    RightAngles.DEG_0,
+    RightAngles.DEG_90,
+    RightAngles.DEG_180,
+    RightAngles.DEG_270,
+]
+
+
+def random_body(rng: np.random.Generator, num_modules: int) -> BodyV2:
+    """
+    Create a body by attaching random bricks and active hinges with random rotations at random free attachment points.
+
+    :param rng: Random number generator.
+    :param num_modules: The number of modules to attach, if there are enough free attachment points.
+    :returns: The body.
+    """
+    body = BodyV2()
+    modules: list[Module] = [body.core, *body.core.children.values()]
+    for _ in range(num_modules):
+        free = [
+            (module, index)
+            for module in modules
+            for index in module.attachment_points.keys()
+            if index not in module.children and module.can_set_child(index)
+        ]
+        if len(free) == 0:
+            break
+        parent, index = free[rng.integers(len(free))]
+        rotation = _ROTATIONS[rng.integers(len(_ROTATIONS))]
+        child = BrickV2(rotation) if rng.random() < 0.5 else ActiveHingeV2(rotation)
+        parent.set_child(child, index)
+        modules.append(child)
+    return body
@@ -0,0 +1,20 @@
+"""Timing functions for benchmarks."""
+
+import time
+from typing import Callable
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    """
+    Call a function a number of times and get the shortest duration, which is the least disturbed by other processes.
+
+    :param repeat: The number of calls.
+    :param function: The function.
+    :returns: The shortest duration, in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
@@ -0,0 +1,195 @@
+"""
+Measure developing CPPNWIN body genotypes into bodies.
+
+Compares the development of v2 bodies with a copy of the pyrr based development with one CPPN query per module that it replaced.
+The replaced v1 development is not copied; run this script on the commit before batched queries to compare v1.
+
+`BrickV1` passes an argument that `Brick` does not accept, so v1 bodies are developed with a local replacement of `BrickV1`.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import multineat
+import numpy as np
+import revolve2.standards.genotypes.cppnwin.modular_robot.v1._body_develop as body_develop_v1
+from _timing import best_of
+from pyrr import Quaternion, Vector3
+from revolve2.modular_robot.body import Module, RightAngles
+from revolve2.modular_robot.body.base import Brick
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2
+from revolve2.standards.genotypes.cppnwin.modular_robot.v1 import BodyGenotypeV1
+from revolve2.standards.genotypes.cppnwin.modular_robot.v2 import BodyGenotypeV2
+
+NUM_GENOTYPES = 200
+NUM_MUTATIONS = 30
+REPEAT = 10
+
+
+class _BrickV1(Brick):
+    """A v1 brick that passes the arguments `Brick` accepts."""
+
+    def __init__(self, rotation: float | RightAngles):
+        """
+        Initialize this object.
+
+        :param rotation: The modules' rotation.
+        """
+        super().__init__(
+            rotation=rotation,
+            bounding_box=Vector3([0.06288625, 0.06288625, 0.0603]),
+            mass=0.030,
+            front_offset=0.06288625 / 2.0,
+            side_offset=0.06288625 / 2.0,
+            sensors=[],
+        )
+
+
+@dataclass
+class _ReferenceModule:
+    position: Vector3
+    forward: Vector3
+    up: Vector3
+    chain_length: int
+    module_reference: Module
+
+
+def _rotate(a: Vector3, b: Vector3, rotation: Quaternion) -> Vector3:
+    """
+    Rotate vector a around b, like the development that preceded batched queries.
+
+    :param a: Vector a.
+    :param b: Vector b.
+    :param rotation: The rotation.
+    :returns: The rotated vector.
+    """
+    cos_angle = int(round(np.cos(rotation.angle)))
+    sin_angle = int(round(np.sin(rotation.angle)))
+    rotated: Vector3 = (
+        a * cos_angle + sin_angle * b.cross(a) + (1 - cos_angle) * b.dot(a) * b
+    )
+    return rotated
+
+
+def reference_develop(genotype: multineat.Genome) -> BodyV2:
+    """
+    Develop a body with the pyrr based development and one multineat query per module that preceded batched queries.
+
+    :param genotype: The genotype.
+    :returns: The body.
+    """
+    max_parts = 20
+    body_net = multineat.NeuralNetwork()
+    genotype.BuildPhenotype(body_net)
+    grid = np.zeros(shape=(max_parts * 2 + 1,) * 3, dtype=np.uint8)
+    body = BodyV2()
+    core_position = Vector3([max_parts + 1] * 3, dtype=np.int_)
+    grid[tuple(core_position)] = 1
+    part_count = 1
+
+    to_explore = deque(
+        _ReferenceModule(
+            core_position, Vector3([0, -1, 0]), Vector3([0, 0, 1]), 0, face
+        )
+        for face in body.core_v2.attachment_faces.values()
+    )
+    while len(to_explore) > 0:
+        module = to_explore.popleft()
+        for (
+            index,
+            attachment_point,
+        ) in module.module_reference.attachment_points.items():
+            if part_count >= max_parts:
+                continue
+            forward = _rotate(module.forward, module.up, attachment_point.orientation)
+            position = Vector3(
+                [int(round(v)) for v in module.position + forward], dtype=np.int64
+            )
+            chain_length = module.chain_length + 1
+            if grid[tuple(position)] > 0:
+                continue
+
+            x, y, z = np.array(
+                np.round(position + attachment_point.offset), dtype=np.int64
+            )
+            body_net.Input([1.0, x, y, z, chain_length])
+            body_net.ActivateAllLayers()
+            outputs = body_net.Output()
+            types: list[Any] = [None, BrickV2, ActiveHingeV2]
+            child_type = types[max(0, int(outputs[0] * len(types) - 1e-6))]
+            angle = max(0, int(outputs[1] * 4 - 1e-6)) * (np.pi / 2.0)
+
+            if child_type is None or not module.module_reference.can_set_child(index):
+                continue
+            child = child_type(angle)
+            grid[tuple(position)] += 1
+            up = _rotate(module.up, forward, Quaternion.from_eulers([angle, 0, 0]))
+            module.module_reference.set_child(child, index)
+            to_explore.append(
+                _ReferenceModule(position, forward, up, chain_length, child)
+            )
+            part_count += 1
+    return body
+
+
+def mutated_genotypes(
+    random_body: Callable[[multineat.InnovationDatabase, np.random.Generator], Any],
+) -> list[Any]:
+    """
+    Create a population of random genotypes, each mutated many times.
+
+    :param random_body: Function that creates a random genotype.
+    :returns: The genotypes.
+    """
+    rng = np.random.Generator(np.random.PCG64(0))
+    innov_db = multineat.InnovationDatabase()
+    genotypes = []
+    for _ in range(NUM_GENOTYPES):
+        genotype = random_body(innov_db, rng)
+        for _ in range(NUM_MUTATIONS):
+            genotype = genotype.mutate_body(innov_db, rng)
+        genotypes.append(genotype)
+    return genotypes
+
+
+def report(name: str, seconds: float) -> None:
+    """
+    Print the throughput of developing the population.
+
+    :param name: Name of the development.
+    :param seconds: Duration of developing the population.
+    """
+    print(
+        f"{name:12s}  {NUM_GENOTYPES / seconds:10.0f}  {1000 * seconds / NUM_GENOTYPES:7.2f}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    setattr(body_develop_v1, "BrickV1", _BrickV1)
+    genotypes_v1: list[BodyGenotypeV1] = mutated_genotypes(BodyGenotypeV1.random_body)
+    genotypes_v2: list[BodyGenotypeV2] = mutated_genotypes(BodyGenotypeV2.random_body)
+
+    print("development   bodies / s  ms/body")
+    report(
+        "v1",
+        best_of(REPEAT, lambda: [genotype.develop_body() for genotype in genotypes_v1]),
+    )
+    report(
+        "v2 reference",
+        best_of(
+            REPEAT,
+            lambda: [
+                reference_develop(genotype.body.genotype) for genotype in genotypes_v2
+            ],
+        ),
+    )
+    report(
+        "v2",
+        best_of(REPEAT, lambda: [genotype.develop_body() for genotype in genotypes_v2]),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure integrating the state of CPG networks with each `CpgIntegrator`.
+
+The networks connect a chain of CPGs with random weights, as the neighbour CPG brains do for a snake.
+Also prints how far the propagator integrators drift from the Runge-Kutta integration over the whole run.
+"""
+
+import math
+
+import numpy as np
+import numpy.typing as npt
+from _timing import best_of
+from revolve2.modular_robot.brain.cpg import CpgIntegrator, CpgNetworkStructure
+from revolve2.modular_robot.brain.cpg._brain_cpg_instance import CpgIntegration
+from revolve2.modular_robot.brain.cpg._cpg_network_structure import CpgPair
+
+DT = 1 / 60
+NUM_STEPS = 600
+REPEAT = 5
+
+
+def chain_network(
+    rng: np.random.Generator, num_cpgs: int
+) -> tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]:
+    """
+    Create a network of a chain of CPGs with random weights.
+
+    :param rng: Random number generator.
+    :param num_cpgs: The number of CPGs.
+    :returns: The weight matrix and the initial state.
+    """
+    cpgs = CpgNetworkStructure.make_cpgs(num_cpgs)
+    structure = CpgNetworkStructure(
+        cpgs, {CpgPair(cpg, next_cpg) for cpg, next_cpg in zip(cpgs, cpgs[1:])}
+    )
+    weights = structure.make_connection_weights_matrix_from_params(
+        list(rng.uniform(-1.0, 1.0, structure.num_connections))
+    )
+    return weights, structure.make_uniform_state(0.5 * math.sqrt(2))
+
+
+def integrate(
+    integration: CpgIntegration, initial_state: npt.NDArray[np.float_]
+) -> npt.NDArray[np.float_]:
+    """
+    Integrate a state for all steps.
+
+    :param integration: The integration.
+    :param initial_state: The initial state.
+    :returns: The state after every step.
+    """
+    states = np.empty((NUM_STEPS, len(initial_state)))
+    state = initial_state
+    for step in range(NUM_STEPS):
+        state = integration.step(state, DT)
+        states[step] = state
+    return states
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = np.random.Generator(np.random.PCG64(0))
+    integrators = [
+        CpgIntegrator.RK45,
+        CpgIntegrator.RK4_PROPAGATOR,
+        CpgIntegrator.EXACT_PROPAGATOR,
+    ]
+    print(
+        "hinges  rk45  rk4 prop  exact  (us per step)  max |diff| vs rk45 (rk4 / exact)"
+    )
+    for num_hinges in [4, 8, 16, 32, 64]:
+        weights, initial_state = chain_network(rng, num_hinges)
+        microseconds = []
+        states = []
+        for integrator in integrators:
+            integration = CpgIntegration([weights], integrator)
+            # The propagators are created on the first step and reused afterwards, as during a simulation.
+            states.append(integrate(integration, initial_state))
+            seconds = best_of(REPEAT, lambda: integrate(integration, initial_state))
+            microseconds.append(1e6 * seconds / NUM_STEPS)
+        rk4_diff, exact_diff = (
+            np.max(np.abs(states[0] - propagated)) for propagated in states[1:]
+        )
+        print(
+            f"{num_hinges:6d}  {microseconds[0]:4.1f}  {microseconds[1]:8.1f}  {microseconds[2]:5.1f}"
+            f"  {rk4_diff:.1e} / {exact_diff:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure connecting the CPGs of neighbouring active hinges in random bodies.
+
+Compares `active_hinges_to_cpg_network_structure_neighbor`, which uses the cached module graph of the body,
+with the walk from every active hinge to its neighbours that it replaced.
+"""
+
+import numpy as np
+from _random_body import random_body
+from _timing import best_of
+from revolve2.modular_robot.body.base import ActiveHinge
+from revolve2.modular_robot.brain.cpg import (
+    CpgNetworkStructure,
+    active_hinges_to_cpg_network_structure_neighbor,
+)
+from revolve2.modular_robot.brain.cpg._cpg_network_structure import CpgPair
+
+NUM_BODIES = 50
+REPEAT = 20
+
+
+def neighbour_walk(active_hinges: list[ActiveHinge]) -> CpgNetworkStructure:
+    """
+    Connect the CPGs of neighbouring active hinges by walking from every active hinge to its neighbours.
+
+    :param active_hinges: The active hinges.
+    :returns: The structure of the CPG network.
+    """
+    cpgs = CpgNetworkStructure.make_cpgs(len(active_hinges))
+    cpg_of = {active_hinge: cpg for active_hinge, cpg in zip(active_hinges, cpgs)}
+    connections: set[CpgPair] = set()
+    for active_hinge, cpg in zip(active_hinges, cpgs):
+        connections.update(
+            CpgPair(cpg, cpg_of[neighbour])
+            for neighbour in active_hinge.neighbours(within_range=2)
+            if isinstance(neighbour, ActiveHinge)
+        )
+    return CpgNetworkStructure(cpgs, connections)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = np.random.Generator(np.random.PCG64(0))
+    print("modules  neighbour walk  module graph  (ms per body)")
+    for num_modules in [20, 100, 200]:
+        bodies = [random_body(rng, num_modules) for _ in range(NUM_BODIES)]
+        hinges = [body.find_modules_of_type(ActiveHinge) for body in bodies]
+        # The lattice and module graph are cached on the body, as when a brain is created for a body that was already used.
+        for body in bodies:
+            body.module_graph
+
+        walk_seconds = best_of(REPEAT, lambda: [neighbour_walk(h) for h in hinges])
+        graph_seconds = best_of(
+            REPEAT,
+            lambda: [
+                active_hinges_to_cpg_network_structure_neighbor(h, body)
+                for h, body in zip(hinges, bodies)
+            ],
+        )
+        print(
+            f"{num_modules:7d}  {1000 * walk_seconds / NUM_BODIES:14.2f}  {1000 * graph_seconds / NUM_BODIES:12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
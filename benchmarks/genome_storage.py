@@ -0,0 +1,136 @@
+"""
+Measure storing CPPNWIN genomes in a database as text and compressed.
+
+Creates a database of mutated genotypes as text, converts a copy to compressed genomes with `migrate_genome_storage`,
+and measures the size of both databases and the duration of loading their genotypes.
+Loading and then accessing every genome shows the cost of loading when genomes were deserialized as soon as they were loaded.
+"""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Sequence
+
+import multineat
+import numpy as np
+import sqlalchemy
+import sqlalchemy.orm as orm
+from _timing import best_of
+from revolve2.experimentation.database import HasId, OpenMethod, open_database_sqlite
+from revolve2.standards.genotypes.cppnwin import GenomeStorage, migrate_genome_storage
+from revolve2.standards.genotypes.cppnwin.modular_robot import BrainGenotypeCpgOrm
+from revolve2.standards.genotypes.cppnwin.modular_robot.v2 import BodyGenotypeOrmV2
+from sqlalchemy.engine import Engine
+
+NUM_GENOTYPES = 2000
+NUM_MUTATIONS = 20
+REPEAT = 5
+
+
+class Base(orm.MappedAsDataclass, orm.DeclarativeBase):
+    """Base class for the SQLAlchemy models of the benchmark."""
+
+    pass
+
+
+class Genotype(Base, HasId, BodyGenotypeOrmV2, BrainGenotypeCpgOrm):
+    """A genotype for a modular robot body and brain, stored as text."""
+
+    __tablename__ = "genotype"
+
+
+def mutated_genotypes() -> list[Genotype]:
+    """
+    Create random genotypes, each mutated many times.
+
+    :returns: The genotypes.
+    """
+    rng = np.random.Generator(np.random.PCG64(0))
+    innov_db_body = multineat.InnovationDatabase()
+    innov_db_brain = multineat.InnovationDatabase()
+    genotypes = []
+    for _ in range(NUM_GENOTYPES):
+        body = Genotype.random_body(innov_db_body, rng)
+        brain = Genotype.random_brain(innov_db_brain, rng)
+        for _ in range(NUM_MUTATIONS):
+            body = body.mutate_body(innov_db_body, rng)
+            brain = brain.mutate_brain(innov_db_brain, rng)
+        genotypes.append(Genotype(body=body.body, brain=brain.brain))
+    return genotypes
+
+
+def load(dbengine: Engine, deserialize: bool) -> None:
+    """
+    Load all genotypes from a database.
+
+    :param dbengine: The database.
+    :param deserialize: Whether to access the genomes of the genotypes.
+    """
+    with orm.Session(dbengine) as session:
+        genotypes: Sequence[Genotype] = session.scalars(
+            sqlalchemy.select(Genotype)
+        ).all()
+        if deserialize:
+            for genotype in genotypes:
+                genotype.body
+                genotype.brain
+
+
+def size(dbengine: Engine, path: Path) -> float:
+    """
+    Get the size of a database without free pages.
+
+    :param dbengine: The database.
+    :param path: The database file.
+    :returns: The size, in MB.
+    """
+    with dbengine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+    return path.stat().st_size / 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = Path(directory) / "text.sqlite"
+        compressed_path = Path(directory) / "compressed.sqlite"
+
+        text_db = open_database_sqlite(
+            str(text_path), open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+        )
+        Base.metadata.create_all(text_db)
+        with orm.Session(text_db) as session:
+            session.add_all(mutated_genotypes())
+            session.commit()
+        text_size = size(text_db, text_path)
+
+        shutil.copy(text_path, compressed_path)
+        compressed_db = open_database_sqlite(
+            str(compressed_path), open_method=OpenMethod.OPEN_IF_EXISTS
+        )
+        start = time.perf_counter()
+        migrate_genome_storage(
+            compressed_db,
+            Genotype,
+            ["serialized_body", "serialized_brain"],
+            GenomeStorage.COMPRESSED,
+        )
+        migrate_seconds = time.perf_counter() - start
+        compressed_size = size(compressed_db, compressed_path)
+
+        print("storage     size (MB)  load (ms)  load and access genomes (ms)")
+        for name, dbengine, database_size in [
+            ("text", text_db, text_size),
+            ("compressed", compressed_db, compressed_size),
+        ]:
+            load_seconds = best_of(REPEAT, lambda: load(dbengine, False))
+            deserialize_seconds = best_of(REPEAT, lambda: load(dbengine, True))
+            print(
+                f"{name:10s}  {database_size:9.1f}  {1000 * load_seconds:9.0f}  {1000 * deserialize_seconds:28.0f}"
+            )
+        print(f"migrating the text database: {migrate_seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
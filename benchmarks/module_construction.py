@@ -0,0 +1,74 @@
+"""
+Measure the time and memory it takes to create modules and to develop bodies.
+
+The replaced implementations cannot be copied into this script, so run it on the commit before a change to compare.
+"""
+
+import gc
+import tracemalloc
+from typing import Callable
+
+import multineat
+import numpy as np
+from _timing import best_of
+from revolve2.modular_robot.body.base import Body
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BrickV2
+from revolve2.standards.genotypes.cppnwin.modular_robot.v2 import BodyGenotypeV2
+
+NUM_MODULES = 20000
+NUM_BODIES = 200
+REPEAT = 5
+
+
+def create_modules() -> list[BrickV2 | ActiveHingeV2]:
+    """
+    Create bricks and active hinges that are not attached to anything.
+
+    :returns: The modules.
+    """
+    return [
+        BrickV2(0.0) if i % 2 == 0 else ActiveHingeV2(0.0) for i in range(NUM_MODULES)
+    ]
+
+
+def retained_bytes(function: Callable[[], object]) -> int:
+    """
+    Measure the memory that is allocated by a function and still used by its result.
+
+    :param function: The function.
+    :returns: The number of bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    seconds = best_of(REPEAT, create_modules)
+    module_bytes = retained_bytes(create_modules) / NUM_MODULES
+    print(
+        f"{NUM_MODULES} bare modules: {1000 * seconds:.0f} ms, {module_bytes:.0f} bytes per module"
+    )
+
+    rng = np.random.Generator(np.random.PCG64(0))
+    innov_db = multineat.InnovationDatabase()
+    genotypes = [BodyGenotypeV2.random_body(innov_db, rng) for _ in range(NUM_BODIES)]
+
+    def develop() -> list[Body]:
+        return [genotype.develop_body() for genotype in genotypes]
+
+    seconds = best_of(REPEAT, develop)
+    body_bytes = retained_bytes(develop)
+    print(
+        f"{NUM_BODIES} developed bodies: {1000 * seconds:.0f} ms, {body_bytes / 2**20:.2f} MiB retained"
+    )
+
+
+if __name__ == "__main__":
+    main()
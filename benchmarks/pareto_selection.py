@@ -0,0 +1,119 @@
+"""
+Measure selecting individuals with multiple objectives using `pareto_frontier` and `non_dominated_sort`.
+
+Compares `pareto_frontier` with a copy of the pairwise loop that calculated domination orders before they were calculated with NumPy.
+The loop is only measured for small populations, because its duration grows quadratically.
+"""
+
+from typing import Callable
+
+import numpy as np
+from _timing import best_of
+from numpy.typing import NDArray
+from revolve2.experimentation.optimization.ea.selection import (
+    non_dominated_sort,
+    pareto_frontier,
+)
+
+REPEAT = 5
+PAIRWISE_MAX_POINTS = 1000
+
+
+def pairwise_domination_orders(
+    value_array: NDArray[np.float_], frontier_order: list[bool]
+) -> list[int]:
+    """
+    Find the pareto domination order for each point, by comparing every pair of points in Python.
+
+    :param value_array: A (*value) array.
+    :param frontier_order: The order of a specific value.
+    :returns: The domination order of every point.
+    """
+    domination_orders = [0] * value_array.shape[0]
+    i = 0
+    for pair in value_array:
+        dom = sum(
+            [
+                any(
+                    [
+                        p[j] > pair[j] if frontier_order[j] else p[j] < pair[j]
+                        for j in range(len(frontier_order))
+                    ]
+                )
+                for p in value_array
+            ]
+        )
+        domination_orders[i] = dom
+        i += 1
+    return domination_orders
+
+
+def pairwise_pareto_frontier(
+    frontier_values: list[list[float]], frontier_order: list[bool], to_take: int
+) -> list[int]:
+    """
+    Select individuals like `pareto_frontier`, using the pairwise domination orders.
+
+    :param frontier_values: Lists of values, one list per objective.
+    :param frontier_order: The order of every value. True = ascending, False = descending.
+    :param to_take: The amount of individuals to return.
+    :returns: The selected individuals.
+    """
+    domination_orders = pairwise_domination_orders(
+        np.array(frontier_values, dtype=np.float64).T, frontier_order
+    )
+    all_values = np.array([domination_orders] + frontier_values, dtype=np.float64)
+    all_orders = [False] + frontier_order
+    keys = [
+        all_values[i] if all_orders[i] else -all_values[i]
+        for i in range(len(all_orders))
+    ]
+    return list(np.lexsort(keys[:-1])[:to_take])
+
+
+def seconds_to_select(
+    select: Callable[[list[list[float]], list[bool], int], list[int]],
+    rng: np.random.Generator,
+    num_objectives: int,
+    num_points: int,
+) -> float:
+    """
+    Measure selecting half of a population with random objective values.
+
+    :param select: The selection function.
+    :param rng: Random number generator.
+    :param num_objectives: The number of objectives.
+    :param num_points: The size of the population.
+    :returns: The duration, in seconds.
+    """
+    values = rng.normal(size=(num_objectives, num_points)).tolist()
+    order = [objective % 2 == 0 for objective in range(num_objectives)]
+    return best_of(REPEAT, lambda: select(values, order, num_points // 2))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = np.random.Generator(np.random.PCG64(0))
+
+    print("pareto_frontier, 2 objectives")
+    print("points  pairwise (s)  numpy (s)")
+    for num_points in [300, 1000, 10000]:
+        pairwise = (
+            f"{seconds_to_select(pairwise_pareto_frontier, rng, 2, num_points):12.4f}"
+            if num_points <= PAIRWISE_MAX_POINTS
+            else " " * 12
+        )
+        numpy = seconds_to_select(pareto_frontier, rng, 2, num_points)
+        print(f"{num_points:6d}  {pairwise}  {numpy:9.4f}")
+
+    print()
+    print("non_dominated_sort")
+    print("points  2 objectives (s)  3 objectives (s)")
+    for num_points in [1000, 3000, 10000]:
+        two = seconds_to_select(non_dominated_sort, rng, 2, num_points)
+        three = seconds_to_select(non_dominated_sort, rng, 3, num_points)
+        print(f"{num_points:6d}  {two:16.4f}  {three:16.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,32 @@
 
 DATABASE_FILE = "final_runs/5rep_split_1000gen_regular.sqlite"
 # DATABASE_FILE = "final_runs/5rep_split_1000gen_regular.sqlite"
+# Analysis-ready export of the database, created by `export_parquet.py`.
+PARQUET_DIRECTORY = DATABASE_FILE.removesuffix(".sqlite") + "_parquet"
+# State of the running experiment, to resume it if it is interrupted.
+CHECKPOINT_FILE = DATABASE_FILE.removesuffix(".sqlite") + ".checkpoint"
+CHECKPOINT_INTERVAL = 10
+# Databases of the repetitions when they are run at the same time by `sweep.py`.
+SHARD_DIRECTORY = DATABASE_FILE.removesuffix(".sqlite") + "_shards"
+# Island model of `islands.py`. The simulators are divided over the islands.
+ISLAND_DIRECTORY = DATABASE_FILE.removesuffix(".sqlite") + "_islands"
+ISLAND_STATISTICS_FILE = DATABASE_FILE.removesuffix(".sqlite") + "_islands.csv"
+NUM_ISLANDS = 4
+MIGRATION_INTERVAL = 5
+NUM_MIGRANTS = 1
 NUM_REPETITIONS = 1
 NUM_SIMULATORS = 4
 POPULATION_SIZE = 8
 OFFSPRING_SIZE = 5
 NUM_GENERATIONS = 30
+# Save the wall time, CPU time and memory of each stage of every generation to the database.
+MEASURE_STAGES = True
+# Simulate all offspring for a short time first, and only simulate the best fraction for the full time.
+# Set the simulation time in seconds to enable it.
+SCREENING_SIMULATION_TIME: int | None = None
+SCREENING_SIMULATION_TIMESTEP = 0.002
+SCREENING_PROMOTE_FRACTION = 0.4
+# Learn a brain for every robot with CMA-ES, and use the fitness of the best learned brain.
+# Set the number of CMA-ES generations to enable it. If the population size is None, the CMA-ES default is used.
+LEARNING_GENERATIONS: int | None = None
+LEARNING_POPULATION_SIZE: int | None = None
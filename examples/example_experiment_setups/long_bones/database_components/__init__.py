@@ -3,8 +3,19 @@
 from ._base import Base
 from ._experiment import Experiment
 from ._generation import Generation
+from ._generation_statistics import GenerationStatistics
 from ._genotype import Genotype
 from ._individual import Individual
 from ._population import Population
+from ._stage_timing import StageTiming
 
-__all__ = ["Base", "Experiment", "Generation", "Genotype", "Individual", "Population"]
+__all__ = [
+    "Base",
+    "Experiment",
+    "Generation",
+    "GenerationStatistics",
+    "Genotype",
+    "Individual",
+    "Population",
+    "StageTiming",
+]
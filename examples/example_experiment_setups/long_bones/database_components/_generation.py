@@ -16,11 +16,11 @@ class Generation(Base, HasId):
     __tablename__ = "generation"
 
     experiment_id: orm.Mapped[int] = orm.mapped_column(
-        sqlalchemy.ForeignKey("experiment.id"), nullable=False, init=False
+        sqlalchemy.ForeignKey("experiment.id"), nullable=False, init=False, index=True
     )
     experiment: orm.Mapped[Experiment] = orm.relationship()
-    generation_index: orm.Mapped[int] = orm.mapped_column(nullable=False)
+    generation_index: orm.Mapped[int] = orm.mapped_column(nullable=False, index=True)
     population_id: orm.Mapped[int] = orm.mapped_column(
-        sqlalchemy.ForeignKey("population.id"), nullable=False, init=False
+        sqlalchemy.ForeignKey("population.id"), nullable=False, init=False, index=True
     )
     population: orm.Mapped[Population] = orm.relationship()
@@ -0,0 +1,14 @@
+"""GenerationStatistics class."""
+
+from revolve2.experimentation.optimization.ea import (
+    GenerationStatistics as GenericGenerationStatistics,
+)
+
+from ._base import Base
+from ._generation import Generation
+
+
+class GenerationStatistics(Base, GenericGenerationStatistics[Generation]):
+    """Summary statistics of the fitness of the individuals in a generation."""
+
+    __tablename__ = "generation_statistics"
@@ -0,0 +1,49 @@
+"""StageTiming class."""
+
+from __future__ import annotations
+
+import sqlalchemy
+import sqlalchemy.orm as orm
+from revolve2.experimentation.database import HasId
+from revolve2.experimentation.evolution import StageTiming as StageMeasurement
+
+from ._base import Base
+from ._experiment import Experiment
+
+
+class StageTiming(Base, HasId):
+    """Wall time, CPU time and memory of a stage of an evolution step, such as reproduction or evaluation."""
+
+    __tablename__ = "stage_timing"
+
+    experiment_id: orm.Mapped[int] = orm.mapped_column(
+        sqlalchemy.ForeignKey("experiment.id"), nullable=False, init=False, index=True
+    )
+    experiment: orm.Mapped[Experiment] = orm.relationship()
+    # The generation the step started from.
+    generation_index: orm.Mapped[int] = orm.mapped_column(nullable=False)
+    stage: orm.Mapped[str] = orm.mapped_column(nullable=False)
+    wall_seconds: orm.Mapped[float] = orm.mapped_column(nullable=False)
+    cpu_seconds: orm.Mapped[float] = orm.mapped_column(nullable=False)
+    # Memory of the whole process, shared by all runs of a sweep.
+    rss_bytes: orm.Mapped[int | None] = orm.mapped_column(nullable=True)
+
+    @classmethod
+    def from_measurement(
+        cls, experiment: Experiment, measurement: StageMeasurement
+    ) -> StageTiming:
+        """
+        Create a stage timing from a measurement of the evolution.
+
+        :param experiment: The experiment the measurement belongs to.
+        :param measurement: The measurement.
+        :returns: The stage timing.
+        """
+        return cls(
+            experiment=experiment,
+            generation_index=measurement.generation_index,
+            stage=measurement.stage,
+            wall_seconds=measurement.wall_seconds,
+            cpu_seconds=measurement.cpu_seconds,
+            rss_bytes=measurement.rss_bytes,
+        )
@@ -4,6 +4,8 @@ from typing import List, Any
 from database_components import Genotype
 
 from revolve2.experimentation.evolution.abstract_elements import Evaluator as Eval
+from revolve2.experimentation.parallel import ParallelMap
+from revolve2.modular_robot import ModularRobot
 from revolve2.modular_robot_simulation import (
     ModularRobotScene,
     Terrain,
@@ -11,7 +13,12 @@ from revolve2.modular_robot_simulation import (
 )
 from revolve2.simulators.mujoco_simulator import LocalSimulator
 from revolve2.standards import fitness_functions, terrains
-from revolve2.standards.simulation_parameters import make_standard_batch_parameters
+from revolve2.simulation.simulator import BatchParameters
+from revolve2.standards.simulation_parameters import (
+    STANDARD_SIMULATION_TIME,
+    STANDARD_SIMULATION_TIMESTEP,
+    make_standard_batch_parameters,
+)
 from revolve2.modular_robot.body.v2 import BodyV2, BrickV2Large
 
 
@@ -20,22 +27,36 @@ class Evaluator(Eval):
 
     _simulator: LocalSimulator
     _terrain: Terrain
+    _parallel_map: ParallelMap | None
+    _batch_parameters: BatchParameters
 
     def __init__(
         self,
         headless: bool,
         num_simulators: int,
+        parallel_map: ParallelMap | None = None,
+        simulation_time: int = STANDARD_SIMULATION_TIME,
+        simulation_timestep: float = STANDARD_SIMULATION_TIMESTEP,
     ) -> None:
         """
         Initialize this object.
 
         :param headless: `headless` parameter for the physics simulator.
         :param num_simulators: `num_simulators` parameter for the physics simulator.
+        :param parallel_map: Worker processes to develop the genotypes in. The simulator uses the same workers. If None, genotypes are developed in this process.
+        :param simulation_time: Simulated seconds per robot. Shorter than standard for quick screening.
+        :param simulation_timestep: Simulation timestep. Larger than standard for quick screening.
         """
         self._simulator = LocalSimulator(
-            headless=headless, num_simulators=num_simulators
+            headless=headless,
+            num_simulators=num_simulators,
+            executor=None if parallel_map is None else parallel_map.executor,
         )
         self._terrain = terrains.flat()
+        self._parallel_map = parallel_map
+        self._batch_parameters = make_standard_batch_parameters(
+            simulation_time=simulation_time, simulation_timestep=simulation_timestep
+        )
 
     def evaluate(
         self,
@@ -51,7 +72,7 @@ class Evaluator(Eval):
         :param generation_index: The index of the generation.
         :returns: Fitnesses of the robots.
         """
-        robots = [genotype.develop() for genotype in population]
+        robots = self._develop(population)
 
         # Create the scenes.
         scenes = []
@@ -63,7 +84,7 @@ class Evaluator(Eval):
         # Simulate all scenes.
         scene_states = simulate_scenes(
             simulator=self._simulator,
-            batch_parameters=make_standard_batch_parameters(),
+            batch_parameters=self._batch_parameters,
             scenes=scenes,
         )
 
@@ -112,7 +133,7 @@ class Evaluator(Eval):
         :param generation_index: The index of the generation.
         :returns: Fitnesses of the robots.
         """
-        robots = [genotype.develop() for genotype in population]
+        robots = self._develop(population)
 
         # Create the scenes.
         scenes = []
@@ -124,7 +145,7 @@ class Evaluator(Eval):
         # Simulate all scenes.
         scene_states = simulate_scenes(
             simulator=self._simulator,
-            batch_parameters=make_standard_batch_parameters(),
+            batch_parameters=self._batch_parameters,
             scenes=scenes,
         )
 
@@ -134,3 +155,8 @@ class Evaluator(Eval):
         # Calculate the xy displacements.
 
         return positions
+
+    def _develop(self, population: list[Genotype]) -> list[ModularRobot]:
+        if self._parallel_map is None:
+            return [genotype.develop() for genotype in population]
+        return self._parallel_map.map(Genotype.develop, population)
@@ -0,0 +1,42 @@
+"""Export the fitness of all individuals in the database to a Parquet dataset, partitioned by experiment and ordered by generation within each experiment."""
+
+import logging
+
+import config
+from database_components import Experiment, Generation, Individual, Population
+from revolve2.experimentation.database import OpenMethod, open_database_sqlite
+from revolve2.experimentation.database.parquet import export_parquet
+from revolve2.experimentation.experiment_logging import setup_logging
+from sqlalchemy import select
+
+
+def main() -> None:
+    """Run the program."""
+    setup_logging()
+
+    dbengine = open_database_sqlite(
+        config.DATABASE_FILE, open_method=OpenMethod.OPEN_IF_EXISTS
+    )
+
+    statement = (
+        select(
+            Experiment.id.label("experiment_id"),
+            Generation.generation_index,
+            Individual.population_index,
+            Individual.genotype_id,
+            Individual.fitness,
+        )
+        .join_from(Experiment, Generation, Experiment.id == Generation.experiment_id)
+        .join_from(Generation, Population, Generation.population_id == Population.id)
+        .join_from(Population, Individual, Population.id == Individual.population_id)
+        .order_by(
+            Experiment.id, Generation.generation_index, Individual.population_index
+        )
+    )
+
+    num_rows = export_parquet(dbengine, statement, config.PARQUET_DIRECTORY)
+    logging.info(f"Exported {num_rows} individuals to {config.PARQUET_DIRECTORY}.")
+
+
+if __name__ == "__main__":
+    main()
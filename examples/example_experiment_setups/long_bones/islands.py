@@ -0,0 +1,260 @@
+"""Run the experiment as an island model: multiple populations evolving in their own processes, exchanging their best robots."""
+
+import csv
+import dataclasses
+import logging
+import os
+from functools import partial
+
+import config
+import multineat
+import numpy as np
+from database_components import (
+    Base,
+    Experiment,
+    Generation,
+    Genotype,
+    Individual,
+    Population,
+)
+from main import (
+    CrossoverReproducer,
+    ParentSelector,
+    SurvivorSelector,
+    make_evaluator,
+    save_to_db,
+)
+from revolve2.experimentation.database import (
+    DatabaseWriter,
+    OpenMethod,
+    merge_databases,
+    open_database_sqlite,
+)
+from revolve2.experimentation.evolution import (
+    Island,
+    IslandModel,
+    IslandStatistics,
+    ModularRobotEvolution,
+)
+from revolve2.experimentation.evolution import StageTiming as StageMeasurement
+from revolve2.experimentation.evolution import ring_topology
+from revolve2.experimentation.evolution.abstract_elements import Evaluator
+from revolve2.experimentation.experiment_logging import setup_logging
+from revolve2.experimentation.optimization.ea import ColumnarPopulation
+from revolve2.experimentation.parallel import ParallelMap
+from revolve2.experimentation.rng import make_rng, seed_from_time
+from sqlalchemy.orm import Session
+
+# Size of the range of innovation and neuron numbers of every island. Multineat stores them as 32 bit integers.
+_INNOVATION_RANGE = (2**31 - 1) // (config.NUM_ISLANDS + 1)
+
+
+def island_file(island_index: int) -> str:
+    """
+    Get the database file of an island.
+
+    :param island_index: The index of the island.
+    :returns: The file.
+    """
+    return os.path.join(config.ISLAND_DIRECTORY, f"island_{island_index}.sqlite")
+
+
+class LongBonesIsland(Island):
+    """An island evolving robots, saving its generations to its own database as a separate experiment."""
+
+    _rng: np.random.Generator
+    _experiment: Experiment
+    _database_writer: DatabaseWriter
+    _stage_measurements: list[StageMeasurement]
+    _parallel_map: ParallelMap
+    _innov_db_body: multineat.InnovationDatabase
+    _innov_db_brain: multineat.InnovationDatabase
+    _evaluator: Evaluator
+    _modular_robot_evolution: ModularRobotEvolution
+
+    def __init__(self, island_index: int, rng_seed: int) -> None:
+        """
+        Initialize this object.
+
+        :param island_index: The index of the island.
+        :param rng_seed: Seed for the random number generator.
+        """
+        rng = make_rng(rng_seed)
+        self._rng = rng
+
+        dbengine = open_database_sqlite(
+            island_file(island_index),
+            open_method=OpenMethod.OVERWITE_IF_EXISTS,
+            journal_mode="WAL",
+            synchronous="NORMAL",
+        )
+        Base.metadata.create_all(dbengine)
+        self._experiment = Experiment(rng_seed=rng_seed)
+        with Session(dbengine, expire_on_commit=False) as session:
+            session.add(self._experiment)
+            session.commit()
+        self._database_writer = DatabaseWriter(dbengine)
+        self._stage_measurements = []
+
+        # Islands cannot share an innovation database, as they run in their own processes.
+        # Instead every island numbers its innovations in its own range, so innovations of different islands never get the same number,
+        # and crossover with immigrants only matches the genes they have in common by descent.
+        first_innovation = (island_index + 1) * _INNOVATION_RANGE
+        self._innov_db_body = multineat.InnovationDatabase()
+        self._innov_db_body.Init_i_i(first_innovation, first_innovation)
+        self._innov_db_brain = multineat.InnovationDatabase()
+        self._innov_db_brain.Init_i_i(first_innovation, first_innovation)
+
+        num_simulators = max(1, config.NUM_SIMULATORS // config.NUM_ISLANDS)
+        self._parallel_map = ParallelMap(num_workers=num_simulators)
+        self._evaluator = make_evaluator(self._parallel_map, num_simulators, rng)
+        self._modular_robot_evolution = ModularRobotEvolution(
+            parent_selection=ParentSelector(
+                offspring_size=config.OFFSPRING_SIZE, rng=rng
+            ),
+            survivor_selection=SurvivorSelector(rng=rng),
+            evaluator=self._evaluator,
+            reproducer=CrossoverReproducer(
+                rng=rng,
+                innov_db_body=self._innov_db_body,
+                innov_db_brain=self._innov_db_brain,
+                parallel_map=self._parallel_map,
+            ),
+            stage_callback=(
+                self._stage_measurements.append if config.MEASURE_STAGES else None
+            ),
+        )
+
+    def initial_population(self) -> ColumnarPopulation[Genotype]:
+        """
+        Create, evaluate and save the initial population.
+
+        :returns: The initial population.
+        """
+        initial_genotypes = [
+            Genotype.random(
+                innov_db_body=self._innov_db_body,
+                innov_db_brain=self._innov_db_brain,
+                rng=self._rng,
+            )
+            for _ in range(config.POPULATION_SIZE)
+        ]
+        population = ColumnarPopulation(
+            initial_genotypes,
+            self._evaluator.evaluate(initial_genotypes, generation_index=0),
+        )
+        self._save(population, 0)
+        return population
+
+    def step(
+        self, population: ColumnarPopulation[Genotype], generation_index: int
+    ) -> ColumnarPopulation[Genotype]:
+        """
+        Create and save the next generation.
+
+        :param population: The current population.
+        :param generation_index: The index of the generation of the current population.
+        :returns: The population of the next generation.
+        """
+        self._wait_for_database()
+        population = self._modular_robot_evolution.step(
+            population, generation_index=generation_index
+        )
+        self._save(population, generation_index + 1)
+        return population
+
+    def copy_migrant(self, genotype: Genotype) -> Genotype:
+        """
+        Copy a genotype so it can be saved in the database of another island.
+
+        :param genotype: The genotype.
+        :returns: The copy.
+        """
+        self._wait_for_database()
+        return Genotype(body=genotype.body, brain=genotype.brain)
+
+    def diversity(self, population: ColumnarPopulation[Genotype]) -> float:
+        """
+        Measure the diversity of a population as the fraction of distinct bodies.
+
+        :param population: The population.
+        :returns: The diversity.
+        """
+        self._wait_for_database()
+        bodies = {genotype.body.Serialize() for genotype in population.genotypes}
+        return len(bodies) / len(population)
+
+    def close(self) -> None:
+        """Write the remaining generations and stop the worker processes."""
+        self._database_writer.close()
+        self._parallel_map.close()
+
+    def _save(
+        self, population: ColumnarPopulation[Genotype], generation_index: int
+    ) -> None:
+        generation = Generation(
+            experiment=self._experiment,
+            generation_index=generation_index,
+            population=population.to_orm(Population, Individual),
+        )
+        save_to_db(
+            self._database_writer, generation, population, self._stage_measurements
+        )
+        self._stage_measurements.clear()
+
+    def _wait_for_database(self) -> None:
+        # The writer owns the genotypes of the last saved population until they are written.
+        self._database_writer.flush()
+
+
+def create_island(island_index: int, rng_seed: int) -> LongBonesIsland:
+    """
+    Create an island, in its own process.
+
+    :param island_index: The index of the island.
+    :param rng_seed: Seed of the experiment, from which the seed of the island is derived.
+    :returns: The island.
+    """
+    return LongBonesIsland(island_index, rng_seed + island_index)
+
+
+def main() -> None:
+    """Run the program."""
+    setup_logging(file_name="old_runs/log.txt")
+    os.makedirs(config.ISLAND_DIRECTORY, exist_ok=True)
+
+    island_model = IslandModel(
+        create_island=partial(create_island, rng_seed=seed_from_time()),
+        topology=ring_topology(config.NUM_ISLANDS),
+        migration_interval=config.MIGRATION_INTERVAL,
+        num_migrants=config.NUM_MIGRANTS,
+    )
+    statistics = island_model.run(config.NUM_GENERATIONS)
+
+    # Save the throughput and diversity of the islands.
+    with open(config.ISLAND_STATISTICS_FILE, "w", newline="") as file:
+        writer = csv.DictWriter(
+            file, [field.name for field in dataclasses.fields(IslandStatistics)]
+        )
+        writer.writeheader()
+        writer.writerows(dataclasses.asdict(record) for record in statistics)
+
+    # Combine the databases of the islands, with an experiment per island.
+    logging.info("Merging databases.")
+    dbengine = open_database_sqlite(
+        config.DATABASE_FILE, open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+    )
+    merge_databases(
+        dbengine,
+        [
+            open_database_sqlite(
+                island_file(island_index), open_method=OpenMethod.OPEN_IF_EXISTS
+            )
+            for island_index in range(config.NUM_ISLANDS)
+        ],
+        Base.metadata,
+    )
+
+
+if __name__ == "__main__":
+    main()
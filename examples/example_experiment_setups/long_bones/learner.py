@@ -0,0 +1,457 @@
+"""Learning the brains of robot bodies with CMA-ES, simulating each body many times without rebuilding its simulation model."""
+
+import concurrent.futures
+import math
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import cma
+import numpy as np
+import numpy.typing as npt
+from database_components import Genotype
+from revolve2.experimentation.evolution.abstract_elements import Evaluator as Eval
+from revolve2.experimentation.evolution.abstract_elements import Learner
+from revolve2.experimentation.parallel import ParallelMap
+from revolve2.experimentation.rng import make_rng, make_seeds
+from revolve2.modular_robot import ModularRobot, MorphologyDeduplicator
+from revolve2.modular_robot.body.base import ActiveHinge, Body
+from revolve2.modular_robot.brain.cpg import (
+    BrainCpgNetworkStatic,
+    CpgNetworkStructure,
+    active_hinges_to_cpg_network_structure_neighbor,
+)
+from revolve2.modular_robot_simulation import (
+    ModularRobotScene,
+    ModularRobotSimulationHandler,
+    ModularRobotSimulationState,
+    SceneSimulationState,
+    Terrain,
+)
+from revolve2.simulation.scene import MultiBodySystem, UUIDKey
+from revolve2.simulation.simulator import BatchParameters
+from revolve2.simulators.mujoco_simulator import CompiledScene
+from revolve2.standards import fitness_functions, terrains
+from revolve2.standards.simulation_parameters import make_standard_batch_parameters
+
+FitnessFunction = Callable[
+    [ModularRobot, ModularRobotSimulationState, ModularRobotSimulationState], float
+]
+
+_INITIAL_STATE = math.sqrt(2) * 0.5
+_COMPILED_BODY_CACHE_SIZE = 16
+
+
+def combined_fitness(
+    robot: ModularRobot,
+    begin_state: ModularRobotSimulationState,
+    end_state: ModularRobotSimulationState,
+) -> float:
+    """
+    Calculate the fitness the same way as the `Evaluator` does.
+
+    :param robot: The robot.
+    :param begin_state: Begin state of the robot.
+    :param end_state: End state of the robot.
+    :returns: The fitness.
+    """
+    return fitness_functions.combined_fitness(robot, begin_state, end_state, 0.5, 1, 1)
+
+
+@dataclass
+class LearningResult:
+    """The best brain found for a body."""
+
+    brain: BrainCpgNetworkStatic
+    params: npt.NDArray[np.float_]
+    fitness: float
+    num_evaluations: int
+
+
+class CmaesLearner(Learner):
+    """
+    Learns the weights of a CPG brain for each body with CMA-ES.
+
+    Building the simulation model of a body takes a large part of the time of a simulation,
+    so each worker compiles a body once, and every candidate brain only resets the simulation and replaces the brain.
+    The candidates of all bodies are submitted to the workers interleaved, so workers stay busy while the CMA-ES of a body waits for its slowest candidate.
+    """
+
+    _parallel_map: ParallelMap
+    _rng: np.random.Generator
+    _num_generations: int
+    _initial_std: float
+    _population_size: int | None
+    _candidates_per_task: int
+    _terrain: Terrain
+    _batch_parameters: BatchParameters
+    _fitness_function: FitnessFunction
+
+    def __init__(
+        self,
+        parallel_map: ParallelMap,
+        rng: np.random.Generator,
+        num_generations: int,
+        initial_std: float = 0.5,
+        population_size: int | None = None,
+        candidates_per_task: int = 1,
+        batch_parameters: BatchParameters | None = None,
+        fitness_function: FitnessFunction = combined_fitness,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param parallel_map: Worker processes to simulate in.
+        :param rng: Random number generator to seed the CMA-ES of every body. The learned brains only depend on its state, not on the number of workers.
+        :param num_generations: The number of CMA-ES generations per body.
+        :param initial_std: The initial standard deviation of CMA-ES. Weights are between -1 and 1.
+        :param population_size: The CMA-ES population size. If None, the CMA-ES default for the number of weights is used.
+        :param candidates_per_task: The number of candidates simulated by one task of a worker. More candidates per task cost less communication, but balance the load over the workers less well.
+        :param batch_parameters: The simulation parameters. If None, the standard parameters are used.
+        :param fitness_function: The fitness of a robot from its begin and end state. Must be defined at module level.
+        """
+        assert num_generations >= 1
+        assert candidates_per_task >= 1
+
+        self._parallel_map = parallel_map
+        self._rng = rng
+        self._num_generations = num_generations
+        self._initial_std = initial_std
+        self._population_size = population_size
+        self._candidates_per_task = candidates_per_task
+        self._terrain = terrains.flat()
+        self._batch_parameters = (
+            make_standard_batch_parameters()
+            if batch_parameters is None
+            else batch_parameters
+        )
+        self._fitness_function = fitness_function
+
+    def learn(self, population: Sequence[Body]) -> list[LearningResult]:
+        """
+        Learn a brain for every body.
+
+        :param population: The bodies.
+        :returns: The best brain found for every body.
+        """
+        learnings = [
+            _BodyLearning(
+                body,
+                rng=make_rng(seed),
+                initial_std=self._initial_std,
+                population_size=self._population_size,
+            )
+            for body, seed in zip(population, make_seeds(self._rng, len(population)))
+        ]
+
+        # Tasks of the bodies are interleaved, so the first tasks of all bodies start before the later ones.
+        pending: dict[
+            concurrent.futures.Future[list[float] | None],
+            tuple[_BodyLearning, int, list[npt.NDArray[np.float_]]],
+        ] = {}
+        tasks = [self._ask(learning) for learning in learnings]
+        for index in range(max((len(body_tasks) for body_tasks in tasks), default=0)):
+            for learning, body_tasks in zip(learnings, tasks):
+                if index < len(body_tasks):
+                    start, candidates = body_tasks[index]
+                    pending[self._submit(learning, candidates)] = (
+                        learning,
+                        start,
+                        candidates,
+                    )
+
+        while len(pending) > 0:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                learning, start, candidates = pending.pop(future)
+                fitnesses = future.result()
+                if fitnesses is None:
+                    # The worker did not have the body compiled, so the task is sent again with the body.
+                    pending[self._submit(learning, candidates, send_body=True)] = (
+                        learning,
+                        start,
+                        candidates,
+                    )
+                    continue
+                learning.compiled = True
+                if learning.tell(start, fitnesses) and not learning.finished(
+                    self._num_generations
+                ):
+                    for start, candidates in self._ask(learning):
+                        pending[self._submit(learning, candidates)] = (
+                            learning,
+                            start,
+                            candidates,
+                        )
+
+        return [learning.result() for learning in learnings]
+
+    def _ask(
+        self, learning: "_BodyLearning"
+    ) -> list[tuple[int, list[npt.NDArray[np.float_]]]]:
+        candidates = learning.ask()
+        return [
+            (start, candidates[start : start + self._candidates_per_task])
+            for start in range(0, len(candidates), self._candidates_per_task)
+        ]
+
+    def _submit(
+        self,
+        learning: "_BodyLearning",
+        candidates: list[npt.NDArray[np.float_]],
+        send_body: bool = False,
+    ) -> concurrent.futures.Future[list[float] | None]:
+        # Once a worker has compiled the body, only its key is sent, as pickling the body for every task is expensive.
+        arguments = (
+            learning.key,
+            learning.body if send_body or not learning.compiled else None,
+            self._terrain,
+            self._batch_parameters,
+            self._fitness_function,
+            candidates,
+        )
+        executor = self._parallel_map.executor
+        if executor is not None:
+            return executor.submit(_simulate_candidates, *arguments)
+        future: concurrent.futures.Future[list[float] | None] = (
+            concurrent.futures.Future()
+        )
+        future.set_result(_simulate_candidates(*arguments))
+        return future
+
+
+class _BodyLearning:
+    """The CMA-ES of one body, collecting the fitness of its candidates as their tasks complete."""
+
+    key: str
+    """Identifies the body in the caches of the workers."""
+    body: Body
+    compiled: bool
+    """Whether a worker has compiled the body, so tasks can be sent without it."""
+    cpg_network_structure: CpgNetworkStructure
+    output_mapping: list[tuple[int, ActiveHinge]]
+    num_generations: int
+    _rng: np.random.Generator
+    _es: cma.CMAEvolutionStrategy | None
+    _candidates: list[npt.NDArray[np.float_]]
+    _fitnesses: npt.NDArray[np.float_]
+    _num_received: int
+    _best_params: npt.NDArray[np.float_]
+    _best_fitness: float
+    _num_evaluations: int
+
+    def __init__(
+        self,
+        body: Body,
+        rng: np.random.Generator,
+        initial_std: float,
+        population_size: int | None,
+    ) -> None:
+        self.key = uuid.uuid4().hex
+        self.body = body
+        self.compiled = False
+        (
+            self.cpg_network_structure,
+            self.output_mapping,
+        ) = active_hinges_to_cpg_network_structure_neighbor(
+            body.find_modules_of_type(ActiveHinge), body
+        )
+        self.num_generations = 0
+        self._rng = rng
+
+        num_params = self.cpg_network_structure.num_connections
+        # CMA-ES needs at least two dimensions. Smaller networks are only evaluated once, with all weights zero.
+        self._es = None
+        if num_params >= 2:
+            # CMA-ES samples from the global numpy generator by default, which would make the result depend on the order in which bodies finish.
+            options: dict[str, object] = {
+                "bounds": [-1.0, 1.0],
+                "randn": self._standard_normal,
+                "seed": math.nan,
+                "verbose": -9,
+            }
+            if population_size is not None:
+                options["popsize"] = population_size
+            self._es = cma.CMAEvolutionStrategy(
+                np.zeros(num_params), initial_std, options
+            )
+        self._candidates = []
+        self._fitnesses = np.zeros(0)
+        self._num_received = 0
+        self._best_params = np.zeros(num_params)
+        self._best_fitness = -math.inf
+        self._num_evaluations = 0
+
+    def _standard_normal(self, *shape: int) -> npt.NDArray[np.float_]:
+        return self._rng.standard_normal(shape)
+
+    def ask(self) -> list[npt.NDArray[np.float_]]:
+        self._candidates = (
+            [np.zeros(self.cpg_network_structure.num_connections)]
+            if self._es is None
+            else self._es.ask()
+        )
+        self._fitnesses = np.zeros(len(self._candidates))
+        self._num_received = 0
+        return self._candidates
+
+    def tell(self, start: int, fitnesses: list[float]) -> bool:
+        """
+        Receive the fitnesses of a task, and complete the generation if all fitnesses have been received.
+
+        :param start: The index of the first candidate of the task.
+        :param fitnesses: The fitnesses of the candidates of the task.
+        :returns: Whether the generation was completed.
+        """
+        self._fitnesses[start : start + len(fitnesses)] = fitnesses
+        self._num_received += len(fitnesses)
+        self._num_evaluations += len(fitnesses)
+        for params, fitness in zip(self._candidates[start:], fitnesses):
+            if fitness > self._best_fitness:
+                self._best_params = params
+                self._best_fitness = fitness
+
+        if self._num_received < len(self._candidates):
+            return False
+        if self._es is not None:
+            # CMA-ES minimizes.
+            self._es.tell(self._candidates, (-self._fitnesses).tolist())
+        self.num_generations += 1
+        return True
+
+    def finished(self, num_generations: int) -> bool:
+        return self._es is None or self.num_generations >= num_generations
+
+    def result(self) -> LearningResult:
+        return LearningResult(
+            brain=BrainCpgNetworkStatic.uniform_from_params(
+                params=self._best_params,
+                cpg_network_structure=self.cpg_network_structure,
+                initial_state_uniform=_INITIAL_STATE,
+                output_mapping=self.output_mapping,
+            ),
+            params=self._best_params,
+            fitness=self._best_fitness,
+            num_evaluations=self._num_evaluations,
+        )
+
+
+class LearningEvaluator(Eval):
+    """
+    Evaluates robots by the fitness of the best brain learned for their body.
+
+    The brains of the genotypes are not used, and the learned brains are not inherited.
+    Robots with the same morphology get the same fitness, so a brain is learned only once for each morphology in the population.
+    """
+
+    _parallel_map: ParallelMap
+    _learner: CmaesLearner
+
+    def __init__(self, parallel_map: ParallelMap, learner: CmaesLearner) -> None:
+        """
+        Initialize this object.
+
+        :param parallel_map: Worker processes to develop the genotypes in.
+        :param learner: The learner.
+        """
+        self._parallel_map = parallel_map
+        self._learner = learner
+
+    def evaluate(
+        self,
+        population: list[Genotype],
+        generation_index: int = 0,
+    ) -> list[float]:
+        """
+        Learn a brain for every robot.
+
+        :param population: The robots.
+        :param generation_index: The index of the generation.
+        :returns: The fitness of the best learned brain of every robot.
+        """
+        bodies = self._parallel_map.map(Genotype.develop_body, population)
+        representatives, morphologies = MorphologyDeduplicator.group(bodies)
+        results = self._learner.learn([bodies[i] for i in representatives])
+        return [results[morphology].fitness for morphology in morphologies]
+
+
+class _CompiledBody:
+    """A body in a scene that is compiled once, so it can be simulated with many brains."""
+
+    robot: ModularRobot
+    cpg_network_structure: CpgNetworkStructure
+    output_mapping: list[tuple[int, ActiveHinge]]
+    compiled_scene: CompiledScene
+    handler: ModularRobotSimulationHandler
+    scene_mapping: dict[UUIDKey[ModularRobot], MultiBodySystem]
+
+    def __init__(
+        self, body: Body, terrain: Terrain, batch_parameters: BatchParameters
+    ) -> None:
+        (
+            self.cpg_network_structure,
+            self.output_mapping,
+        ) = active_hinges_to_cpg_network_structure_neighbor(
+            body.find_modules_of_type(ActiveHinge), body
+        )
+        self.robot = ModularRobot(
+            body, self._brain(np.zeros(self.cpg_network_structure.num_connections))
+        )
+        scene = ModularRobotScene(terrain=terrain)
+        scene.add_robot(self.robot)
+        simulation_scene, self.scene_mapping = scene.to_simulation_scene()
+        assert isinstance(simulation_scene.handler, ModularRobotSimulationHandler)
+        self.handler = simulation_scene.handler
+        self.compiled_scene = CompiledScene(simulation_scene, batch_parameters)
+
+    def simulate(
+        self, params: npt.NDArray[np.float_], fitness_function: FitnessFunction
+    ) -> float:
+        self.handler.replace_brain(0, self._brain(params).make_instance())
+        states = self.compiled_scene.simulate()
+        return fitness_function(
+            self.robot,
+            SceneSimulationState(
+                states[0], self.scene_mapping
+            ).get_modular_robot_simulation_state(self.robot),
+            SceneSimulationState(
+                states[-1], self.scene_mapping
+            ).get_modular_robot_simulation_state(self.robot),
+        )
+
+    def _brain(self, params: npt.NDArray[np.float_]) -> BrainCpgNetworkStatic:
+        return BrainCpgNetworkStatic.uniform_from_params(
+            params=params,
+            cpg_network_structure=self.cpg_network_structure,
+            initial_state_uniform=_INITIAL_STATE,
+            output_mapping=self.output_mapping,
+        )
+
+
+# Bodies compiled by this process, most recently used last.
+_compiled_bodies: OrderedDict[str, _CompiledBody] = OrderedDict()
+
+
+def _simulate_candidates(
+    key: str,
+    body: Body | None,
+    terrain: Terrain,
+    batch_parameters: BatchParameters,
+    fitness_function: FitnessFunction,
+    candidates: list[npt.NDArray[np.float_]],
+) -> list[float] | None:
+    compiled_body = _compiled_bodies.get(key)
+    if compiled_body is None:
+        # The body was not sent as another worker compiled it, so the learner has to send it again.
+        if body is None:
+            return None
+        compiled_body = _CompiledBody(body, terrain, batch_parameters)
+        _compiled_bodies[key] = compiled_body
+        if len(_compiled_bodies) > _COMPILED_BODY_CACHE_SIZE:
+            _compiled_bodies.popitem(last=False)
+    else:
+        _compiled_bodies.move_to_end(key)
+    return [compiled_body.simulate(params, fitness_function) for params in candidates]
@@ -1,7 +1,8 @@
 """Main script for the example."""
 
 import logging
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Sequence
 
 import config
 import multineat
@@ -11,20 +12,38 @@ from database_components import (
     Base,
     Experiment,
     Generation,
+    GenerationStatistics,
     Genotype,
     Individual,
     Population,
+    StageTiming,
 )
 from evaluator import Evaluator
+from learner import CmaesLearner, LearningEvaluator
+from sqlalchemy import delete, select
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from revolve2.experimentation.database import OpenMethod, open_database_sqlite
-from revolve2.experimentation.evolution import ModularRobotEvolution
+from revolve2.experimentation.checkpoint import Checkpointer
+from revolve2.experimentation.database import (
+    DatabaseWriter,
+    OpenMethod,
+    open_database_sqlite,
+)
+from revolve2.experimentation.evolution import (
+    ModularRobotEvolution,
+    MultiFidelityEvaluator,
+)
+from revolve2.experimentation.evolution import StageTiming as StageMeasurement
+from revolve2.experimentation.evolution.abstract_elements import Evaluator as Eval
 from revolve2.experimentation.evolution.abstract_elements import Reproducer, Selector
 from revolve2.experimentation.experiment_logging import setup_logging
-from revolve2.experimentation.optimization.ea import population_management, selection
+from revolve2.experimentation.optimization.ea import ColumnarPopulation, selection
+from revolve2.experimentation.parallel import ParallelMap
 from revolve2.experimentation.rng import make_rng, seed_from_time
+from revolve2.standards.genotypes.cppnwin import (
+    MultineatInnovationDatabasePickleWrapper,
+)
 
 
 class ParentSelector(Selector):
@@ -44,8 +63,8 @@ class ParentSelector(Selector):
         self.rng = rng
 
     def select(
-        self, population: Population, **kwargs: Any
-    ) -> tuple[npt.NDArray[np.int_], dict[str, Population]]:
+        self, population: ColumnarPopulation[Genotype], **kwargs: Any
+    ) -> tuple[npt.NDArray[np.int_], dict[str, ColumnarPopulation[Genotype]]]:
         """
         Select the parents.
 
@@ -53,22 +72,12 @@ class ParentSelector(Selector):
         :param kwargs: Other parameters.
         :return: The parent pairs.
         """
-        return np.array(
-            [
-                selection.multiple_unique(
-                    selection_size=2,
-                    population=[
-                        individual.genotype for individual in population.individuals
-                    ],
-                    fitnesses=[
-                        individual.fitness for individual in population.individuals
-                    ],
-                    selection_function=lambda _, fitnesses: selection.tournament(
-                        rng=self.rng, fitnesses=fitnesses, k=2
-                    ),
-                )
-                for _ in range(self.offspring_size)
-            ],
+        return selection.unique_tournaments(
+            rng=self.rng,
+            fitnesses=population.fitnesses,
+            k=2,
+            selection_size=2,
+            num_selections=self.offspring_size,
         ), {"parent_population": population}
 
 
@@ -86,8 +95,8 @@ class SurvivorSelector(Selector):
         self.rng = rng
 
     def select(
-        self, population: Population, **kwargs: Any
-    ) -> tuple[Population, dict[str, Any]]:
+        self, population: ColumnarPopulation[Genotype], **kwargs: Any
+    ) -> tuple[ColumnarPopulation[Genotype], dict[str, Any]]:
         """
         Select survivors using a tournament.
 
@@ -103,54 +112,39 @@ class SurvivorSelector(Selector):
                 "No offspring was passed with positional argument 'children' and / or 'child_task_performance'."
             )
 
-        original_survivors, offspring_survivors = population_management.steady_state(
-            old_genotypes=[i.genotype for i in population.individuals],
-            old_fitnesses=[i.fitness for i in population.individuals],
-            new_genotypes=offspring,
-            new_fitnesses=offspring_fitness,
-            selection_function=lambda n, genotypes, fitnesses: selection.multiple_unique(
-                selection_size=n,
-                population=genotypes,
-                fitnesses=fitnesses,
-                selection_function=lambda _, fitnesses: selection.tournament(
-                    rng=self.rng, fitnesses=fitnesses, k=2
-                ),
-            ),
+        # Steady state: the survivors are selected from parents and offspring together.
+        candidates = ColumnarPopulation.concatenate(
+            [population, ColumnarPopulation(offspring, offspring_fitness)]
         )
-
-        return (
-            Population(
-                individuals=[
-                    Individual(
-                        genotype=population.individuals[i].genotype,
-                        fitness=population.individuals[i].fitness,
-                    )
-                    for i in original_survivors
-                ]
-                + [
-                    Individual(
-                        genotype=offspring[i],
-                        fitness=offspring_fitness[i],
-                    )
-                    for i in offspring_survivors
-                ]
-            ),
-            {},
+        survivors = selection.unique_tournaments(
+            rng=self.rng,
+            fitnesses=candidates.fitnesses,
+            k=2,
+            selection_size=len(population),
         )
+        return candidates.take(survivors), {}
 
 
 class CrossoverReproducer(Reproducer):
-    """A simple crossover reproducer using multineat."""
+    """
+    A simple crossover reproducer using multineat.
+
+    Crossover does not use the innovation databases, so it is done in the worker processes.
+    Mutation can add innovations to the databases, and later mutations depend on them, so it is done here, in order.
+    Every child gets its own random number generator, so the children do not depend on the number of workers.
+    """
 
     rng: np.random.Generator
     innov_db_body: multineat.InnovationDatabase
     innov_db_brain: multineat.InnovationDatabase
+    parallel_map: ParallelMap
 
     def __init__(
         self,
         rng: np.random.Generator,
         innov_db_body: multineat.InnovationDatabase,
         innov_db_brain: multineat.InnovationDatabase,
+        parallel_map: ParallelMap | None = None,
     ):
         """
         Initialize the reproducer.
@@ -158,10 +152,14 @@ class CrossoverReproducer(Reproducer):
         :param rng: The ranfom generator.
         :param innov_db_body: The innovation database for the body.
         :param innov_db_brain: The innovation database for the brain.
+        :param parallel_map: Worker processes to do the crossovers in. If None, crossovers are done in this process.
         """
         self.rng = rng
         self.innov_db_body = innov_db_body
         self.innov_db_brain = innov_db_brain
+        self.parallel_map = (
+            ParallelMap(num_workers=1) if parallel_map is None else parallel_map
+        )
 
     def reproduce(
         self, population: npt.NDArray[np.int_], **kwargs: Any
@@ -174,44 +172,155 @@ class CrossoverReproducer(Reproducer):
         :return: The genotypes of the children.
         :raises ValueError: If the parent population is not passed as a kwarg `parent_population`.
         """
-        parent_population: Population | None = kwargs.get("parent_population")
+        parent_population: ColumnarPopulation[Genotype] | None = kwargs.get(
+            "parent_population"
+        )
         if parent_population is None:
             raise ValueError("No parent population given.")
 
-        offspring_genotypes = [
-            Genotype.crossover(
-                parent_population.individuals[parent1_i].genotype,
-                parent_population.individuals[parent2_i].genotype,
-                self.rng,
-            ).mutate(self.innov_db_body, self.innov_db_brain, self.rng)
+        parents = [
+            (
+                parent_population.genotypes[parent1_i],
+                parent_population.genotypes[parent2_i],
+            )
             for parent1_i, parent2_i in population
         ]
+        children = self.parallel_map.map_seeded(crossover_parents, parents, self.rng)
+        offspring_genotypes = [
+            child.mutate(self.innov_db_body, self.innov_db_brain, child_rng)
+            for child, child_rng in children
+        ]
         return offspring_genotypes
 
 
-def run_experiment(dbengine: Engine) -> None:
+def crossover_parents(
+    parents: tuple[Genotype, Genotype], rng: np.random.Generator
+) -> tuple[Genotype, np.random.Generator]:
+    """
+    Create a child by crossover.
+
+    The random number generator is returned as well, so the child can be mutated using the same generator in the main process.
+
+    :param parents: The two parents.
+    :param rng: The random number generator of the child.
+    :returns: The child and the random number generator.
+    """
+    parent1, parent2 = parents
+    return Genotype.crossover(parent1, parent2, rng), rng
+
+
+def make_evaluator(
+    parallel_map: ParallelMap, num_simulators: int, rng: np.random.Generator
+) -> Eval:
+    """
+    Create the evaluator, learning a brain for every robot or screening robots with a short simulation first if configured.
+
+    :param parallel_map: Worker processes for development and simulation.
+    :param num_simulators: The number of simulators.
+    :param rng: Random number generator for learning.
+    :returns: The evaluator.
+    """
+    if config.LEARNING_GENERATIONS is not None:
+        return LearningEvaluator(
+            parallel_map=parallel_map,
+            learner=CmaesLearner(
+                parallel_map=parallel_map,
+                rng=rng,
+                num_generations=config.LEARNING_GENERATIONS,
+                population_size=config.LEARNING_POPULATION_SIZE,
+            ),
+        )
+    evaluator = Evaluator(
+        headless=True,
+        num_simulators=num_simulators,
+        parallel_map=parallel_map,
+    )
+    if config.SCREENING_SIMULATION_TIME is None:
+        return evaluator
+    return MultiFidelityEvaluator(
+        screening_evaluator=Evaluator(
+            headless=True,
+            num_simulators=num_simulators,
+            parallel_map=parallel_map,
+            simulation_time=config.SCREENING_SIMULATION_TIME,
+            simulation_timestep=config.SCREENING_SIMULATION_TIMESTEP,
+        ),
+        full_evaluator=evaluator,
+        promote_fraction=config.SCREENING_PROMOTE_FRACTION,
+    )
+
+
+@dataclass
+class Checkpoint:
+    """
+    The state of an experiment after a generation, from which the experiment can be resumed.
+
+    The experiment and the genotypes of the population are already in the database, so only their ids are stored.
+    """
+
+    repetition: int
+    experiment_id: int
+    generation_index: int
+    genotype_ids: list[int]
+    fitnesses: list[float]
+    rng: np.random.Generator
+    innov_db_body: MultineatInnovationDatabasePickleWrapper
+    innov_db_brain: MultineatInnovationDatabasePickleWrapper
+
+
+def run_experiment(
+    dbengine: Engine,
+    database_writer: DatabaseWriter,
+    parallel_map: ParallelMap,
+    checkpointer: Checkpointer,
+    repetition: int,
+    checkpoint: Checkpoint | None = None,
+    rng_seed: int | None = None,
+) -> None:
     """
     Run an experiment.
 
     :param dbengine: An openened database with matching initialize database structure.
+    :param database_writer: Writes generations to the database in the background.
+    :param parallel_map: Worker processes for development, reproduction and simulation.
+    :param checkpointer: Saves checkpoints of the experiment.
+    :param repetition: The index of the experiment in the repetitions.
+    :param checkpoint: A checkpoint of this experiment to resume from. If None, a new experiment is started.
+    :param rng_seed: Seed for the random number generator of a new experiment. If None, a seed is created from the current time.
     """
     logging.info("----------------")
-    logging.info("Start experiment")
-
-    # Set up the random number generator.
-    rng_seed = seed_from_time()
-    rng = make_rng(rng_seed)
-
-    # Create and save the experiment instance.
-    experiment = Experiment(rng_seed=rng_seed)
-    logging.info("Saving experiment configuration.")
-    with Session(dbengine) as session:
-        session.add(experiment)
-        session.commit()
+    if checkpoint is None:
+        logging.info("Start experiment")
+
+        # Set up the random number generator.
+        if rng_seed is None:
+            rng_seed = seed_from_time()
+        rng = make_rng(rng_seed)
+
+        # Create and save the experiment instance.
+        experiment = Experiment(rng_seed=rng_seed)
+        logging.info("Saving experiment configuration.")
+        with Session(dbengine, expire_on_commit=False) as session:
+            session.add(experiment)
+            session.commit()
+
+        # CPPN innovation databases.
+        innov_db_body = multineat.InnovationDatabase()
+        innov_db_brain = multineat.InnovationDatabase()
+    else:
+        logging.info(
+            f"Resume experiment from generation {checkpoint.generation_index}."
+        )
+        rng = checkpoint.rng
+        with Session(dbengine, expire_on_commit=False) as session:
+            experiment = session.scalars(
+                select(Experiment).where(Experiment.id == checkpoint.experiment_id)
+            ).one()
+        innov_db_body = checkpoint.innov_db_body.innovation_database
+        innov_db_brain = checkpoint.innov_db_brain.innovation_database
 
-    # CPPN innovation databases.
-    innov_db_body = multineat.InnovationDatabase()
-    innov_db_brain = multineat.InnovationDatabase()
+        # Generations saved after the checkpoint will be created again.
+        remove_generations_after(dbengine, experiment, checkpoint.generation_index)
 
     """
     Here we initialize the components used for the evolutionary process.
@@ -222,68 +331,183 @@ def run_experiment(dbengine: Engine) -> None:
     - crossover_reproducer: Allows us to generate offspring from parents.
     - modular_robot_evolution: The evolutionary process as a object that can be iterated.
     """
-    evaluator = Evaluator(headless=True, num_simulators=config.NUM_SIMULATORS)
+    evaluator = make_evaluator(parallel_map, config.NUM_SIMULATORS, rng)
     parent_selector = ParentSelector(offspring_size=config.OFFSPRING_SIZE, rng=rng)
     survivor_selector = SurvivorSelector(rng=rng)
     crossover_reproducer = CrossoverReproducer(
-        rng=rng, innov_db_body=innov_db_body, innov_db_brain=innov_db_brain
+        rng=rng,
+        innov_db_body=innov_db_body,
+        innov_db_brain=innov_db_brain,
+        parallel_map=parallel_map,
     )
 
+    # Measurements of the stages of a step, saved together with the generation the step creates.
+    stage_measurements: list[StageMeasurement] = []
     modular_robot_evolution = ModularRobotEvolution(
         parent_selection=parent_selector,
         survivor_selection=survivor_selector,
         evaluator=evaluator,
         reproducer=crossover_reproducer,
+        stage_callback=(stage_measurements.append if config.MEASURE_STAGES else None),
     )
 
-    # Create an initial population, as we cant start from nothing.
-    logging.info("Generating initial population.")
-    initial_genotypes = [
-        Genotype.random(
-            innov_db_body=innov_db_body,
-            innov_db_brain=innov_db_brain,
-            rng=rng,
-        )
-        for _ in range(config.POPULATION_SIZE)
-    ]
-
-    # Evaluate the initial population.
-    logging.info("Evaluating initial population.")
-    initial_fitnesses = evaluator.evaluate(initial_genotypes)
-
-    # Create a population of individuals, combining genotype with fitness.
-    population = Population(
-        individuals=[
-            Individual(genotype=genotype, fitness=fitness)
-            for genotype, fitness in zip(
-                initial_genotypes, initial_fitnesses, strict=True
+    if checkpoint is None:
+        # Create an initial population, as we cant start from nothing.
+        logging.info("Generating initial population.")
+        initial_genotypes = [
+            Genotype.random(
+                innov_db_body=innov_db_body,
+                innov_db_brain=innov_db_brain,
+                rng=rng,
             )
+            for _ in range(config.POPULATION_SIZE)
         ]
-    )
 
-    # Finish the zeroth generation and save it to the database.
-    generation = Generation(
-        experiment=experiment, generation_index=0, population=population
-    )
-    save_to_db(dbengine, generation)
+        # Evaluate the initial population.
+        logging.info("Evaluating initial population.")
+        initial_fitnesses = evaluator.evaluate(initial_genotypes, generation_index=0)
+
+        # Create a population, combining genotype with fitness.
+        # It is only converted to the database models when it is saved.
+        population = ColumnarPopulation(initial_genotypes, initial_fitnesses)
+        generation_index = 0
+
+        # Finish the zeroth generation and save it to the database.
+        generation = Generation(
+            experiment=experiment,
+            generation_index=generation_index,
+            population=population.to_orm(Population, Individual),
+        )
+        save_to_db(database_writer, generation, population, [])
+    else:
+        population = load_population(
+            dbengine, checkpoint.genotype_ids, checkpoint.fitnesses
+        )
+        generation_index = checkpoint.generation_index
 
     # Start the actual optimization process.
     logging.info("Start optimization process.")
-    while generation.generation_index < config.NUM_GENERATIONS:
-        logging.info(
-            f"Generation {generation.generation_index + 1} / {config.NUM_GENERATIONS}."
-        )
+    while True:
+        # The saved generation contains the genotypes of the population, which the writer owns until they are written.
+        # This also makes sure everything in a checkpoint is in the database, so it is not saved again after resuming.
+        database_writer.flush()
+
+        # Save a checkpoint after every few generations, and after the last one.
+        if (
+            checkpointer.is_due(generation_index)
+            or generation_index == config.NUM_GENERATIONS
+        ) and (checkpoint is None or generation_index > checkpoint.generation_index):
+            checkpointer.save(
+                Checkpoint(
+                    repetition=repetition,
+                    experiment_id=experiment.id,
+                    generation_index=generation_index,
+                    genotype_ids=[genotype.id for genotype in population.genotypes],
+                    fitnesses=population.fitnesses.tolist(),
+                    rng=rng,
+                    innov_db_body=MultineatInnovationDatabasePickleWrapper(
+                        innov_db_body
+                    ),
+                    innov_db_brain=MultineatInnovationDatabasePickleWrapper(
+                        innov_db_brain
+                    ),
+                )
+            )
+
+        if generation_index >= config.NUM_GENERATIONS:
+            break
+
+        logging.info(f"Generation {generation_index + 1} / {config.NUM_GENERATIONS}.")
 
         # Here we iterate the evolutionary process using the step.
-        population = modular_robot_evolution.step(population, generation_index=generation.generation_index)
+        population = modular_robot_evolution.step(
+            population, generation_index=generation_index
+        )
+        generation_index += 1
 
         # Make it all into a generation and save it to the database.
         generation = Generation(
             experiment=experiment,
-            generation_index=generation.generation_index + 1,
-            population=population,
+            generation_index=generation_index,
+            population=population.to_orm(Population, Individual),
         )
-        save_to_db(dbengine, generation)
+        save_to_db(database_writer, generation, population, stage_measurements)
+        stage_measurements.clear()
+
+
+def load_population(
+    dbengine: Engine, genotype_ids: list[int], fitnesses: list[float]
+) -> ColumnarPopulation[Genotype]:
+    """
+    Load a population from the database.
+
+    :param dbengine: The database engine.
+    :param genotype_ids: Ids of the genotypes of the individuals.
+    :param fitnesses: Fitnesses of the individuals.
+    :returns: The population.
+    """
+    with Session(dbengine, expire_on_commit=False) as session:
+        genotypes: Sequence[Genotype] = session.scalars(
+            select(Genotype).where(Genotype.id.in_(genotype_ids))
+        ).all()
+    genotypes_by_id = {genotype.id: genotype for genotype in genotypes}
+    return ColumnarPopulation(
+        [genotypes_by_id[genotype_id] for genotype_id in genotype_ids],
+        fitnesses,
+        ids=genotype_ids,
+    )
+
+
+def remove_generations_after(
+    dbengine: Engine, experiment: Experiment, generation_index: int
+) -> None:
+    """
+    Remove the generations of an experiment after a generation from the database, together with those of their genotypes that are no longer in any population.
+
+    :param dbengine: The database engine.
+    :param experiment: The experiment.
+    :param generation_index: Index of the last generation to keep.
+    """
+    with Session(dbengine) as session:
+        generations: Sequence[Generation] = session.scalars(
+            select(Generation).where(
+                Generation.experiment_id == experiment.id,
+                Generation.generation_index > generation_index,
+            )
+        ).all()
+        generation_ids = [generation.id for generation in generations]
+        population_ids = [generation.population_id for generation in generations]
+
+        session.execute(
+            delete(GenerationStatistics).where(
+                GenerationStatistics.generation_id.in_(generation_ids)
+            )
+        )
+        session.execute(delete(Generation).where(Generation.id.in_(generation_ids)))
+        session.execute(
+            delete(StageTiming).where(
+                StageTiming.experiment_id == experiment.id,
+                StageTiming.generation_index >= generation_index,
+            )
+        )
+        genotype_ids: Sequence[int] = session.scalars(
+            select(Individual.genotype_id)
+            .where(Individual.population_id.in_(population_ids))
+            .distinct()
+        ).all()
+        session.execute(
+            delete(Individual).where(Individual.population_id.in_(population_ids))
+        )
+        session.execute(delete(Population).where(Population.id.in_(population_ids)))
+        # Genotypes are only referenced by individuals, so the offspring of the removed generations would be left behind.
+        # Only genotypes of the removed populations are considered, so genotypes of other experiments are never touched.
+        session.execute(
+            delete(Genotype).where(
+                Genotype.id.in_(genotype_ids),
+                Genotype.id.not_in(select(Individual.genotype_id)),
+            )
+        )
+        session.commit()
 
 
 def main() -> None:
@@ -291,29 +515,72 @@ def main() -> None:
     # Set up logging.
     setup_logging(file_name="old_runs/log.txt")
 
-    # Open the database, only if it does not already exists.
+    # Resume from the last checkpoint if the program was interrupted.
+    checkpointer = Checkpointer(
+        config.CHECKPOINT_FILE, interval=config.CHECKPOINT_INTERVAL
+    )
+    checkpoint: Checkpoint | None = checkpointer.load()
+
+    # Open the database, only if it does not already exists, unless resuming.
+    # With a write-ahead log, committing a generation does not wait for the disk every time.
     dbengine = open_database_sqlite(
-        config.DATABASE_FILE, open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+        config.DATABASE_FILE,
+        open_method=(
+            OpenMethod.NOT_EXISTS_AND_CREATE
+            if checkpoint is None
+            else OpenMethod.OPEN_IF_EXISTS
+        ),
+        journal_mode="WAL",
+        synchronous="NORMAL",
     )
     # Create the structure of the database.
     Base.metadata.create_all(dbengine)
 
-    # Run the experiment several times.
-    for _ in range(config.NUM_REPETITIONS):
-        run_experiment(dbengine)
+    # Run the experiment several times, sharing one pool of worker processes.
+    # Generations are saved in the background, and all of them are written before the program exits.
+    first_repetition = 0 if checkpoint is None else checkpoint.repetition
+    with ParallelMap(num_workers=config.NUM_SIMULATORS) as parallel_map:
+        with DatabaseWriter(dbengine) as database_writer:
+            for repetition in range(first_repetition, config.NUM_REPETITIONS):
+                run_experiment(
+                    dbengine,
+                    database_writer,
+                    parallel_map,
+                    checkpointer,
+                    repetition,
+                    checkpoint if repetition == first_repetition else None,
+                )
+
+    # All repetitions are finished, so there is nothing to resume.
+    checkpointer.remove()
 
 
-def save_to_db(dbengine: Engine, generation: Generation) -> None:
+def save_to_db(
+    database_writer: DatabaseWriter,
+    generation: Generation,
+    population: ColumnarPopulation[Genotype],
+    stage_measurements: list[StageMeasurement],
+) -> None:
     """
-    Save the current generation to the database.
+    Save the current generation to the database, together with statistics of its fitness and the time and memory used to create it.
 
-    :param dbengine: The database engine.
+    The writer owns the generation and its experiment and population until it is flushed,
+    so all models referring to them are created before anything is added.
+
+    :param database_writer: The database writer.
     :param generation: The current generation.
+    :param population: The population of the current generation.
+    :param stage_measurements: Measurements of the stages of the evolution step that created the generation.
     """
     logging.info("Saving generation.")
-    with Session(dbengine, expire_on_commit=False) as session:
-        session.add(generation)
-        session.commit()
+    statistics = GenerationStatistics.from_population(generation, population)
+    stage_timings = [
+        StageTiming.from_measurement(generation.experiment, measurement)
+        for measurement in stage_measurements
+    ]
+    database_writer.add(generation)
+    database_writer.add_all(statistics)
+    database_writer.add_all(stage_timings)
 
 
 if __name__ == "__main__":
@@ -2,11 +2,8 @@
 
 import config
 import matplotlib.pyplot as plt
-import pandas
-from database_components import Experiment, Generation, Individual, Population
-from sqlalchemy import select
 
-from revolve2.experimentation.database import OpenMethod, open_database_sqlite
+from revolve2.experimentation.database.parquet import open_parquet_dataset
 from revolve2.experimentation.experiment_logging import setup_logging
 
 
@@ -14,20 +11,11 @@ def main() -> None:
     """Run the program."""
     setup_logging()
 
-    dbengine = open_database_sqlite(
-        "final_runs/5rep_split_1000gen_regular.sqlite", open_method=OpenMethod.OPEN_IF_EXISTS
-    )
-
-    df = pandas.read_sql(
-        select(
-            Experiment.id.label("experiment_id"),
-            Generation.generation_index,
-            Individual.fitness,
-        )
-        .join_from(Experiment, Generation, Experiment.id == Generation.experiment_id)
-        .join_from(Generation, Population, Generation.population_id == Population.id)
-        .join_from(Population, Individual, Population.id == Individual.population_id),
-        dbengine,
+    # Read the export created by `export_parquet.py` instead of joining the database tables.
+    df = (
+        open_parquet_dataset(config.PARQUET_DIRECTORY)
+        .to_table(columns=["experiment_id", "generation_index", "fitness"])
+        .to_pandas()
     )
 
     agg_per_experiment_per_generation = (
@@ -0,0 +1,107 @@
+"""Run all repetitions of the experiment at the same time, sharing the simulators, and merge their databases."""
+
+import logging
+import os
+
+import config
+from database_components import Base
+from main import run_experiment
+from revolve2.experimentation.checkpoint import Checkpointer
+from revolve2.experimentation.database import (
+    DatabaseWriter,
+    OpenMethod,
+    merge_databases,
+    open_database_sqlite,
+)
+from revolve2.experimentation.experiment_logging import setup_logging
+from revolve2.experimentation.parallel import ParallelMap
+from revolve2.experimentation.rng import seed_from_time
+from revolve2.experimentation.sweep import run_sweep
+
+
+def shard_file(repetition: int) -> str:
+    """
+    Get the database file of a repetition.
+
+    :param repetition: The repetition.
+    :returns: The file.
+    """
+    return os.path.join(config.SHARD_DIRECTORY, f"repetition_{repetition}.sqlite")
+
+
+def run_repetition(run: tuple[int, int], parallel_map: ParallelMap) -> None:
+    """
+    Run one repetition of the experiment in its own database, resuming it if it was interrupted.
+
+    :param run: The repetition and the seed for its random number generator.
+    :param parallel_map: Worker processes shared with the other repetitions.
+    """
+    repetition, rng_seed = run
+    database_file = shard_file(repetition)
+
+    # The checkpoint is kept after the repetition is finished, so a finished repetition is not run again when the sweep is resumed.
+    # Without a checkpoint, an existing database is from a run that did not get far enough to save a checkpoint.
+    checkpointer = Checkpointer(
+        database_file.removesuffix(".sqlite") + ".checkpoint",
+        interval=config.CHECKPOINT_INTERVAL,
+    )
+    checkpoint = checkpointer.load()
+    dbengine = open_database_sqlite(
+        database_file,
+        open_method=(
+            OpenMethod.OVERWITE_IF_EXISTS
+            if checkpoint is None
+            else OpenMethod.OPEN_IF_EXISTS
+        ),
+        journal_mode="WAL",
+        synchronous="NORMAL",
+    )
+    Base.metadata.create_all(dbengine)
+
+    with DatabaseWriter(dbengine) as database_writer:
+        run_experiment(
+            dbengine,
+            database_writer,
+            parallel_map,
+            checkpointer,
+            repetition,
+            checkpoint,
+            rng_seed=rng_seed,
+        )
+
+
+def main() -> None:
+    """Run the program."""
+    setup_logging(file_name="old_runs/log.txt")
+    os.makedirs(config.SHARD_DIRECTORY, exist_ok=True)
+
+    # Distinct seeds, as the repetitions start at the same time.
+    rng_seed = seed_from_time()
+    run_sweep(
+        run_repetition,
+        [
+            (repetition, rng_seed + repetition)
+            for repetition in range(config.NUM_REPETITIONS)
+        ],
+        num_workers=config.NUM_SIMULATORS,
+    )
+
+    # Combine the databases of the repetitions.
+    logging.info("Merging databases.")
+    dbengine = open_database_sqlite(
+        config.DATABASE_FILE, open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+    )
+    merge_databases(
+        dbengine,
+        [
+            open_database_sqlite(
+                shard_file(repetition), open_method=OpenMethod.OPEN_IF_EXISTS
+            )
+            for repetition in range(config.NUM_REPETITIONS)
+        ],
+        Base.metadata,
+    )
+
+
+if __name__ == "__main__":
+    main()
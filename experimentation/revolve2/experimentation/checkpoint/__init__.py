@@ -0,0 +1,5 @@
+"""Checkpoints of experiments, to resume them after they are interrupted."""
+
+from ._checkpointer import Checkpointer
+
+__all__ = ["Checkpointer"]
@@ -0,0 +1,78 @@
+import os
+import pickle
+from typing import Any
+
+
+class Checkpointer:
+    """
+    Saves the state of an experiment to a file at regular intervals, so the experiment can be resumed if it is interrupted.
+
+    The state can be any picklable object, usually a dataclass with everything the rest of the experiment depends on,
+    such as the random number generators, the current population and the state of the evolution components.
+    A NumPy `Generator` pickles its complete bit generator state, so an experiment resumed from a checkpoint continues exactly as it would have.
+
+    Checkpoints are written to a temporary file next to the checkpoint file, which replaces the checkpoint file only when it is complete.
+    An interruption while saving therefore leaves the previous checkpoint intact.
+    """
+
+    _file: str
+    _interval: int
+
+    def __init__(self, file: str, interval: int = 1) -> None:
+        """
+        Initialize this object.
+
+        :param file: The checkpoint file.
+        :param interval: Number of steps between checkpoints.
+        """
+        assert interval >= 1
+
+        self._file = file
+        self._interval = interval
+
+    @property
+    def file(self) -> str:
+        """
+        Get the checkpoint file.
+
+        :returns: The file.
+        """
+        return self._file
+
+    def is_due(self, step: int) -> bool:
+        """
+        Check whether a checkpoint should be saved at a step, which is every `interval` steps.
+
+        :param step: The step, for example the generation index.
+        :returns: Whether a checkpoint should be saved.
+        """
+        return step % self._interval == 0
+
+    def save(self, state: Any) -> None:
+        """
+        Save a checkpoint, replacing the previous one.
+
+        :param state: The state of the experiment.
+        """
+        temporary_file = f"{self._file}.tmp"
+        with open(temporary_file, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_file, self._file)
+
+    def load(self) -> Any | None:
+        """
+        Load the last saved checkpoint.
+
+        :returns: The state of the experiment, or None if there is no checkpoint.
+        """
+        if not os.path.exists(self._file):
+            return None
+        with open(self._file, "rb") as f:
+            return pickle.load(f)
+
+    def remove(self) -> None:
+        """Remove the checkpoint, for example when the experiment is finished."""
+        if os.path.exists(self._file):
+            os.remove(self._file)
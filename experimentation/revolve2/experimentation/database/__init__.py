@@ -1,7 +1,18 @@
 """Standard SQLAlchemy models and different ways to open databases."""
 
+from ._create_missing_indexes import create_missing_indexes
+from ._database_writer import DatabaseWriter
 from ._has_id import HasId
+from ._merge_databases import merge_databases
 from ._open_method import OpenMethod
 from ._sqlite import open_async_database_sqlite, open_database_sqlite
 
-__all__ = ["HasId", "OpenMethod", "open_async_database_sqlite", "open_database_sqlite"]
+__all__ = [
+    "DatabaseWriter",
+    "HasId",
+    "OpenMethod",
+    "create_missing_indexes",
+    "merge_databases",
+    "open_async_database_sqlite",
+    "open_database_sqlite",
+]
@@ -0,0 +1,29 @@
+import sqlalchemy
+from sqlalchemy.engine import Engine
+
+
+def create_missing_indexes(dbengine: Engine, metadata: sqlalchemy.MetaData) -> int:
+    """
+    Create the indexes declared by the models that do not exist in the database yet.
+
+    `MetaData.create_all` only creates indexes together with new tables,
+    so use this to add indexes that were declared after a database was created.
+    Tables that do not exist in the database are skipped.
+
+    :param dbengine: The database.
+    :param metadata: The metadata of the models, for example `Base.metadata`.
+    :returns: The number of created indexes.
+    """
+    inspector = sqlalchemy.inspect(dbengine)
+    table_names = set(inspector.get_table_names())
+
+    num_created = 0
+    for table in metadata.sorted_tables:
+        if table.name not in table_names:
+            continue
+        index_names = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in index_names:
+                index.create(dbengine)
+                num_created += 1
+    return num_created
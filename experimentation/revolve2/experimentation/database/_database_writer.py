@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+from types import TracebackType
+from typing import Any, Iterable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class DatabaseWriter:
+    """
+    Writes SQLAlchemy model instances to a database in a background thread.
+
+    Instances are queued and inserted in batches, each batch in a single transaction,
+    so the experiment does not wait for the database and the cost of a commit is shared by many instances.
+    Queued instances are written when `flush` or `close` is called, when the writer is used as a context manager and exits,
+    and when the interpreter exits.
+
+    Instances are written using their relationships, like `Session.add`.
+    The background thread changes the state of added instances and of everything reachable from them through their relationships while writing them,
+    so the writer owns all of these objects from the moment they are added until the next call to `flush` or `close` returns.
+    In between, the caller must not read or modify them, or create new instances that refer to them.
+    Writing happens with `expire_on_commit=False`, so instances can be used again once they are written.
+
+    If an error occurs while writing, no further instances are written and the error is raised by every following call to `add` and `flush`, and by `close`.
+    """
+
+    _dbengine: Engine
+    _max_batch_size: int
+    _queue: queue.Queue[Any]
+    _thread: threading.Thread
+    _error: BaseException | None
+    _closed: bool
+
+    _STOP = object()
+
+    def __init__(
+        self, dbengine: Engine, max_batch_size: int = 10000, max_queue_size: int = 0
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param dbengine: The database to write to.
+        :param max_batch_size: Maximum number of queued instances written in one transaction.
+        :param max_queue_size: Maximum number of queued instances. `add` blocks while the queue is full. If 0, the queue is unbounded.
+        """
+        assert max_batch_size >= 1
+
+        self._dbengine = dbengine
+        self._max_batch_size = max_batch_size
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._error = None
+        self._closed = False
+        # A daemon thread does not keep the interpreter alive; the exit handler makes sure the queue is written first.
+        self._thread = threading.Thread(
+            target=self._run, name="DatabaseWriter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, instance: Any) -> None:
+        """
+        Queue an instance to be written.
+
+        :param instance: The model instance.
+        """
+        self._check()
+        self._queue.put(instance)
+
+    def add_all(self, instances: Iterable[Any]) -> None:
+        """
+        Queue instances to be written.
+
+        :param instances: The model instances.
+        """
+        for instance in instances:
+            self.add(instance)
+
+    def flush(self) -> None:
+        """Wait until all queued instances are written."""
+        self._check()
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write all queued instances and stop the background thread. Does nothing if already closed."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> DatabaseWriter:
+        """
+        Use this writer as a context manager.
+
+        :returns: This writer.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close this writer.
+
+        :param exc_type: The type of the raised exception, if any.
+        :param exc_value: The raised exception, if any.
+        :param traceback: The traceback of the raised exception, if any.
+        """
+        self.close()
+
+    def _check(self) -> None:
+        assert not self._closed, "Database writer is closed."
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            instances = [instance for instance in batch if instance is not self._STOP]
+            stop = len(instances) < len(batch)
+            try:
+                if len(instances) > 0 and self._error is None:
+                    with Session(self._dbengine, expire_on_commit=False) as session:
+                        session.add_all(instances)
+                        session.commit()
+            except BaseException as error:
+                self._error = error
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
@@ -0,0 +1,66 @@
+from typing import Any, Sequence
+
+import sqlalchemy
+from sqlalchemy.engine import Engine
+
+
+def merge_databases(
+    dbengine: Engine,
+    shards: Sequence[Engine],
+    metadata: sqlalchemy.MetaData,
+    chunk_size: int = 10000,
+) -> None:
+    """
+    Copy the rows of multiple databases into one database, for example databases of experiments that ran at the same time.
+
+    All databases must have the tables of the models. The tables are created in the target database if they do not exist.
+    Rows get new ids, after the ids already in the target database, and foreign keys are changed accordingly.
+    The rows of each shard are copied in one transaction, in chunks, so shards do not have to fit in memory.
+
+    :param dbengine: The database to copy to.
+    :param shards: The databases to copy from.
+    :param metadata: The metadata of the models, for example `Base.metadata`.
+    :param chunk_size: Number of rows copied at once.
+    :raises ValueError: If a table does not have a single integer primary key.
+    """
+    assert chunk_size >= 1
+
+    tables = metadata.sorted_tables
+    for table in tables:
+        if len(table.primary_key.columns) != 1 or not issubclass(
+            table.primary_key.columns[0].type.python_type, int
+        ):
+            raise ValueError(
+                f"Table '{table.name}' does not have a single integer primary key."
+            )
+
+    metadata.create_all(dbengine)
+    for shard in shards:
+        with dbengine.begin() as target, shard.connect() as source:
+            # Ids of the shard are moved past the largest id in the target database.
+            offsets = {}
+            for table in tables:
+                (key,) = table.primary_key.columns
+                max_id = target.execute(sqlalchemy.func.max(key).select()).scalar()
+                offsets[table.name] = 0 if max_id is None else max_id
+
+            for table in tables:
+                shifted_columns = {
+                    column.name: offsets[table.name]
+                    for column in table.primary_key.columns
+                } | {
+                    foreign_key.parent.name: offsets[foreign_key.column.table.name]
+                    for foreign_key in table.foreign_keys
+                }
+                result = source.execution_options(yield_per=chunk_size).execute(
+                    sqlalchemy.select(table)
+                )
+                for rows in result.partitions():
+                    values: list[dict[str, Any]] = []
+                    for row in rows:
+                        row_values = dict(row._mapping)
+                        for name, offset in shifted_columns.items():
+                            if row_values[name] is not None:
+                                row_values[name] += offset
+                        values.append(row_values)
+                    target.execute(sqlalchemy.insert(table), values)
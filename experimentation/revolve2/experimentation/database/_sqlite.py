@@ -1,7 +1,8 @@
 import os
 from pathlib import Path
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
@@ -9,31 +10,80 @@ from ._open_method import OpenMethod
 
 
 def open_async_database_sqlite(
-    db_file: str, open_method: OpenMethod = OpenMethod.OPEN_IF_EXISTS
+    db_file: str,
+    open_method: OpenMethod = OpenMethod.OPEN_IF_EXISTS,
+    journal_mode: str | None = None,
+    synchronous: str | None = None,
+    cache_size: int | None = None,
 ) -> AsyncEngine:
     """
     Open an SQLAlchemy SQLite async database.
 
     :param db_file: File for the database.
     :param open_method: The way the database should be opened.
+    :param journal_mode: See `open_database_sqlite`.
+    :param synchronous: See `open_database_sqlite`.
+    :param cache_size: See `open_database_sqlite`.
     :returns: The opened database.
     """
     __common(db_file, open_method)
-    return create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    __set_pragmas(engine.sync_engine, journal_mode, synchronous, cache_size)
+    return engine
 
 
 def open_database_sqlite(
-    db_file: str, open_method: OpenMethod = OpenMethod.OPEN_IF_EXISTS
+    db_file: str,
+    open_method: OpenMethod = OpenMethod.OPEN_IF_EXISTS,
+    journal_mode: str | None = None,
+    synchronous: str | None = None,
+    cache_size: int | None = None,
 ) -> Engine:
     """
     Open an SQLAlchemy SQLite database.
 
+    The pragmas are set for every connection to the database. If None, the SQLite default is used.
+    For experiments that write a lot, `journal_mode="WAL"` and `synchronous="NORMAL"` make commits much cheaper,
+    at the risk of losing the last transactions, but not of corrupting the database, if the computer crashes.
+    See https://www.sqlite.org/pragma.html.
+
     :param db_file: File for the database.
     :param open_method: The way the database should be opened.
+    :param journal_mode: The journal mode, for example "DELETE" (the SQLite default) or "WAL".
+    :param synchronous: How carefully data is written to disk, for example "FULL" (the SQLite default), "NORMAL" or "OFF".
+    :param cache_size: The size of the page cache. Positive values are a number of pages, negative values a number of KiB.
     :returns: The opened database.
     """
     __common(db_file, open_method)
-    return create_engine(f"sqlite:///{db_file}")
+    engine = create_engine(f"sqlite:///{db_file}")
+    __set_pragmas(engine, journal_mode, synchronous, cache_size)
+    return engine
+
+
+def __set_pragmas(
+    engine: Engine,
+    journal_mode: str | None,
+    synchronous: str | None,
+    cache_size: int | None,
+) -> None:
+    pragmas = [
+        f"PRAGMA {name}={value}"
+        for name, value in [
+            ("journal_mode", journal_mode),
+            ("synchronous", synchronous),
+            ("cache_size", cache_size),
+        ]
+        if value is not None
+    ]
+    if len(pragmas) == 0:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
 
 
 def __common(db_file: str, open_method: OpenMethod = OpenMethod.OPEN_IF_EXISTS) -> None:
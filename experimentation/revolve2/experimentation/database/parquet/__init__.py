@@ -0,0 +1,9 @@
+"""
+Export of experiment databases to Parquet datasets, for analysis.
+
+Requires the optional `pyarrow` dependency, installed using the `parquet` extra of `revolve2-experimentation`.
+"""
+
+from ._export_parquet import export_parquet, open_parquet_dataset
+
+__all__ = ["export_parquet", "open_parquet_dataset"]
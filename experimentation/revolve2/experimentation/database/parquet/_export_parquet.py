@@ -0,0 +1,123 @@
+import datetime
+from typing import Iterator, Sequence
+
+import pyarrow
+import pyarrow.dataset
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.selectable import ExecutableReturnsRows
+
+_ARROW_TYPES: dict[type, pyarrow.DataType] = {
+    bool: pyarrow.bool_(),
+    int: pyarrow.int64(),
+    float: pyarrow.float64(),
+    str: pyarrow.string(),
+    bytes: pyarrow.binary(),
+    datetime.datetime: pyarrow.timestamp("us"),
+}
+
+
+def export_parquet(
+    dbengine: Engine,
+    statement: ExecutableReturnsRows,
+    directory: str,
+    partition_by: Sequence[str] = ("experiment_id",),
+    chunk_size: int = 100000,
+) -> int:
+    """
+    Stream the result of a query into a Parquet dataset, partitioned by the values of some of its columns.
+
+    Rows are fetched and written in chunks, so the result does not have to fit in memory.
+    Partitions are stored as directories such as `experiment_id=1/`.
+    Analysis scripts can read only the columns and rows they need using `open_parquet_dataset`, without joining the database tables.
+
+    Partitions that already exist in the directory are replaced if the query returns rows for them, and kept otherwise.
+    The rows should be ordered by the partition columns, or partitions are split over many small files.
+    Ordering the rows within a partition, for example by generation, also lets readers skip parts of files when filtering on those columns.
+    Partitioning by generation as well is possible, but usually makes files too small to read efficiently.
+
+    For example, for the standard experiment models::
+
+        statement = (
+            select(
+                Experiment.id.label("experiment_id"),
+                Generation.generation_index,
+                Individual.fitness,
+            )
+            .join_from(Experiment, Generation, Experiment.id == Generation.experiment_id)
+            .join_from(Generation, Population, Generation.population_id == Population.id)
+            .join_from(Population, Individual, Population.id == Individual.population_id)
+            .order_by(Experiment.id, Generation.generation_index)
+        )
+        export_parquet(dbengine, statement, "database_parquet")
+        df = (
+            open_parquet_dataset("database_parquet")
+            .to_table(filter=pyarrow.dataset.field("experiment_id") == 1)
+            .to_pandas()
+        )
+
+    :param dbengine: The database.
+    :param statement: The query, for example a `select`. Its columns become the columns of the dataset, so they must have unique names.
+    :param directory: Directory of the dataset. Created if it does not exist.
+    :param partition_by: Names of the columns to partition by.
+    :param chunk_size: Number of rows fetched and written at once.
+    :returns: The number of exported rows.
+    :raises ValueError: If a column has a type that cannot be exported.
+    """
+    assert chunk_size >= 1
+
+    fields = []
+    for name, column in statement.exported_columns.items():
+        try:
+            arrow_type = _ARROW_TYPES[column.type.python_type]
+        except (KeyError, NotImplementedError):
+            raise ValueError(f"Cannot export column '{name}' of type {column.type}.")
+        fields.append(pyarrow.field(name, arrow_type))
+    schema = pyarrow.schema(fields)
+    assert len(set(schema.names)) == len(schema.names), "Column names must be unique."
+    assert all(
+        name in schema.names for name in partition_by
+    ), "Partition columns must be columns of the query."
+
+    num_rows = 0
+
+    def batches() -> Iterator[pyarrow.RecordBatch]:
+        nonlocal num_rows
+        with dbengine.connect() as connection:
+            result = connection.execution_options(yield_per=chunk_size).execute(
+                statement
+            )
+            for rows in result.partitions():
+                num_rows += len(rows)
+                yield pyarrow.RecordBatch.from_arrays(
+                    [
+                        pyarrow.array(values, type=field.type)
+                        for values, field in zip(zip(*rows), schema)
+                    ],
+                    schema=schema,
+                )
+
+    pyarrow.dataset.write_dataset(
+        batches(),
+        directory,
+        schema=schema,
+        format="parquet",
+        partitioning=list(partition_by),
+        partitioning_flavor="hive",
+        existing_data_behavior="delete_matching",
+        # A chunk can contain a separate partition for every row.
+        max_partitions=max(chunk_size, 1024),
+    )
+    return num_rows
+
+
+def open_parquet_dataset(directory: str) -> pyarrow.dataset.Dataset:
+    """
+    Open a Parquet dataset created by `export_parquet`.
+
+    Nothing is read until the dataset is used.
+    Use `Dataset.to_table` with `columns` and `filter` to read only part of the data.
+
+    :param directory: Directory of the dataset.
+    :returns: The dataset, including the partition columns.
+    """
+    return pyarrow.dataset.dataset(directory, format="parquet", partitioning="hive")
@@ -1,5 +1,34 @@
 """Concrete Elements for Evolutionary Processes."""
 
+from ._async_steady_state_evolution import AsyncSteadyStateEvolution
+from ._island_model import (
+    Island,
+    IslandModel,
+    IslandStatistics,
+    fully_connected_topology,
+    ring_topology,
+)
 from ._modular_robot_evolution import ModularRobotEvolution
+from ._multi_fidelity_evaluator import MultiFidelityEvaluator, ScreeningStatistics
+from ._stage_timing import (
+    StageTiming,
+    StageTimingCsvWriter,
+    log_stage_timing,
+    measure_stage,
+)
 
-__all__ = ["ModularRobotEvolution"]
+__all__ = [
+    "AsyncSteadyStateEvolution",
+    "Island",
+    "IslandModel",
+    "IslandStatistics",
+    "ModularRobotEvolution",
+    "MultiFidelityEvaluator",
+    "ScreeningStatistics",
+    "StageTiming",
+    "StageTimingCsvWriter",
+    "fully_connected_topology",
+    "log_stage_timing",
+    "measure_stage",
+    "ring_topology",
+]
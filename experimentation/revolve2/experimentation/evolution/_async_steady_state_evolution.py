@@ -0,0 +1,277 @@
+import concurrent.futures
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .abstract_elements import Evaluator, Evolution, Reproducer, Selector
+
+TPopulation = (
+    Any  # An alias for Any signifying that a population can vary depending on use-case.
+)
+
+
+@dataclass
+class _PendingEvaluation:
+    children: list[Any]
+    num_updates: int
+    """Number of population updates when the parents of the children were selected."""
+
+
+class AsyncSteadyStateEvolution(Evolution):
+    """
+    An evolutionary process that evaluates offspring asynchronously, keeping all workers busy.
+
+    Offspring are evaluated in small batches on an executor, for example `ParallelMap.executor` from `revolve2.experimentation.parallel`.
+    Whenever an evaluation finishes, new offspring are created from the current population and submitted, so workers do not wait for the slowest evaluation of a generation.
+    Finished evaluations are integrated into the population one batch at a time using the survivor selection, in the order they finish.
+
+    Because parents are selected while earlier offspring are still being evaluated, offspring can be stale: the population may have been updated after their parents were selected.
+    With `max_staleness`, offspring whose parents were selected more than that many updates ago are discarded instead of integrated.
+    Offspring that become too stale while waiting to be submitted are discarded without being evaluated.
+
+    The evaluator is sent to the workers, so it must be picklable and must not use a pool of workers itself.
+    Populations are saved in a background thread, so the survivor selection must return a new population instead of modifying the current one.
+    """
+
+    _parent_selection: Selector
+    _survivor_selection: Selector
+    _reproducer: Reproducer
+    _evaluator: Evaluator
+    _executor: concurrent.futures.Executor
+    _max_pending: int
+    _batch_size: int
+    _max_staleness: int | None
+    _save_function: Callable[[TPopulation, int], None] | None
+    _save_interval: int
+
+    _pending: dict["concurrent.futures.Future[list[float]]", _PendingEvaluation]
+    _unsubmitted: list[_PendingEvaluation]
+    """Batches of offspring that are not submitted yet, because `max_pending` batches were already being evaluated."""
+    _saver: concurrent.futures.ThreadPoolExecutor | None
+    _pending_saves: list["concurrent.futures.Future[None]"]
+    _num_updates: int
+    _num_evaluations: int
+    _num_discarded: int
+    _start_time: float | None
+
+    def __init__(
+        self,
+        parent_selection: Selector,
+        survivor_selection: Selector,
+        evaluator: Evaluator,
+        reproducer: Reproducer,
+        executor: concurrent.futures.Executor,
+        max_pending: int,
+        batch_size: int = 1,
+        max_staleness: int | None = None,
+        save_function: Callable[[TPopulation, int], None] | None = None,
+        save_interval: int = 1,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param parent_selection: Selector object for the parents for reproduction. Called whenever there is room for new evaluations.
+        :param survivor_selection: Selector object for the survivor selection. Called with the `children` and their `child_task_performance` of one batch at a time.
+        :param evaluator: Evaluator object for evaluation. Runs in the workers.
+        :param reproducer: The reproducer object.
+        :param executor: The workers to evaluate in.
+        :param max_pending: Maximum number of batches being evaluated at once. Usually a few more than the number of workers, so workers do not wait for new work.
+        :param batch_size: Number of offspring per evaluation.
+        :param max_staleness: Maximum number of population updates between the selection of the parents of offspring and their integration. If None, offspring are never discarded.
+        :param save_function: Function that saves a population, for example to a database. Called in a background thread with the population and the number of updates so far.
+        :param save_interval: Number of population updates between saves.
+        """
+        assert max_pending >= 1
+        assert batch_size >= 1
+        assert max_staleness is None or max_staleness >= 0
+        assert save_interval >= 1
+
+        self._parent_selection = parent_selection
+        self._survivor_selection = survivor_selection
+        self._evaluator = evaluator
+        self._reproducer = reproducer
+        self._executor = executor
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._max_staleness = max_staleness
+        self._save_function = save_function
+        self._save_interval = save_interval
+
+        self._pending = {}
+        self._unsubmitted = []
+        self._saver = (
+            None
+            if save_function is None
+            else concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        )
+        self._pending_saves = []
+        self._num_updates = 0
+        self._num_evaluations = 0
+        self._num_discarded = 0
+        self._start_time = None
+
+    @property
+    def num_updates(self) -> int:
+        """
+        Get the number of times the population was updated.
+
+        :returns: The number of updates.
+        """
+        return self._num_updates
+
+    @property
+    def num_evaluations(self) -> int:
+        """
+        Get the number of finished evaluations of offspring, including discarded ones.
+
+        :returns: The number of evaluations.
+        """
+        return self._num_evaluations
+
+    @property
+    def num_discarded(self) -> int:
+        """
+        Get the number of offspring that were discarded because they were too stale, whether they were evaluated or not.
+
+        :returns: The number of discarded offspring.
+        """
+        return self._num_discarded
+
+    @property
+    def evaluations_per_second(self) -> float:
+        """
+        Get the throughput since the first evaluation was submitted.
+
+        :returns: The number of finished evaluations per second.
+        """
+        if self._start_time is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._start_time
+        return self._num_evaluations / elapsed if elapsed > 0.0 else 0.0
+
+    def step(self, population: TPopulation, **kwargs: Any) -> TPopulation:
+        """
+        Step the current evolution by one iteration.
+
+        Fills the workers with new offspring, waits until at least one evaluation finishes and integrates all finished evaluations.
+
+        :param population: The current population.
+        :param kwargs: Additional keyword arguments to use in the selection.
+        :return: The population resulting from the step.
+        """
+        self._submit(population, **kwargs)
+
+        done, _ = concurrent.futures.wait(
+            self._pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in [future for future in self._pending if future in done]:
+            pending = self._pending.pop(future)
+            child_task_performance = future.result()
+            self._num_evaluations += len(pending.children)
+
+            staleness = self._num_updates - pending.num_updates
+            if self._max_staleness is not None and staleness > self._max_staleness:
+                self._num_discarded += len(pending.children)
+                continue
+
+            population, *_ = self._survivor_selection.select(
+                population,
+                **kwargs,
+                children=pending.children,
+                child_task_performance=child_task_performance,
+            )
+            self._num_updates += 1
+            if self._num_updates % self._save_interval == 0:
+                self._save(population)
+        return population
+
+    def run(
+        self, population: TPopulation, num_evaluations: int, **kwargs: Any
+    ) -> TPopulation:
+        """
+        Step the evolution until a number of offspring has been evaluated.
+
+        Evaluations that are still running afterwards are discarded, and pending saves are finished.
+
+        :param population: The initial population.
+        :param num_evaluations: The number of evaluations of offspring to do, including discarded ones.
+        :param kwargs: Additional keyword arguments to use in the selection.
+        :return: The final population.
+        """
+        while self._num_evaluations < num_evaluations:
+            population = self.step(population, **kwargs)
+        self.close()
+        logging.info(
+            f"Evaluated {self._num_evaluations} offspring at {self.evaluations_per_second:.2f} evaluations/s, discarded {self._num_discarded} stale offspring."
+        )
+        return population
+
+    def close(self) -> None:
+        """Discard running evaluations, wait for pending saves to finish and stop the thread that saves populations."""
+        for future in self._pending:
+            future.cancel()
+        concurrent.futures.wait(self._pending)
+        self._pending = {}
+        self._unsubmitted = []
+        self._wait_for_saves(0)
+        if self._saver is not None:
+            self._saver.shutdown()
+
+    def _submit(self, population: TPopulation, **kwargs: Any) -> None:
+        if self._max_staleness is not None:
+            # Offspring that are already too stale would be discarded after their evaluation, so they are not evaluated at all.
+            fresh: list[_PendingEvaluation] = []
+            for pending in self._unsubmitted:
+                if self._num_updates - pending.num_updates > self._max_staleness:
+                    self._num_discarded += len(pending.children)
+                else:
+                    fresh.append(pending)
+            self._unsubmitted = fresh
+
+        while len(self._pending) < self._max_pending:
+            # Offspring are only created when all earlier offspring are submitted, so no more than `max_pending` batches are evaluated at once.
+            if len(self._unsubmitted) == 0:
+                parents, parent_kwargs = self._parent_selection.select(
+                    population, **kwargs
+                )
+                children = self._reproducer.reproduce(parents, **parent_kwargs)
+                assert (
+                    len(children) > 0
+                ), "The reproducer created no offspring, so there is nothing to evaluate."
+                self._unsubmitted = [
+                    _PendingEvaluation(
+                        children=list(children[start : start + self._batch_size]),
+                        num_updates=self._num_updates,
+                    )
+                    for start in range(0, len(children), self._batch_size)
+                ]
+            if self._start_time is None:
+                self._start_time = time.perf_counter()
+            pending = self._unsubmitted.pop(0)
+            future = self._executor.submit(
+                _evaluate, self._evaluator, pending.children, pending.num_updates
+            )
+            self._pending[future] = pending
+
+    def _save(self, population: TPopulation) -> None:
+        if self._saver is None or self._save_function is None:
+            return
+        # Allow one save to wait while another one runs, so the evolution only blocks if saving cannot keep up.
+        self._wait_for_saves(1)
+        self._pending_saves.append(
+            self._saver.submit(self._save_function, population, self._num_updates)
+        )
+
+    def _wait_for_saves(self, max_pending: int) -> None:
+        while len(self._pending_saves) > max_pending:
+            self._pending_saves.pop(0).result()
+        for future in [future for future in self._pending_saves if future.done()]:
+            self._pending_saves.remove(future)
+            future.result()
+
+
+def _evaluate(
+    evaluator: Evaluator, children: list[Any], num_updates: int
+) -> list[float]:
+    return evaluator.evaluate(children, generation_index=num_updates)
@@ -0,0 +1,357 @@
+import logging
+import multiprocessing
+import multiprocessing.queues
+import queue
+import time
+import traceback
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from ..optimization.ea import ColumnarPopulation
+
+
+class Island(ABC):
+    """
+    One island of an `IslandModel`: an evolution of its own population, in its own process.
+
+    An island is created in its process, so it can open its own database and worker processes there.
+    """
+
+    @abstractmethod
+    def initial_population(self) -> ColumnarPopulation[Any]:
+        """
+        Create and evaluate the initial population.
+
+        :returns: The initial population.
+        """
+
+    @abstractmethod
+    def step(
+        self, population: ColumnarPopulation[Any], generation_index: int
+    ) -> ColumnarPopulation[Any]:
+        """
+        Step the evolution of this island by one generation, for example using `ModularRobotEvolution.step`, and save the result.
+
+        :param population: The current population.
+        :param generation_index: The index of the generation of the current population.
+        :returns: The population of the next generation.
+        """
+
+    def copy_migrant(self, genotype: Any) -> Any:
+        """
+        Copy the genotype of an individual that migrates to another island.
+
+        Override this if genotypes are database models, to create a new genotype that can be saved in the database of the other island.
+        By default, the genotype itself is sent.
+
+        :param genotype: The genotype.
+        :returns: The copy.
+        """
+        return genotype
+
+    def diversity(self, population: ColumnarPopulation[Any]) -> float:
+        """
+        Measure the diversity of a population.
+
+        Override this for a measure that uses the genotypes.
+        By default, this is the standard deviation of the fitness.
+
+        :param population: The population.
+        :returns: The diversity.
+        """
+        return float(population.fitnesses.std())
+
+    def close(self) -> None:
+        """Release the resources of this island, such as databases and worker processes. Called when the island is finished."""
+        pass
+
+
+@dataclass
+class IslandStatistics:
+    """Statistics of a generation of an island of an `IslandModel`."""
+
+    island_index: int
+    generation_index: int
+    step_seconds: float
+    """Time it took to create the generation."""
+    migration_seconds: float
+    """Time it took to exchange migrants before the generation, mostly waiting for other islands."""
+    num_immigrants: int
+    """Number of individuals that arrived from other islands before the generation."""
+    best_fitness: float
+    mean_fitness: float
+    diversity: float
+
+
+def ring_topology(num_islands: int) -> list[list[int]]:
+    """
+    Create a topology in which every island sends migrants to the next island, and the last to the first.
+
+    :param num_islands: The number of islands.
+    :returns: The islands each island sends migrants to.
+    """
+    return [[(index + 1) % num_islands] for index in range(num_islands)]
+
+
+def fully_connected_topology(num_islands: int) -> list[list[int]]:
+    """
+    Create a topology in which every island sends migrants to all other islands.
+
+    :param num_islands: The number of islands.
+    :returns: The islands each island sends migrants to.
+    """
+    return [
+        [target for target in range(num_islands) if target != index]
+        for index in range(num_islands)
+    ]
+
+
+class IslandModel:
+    """
+    Runs multiple evolutions, the islands, in separate processes, exchanging their best individuals every few generations.
+
+    Every island does selection and reproduction in its own process, so these no longer limit the evolution of a large population.
+    Each island should use its own worker processes for evaluation, and its own database.
+    Use `revolve2.experimentation.database.merge_databases` to combine the databases afterwards.
+
+    Every `migration_interval` generations, each island sends copies of its best `num_migrants` individuals to the islands it is connected to in the topology,
+    and replaces its worst individuals with the ones it receives.
+    An island waits for the migrants of all islands that send to it, so the evolution does not depend on the speed of the islands and is reproducible.
+    """
+
+    _create_island: Callable[[int], Island]
+    _topology: list[list[int]]
+    _migration_interval: int
+    _num_migrants: int
+
+    def __init__(
+        self,
+        create_island: Callable[[int], Island],
+        topology: Sequence[Sequence[int]],
+        migration_interval: int,
+        num_migrants: int,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param create_island: Function that creates an island with the given index. It is called in the process of the island, so it must be picklable, such as a function defined at module level.
+        :param topology: For each island, the islands it sends migrants to. See `ring_topology` and `fully_connected_topology`. The length determines the number of islands.
+        :param migration_interval: The number of generations between migrations.
+        :param num_migrants: The number of individuals an island sends to each connected island.
+        :raises ValueError: If the topology refers to an island that does not exist, or an island sends migrants to itself.
+        """
+        assert len(topology) >= 1
+        assert migration_interval >= 1
+        assert num_migrants >= 0
+
+        for index, targets in enumerate(topology):
+            for target in targets:
+                if target == index or not 0 <= target < len(topology):
+                    raise ValueError(
+                        f"Island {index} cannot send migrants to island {target}."
+                    )
+
+        self._create_island = create_island
+        self._topology = [list(targets) for targets in topology]
+        self._migration_interval = migration_interval
+        self._num_migrants = num_migrants
+
+    @property
+    def num_islands(self) -> int:
+        """
+        Get the number of islands.
+
+        :returns: The number of islands.
+        """
+        return len(self._topology)
+
+    def run(self, num_generations: int) -> list[IslandStatistics]:
+        """
+        Run the islands for a number of generations.
+
+        :param num_generations: The number of generations after the initial population.
+        :returns: The statistics of every generation of every island, including the initial populations, in the order they were created.
+        :raises RuntimeError: If an island failed. The other islands are stopped.
+        """
+        assert num_generations >= 0
+
+        # One queue per connection, so migrants of different islands and migrations cannot be mixed up.
+        connections: dict[
+            tuple[int, int], multiprocessing.queues.Queue[ColumnarPopulation[Any]]
+        ] = {
+            (source, target): multiprocessing.Queue()
+            for source, targets in enumerate(self._topology)
+            for target in targets
+        }
+        results: multiprocessing.queues.Queue[tuple[str, int, Any]] = (
+            multiprocessing.Queue()
+        )
+        processes = [
+            multiprocessing.Process(
+                target=_run_island,
+                name=f"Island {index}",
+                kwargs={
+                    "create_island": self._create_island,
+                    "island_index": index,
+                    "num_generations": num_generations,
+                    "migration_interval": self._migration_interval,
+                    "num_migrants": self._num_migrants,
+                    "outboxes": [
+                        connections[(index, target)] for target in self._topology[index]
+                    ],
+                    "inboxes": [
+                        connection
+                        for (source, target), connection in connections.items()
+                        if target == index
+                    ],
+                    "results": results,
+                },
+            )
+            for index in range(self.num_islands)
+        ]
+        for process in processes:
+            process.start()
+
+        statistics: list[IslandStatistics] = []
+        num_finished = 0
+        try:
+            while num_finished < self.num_islands:
+                try:
+                    kind, island_index, value = results.get(timeout=1.0)
+                except queue.Empty:
+                    for index, process in enumerate(processes):
+                        if process.exitcode not in (None, 0):
+                            raise RuntimeError(
+                                f"Island {index} stopped with exit code {process.exitcode}."
+                            )
+                    continue
+
+                if kind == "statistics":
+                    statistics.append(value)
+                elif kind == "finished":
+                    num_finished += 1
+                    logging.info(f"Island {island_index} finished.")
+                else:
+                    raise RuntimeError(f"Island {island_index} failed:\n{value}")
+        finally:
+            # Stop the other islands if one failed, as they would wait for its migrants forever.
+            if num_finished < self.num_islands:
+                for process in processes:
+                    process.terminate()
+            for process in processes:
+                process.join()
+
+        _log_throughput(statistics)
+        return statistics
+
+
+def _run_island(
+    create_island: Callable[[int], Island],
+    island_index: int,
+    num_generations: int,
+    migration_interval: int,
+    num_migrants: int,
+    outboxes: list["multiprocessing.queues.Queue[ColumnarPopulation[Any]]"],
+    inboxes: list["multiprocessing.queues.Queue[ColumnarPopulation[Any]]"],
+    results: "multiprocessing.queues.Queue[tuple[str, int, Any]]",
+) -> None:
+    try:
+        island = create_island(island_index)
+        try:
+            start_time = time.perf_counter()
+            population = island.initial_population()
+            step_seconds = time.perf_counter() - start_time
+            migration_seconds = 0.0
+            num_immigrants = 0
+            for generation_index in range(num_generations + 1):
+                if generation_index > 0:
+                    start_time = time.perf_counter()
+                    population = island.step(population, generation_index - 1)
+                    step_seconds = time.perf_counter() - start_time
+
+                results.put(
+                    (
+                        "statistics",
+                        island_index,
+                        IslandStatistics(
+                            island_index=island_index,
+                            generation_index=generation_index,
+                            step_seconds=step_seconds,
+                            migration_seconds=migration_seconds,
+                            num_immigrants=num_immigrants,
+                            best_fitness=float(population.fitnesses.max()),
+                            mean_fitness=float(population.fitnesses.mean()),
+                            diversity=island.diversity(population),
+                        ),
+                    )
+                )
+
+                # Migrants are part of the population from the next generation.
+                migration_seconds = 0.0
+                num_immigrants = 0
+                if (
+                    generation_index < num_generations
+                    and generation_index % migration_interval == 0
+                    and num_migrants > 0
+                ):
+                    start_time = time.perf_counter()
+                    population, num_immigrants = _migrate(
+                        island, population, num_migrants, outboxes, inboxes
+                    )
+                    migration_seconds = time.perf_counter() - start_time
+        finally:
+            island.close()
+    except BaseException:
+        results.put(("error", island_index, traceback.format_exc()))
+        raise
+    results.put(("finished", island_index, None))
+
+
+def _migrate(
+    island: Island,
+    population: ColumnarPopulation[Any],
+    num_migrants: int,
+    outboxes: list["multiprocessing.queues.Queue[ColumnarPopulation[Any]]"],
+    inboxes: list["multiprocessing.queues.Queue[ColumnarPopulation[Any]]"],
+) -> tuple[ColumnarPopulation[Any], int]:
+    # Best individuals first, keeping the order of individuals with the same fitness.
+    ranking = np.argsort(-population.fitnesses, kind="stable")
+
+    emigrants = population.take(ranking[:num_migrants])
+    emigrants.genotypes = [
+        island.copy_migrant(genotype) for genotype in emigrants.genotypes
+    ]
+    emigrants.ids[:] = -1
+    for outbox in outboxes:
+        outbox.put(emigrants)
+
+    immigrants = [inbox.get() for inbox in inboxes]
+    num_immigrants = min(sum(len(group) for group in immigrants), len(population))
+    if num_immigrants == 0:
+        return population, 0
+    survivors = population.take(np.sort(ranking[: len(population) - num_immigrants]))
+    return (
+        ColumnarPopulation.concatenate([survivors, *immigrants]).take(
+            np.arange(len(population))
+        ),
+        num_immigrants,
+    )
+
+
+def _log_throughput(statistics: list[IslandStatistics]) -> None:
+    for island_index in sorted({record.island_index for record in statistics}):
+        records = [
+            record
+            for record in statistics
+            if record.island_index == island_index and record.generation_index > 0
+        ]
+        if len(records) == 0:
+            continue
+        step_seconds = sum(record.step_seconds for record in records)
+        migration_seconds = sum(record.migration_seconds for record in records)
+        logging.info(
+            f"Island {island_index}: {len(records) / step_seconds:.2f} generations/s, {migration_seconds:.2f} s exchanging migrants, final diversity {records[-1].diversity:.4f}."
+        )
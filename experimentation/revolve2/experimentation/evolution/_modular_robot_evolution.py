@@ -1,5 +1,6 @@
-from typing import Any
+from typing import Any, Callable
 
+from ._stage_timing import StageTiming, measure_stage
 from .abstract_elements import Evaluator, Evolution, Learner, Reproducer, Selector
 
 TPopulation = (
@@ -15,6 +16,7 @@ class ModularRobotEvolution(Evolution):
     _learner: Learner | None
     _evaluator: Evaluator
     _reproducer: Reproducer
+    _stage_callback: Callable[[StageTiming], None] | None
 
     def __init__(
         self,
@@ -23,6 +25,7 @@ class ModularRobotEvolution(Evolution):
         evaluator: Evaluator,
         reproducer: Reproducer,
         learner: Learner | None = None,
+        stage_callback: Callable[[StageTiming], None] | None = None,
     ) -> None:
         """
         Initialize the ModularRobotEvolution object to make robots evolve.
@@ -32,14 +35,18 @@ class ModularRobotEvolution(Evolution):
         :param evaluator: Evaluator object for evaluation.
         :param reproducer: The reproducer object.
         :param learner: Learning object for learning.
+        :param stage_callback: Receives the wall time, CPU time and memory of each stage of every step, for example `log_stage_timing` or a `StageTimingCsvWriter`. If None, nothing is measured.
         """
         self._parent_selection = parent_selection
         self._survivor_selection = survivor_selection
         self._evaluator = evaluator
         self._learner = learner
         self._reproducer = reproducer
+        self._stage_callback = stage_callback
 
-    def step(self, population: TPopulation, generation_index: int = 0, **kwargs: Any) -> TPopulation:
+    def step(
+        self, population: TPopulation, generation_index: int = 0, **kwargs: Any
+    ) -> TPopulation:
         """
         Step the current evolution by one iteration.
 
@@ -56,13 +63,40 @@ class ModularRobotEvolution(Evolution):
         The schedule can be easily adapted and reorganized for your needs.
 
         :param population: The current population.
+        :param generation_index: The index of the generation of the current population.
         :param kwargs: Additional keyword arguments to use in the step.
         :return: The population resulting from the step
         """
-        parents, parent_kwargs = self._parent_selection.select(population, **kwargs)
-        children = self._reproducer.reproduce(parents, **parent_kwargs)
-        child_task_performance = self._evaluator.evaluate(children, generation_index=generation_index)
-        survivors, *_ = self._survivor_selection.select(
+        callback = self._stage_callback
+        parents, parent_kwargs = measure_stage(
+            callback,
+            "parent_selection",
+            generation_index,
+            self._parent_selection.select,
+            population,
+            **kwargs
+        )
+        children = measure_stage(
+            callback,
+            "reproduction",
+            generation_index,
+            self._reproducer.reproduce,
+            parents,
+            **parent_kwargs
+        )
+        child_task_performance = measure_stage(
+            callback,
+            "evaluation",
+            generation_index,
+            self._evaluator.evaluate,
+            children,
+            generation_index=generation_index,
+        )
+        survivors, *_ = measure_stage(
+            callback,
+            "survivor_selection",
+            generation_index,
+            self._survivor_selection.select,
             population,
             **kwargs,
             children=children,
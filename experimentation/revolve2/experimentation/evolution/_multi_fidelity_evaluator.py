@@ -0,0 +1,226 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .abstract_elements import Evaluator
+
+TPopulation = (
+    Any  # An alias for Any signifying that a population can vary depending on use-case.
+)
+
+
+@dataclass
+class ScreeningStatistics:
+    """Statistics of one evaluation by a `MultiFidelityEvaluator`."""
+
+    generation_index: int
+    num_candidates: int
+    num_promoted: int
+    """Number of candidates that got the full evaluation."""
+    screening_seconds: float
+    full_seconds: float
+    rank_correlation: float | None
+    """
+    Spearman rank correlation between the screening and full fitness of the promoted candidates.
+
+    Close to 1 if screening ranks candidates like the full evaluation does.
+    None if there are less than two promoted candidates or all of them have the same fitness.
+    """
+
+
+class MultiFidelityEvaluator(Evaluator):
+    """
+    An evaluator that screens all candidates with a cheap evaluation and only fully evaluates the promising ones.
+
+    The screening evaluator is usually the full evaluator with a shorter simulation time or a larger simulation timestep,
+    so clearly bad candidates, such as most random or mutated offspring, take only a fraction of the simulation time.
+    Candidates in the top `promote_fraction` of the screening, or with a screening fitness of at least `promote_threshold`, are evaluated again with the full evaluator.
+
+    Screened-out candidates get `screened_out_fitness` if given.
+    Otherwise their fitness is estimated from the screening fitness, using a linear fit of the full on the screening fitness of the promoted candidates,
+    and limited to the lowest full fitness of the promoted candidates, so they never rank above a candidate that was evaluated fully.
+    If no candidate is promoted, which can only happen when only `promote_threshold` is used, the promoted candidates of the last evaluation that had any are used for the estimate.
+    Until there has been such an evaluation, screened-out candidates get their screening fitness, which is on a different scale than the full fitness of candidates in later evaluations.
+
+    Statistics of each evaluation are logged and available as `last_statistics`.
+    Check `rank_correlation` to see whether the screening is a good predictor of the full evaluation.
+    """
+
+    _screening_evaluator: Evaluator
+    _full_evaluator: Evaluator
+    _promote_fraction: float | None
+    _promote_threshold: float | None
+    _screened_out_fitness: float | None
+    _last_statistics: ScreeningStatistics | None
+    _last_promoted: tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]] | None
+    """The screening and full fitnesses of the promoted candidates of the last evaluation that promoted any."""
+
+    def __init__(
+        self,
+        screening_evaluator: Evaluator,
+        full_evaluator: Evaluator,
+        promote_fraction: float | None = 0.5,
+        promote_threshold: float | None = None,
+        screened_out_fitness: float | None = None,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param screening_evaluator: The cheap evaluator that evaluates all candidates.
+        :param full_evaluator: The evaluator of the promoted candidates.
+        :param promote_fraction: Fraction of the candidates with the best screening fitness that are promoted, rounded up. If None, only the threshold is used.
+        :param promote_threshold: Candidates with at least this screening fitness are promoted as well. If None, only the fraction is used.
+        :param screened_out_fitness: Fitness of candidates that are not promoted. If None, it is estimated from their screening fitness.
+        """
+        assert promote_fraction is not None or promote_threshold is not None
+        assert promote_fraction is None or 0.0 < promote_fraction <= 1.0
+
+        self._screening_evaluator = screening_evaluator
+        self._full_evaluator = full_evaluator
+        self._promote_fraction = promote_fraction
+        self._promote_threshold = promote_threshold
+        self._screened_out_fitness = screened_out_fitness
+        self._last_statistics = None
+        self._last_promoted = None
+
+    @property
+    def last_statistics(self) -> ScreeningStatistics | None:
+        """
+        Get the statistics of the last evaluation.
+
+        :returns: The statistics, or None if nothing has been evaluated yet.
+        """
+        return self._last_statistics
+
+    def evaluate(
+        self, population: TPopulation, generation_index: int = 0
+    ) -> list[float]:
+        """
+        Evaluate individuals from a population.
+
+        :param population: The candidates, as a list.
+        :param generation_index: The index of the generation, passed to both evaluators.
+        :returns: The fitness of each candidate: the full fitness of promoted candidates, and the estimated or given fitness of the others.
+        """
+        if len(population) == 0:
+            return []
+
+        start_time = time.perf_counter()
+        screening_fitnesses = np.asarray(
+            self._screening_evaluator.evaluate(
+                population, generation_index=generation_index
+            ),
+            dtype=np.float_,
+        )
+        screening_seconds = time.perf_counter() - start_time
+
+        promoted = self._promoted(screening_fitnesses)
+        start_time = time.perf_counter()
+        full_fitnesses = np.asarray(
+            self._full_evaluator.evaluate(
+                [population[i] for i in promoted.tolist()],
+                generation_index=generation_index,
+            ),
+            dtype=np.float_,
+        )
+        full_seconds = time.perf_counter() - start_time
+
+        if len(promoted) > 0:
+            self._last_promoted = (screening_fitnesses[promoted], full_fitnesses)
+        if self._last_promoted is None:
+            fitnesses = self._estimate(
+                screening_fitnesses, screening_fitnesses[promoted], full_fitnesses
+            )
+        else:
+            fitnesses = self._estimate(screening_fitnesses, *self._last_promoted)
+        fitnesses[promoted] = full_fitnesses
+
+        self._last_statistics = ScreeningStatistics(
+            generation_index=generation_index,
+            num_candidates=len(population),
+            num_promoted=len(promoted),
+            screening_seconds=screening_seconds,
+            full_seconds=full_seconds,
+            rank_correlation=_rank_correlation(
+                screening_fitnesses[promoted], full_fitnesses
+            ),
+        )
+        correlation = (
+            "n/a"
+            if self._last_statistics.rank_correlation is None
+            else f"{self._last_statistics.rank_correlation:.3f}"
+        )
+        logging.info(
+            f"Screening: promoted {len(promoted)} of {len(population)} candidates, screening {screening_seconds:.2f} s, full evaluation {full_seconds:.2f} s, rank correlation {correlation}."
+        )
+        result: list[float] = fitnesses.tolist()
+        return result
+
+    def _promoted(
+        self, screening_fitnesses: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.int_]:
+        is_promoted = np.zeros(len(screening_fitnesses), dtype=np.bool_)
+        if self._promote_fraction is not None:
+            num_promoted = math.ceil(self._promote_fraction * len(screening_fitnesses))
+            ranking = np.argsort(-screening_fitnesses, kind="stable")
+            is_promoted[ranking[:num_promoted]] = True
+        if self._promote_threshold is not None:
+            is_promoted |= screening_fitnesses >= self._promote_threshold
+        return np.flatnonzero(is_promoted)
+
+    def _estimate(
+        self,
+        screening_fitnesses: npt.NDArray[np.float_],
+        promoted_screening_fitnesses: npt.NDArray[np.float_],
+        promoted_full_fitnesses: npt.NDArray[np.float_],
+    ) -> npt.NDArray[np.float_]:
+        if self._screened_out_fitness is not None:
+            return np.full(len(screening_fitnesses), self._screened_out_fitness)
+        if len(promoted_full_fitnesses) == 0:
+            return screening_fitnesses.copy()
+
+        slope = 0.0
+        if (
+            len(promoted_full_fitnesses) >= 2
+            and np.ptp(promoted_screening_fitnesses) > 0
+        ):
+            slope, intercept = np.polyfit(
+                promoted_screening_fitnesses, promoted_full_fitnesses, deg=1
+            ).tolist()
+        if slope > 0.0:
+            estimates = slope * screening_fitnesses + intercept
+        else:
+            # Without a useful fit, keep the difference between the screening and the full fitness.
+            estimates = screening_fitnesses + (
+                promoted_full_fitnesses.mean() - promoted_screening_fitnesses.mean()
+            )
+        limited: npt.NDArray[np.float_] = np.minimum(
+            estimates, promoted_full_fitnesses.min()
+        )
+        return limited
+
+
+def _rank_correlation(
+    a: npt.NDArray[np.float_], b: npt.NDArray[np.float_]
+) -> float | None:
+    if len(a) < 2 or np.ptp(a) == 0 or np.ptp(b) == 0:
+        return None
+    return float(np.corrcoef(_average_ranks(a), _average_ranks(b))[0, 1])
+
+
+def _average_ranks(values: npt.NDArray[np.float_]) -> npt.NDArray[np.float_]:
+    """
+    Rank values, where tied values get the mean of the ranks they span, as in the Spearman rank correlation.
+
+    :param values: The values.
+    :returns: The rank of every value, starting at 0.
+    """
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    ranks: npt.NDArray[np.float_] = ((ends - counts + ends - 1) / 2.0)[inverse]
+    return ranks
@@ -0,0 +1,134 @@
+import csv
+import dataclasses
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+TResult = TypeVar("TResult")
+
+
+@dataclass
+class StageTiming:
+    """
+    Resources used by one stage of a step of an evolution, such as reproduction or evaluation.
+
+    CPU time is that of the thread that runs the stage only.
+    Work done in other threads and in worker processes is not included, so a stage that takes much more wall time than CPU time is mostly waiting for workers.
+    Resident memory is that of the whole process.
+    When several experiments run as threads of one process, such as in `run_sweep`, it includes the memory of all of them, so it is not a per-experiment measurement.
+    """
+
+    stage: str
+    """Name of the stage, for example 'parent_selection', 'reproduction', 'evaluation' or 'survivor_selection'."""
+    generation_index: int
+    """The index of the generation the step started from."""
+    wall_seconds: float
+    cpu_seconds: float
+    rss_bytes: int | None
+    """Resident memory of the process after the stage, or None if it cannot be measured on this platform."""
+    rss_delta_bytes: int | None
+    """Change in resident memory of the process during the stage, or None if it cannot be measured on this platform. Includes allocations of other threads."""
+
+
+def measure_stage(
+    callback: Callable[[StageTiming], None] | None,
+    stage: str,
+    generation_index: int,
+    function: Callable[..., TResult],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> TResult:
+    """
+    Call a function, measuring its wall time, CPU time and memory if there is a callback to report them to.
+
+    Without a callback, the function is only called, so measuring costs nothing when it is disabled.
+
+    :param callback: Function that receives the measurement. If None, nothing is measured.
+    :param stage: Name of the stage.
+    :param generation_index: The index of the generation the step started from.
+    :param function: The function that does the stage.
+    :param args: Positional arguments for the function.
+    :param kwargs: Keyword arguments for the function.
+    :returns: The result of the function.
+    """
+    if callback is None:
+        return function(*args, **kwargs)
+
+    rss_before = _resident_memory()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    result = function(*args, **kwargs)
+    wall_seconds = time.perf_counter() - wall_start
+    cpu_seconds = time.thread_time() - cpu_start
+    rss_after = _resident_memory()
+
+    callback(
+        StageTiming(
+            stage=stage,
+            generation_index=generation_index,
+            wall_seconds=wall_seconds,
+            cpu_seconds=cpu_seconds,
+            rss_bytes=rss_after,
+            rss_delta_bytes=(
+                None
+                if rss_before is None or rss_after is None
+                else rss_after - rss_before
+            ),
+        )
+    )
+    return result
+
+
+def log_stage_timing(timing: StageTiming) -> None:
+    """
+    Log a stage timing. Can be used as stage callback.
+
+    :param timing: The stage timing.
+    """
+    memory = "" if timing.rss_bytes is None else f", {timing.rss_bytes / 2**20:.1f} MiB"
+    logging.info(
+        f"Generation {timing.generation_index} {timing.stage}: {timing.wall_seconds:.3f} s wall, {timing.cpu_seconds:.3f} s CPU{memory}."
+    )
+
+
+class StageTimingCsvWriter:
+    """Appends stage timings to a CSV file. Can be used as stage callback."""
+
+    _file: str
+
+    def __init__(self, file: str) -> None:
+        """
+        Initialize this object.
+
+        :param file: The CSV file. A header is written if the file does not exist yet.
+        """
+        self._file = file
+
+    def __call__(self, timing: StageTiming) -> None:
+        """
+        Append a stage timing to the file.
+
+        :param timing: The stage timing.
+        """
+        write_header = not os.path.exists(self._file)
+        with open(self._file, "a", newline="") as file:
+            writer = csv.DictWriter(
+                file, [field.name for field in dataclasses.fields(StageTiming)]
+            )
+            if write_header:
+                writer.writeheader()
+            writer.writerow(dataclasses.asdict(timing))
+
+
+def _resident_memory() -> int | None:
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError):
+        return None
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
@@ -1,8 +1,17 @@
 """Standardized building blocks related to Evolutionary Algorithms."""
 
+from ._columnar_population import ColumnarPopulation
 from ._generation import Generation
+from ._generation_statistics import GenerationStatistics
 from ._individual import Individual
 from ._parameters import Parameters
 from ._population import Population
 
-__all__ = ["Generation", "Individual", "Parameters", "Population"]
+__all__ = [
+    "ColumnarPopulation",
+    "Generation",
+    "GenerationStatistics",
+    "Individual",
+    "Parameters",
+    "Population",
+]
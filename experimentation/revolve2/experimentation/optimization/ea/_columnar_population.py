@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, Mapping, Sequence, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from ._individual import Individual
+from ._population import Population
+
+TGenotype = TypeVar("TGenotype")
+TIndividual = TypeVar("TIndividual", bound=Individual[Any])
+TPopulation = TypeVar("TPopulation", bound=Population[Any])
+
+
+class ColumnarPopulation(Generic[TGenotype]):
+    """
+    An in-memory population, stored as columns instead of as a list of individuals.
+
+    Fitnesses, ids and other metrics are NumPy arrays, and the genotypes are a list in the same order.
+    Selection and population management can therefore work on whole columns at once,
+    and survivors are taken by index without creating new objects per individual.
+
+    The population is independent of the database.
+    Convert from and to the SQLAlchemy `Population` and `Individual` models using `from_orm` and `to_orm`, only when the population is saved or loaded.
+    """
+
+    genotypes: list[TGenotype]
+    """The genotypes of the individuals."""
+
+    fitnesses: npt.NDArray[np.float_]
+    """The fitness of each individual."""
+
+    ids: npt.NDArray[np.int_]
+    """The database id of the genotype of each individual, or -1 for genotypes that have not been saved."""
+
+    metrics: dict[str, npt.NDArray[Any]]
+    """Other values of each individual, by name. For example the age or novelty of individuals."""
+
+    def __init__(
+        self,
+        genotypes: Sequence[TGenotype],
+        fitnesses: Sequence[float] | npt.NDArray[np.float_],
+        ids: Sequence[int] | npt.NDArray[np.int_] | None = None,
+        metrics: Mapping[str, Sequence[Any] | npt.NDArray[Any]] | None = None,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param genotypes: The genotypes of the individuals.
+        :param fitnesses: The fitness of each individual.
+        :param ids: The database id of the genotype of each individual. If None, the genotypes are considered not saved.
+        :param metrics: Other values of each individual, by name.
+        """
+        self.genotypes = list(genotypes)
+        self.fitnesses = np.asarray(fitnesses, dtype=np.float_)
+        self.ids = (
+            np.full(len(self.genotypes), -1, dtype=np.int_)
+            if ids is None
+            else np.asarray(ids, dtype=np.int_)
+        )
+        self.metrics = (
+            {}
+            if metrics is None
+            else {name: np.asarray(values) for name, values in metrics.items()}
+        )
+
+        assert self.fitnesses.shape == (len(self.genotypes),)
+        assert self.ids.shape == (len(self.genotypes),)
+        assert all(
+            len(values) == len(self.genotypes) for values in self.metrics.values()
+        )
+
+    def __len__(self) -> int:
+        """
+        Get the number of individuals.
+
+        :returns: The number of individuals.
+        """
+        return len(self.genotypes)
+
+    def take(
+        self, indices: Sequence[int] | npt.NDArray[np.int_]
+    ) -> ColumnarPopulation[TGenotype]:
+        """
+        Create a population from some of the individuals of this population.
+
+        :param indices: Indices of the individuals to take. Individuals can be taken more than once.
+        :returns: The created population.
+        """
+        indices = np.asarray(indices, dtype=np.int_)
+        return ColumnarPopulation(
+            genotypes=[self.genotypes[i] for i in indices.tolist()],
+            fitnesses=self.fitnesses[indices],
+            ids=self.ids[indices],
+            metrics={name: values[indices] for name, values in self.metrics.items()},
+        )
+
+    @staticmethod
+    def concatenate(
+        populations: Sequence[ColumnarPopulation[TGenotype]],
+    ) -> ColumnarPopulation[TGenotype]:
+        """
+        Create a population containing the individuals of multiple populations, in order.
+
+        All populations must have the same metrics.
+
+        :param populations: The populations.
+        :returns: The created population.
+        """
+        assert len(populations) > 0
+        assert all(
+            population.metrics.keys() == populations[0].metrics.keys()
+            for population in populations
+        )
+
+        return ColumnarPopulation(
+            genotypes=[
+                genotype
+                for population in populations
+                for genotype in population.genotypes
+            ],
+            fitnesses=np.concatenate(
+                [population.fitnesses for population in populations]
+            ),
+            ids=np.concatenate([population.ids for population in populations]),
+            metrics={
+                name: np.concatenate(
+                    [population.metrics[name] for population in populations]
+                )
+                for name in populations[0].metrics
+            },
+        )
+
+    @staticmethod
+    def from_orm(
+        population: Population[Any], metrics: Sequence[str] = ()
+    ) -> ColumnarPopulation[Any]:
+        """
+        Create a population from an SQLAlchemy population model.
+
+        :param population: The population model.
+        :param metrics: Names of other attributes of the individuals to store as metrics.
+        :returns: The created population.
+        """
+        individuals = population.individuals
+        return ColumnarPopulation(
+            genotypes=[individual.genotype for individual in individuals],
+            fitnesses=[individual.fitness for individual in individuals],
+            ids=[
+                -1 if individual.genotype.id is None else individual.genotype.id
+                for individual in individuals
+            ],
+            metrics={
+                name: [getattr(individual, name) for individual in individuals]
+                for name in metrics
+            },
+        )
+
+    def to_orm(
+        self,
+        population_type: Callable[..., TPopulation],
+        individual_type: Callable[..., TIndividual],
+        metrics: Sequence[str] = (),
+    ) -> TPopulation:
+        """
+        Create an SQLAlchemy population model from this population, to save it.
+
+        :param population_type: The population model class.
+        :param individual_type: The individual model class.
+        :param metrics: Names of metrics to pass to the individual model as well. The model must have attributes with these names.
+        :returns: The created population model.
+        """
+        fitnesses = self.fitnesses.tolist()
+        metric_values = {name: self.metrics[name].tolist() for name in metrics}
+        return population_type(
+            individuals=[
+                individual_type(
+                    genotype=genotype,
+                    fitness=fitness,
+                    **{name: values[i] for name, values in metric_values.items()},
+                )
+                for i, (genotype, fitness) in enumerate(zip(self.genotypes, fitnesses))
+            ]
+        )
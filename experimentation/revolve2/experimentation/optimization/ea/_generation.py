@@ -37,6 +37,7 @@ class Generation(HasId, orm.MappedAsDataclass, Generic[TPopulation]):
             sqlalchemy.ForeignKey("population.id"),
             nullable=False,
             init=False,
+            index=True,
         )
         population: orm.Mapped[TPopulation] = orm.relationship()
 
@@ -85,6 +86,7 @@ class Generation(HasId, orm.MappedAsDataclass, Generic[TPopulation]):
             sqlalchemy.ForeignKey(f"{cls.__type_tpopulation.__tablename__}.id"),
             nullable=False,
             init=False,
+            index=True,
         )
 
     @classmethod
@@ -0,0 +1,194 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    ForwardRef,
+    Generic,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+import numpy as np
+import numpy.typing as npt
+import sqlalchemy
+import sqlalchemy.orm as orm
+from typing_extensions import Self
+
+from ..._util.init_subclass_get_generic_args import init_subclass_get_generic_args
+from ...database import HasId
+from ._columnar_population import ColumnarPopulation
+
+TGeneration = TypeVar("TGeneration")
+
+
+class GenerationStatistics(HasId, orm.MappedAsDataclass, Generic[TGeneration]):
+    """
+    Generic SQLAlchemy model for summary statistics of a metric of the individuals in a generation.
+
+    Inherit from this to create your own statistics table.
+    Save statistics together with each generation, using `from_population`,
+    so plots and dashboards can read one row per generation instead of all individuals.
+
+    The generic parameter `TGeneration` refers to the user-defined generation type,
+    which should have an `id` field that will be used as a foreign key reference.
+    This parameter cannot be a forward reference.
+
+    For example::
+
+        class MyGenerationStatistics(Base, GenerationStatistics[MyGeneration]):
+            __tablename__ = "my_generation_statistics"
+    """
+
+    # -------------------------------------
+    # Class members interesting to the user
+    # -------------------------------------
+    if TYPE_CHECKING:
+        generation_id: orm.Mapped[int] = orm.mapped_column(
+            nullable=False, init=False, index=True
+        )
+        generation: orm.Mapped[TGeneration] = orm.relationship()
+        metric: orm.Mapped[str] = orm.mapped_column(nullable=False)
+        count: orm.Mapped[int] = orm.mapped_column(nullable=False)
+        minimum: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        maximum: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        mean: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        std: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        quartile1: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        median: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        quartile3: orm.Mapped[float] = orm.mapped_column(nullable=False)
+
+    # ----------------------
+    # Implementation details
+    # ----------------------
+    else:
+
+        @orm.declared_attr
+        def generation_id(cls) -> orm.Mapped[int]:  # noqa
+            return cls.__generation_id_impl()
+
+        @orm.declared_attr
+        def generation(cls) -> orm.Mapped[TGeneration]:  # noqa
+            return cls.__generation_impl()
+
+        @orm.declared_attr
+        def metric(cls) -> orm.Mapped[str]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def count(cls) -> orm.Mapped[int]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def minimum(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def maximum(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def mean(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def std(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def quartile1(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def median(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+        @orm.declared_attr
+        def quartile3(cls) -> orm.Mapped[float]:  # noqa
+            return orm.mapped_column(nullable=False)
+
+    __type_tgeneration: ClassVar[Type[TGeneration]]  # type: ignore[misc]
+
+    def __init_subclass__(cls: Type[Self], /, **kwargs: dict[str, Any]) -> None:
+        """
+        Initialize a version of this class when it is subclassed.
+
+        Gets the actual type of `TGeneration` and stores it for later use.
+
+        :param kwargs: Remaining arguments passed to super.
+        """
+        generic_types = init_subclass_get_generic_args(cls, GenerationStatistics)
+        assert len(generic_types) == 1
+        cls.__type_tgeneration = generic_types[0]
+        assert not isinstance(
+            cls.__type_tgeneration, ForwardRef
+        ), "TGeneration generic argument cannot be a forward reference."
+
+        super().__init_subclass__(**kwargs)  # type: ignore[arg-type]
+
+    @classmethod
+    def from_values(
+        cls,
+        generation: TGeneration,
+        metric: str,
+        values: Sequence[float] | npt.NDArray[np.float_],
+    ) -> Self:
+        """
+        Calculate the statistics of the values of a metric.
+
+        The standard deviation is that of the population, not the sample.
+
+        :param generation: The generation the values belong to.
+        :param metric: Name of the metric.
+        :param values: The values. There must be at least one.
+        :returns: The statistics.
+        """
+        array = np.asarray(values, dtype=np.float_)
+        assert array.ndim == 1 and len(array) > 0
+        quartile1, median, quartile3 = np.quantile(array, [0.25, 0.5, 0.75]).tolist()
+        return cls(
+            generation=generation,
+            metric=metric,
+            count=len(array),
+            minimum=float(array.min()),
+            maximum=float(array.max()),
+            mean=float(array.mean()),
+            std=float(array.std()),
+            quartile1=quartile1,
+            median=median,
+            quartile3=quartile3,
+        )
+
+    @classmethod
+    def from_population(
+        cls,
+        generation: TGeneration,
+        population: ColumnarPopulation[Any],
+        metrics: Sequence[str] | None = None,
+    ) -> list[Self]:
+        """
+        Calculate the statistics of the fitness and other metrics of a population.
+
+        :param generation: The generation the population belongs to.
+        :param population: The population.
+        :param metrics: Names of the metrics of the population to calculate statistics for, besides the fitness. If None, all metrics are used.
+        :returns: The statistics, with metric "fitness" first and the other metrics in order.
+        """
+        metric_names = population.metrics.keys() if metrics is None else metrics
+        return [cls.from_values(generation, "fitness", population.fitnesses)] + [
+            cls.from_values(generation, name, population.metrics[name])
+            for name in metric_names
+        ]
+
+    @classmethod
+    def __generation_id_impl(cls) -> orm.Mapped[int]:
+        return orm.mapped_column(
+            sqlalchemy.ForeignKey(f"{cls.__type_tgeneration.__tablename__}.id"),
+            nullable=False,
+            init=False,
+            index=True,
+        )
+
+    @classmethod
+    def __generation_impl(cls) -> orm.Mapped[TGeneration]:
+        return orm.relationship(cls.__type_tgeneration)
@@ -23,6 +23,9 @@ class Individual(HasId, orm.MappedAsDataclass, Generic[TGenotype]):
     which should have an `id` field that will be used as a foreign key reference.
     This parameter cannot be a forward reference.
 
+    The population id, genotype id and fitness are indexed, so finding the individuals of a population or the best individuals does not scan the whole table.
+    Use `revolve2.experimentation.database.create_missing_indexes` to add the indexes to databases created before they were declared.
+
     For example::
 
         class MyIndividual(Base, Individual[MyGenotype], population_table="my_population"):
@@ -33,13 +36,17 @@ class Individual(HasId, orm.MappedAsDataclass, Generic[TGenotype]):
     # Class members interesting to the user
     # -------------------------------------
     if TYPE_CHECKING:
-        population_id: orm.Mapped[int] = orm.mapped_column(nullable=False, init=False)
+        population_id: orm.Mapped[int] = orm.mapped_column(
+            nullable=False, init=False, index=True
+        )
         population_index: orm.Mapped[int] = orm.mapped_column(
             nullable=False, init=False
         )
-        genotype_id: orm.Mapped[int] = orm.mapped_column(nullable=False, init=False)
+        genotype_id: orm.Mapped[int] = orm.mapped_column(
+            nullable=False, init=False, index=True
+        )
         genotype: orm.Mapped[TGenotype] = orm.relationship()
-        fitness: orm.Mapped[float] = orm.mapped_column(nullable=False)
+        fitness: orm.Mapped[float] = orm.mapped_column(nullable=False, index=True)
 
     # ----------------------
     # Implementation details
@@ -100,6 +107,7 @@ class Individual(HasId, orm.MappedAsDataclass, Generic[TGenotype]):
             sqlalchemy.ForeignKey(f"{cls.__population_table}.id"),
             nullable=False,
             init=False,
+            index=True,
         )
 
     @classmethod
@@ -112,6 +120,7 @@ class Individual(HasId, orm.MappedAsDataclass, Generic[TGenotype]):
             sqlalchemy.ForeignKey(f"{cls.__type_tgenotype.__tablename__}.id"),
             nullable=False,
             init=False,
+            index=True,
         )
 
     @classmethod
@@ -120,4 +129,4 @@ class Individual(HasId, orm.MappedAsDataclass, Generic[TGenotype]):
 
     @classmethod
     def __fitness_impl(cls) -> orm.Mapped[float]:
-        return orm.mapped_column(nullable=False)
+        return orm.mapped_column(nullable=False, index=True)
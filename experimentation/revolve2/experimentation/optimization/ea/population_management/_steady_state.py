@@ -13,7 +13,8 @@ def steady_state(
     new_genotypes: list[Genotype],
     new_fitnesses: list[Fitness],
     selection_function: Callable[
-        [int, list[Genotype], list[Fitness]], npt.NDArray[np.float_]
+        [int, list[Genotype], list[Fitness]],
+        npt.NDArray[np.int_] | npt.NDArray[np.float_],
     ],
 ) -> tuple[list[int], list[int]]:
     """
@@ -1,8 +1,18 @@
 """Functions for selecting individuals from populations in EA algorithms."""
 
 from ._multiple_unique import multiple_unique
+from ._non_dominated_sort import non_dominated_sort
 from ._pareto_frontier import pareto_frontier
 from ._topn import topn
-from ._tournament import tournament
+from ._tournament import tournament, tournaments
+from ._unique_tournaments import unique_tournaments
 
-__all__ = ["multiple_unique", "pareto_frontier", "topn", "tournament"]
+__all__ = [
+    "multiple_unique",
+    "non_dominated_sort",
+    "pareto_frontier",
+    "topn",
+    "tournament",
+    "tournaments",
+    "unique_tournaments",
+]
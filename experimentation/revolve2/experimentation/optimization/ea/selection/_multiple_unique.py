@@ -16,6 +16,8 @@ def multiple_unique(
     """
     Select multiple distinct individuals from a population using the provided selection function.
 
+    For tournament selection, `unique_tournaments` gives the same distribution without repeating tournaments.
+
     :param selection_size: Amount of of individuals to select.
     :param population: List of individuals to select from.
     :param fitnesses: Fitnesses of the population.
@@ -25,12 +27,14 @@ def multiple_unique(
     assert len(population) == len(fitnesses)
     assert selection_size <= len(population)
 
-    selected_individuals = []
+    selected_individuals: list[int] = []
+    selected_set: set[int] = set()
     for _ in range(selection_size):
         new_individual = False
         while new_individual is False:
             selected_individual = selection_function(population, fitnesses)
-            if selected_individual not in selected_individuals:
+            if selected_individual not in selected_set:
                 selected_individuals.append(selected_individual)
+                selected_set.add(selected_individual)
                 new_individual = True
     return np.array(selected_individuals)
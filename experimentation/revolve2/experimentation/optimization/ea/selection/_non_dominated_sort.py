@@ -0,0 +1,133 @@
+from itertools import combinations
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+TValues = TypeVar("TValues")
+
+_BLOCK_ELEMENTS = 2**22
+"""Maximum number of pairs of points compared at once."""
+
+
+def non_dominated_sort(
+    frontier_values: list[list[TValues]], frontier_order: list[bool], to_take: int
+) -> list[int]:
+    """
+    Return individuals based on their pareto front and crowding distance, as done by NSGA-II.
+
+    Individuals are sorted by the pareto front they are in, best front first.
+    Within a front, individuals in less crowded regions of the objective space come first, so a diverse set of individuals is selected.
+    For more information see: Deb et al. (2002). A fast and elitist multiobjective genetic algorithm: NSGA-II.
+
+    :param frontier_values: Lists of values that are used for the frontier, one list per objective. These values need to be numeric.
+    :param frontier_order: List of orders for the values used in frontier selection. True = ascending, False = descending.
+    :param to_take: The amount of individuals to return.
+    :returns: The index of the individuals that were selected. Best is first.
+    """
+    assert all(len(x) == len(y) for x, y in combinations(frontier_values, 2))
+    assert len(frontier_values[0]) >= to_take
+
+    # Negate descending values, so smaller is always better.
+    values = np.array(frontier_values, dtype=np.float64).T * np.where(
+        frontier_order, 1.0, -1.0
+    )
+    fronts = _get_fronts(values)
+    crowding_distances = _get_crowding_distances(values, fronts)
+    order = np.lexsort((-crowding_distances, fronts))
+    return order[:to_take].tolist()  # type: ignore[no-any-return]
+
+
+def _dominates(a: NDArray[np.float_], b: NDArray[np.float_]) -> NDArray[np.bool_]:
+    """
+    Check which points dominate which other points.
+
+    :param a: The first points. Shape (num_a, num_values).
+    :param b: The second points. Shape (num_b, num_values).
+    :returns: Whether each point in `a` dominates each point in `b`. Shape (num_a, num_b).
+    """
+    # Comparing one value at a time is faster than reducing over a short last axis.
+    not_worse = np.ones((a.shape[0], b.shape[0]), dtype=np.bool_)
+    better = np.zeros((a.shape[0], b.shape[0]), dtype=np.bool_)
+    for a_column, b_column in zip(a.T, b.T):
+        not_worse &= a_column[:, None] <= b_column[None, :]
+        better |= a_column[:, None] < b_column[None, :]
+    result: NDArray[np.bool_] = not_worse & better
+    return result
+
+
+def _count_dominators(
+    dominators: NDArray[np.float_], points: NDArray[np.float_]
+) -> NDArray[np.int_]:
+    """
+    Count for every point how many of the dominators dominate it, comparing in blocks to bound memory use.
+
+    :param dominators: The possible dominators. Shape (num_dominators, num_values).
+    :param points: The points. Shape (num_points, num_values).
+    :returns: The number of dominators of each point. Shape (num_points,).
+    """
+    block_size = max(1, _BLOCK_ELEMENTS // max(1, points.shape[0]))
+    counts = np.zeros(points.shape[0], dtype=np.int_)
+    for start in range(0, dominators.shape[0], block_size):
+        counts += np.count_nonzero(
+            _dominates(dominators[start : start + block_size], points), axis=0
+        )
+    return counts
+
+
+def _get_fronts(values: NDArray[np.float_]) -> NDArray[np.int_]:
+    """
+    Find the pareto front of each point, where smaller values are better.
+
+    Front 0 contains the points that are not dominated by any point.
+    Front i contains the points that are only dominated by points in fronts before i.
+
+    :param values: The values. Shape (num_points, num_values).
+    :returns: The front of each point.
+    """
+    fronts = np.full(values.shape[0], -1, dtype=np.int_)
+    remaining = np.arange(values.shape[0])
+    num_dominators = _count_dominators(values, values)
+    front = 0
+    while len(remaining) > 0:
+        in_front = num_dominators == 0
+        fronts[remaining[in_front]] = front
+        front_values = values[remaining[in_front]]
+        remaining = remaining[~in_front]
+        num_dominators = num_dominators[~in_front] - _count_dominators(
+            front_values, values[remaining]
+        )
+        front += 1
+    return fronts
+
+
+def _get_crowding_distances(
+    values: NDArray[np.float_], fronts: NDArray[np.int_]
+) -> NDArray[np.float_]:
+    """
+    Calculate the crowding distance of each point within its front.
+
+    The crowding distance is the sum over all values of the distance between the two neighbours of a point in its front, normalized by the range of the value in the front.
+    Points at the boundary of a front get an infinite distance.
+
+    :param values: The values. Shape (num_points, num_values).
+    :param fronts: The front of each point.
+    :returns: The crowding distances.
+    """
+    distances = np.zeros(values.shape[0])
+    for front in range(int(fronts.max(initial=-1)) + 1):
+        members = np.flatnonzero(fronts == front)
+        front_values = values[members]
+        order = np.argsort(front_values, axis=0, kind="stable")
+        sorted_values = np.take_along_axis(front_values, order, axis=0)
+        value_range = sorted_values[-1] - sorted_values[0]
+
+        front_distances = np.zeros_like(front_values)
+        front_distances[1:-1] = (sorted_values[2:] - sorted_values[:-2]) / np.where(
+            value_range > 0.0, value_range, 1.0
+        )
+        front_distances[0] = np.inf
+        front_distances[-1] = np.inf
+        np.put_along_axis(front_distances, order, front_distances.copy(), axis=0)
+        distances[members] = front_distances.sum(axis=1)
+    return distances
@@ -7,6 +7,9 @@ from numpy.typing import NDArray
 TValues = TypeVar("TValues")
 TOther = TypeVar("TOther")
 
+_BLOCK_ELEMENTS = 2**22
+"""Maximum number of pairs of points compared at once."""
+
 
 def pareto_frontier(
     frontier_values: list[list[TValues]], frontier_order: list[bool], to_take: int
@@ -47,25 +50,23 @@ def _get_domination_orders(
     """
     Find the pareto domination order for each point.
 
+    The domination order of a point is the number of points it is better than in at least one value.
+    Points are compared in blocks, so memory use is bounded for large populations.
+
     :param value_array: A (*value) array.
     :param frontier_order: The order of a specific value.
     :return: A mask for the pareto front.
     """
-    domination_orders = [0] * value_array.shape[0]
+    # Negate descending values, so better is always smaller.
+    values = value_array * np.where(frontier_order, 1.0, -1.0)
 
-    i = 0
-    for pair in value_array:
-        dom = sum(
-            [
-                any(
-                    [
-                        p[j] > pair[j] if frontier_order[j] else p[j] < pair[j]
-                        for j in range(len(frontier_order))
-                    ]
-                )
-                for p in value_array
-            ]
-        )
-        domination_orders[i] = dom
-        i += 1
-    return domination_orders
+    num_points = values.shape[0]
+    block_size = max(1, _BLOCK_ELEMENTS // max(1, num_points))
+    domination_orders = np.empty(num_points, dtype=np.int_)
+    for start in range(0, num_points, block_size):
+        block = values[start : start + block_size]
+        better = np.zeros((block.shape[0], num_points), dtype=np.bool_)
+        for block_column, column in zip(block.T, values.T):
+            better |= block_column[:, None] < column[None, :]
+        domination_orders[start : start + block_size] = np.count_nonzero(better, axis=1)
+    return domination_orders.tolist()  # type: ignore[no-any-return]
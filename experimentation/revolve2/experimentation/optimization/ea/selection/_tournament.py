@@ -1,6 +1,7 @@
-from typing import TypeVar
+from typing import Sequence, TypeVar
 
 import numpy as np
+import numpy.typing as npt
 
 Fitness = TypeVar("Fitness")
 
@@ -16,5 +17,33 @@ def tournament(rng: np.random.Generator, fitnesses: list[Fitness], k: int) -> in
     """
     assert len(fitnesses) >= k
 
-    participant_indices = rng.choice(range(len(fitnesses)), size=k)
+    # Draws the same participants as `rng.choice(range(len(fitnesses)), size=k)`, without creating the range.
+    participant_indices = rng.integers(0, len(fitnesses), size=k)
     return max(participant_indices, key=lambda i: fitnesses[i])  # type: ignore[no-any-return]
+
+
+def tournaments(
+    rng: np.random.Generator,
+    fitnesses: Sequence[float] | npt.NDArray[np.float_],
+    k: int,
+    num: int,
+) -> npt.NDArray[np.int_]:
+    """
+    Perform many tournaments at once and return the indices of the winners.
+
+    The winners are the same as those of `num` consecutive calls to `tournament` with the same random number generator.
+
+    :param rng: Random number generator.
+    :param fitnesses: Fitnesses of the individuals that join the tournaments.
+    :param k: Amount of individuals to participate in each tournament.
+    :param num: The number of tournaments.
+    :returns: The index of the winner of each tournament.
+    """
+    assert len(fitnesses) >= k
+
+    participant_indices = rng.integers(0, len(fitnesses), size=(num, k))
+    participant_fitnesses = np.asarray(fitnesses)[participant_indices]
+    winners: npt.NDArray[np.int_] = participant_indices[
+        np.arange(num), np.argmax(participant_fitnesses, axis=1)
+    ]
+    return winners
@@ -0,0 +1,65 @@
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+def unique_tournaments(
+    rng: np.random.Generator,
+    fitnesses: Sequence[float] | npt.NDArray[np.float_],
+    k: int,
+    selection_size: int,
+    num_selections: int | None = None,
+) -> npt.NDArray[np.int_]:
+    """
+    Select multiple distinct individuals using tournaments, without repeating tournaments until a new individual wins.
+
+    The result has the same distribution as `multiple_unique` with `tournament` as selection function.
+    That function repeats tournaments until an individual wins that was not selected yet,
+    which is the same as sampling without replacement, weighted by the probability of each individual to win a single tournament.
+    Here that probability is calculated from the rank of each individual, and the sampling is done at once using the Gumbel-top-k trick.
+
+    :param rng: Random number generator.
+    :param fitnesses: Fitnesses of the individuals to select from.
+    :param k: Amount of individuals to participate in each tournament.
+    :param selection_size: Amount of individuals to select.
+    :param num_selections: Number of independent selections to make, for example one pair of parents per offspring. If None, a single selection is made.
+    :returns: Indices of the selected individuals, in order of selection. Shape (selection_size,), or (num_selections, selection_size) if `num_selections` is given.
+    """
+    assert selection_size <= len(fitnesses)
+
+    keys = _log_win_probabilities(np.asarray(fitnesses), k) + rng.gumbel(
+        size=(1 if num_selections is None else num_selections, len(fitnesses))
+    )
+    selected = np.argpartition(-keys, selection_size - 1, axis=1)[:, :selection_size]
+    selected = np.take_along_axis(
+        selected,
+        np.argsort(-np.take_along_axis(keys, selected, axis=1), axis=1),
+        axis=1,
+    )
+    result: npt.NDArray[np.int_] = selected[0] if num_selections is None else selected
+    return result
+
+
+def _log_win_probabilities(
+    fitnesses: npt.NDArray[np.float_], k: int
+) -> npt.NDArray[np.float_]:
+    """
+    Calculate the log of the probability of each individual to win a single tournament.
+
+    Participants are drawn with replacement, so the probability that the best participant has one of the `worse + tied` lowest fitnesses is `((worse + tied) / n)^k`.
+    Individuals with equal fitness share the probability that one of them wins equally.
+
+    :param fitnesses: Fitnesses of the individuals.
+    :param k: Amount of individuals to participate in a tournament.
+    :returns: The log probabilities.
+    """
+    _, inverse, counts = np.unique(fitnesses, return_inverse=True, return_counts=True)
+    tied = counts[inverse]
+    worse = (np.cumsum(counts) - counts)[inverse]
+    result: npt.NDArray[np.float_] = (
+        k * np.log((worse + tied) / len(fitnesses))
+        + np.log1p(-((worse / (worse + tied)) ** k))
+        - np.log(tied)
+    )
+    return result
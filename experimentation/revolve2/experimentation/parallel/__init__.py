@@ -0,0 +1,6 @@
+"""Tools to distribute work over multiple processes."""
+
+from ._fair_pool import FairPool
+from ._parallel_map import ParallelMap
+
+__all__ = ["FairPool", "ParallelMap"]
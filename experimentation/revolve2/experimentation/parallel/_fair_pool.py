@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from types import TracebackType
+from typing import Any, Callable, TypeVar
+
+TResult = TypeVar("TResult")
+
+
+@dataclass
+class _Task:
+    future: concurrent.futures.Future[Any]
+    function: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+
+
+class FairPool:
+    """
+    A pool of worker processes shared fairly by multiple users, for example multiple experiments running at the same time.
+
+    Every user gets its own lane, which is an executor that can be used wherever an executor is accepted,
+    such as `ParallelMap` or a simulator.
+    Work submitted to the lanes is sent to the workers in turn, one task per lane with waiting work,
+    so a lane that submits a lot of work at once does not delay the work of the other lanes until it is done.
+    Only a few tasks per worker are sent to the workers at a time; the rest waits in the lanes.
+    """
+
+    _num_workers: int
+    _max_in_flight: int
+    _executor: concurrent.futures.ProcessPoolExecutor
+    _lock: threading.RLock
+    _queues: dict[int, deque[_Task]]
+    _turns: deque[int]
+    _num_in_flight: int
+    _num_lanes: int
+
+    def __init__(self, num_workers: int, tasks_per_worker: int = 2) -> None:
+        """
+        Initialize this object.
+
+        :param num_workers: The number of worker processes.
+        :param tasks_per_worker: Number of tasks per worker that are sent to the workers at once. More than one keeps workers busy while results are being returned.
+        """
+        assert num_workers >= 1
+        assert tasks_per_worker >= 1
+
+        self._num_workers = num_workers
+        self._max_in_flight = num_workers * tasks_per_worker
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=num_workers)
+        # Reentrant, because a callback of a finished task can run while dispatching.
+        self._lock = threading.RLock()
+        self._queues = {}
+        self._turns = deque()
+        self._num_in_flight = 0
+        self._num_lanes = 0
+
+    @property
+    def num_workers(self) -> int:
+        """
+        Get the number of worker processes.
+
+        :returns: The number of workers.
+        """
+        return self._num_workers
+
+    def lane(self) -> concurrent.futures.Executor:
+        """
+        Create a new lane.
+
+        :returns: The lane.
+        """
+        with self._lock:
+            lane_id = self._num_lanes
+            self._num_lanes += 1
+            self._queues[lane_id] = deque()
+        return _Lane(self, lane_id)
+
+    def close(self) -> None:
+        """Shut down the worker processes, waiting for all submitted work to finish, including the work still waiting in the lanes."""
+        # Waiting work is only sent to the workers when earlier work finishes, which cannot happen anymore after shutting them down.
+        while True:
+            with self._lock:
+                waiting = [
+                    task.future
+                    for queue in self._queues.values()
+                    for task in queue
+                    if not task.future.done()
+                ]
+            if len(waiting) == 0:
+                break
+            concurrent.futures.wait(waiting)
+        self._executor.shutdown()
+
+    def __enter__(self) -> FairPool:
+        """
+        Use this object as a context manager that closes it on exit.
+
+        :returns: This object.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close this object.
+
+        :param exc_type: The type of the exception that was raised, if any.
+        :param exc_value: The exception that was raised, if any.
+        :param traceback: The traceback of the exception, if any.
+        """
+        self.close()
+
+    def _submit(
+        self,
+        lane_id: int,
+        function: Callable[..., TResult],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> concurrent.futures.Future[TResult]:
+        future: concurrent.futures.Future[TResult] = concurrent.futures.Future()
+        with self._lock:
+            queue = self._queues[lane_id]
+            if len(queue) == 0:
+                self._turns.append(lane_id)
+            queue.append(_Task(future, function, args, kwargs))
+            self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        # Must be called with the lock held.
+        while self._num_in_flight < self._max_in_flight and len(self._turns) > 0:
+            lane_id = self._turns.popleft()
+            queue = self._queues[lane_id]
+            task = queue.popleft()
+            if len(queue) > 0:
+                self._turns.append(lane_id)
+
+            # Skip tasks that were cancelled while waiting.
+            if not task.future.set_running_or_notify_cancel():
+                continue
+            try:
+                worker_future = self._executor.submit(
+                    task.function, *task.args, **task.kwargs
+                )
+            except Exception as exception:
+                # For example because the workers were shut down or one of them died. The task fails instead of waiting forever.
+                task.future.set_exception(exception)
+                continue
+            self._num_in_flight += 1
+            worker_future.add_done_callback(partial(self._on_done, future=task.future))
+
+    def _on_done(
+        self,
+        worker_future: concurrent.futures.Future[Any],
+        future: concurrent.futures.Future[Any],
+    ) -> None:
+        with self._lock:
+            self._num_in_flight -= 1
+            self._dispatch()
+        exception = worker_future.exception()
+        if exception is None:
+            future.set_result(worker_future.result())
+        else:
+            future.set_exception(exception)
+
+
+class _Lane(concurrent.futures.Executor):
+    """An executor that submits work to a `FairPool`."""
+
+    _pool: FairPool
+    _lane_id: int
+
+    def __init__(self, pool: FairPool, lane_id: int) -> None:
+        self._pool = pool
+        self._lane_id = lane_id
+
+    def submit(
+        self, fn: Callable[..., TResult], /, *args: Any, **kwargs: Any
+    ) -> concurrent.futures.Future[TResult]:
+        """
+        Submit work to the pool.
+
+        :param fn: The function to call.
+        :param args: Positional arguments for the function.
+        :param kwargs: Keyword arguments for the function.
+        :returns: The future of the result.
+        """
+        return self._pool._submit(self._lane_id, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Do nothing; the pool is shut down by its owner.
+
+        :param wait: Ignored.
+        :param cancel_futures: Ignored.
+        """
+        pass
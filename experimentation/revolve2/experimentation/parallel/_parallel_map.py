@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import concurrent.futures
+from functools import partial
+from types import TracebackType
+from typing import Callable, Sequence, TypeVar
+
+import numpy as np
+
+from ..rng import make_rng, make_seeds
+
+TItem = TypeVar("TItem")
+TResult = TypeVar("TResult")
+
+
+class ParallelMap:
+    """
+    Calls functions for many items using a pool of worker processes.
+
+    The pool is created once and reused by every call.
+    It can be shared with other work, for example by passing `executor` to a simulator, so that all parallel work runs in the same processes.
+    Functions, items and results must be picklable.
+    Results are always returned in the order of the items.
+    """
+
+    _num_workers: int
+    _executor: concurrent.futures.Executor | None
+    _owns_executor: bool
+
+    def __init__(
+        self, num_workers: int, executor: concurrent.futures.Executor | None = None
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param num_workers: The number of worker processes. If this is 1 and no executor is given, all work is done in the calling process and no pool is created.
+        :param executor: An existing pool of worker processes to use instead of creating one, for example a lane of a `FairPool`. It is not shut down when this object is closed. `num_workers` should be the number of workers of this pool.
+        """
+        assert num_workers >= 1
+
+        self._num_workers = num_workers
+        self._owns_executor = executor is None
+        if executor is not None:
+            self._executor = executor
+        elif num_workers > 1:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_workers
+            )
+        else:
+            self._executor = None
+
+    @property
+    def num_workers(self) -> int:
+        """
+        Get the number of worker processes.
+
+        :returns: The number of workers.
+        """
+        return self._num_workers
+
+    @property
+    def executor(self) -> concurrent.futures.Executor | None:
+        """
+        Get the pool of worker processes.
+
+        :returns: The pool, or None if all work is done in the calling process.
+        """
+        return self._executor
+
+    def map(
+        self, function: Callable[[TItem], TResult], items: Sequence[TItem]
+    ) -> list[TResult]:
+        """
+        Call a function for every item.
+
+        Items are sent to the workers in chunks, a few per worker, to limit the communication overhead.
+
+        :param function: The function to call. Must be defined at module level so it can be sent to the workers.
+        :param items: The items.
+        :returns: The results, in the order of the items.
+        """
+        if self._executor is None or len(items) <= 1:
+            return [function(item) for item in items]
+        chunk_size = max(1, len(items) // (4 * self._num_workers))
+        return list(self._executor.map(function, items, chunksize=chunk_size))
+
+    def map_seeded(
+        self,
+        function: Callable[[TItem, np.random.Generator], TResult],
+        items: Sequence[TItem],
+        rng: np.random.Generator,
+    ) -> list[TResult]:
+        """
+        Call a function that uses randomness for every item.
+
+        Every call gets its own random number generator, seeded with a seed drawn from `rng` using `make_seeds`.
+        The results therefore only depend on the state of `rng`, not on the number of workers or the order in which the work is done.
+
+        :param function: The function to call with an item and a random number generator. Must be defined at module level.
+        :param items: The items.
+        :param rng: The random number generator to draw the seeds from.
+        :returns: The results, in the order of the items.
+        """
+        seeds = make_seeds(rng, len(items))
+        return self.map(partial(_call_seeded, function), list(zip(items, seeds)))
+
+    def close(self) -> None:
+        """Shut down the worker processes, waiting for running work to finish. A pool that was passed in is not shut down."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+        self._executor = None
+
+    def __enter__(self) -> ParallelMap:
+        """
+        Use this object as a context manager that closes it on exit.
+
+        :returns: This object.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close this object.
+
+        :param exc_type: The type of the exception that was raised, if any.
+        :param exc_value: The exception that was raised, if any.
+        :param traceback: The traceback of the exception, if any.
+        """
+        self.close()
+
+
+def _call_seeded(
+    function: Callable[[TItem, np.random.Generator], TResult],
+    item_and_seed: tuple[TItem, int],
+) -> TResult:
+    item, seed = item_and_seed
+    return function(item, make_rng(seed))
@@ -43,6 +43,17 @@ def make_rng(seed: int) -> np.random.Generator:
     return np.random.Generator(np.random.PCG64(seed))
 
 
+def make_seeds(rng: np.random.Generator, count: int) -> list[int]:
+    """
+    Draw seeds for independent random number generators, for example one per task that is run in parallel.
+
+    :param rng: The random number generator to draw the seeds from.
+    :param count: The number of seeds to draw.
+    :returns: The seeds.
+    """
+    return [int(seed) for seed in rng.integers(0, 2**64, size=count, dtype=np.uint64)]
+
+
 def make_rng_time_seed(log_seed: bool = True) -> np.random.Generator:
     """
     Create a numpy random number generator from a seed.
@@ -0,0 +1,5 @@
+"""Running many experiments at the same time."""
+
+from ._run_sweep import run_sweep
+
+__all__ = ["run_sweep"]
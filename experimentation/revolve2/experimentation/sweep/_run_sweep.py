@@ -0,0 +1,50 @@
+import concurrent.futures
+from typing import Callable, Sequence, TypeVar
+
+from ..parallel import FairPool, ParallelMap
+
+TRun = TypeVar("TRun")
+TResult = TypeVar("TResult")
+
+
+def run_sweep(
+    function: Callable[[TRun, ParallelMap], TResult],
+    runs: Sequence[TRun],
+    num_workers: int,
+    max_concurrent_runs: int | None = None,
+) -> list[TResult]:
+    """
+    Do many runs of an experiment at the same time, for example repetitions or configuration variants, sharing one pool of worker processes.
+
+    Every run is done in its own thread by calling `function` with the run and a `ParallelMap`.
+    The parallel maps of all runs send their work to the same `FairPool`, which divides the workers fairly between the runs.
+    While one run selects and reproduces, the workers simulate for the others, so the workers are kept busy.
+    Runs should therefore do their heavy work, such as development and simulation, using the parallel map or its executor.
+
+    If a run fails, the other runs are finished first, after which the exception of the first failed run is raised.
+    Runs should not share state, and each run should write to its own database.
+    Use `revolve2.experimentation.database.merge_databases` to combine the databases afterwards.
+
+    :param function: The function that does a run.
+    :param runs: The runs, for example their configuration.
+    :param num_workers: The number of worker processes.
+    :param max_concurrent_runs: Maximum number of runs at the same time. If None, all runs are started at once.
+    :returns: The results of the runs, in the order of the runs.
+    """
+    if len(runs) == 0:
+        return []
+
+    with FairPool(num_workers) as pool:
+
+        def do_run(run: TRun) -> TResult:
+            return function(run, ParallelMap(num_workers, executor=pool.lane()))
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=(
+                len(runs) if max_concurrent_runs is None else max_concurrent_runs
+            )
+        ) as threads:
+            futures = [threads.submit(do_run, run) for run in runs]
+            concurrent.futures.wait(futures)
+
+    return [future.result() for future in futures]
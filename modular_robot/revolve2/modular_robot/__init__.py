@@ -2,8 +2,10 @@
 
 from ._modular_robot import ModularRobot
 from ._modular_robot_control_interface import ModularRobotControlInterface
+from ._morphology_deduplicator import MorphologyDeduplicator
 
 __all__ = [
     "ModularRobot",
     "ModularRobotControlInterface",
+    "MorphologyDeduplicator",
 ]
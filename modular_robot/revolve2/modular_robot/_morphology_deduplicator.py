@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from typing import Callable, Generic, Sequence, TypeVar
+
+from .body.base import Body
+
+TResult = TypeVar("TResult")
+
+
+class MorphologyDeduplicator(Generic[TResult]):
+    """
+    Groups bodies with identical morphologies so work that only depends on the body is done once per morphology.
+
+    Morphologies are compared using `Body.morphology_hash`,
+    so bodies that are identical up to a rotation around the core are considered the same.
+    Bodies with module angles that are not multiples of 90 degrees have no morphology hash.
+    Each of them is considered a morphology of its own, and their results are not cached.
+    Results are cached across calls, optionally keeping only the most recently used ones.
+    """
+
+    _cache: OrderedDict[str, TResult]
+    _max_size: int | None
+
+    hits: int
+    """Number of requested results that were found in the cache."""
+
+    misses: int
+    """Number of requested results that had to be computed."""
+
+    def __init__(self, max_size: int | None = None) -> None:
+        """
+        Initialize this object.
+
+        :param max_size: Maximum number of results to keep. Unlimited if None.
+        :raises ValueError: If the maximum size is smaller than 1.
+        """
+        if max_size is not None and max_size < 1:
+            raise ValueError("Maximum size must be at least 1.")
+        self._cache = OrderedDict()
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def group(bodies: Sequence[Body]) -> tuple[list[int], list[int]]:
+        """
+        Group bodies by morphology.
+
+        :param bodies: The bodies to group.
+        :returns: For every unique morphology the index of the first body that has it, and for every body the index of its morphology in that list.
+        """
+        unique: dict[str, int] = {}
+        representatives: list[int] = []
+        inverse: list[int] = []
+        for i, body in enumerate(bodies):
+            morphology_hash = _morphology_hash(body)
+            if morphology_hash is None:
+                group = len(representatives)
+            else:
+                group = unique.setdefault(morphology_hash, len(representatives))
+            if group == len(representatives):
+                representatives.append(i)
+            inverse.append(group)
+        return representatives, inverse
+
+    def get(self, body: Body, function: Callable[[Body], TResult]) -> TResult:
+        """
+        Get the result for the morphology of a body, computing it only if it is not cached.
+
+        :param body: The body.
+        :param function: Function that computes the result for a body.
+        :returns: The result.
+        """
+        return self.map([body], function)[0]
+
+    def map(
+        self, bodies: Sequence[Body], function: Callable[[Body], TResult]
+    ) -> list[TResult]:
+        """
+        Get the results for the morphologies of the provided bodies, computing each uncached morphology once.
+
+        :param bodies: The bodies.
+        :param function: Function that computes the result for a body. It is called with the first body of each uncached morphology.
+        :returns: The result for each body.
+        """
+        results: dict[str, TResult] = {}
+        unhashable: dict[int, TResult] = {}
+        hashes = [_morphology_hash(body) for body in bodies]
+        for i, (body, morphology_hash) in enumerate(zip(bodies, hashes)):
+            if morphology_hash is None:
+                self.misses += 1
+                unhashable[i] = function(body)
+            elif morphology_hash in results:
+                self.hits += 1
+            elif morphology_hash in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(morphology_hash)
+                results[morphology_hash] = self._cache[morphology_hash]
+            else:
+                self.misses += 1
+                result = function(body)
+                results[morphology_hash] = result
+                self._store(morphology_hash, result)
+        return [
+            unhashable[i] if morphology_hash is None else results[morphology_hash]
+            for i, morphology_hash in enumerate(hashes)
+        ]
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of cached results.
+
+        :returns: The number of results.
+        """
+        return len(self._cache)
+
+    def _store(self, morphology_hash: str, result: TResult) -> None:
+        self._cache[morphology_hash] = result
+        if self._max_size is not None and len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+
+def _morphology_hash(body: Body) -> str | None:
+    try:
+        return body.morphology_hash
+    except ValueError:
+        return None  # Not all angles are multiples of 90 degrees, so the body has no lattice.
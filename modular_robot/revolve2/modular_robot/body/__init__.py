@@ -3,11 +3,13 @@
 from ._attachment_point import AttachmentPoint
 from ._color import Color
 from ._module import Module
+from ._right_angle_rotations import RightAngleRotations
 from ._right_angles import RightAngles
 
 __all__ = [
     "AttachmentPoint",
     "Color",
     "Module",
+    "RightAngleRotations",
     "RightAngles",
 ]
@@ -6,12 +6,15 @@ from pyrr import Quaternion
 
 from ._attachment_point import AttachmentPoint
 from ._color import Color
+from ._object_id import next_object_id
 from .sensors import ActiveHingeSensor, CameraSensor, IMUSensor, Sensor
 
 
 class _AttachedSensors:
     """A class that contains all the attached Sensors of a Module."""
 
+    __slots__ = ("_camera_sensor", "_active_hinge_sensor", "_imu_sensor")
+
     _camera_sensor: CameraSensor | None
     _active_hinge_sensor: ActiveHingeSensor | None
     _imu_sensor: IMUSensor | None
@@ -96,7 +99,23 @@ class _AttachedSensors:
 class Module:
     """Base class for a module for modular robots."""
 
-    _uuid: uuid.UUID
+    __slots__ = (
+        "_id",
+        "_uuid",
+        "_attachment_points",
+        "_children",
+        "_orientation",
+        "_parent",
+        "_parent_child_index",
+        "_sensors",
+        "_color",
+        "_structure_version",
+        "_modules_by_type",
+    )
+
+    _id: int
+    _uuid: uuid.UUID | None
+    """The uuid of this module. Created from the id when first requested."""
 
     _attachment_points: dict[int, AttachmentPoint]
     _children: dict[int, Module]
@@ -116,9 +135,25 @@ class Module:
     None if this module has not yet been added to a body.
     """
 
-    _sensors: _AttachedSensors
+    _sensors: _AttachedSensors | None
+    """The attached sensors. None if no sensors have been attached yet."""
+
     _color: Color
 
+    _structure_version: int
+    """
+    Counter that is incremented whenever a module is attached anywhere in the tree this module is the root of.
+
+    Only meaningful for root modules. Used by bodies to invalidate cached representations of their structure.
+    """
+
+    _modules_by_type: dict[type[Module], list[Module]] | None
+    """
+    All modules in the tree this module is the root of, indexed by their concrete type.
+
+    Only meaningful for root modules. None until the first child is attached.
+    """
+
     def __init__(
         self,
         orientation: Quaternion,
@@ -138,23 +173,41 @@ class Module:
         self._parent = None
         self._parent_child_index = None
         self._children = {}
-        self._uuid = uuid.uuid1()
+        self._id = next_object_id()
+        self._uuid = None
+        self._structure_version = 0
+        self._modules_by_type = None
 
         """Set parsed arguments."""
-        self._sensors = _AttachedSensors()  # Initialize the attached sensors.
+        self._sensors = None  # The attached sensors are allocated when needed.
         for sensor in sensors:  # Add all desired sensors to the module.
-            self._sensors.add_sensor(sensor)
+            self.add_sensor(sensor)
         self._attachment_points = attachment_points
         self._orientation = orientation
         self._color = color
 
+    @property
+    def id(self) -> int:
+        """
+        Get the id of this module.
+
+        Ids are unique and increase monotonically in the order modules are created within a process.
+
+        :returns: The id.
+        """
+        return self._id
+
     @property
     def uuid(self) -> uuid.UUID:
         """
         Get the uuid.
 
+        The uuid is derived from the id of this module.
+
         :returns: The uuid.
         """
+        if self._uuid is None:
+            self._uuid = uuid.UUID(int=self._id)
         return self._uuid
 
     @property
@@ -212,9 +265,38 @@ class Module:
         module._parent_child_index = child_index
         if self.can_set_child(child_index):
             self._children[child_index] = module
+            self._on_child_attached(module)
         else:
             raise KeyError("Attachment point already populated")
 
+    def _on_child_attached(self, module: Module) -> None:
+        """
+        Update the bookkeeping of the module tree after a child has been attached.
+
+        Must be called by every implementation of `set_child`.
+
+        :param module: The module that was attached.
+        """
+        root = self
+        while root._parent is not None:
+            root = root._parent
+        root._structure_version += 1
+
+        index = root._get_modules_by_type()
+        for module_type, modules in module._get_modules_by_type().items():
+            index.setdefault(module_type, []).extend(modules)
+        module._modules_by_type = None
+
+    def _get_modules_by_type(self) -> dict[type[Module], list[Module]]:
+        """
+        Get the index of all modules in the tree this module is the root of, by their concrete type.
+
+        :returns: The index.
+        """
+        if self._modules_by_type is None:
+            self._modules_by_type = {type(self): [self]}
+        return self._modules_by_type
+
     def can_set_child(self, child_index: int) -> bool:
         """
         Check if a child can be set on a specific attachment point on the module.
@@ -250,8 +332,7 @@ class Module:
                 neighbours = [
                     mod
                     for mod in attached_modules + [open_node.parent]
-                    if mod is not None
-                    and (came_from is None or mod.uuid is not came_from.uuid)
+                    if mod is not None and mod is not came_from
                 ]
                 out_neighbours.extend(neighbours)
                 new_open_nodes += list(zip(neighbours, [open_node] * len(neighbours)))
@@ -292,6 +373,8 @@ class Module:
 
         :return: The value.
         """
+        if self._sensors is None:
+            self._sensors = _AttachedSensors()
         return self._sensors
 
     def add_sensor(self, sensor: Sensor) -> None:
@@ -300,4 +383,4 @@ class Module:
 
         :param sensor: The sensor.
         """
-        self._sensors.add_sensor(sensor)
+        self.sensors.add_sensor(sensor)
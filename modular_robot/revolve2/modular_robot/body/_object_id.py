@@ -0,0 +1,29 @@
+import itertools
+import os
+import random
+
+_counter = itertools.count()
+_process_token = 0
+
+
+def _new_process_token() -> None:
+    global _process_token
+    _process_token = random.SystemRandom().getrandbits(64) << 64
+
+
+_new_process_token()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_new_process_token)
+
+
+def next_object_id() -> int:
+    """
+    Get a new object id.
+
+    Ids are 128 bit integers that increase monotonically within a process.
+    The upper 64 bits are drawn at random once per process, so ids do not collide between processes either.
+    This makes them usable as the integer value of a UUID.
+
+    :returns: The id.
+    """
+    return _process_token | next(_counter)
@@ -0,0 +1,107 @@
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+from numpy.typing import NDArray
+from pyrr import Quaternion
+
+
+def _make_rotation_matrices() -> NDArray[np.int8]:
+    matrices = []
+    for perm in [(0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0)]:
+        for signs in product([1, -1], repeat=3):
+            matrix = np.zeros(shape=(3, 3), dtype=np.int8)
+            for row, (column, sign) in enumerate(zip(perm, signs)):
+                matrix[row, column] = sign
+            if round(np.linalg.det(matrix)) == 1:
+                matrices.append(matrix)
+    # Sort so that the identity is at index 0.
+    matrices.sort(key=lambda m: tuple(-m.flatten()))
+    return np.stack(matrices)
+
+
+class RightAngleRotations:
+    """
+    The 24 rotations that map the axes of a 3d grid onto each other.
+
+    Module orientations and attachment point orientations in a modular robot are (almost always) multiples of 90 degrees.
+    This class maps such rotations to small integer indices so they can be composed and applied using table lookups instead of quaternion products.
+    """
+
+    MATRICES: NDArray[np.int8] = _make_rotation_matrices()
+    """Rotation matrices indexed by rotation index. Shape (24, 3, 3)."""
+
+    IDENTITY: int = 0
+    """Index of the identity rotation."""
+
+    PRODUCTS: NDArray[np.int8]
+    """PRODUCTS[a, b] is the index of the rotation MATRICES[a] @ MATRICES[b]. Shape (24, 24)."""
+
+    X_AXES: NDArray[np.int8]
+    """X_AXES[a] is MATRICES[a] applied to the unit x vector. Shape (24, 3)."""
+
+    _INDICES: dict[tuple[int, ...], int]
+
+    @classmethod
+    def index_of(cls, quaternion: Quaternion) -> int:
+        """
+        Get the rotation index of a quaternion.
+
+        :param quaternion: The quaternion. Must represent a rotation that is a multiple of 90 degrees around the grid axes.
+        :returns: The rotation index.
+        :raises ValueError: If the quaternion is not a right angle rotation.
+        """
+        x, y, z, w = np.ndarray.tolist(quaternion)
+        # Rounding lets quaternions that differ only by floating point noise share a cache entry.
+        index = _index_of_components(round(x, 9), round(y, 9), round(z, 9), round(w, 9))
+        if index is None:
+            raise ValueError("Rotation is not a multiple of 90 degrees.")
+        return index
+
+
+@lru_cache(maxsize=1024)
+def _index_of_components(x: float, y: float, z: float, w: float) -> int | None:
+    """
+    Get the rotation index of a quaternion given by its components.
+
+    :param x: The x component.
+    :param y: The y component.
+    :param z: The z component.
+    :param w: The w component.
+    :returns: The rotation index, or None if the quaternion is not a right angle rotation.
+    """
+    entries = (
+        1.0 - 2.0 * (y * y + z * z),
+        2.0 * (x * y - z * w),
+        2.0 * (x * z + y * w),
+        2.0 * (x * y + z * w),
+        1.0 - 2.0 * (x * x + z * z),
+        2.0 * (y * z - x * w),
+        2.0 * (x * z - y * w),
+        2.0 * (y * z + x * w),
+        1.0 - 2.0 * (x * x + y * y),
+    )
+    key = tuple(round(e) for e in entries)
+    index = RightAngleRotations._INDICES.get(key)
+    if index is None or any(abs(e - k) > 1e-6 for e, k in zip(entries, key)):
+        return None
+    return index
+
+
+RightAngleRotations._INDICES = {
+    tuple(int(v) for v in m.flatten()): i
+    for i, m in enumerate(RightAngleRotations.MATRICES)
+}
+RightAngleRotations.PRODUCTS = np.array(
+    [
+        [
+            RightAngleRotations._INDICES[
+                tuple(int(v) for v in (a.astype(np.int_) @ b).flatten())
+            ]
+            for b in RightAngleRotations.MATRICES
+        ]
+        for a in RightAngleRotations.MATRICES
+    ],
+    dtype=np.int8,
+)
+RightAngleRotations.X_AXES = np.ascontiguousarray(RightAngleRotations.MATRICES[:, :, 0])
@@ -3,13 +3,18 @@
 from ._active_hinge import ActiveHinge
 from ._attachment_face import AttachmentFace
 from ._body import Body
+from ._body_lattice import BodyLattice, ModuleTypeCode
 from ._brick import Brick
 from ._core import Core
+from ._module_graph import ModuleGraph
 
 __all__ = [
     "ActiveHinge",
     "AttachmentFace",
     "Body",
+    "BodyLattice",
     "Brick",
     "Core",
+    "ModuleGraph",
+    "ModuleTypeCode",
 ]
@@ -10,6 +10,26 @@ from ..sensors import Sensor
 class ActiveHinge(Module):
     """An Active Hinge Module."""
 
+    __slots__ = (
+        "_range",
+        "_effort",
+        "_velocity",
+        "_servo1_bounding_box",
+        "_servo2_bounding_box",
+        "_frame_bounding_box",
+        "_frame_offset",
+        "_servo_offset",
+        "_frame_mass",
+        "_servo1_mass",
+        "_servo2_mass",
+        "_joint_offset",
+        "_static_friction",
+        "_dynamic_friction",
+        "_armature",
+        "_pid_gain_p",
+        "_pid_gain_d",
+    )
+
     ATTACHMENT = 0
 
     _range: float
@@ -114,8 +134,6 @@ class ActiveHinge(Module):
             orientation, Color(255, 255, 255, 255), attachment_points, sensors
         )
 
-        self._sensor = None
-
     @property
     def attachment(self) -> Module | None:
         """
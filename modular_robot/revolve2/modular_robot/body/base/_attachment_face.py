@@ -13,6 +13,8 @@ class AttachmentFace(Module):
     This face can be thought of as a pseudo-module which usually does not have a body on its own.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         rotation: float | RightAngles,
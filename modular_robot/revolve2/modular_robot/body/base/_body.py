@@ -1,12 +1,15 @@
+import heapq
 import math
-from typing import Generic, Type, TypeVar
+from typing import Type, TypeVar
 
 import numpy as np
 from numpy.typing import NDArray
-from pyrr import Quaternion, Vector3
+from pyrr import Vector3
 
 from .._module import Module
+from ._body_lattice import BodyLattice
 from ._core import Core
+from ._module_graph import ModuleGraph
 
 TModule = TypeVar("TModule", bound=Module)
 TModuleNP = TypeVar("TModuleNP", bound=np.generic)
@@ -17,6 +20,15 @@ class Body:
 
     _core: Core
 
+    _lattice: BodyLattice | None
+    _lattice_version: int
+    _module_graph: ModuleGraph | None
+    _morphology_hash: str | None
+    _tree_order: dict[Module, int] | None
+    """The position of every module in a depth-first walk of the tree."""
+    _tree_order_version: int
+    """The structure version of the core when the modules by type of the core were last put in tree order."""
+
     def __init__(self, core: Core) -> None:
         """
         Initialize this object.
@@ -24,6 +36,12 @@ class Body:
         :param core: The core of the body.
         """
         self._core = core
+        self._lattice = None
+        self._lattice_version = 0
+        self._module_graph = None
+        self._morphology_hash = None
+        self._tree_order = None
+        self._tree_order_version = 0
 
     @classmethod
     def grid_position(cls, module: Module) -> Vector3:
@@ -60,33 +78,73 @@ class Body:
             parent = parent.parent
         return position
 
-    @classmethod
-    def __find_recur(
-        cls, module: Module, module_type: Type[TModule], exclude: list[Type[TModule]]
-    ) -> list[TModule]:
-        modules = []
-        if isinstance(module, module_type) and not any(
-            [isinstance(module, e) for e in exclude]
-        ):
-            modules.append(module)
-        for child in module.children.values():
-            modules.extend(cls.__find_recur(child, module_type, exclude))
-        return modules
+    def __types_of_type(
+        self, module_type: Type[TModule], exclude: list[type[Module]] | None
+    ) -> list[type[Module]]:
+        return [
+            t
+            for t in self._core._get_modules_by_type().keys()
+            if issubclass(t, module_type)
+            and (exclude is None or not any(issubclass(t, e) for e in exclude))
+        ]
 
     def find_modules_of_type(
-        self, module_type: Type[TModule], exclude: list[Type[TModule]] | None = None
+        self, module_type: Type[TModule], exclude: list[type[Module]] | None = None
     ) -> list[TModule]:
         """
         Find all Modules of a certain type in the robot.
 
+        Modules are returned in depth-first order of the tree, with the children of a module in the order they were set.
+        Attaching a subtree can insert modules anywhere in that order, so the modules of each type are put in tree order once after the structure changed, instead of at every attachment.
+        Later calls only copy or merge these lists.
+
         :param module_type: The type.
         :param exclude: Module types to be excluded in search.
         :return: The list of Modules.
         """
-        return self.__find_recur(
-            self._core, module_type, [] if exclude is None else exclude
+        tree_order = self.__get_tree_order()
+        index = self._core._get_modules_by_type()
+        types = self.__types_of_type(module_type, exclude)
+        if len(types) == 1:
+            return list(index[types[0]])  # type: ignore[arg-type]
+        return list(
+            heapq.merge(*(index[t] for t in types), key=tree_order.__getitem__)  # type: ignore[arg-type]
         )
 
+    def count_modules_of_type(
+        self, module_type: Type[TModule], exclude: list[type[Module]] | None = None
+    ) -> int:
+        """
+        Count the Modules of a certain type in the robot, without building a list of them.
+
+        :param module_type: The type.
+        :param exclude: Module types to be excluded in search.
+        :return: The number of Modules.
+        """
+        index = self._core._get_modules_by_type()
+        return sum(len(index[t]) for t in self.__types_of_type(module_type, exclude))
+
+    def __get_tree_order(self) -> dict[Module, int]:
+        """
+        Get the position of every module in a depth-first walk of the tree, and put the modules by type of the core in that order.
+
+        :returns: The positions.
+        """
+        if (
+            self._tree_order is None
+            or self._tree_order_version != self._core._structure_version
+        ):
+            self._tree_order = {}
+            stack: list[Module] = [self._core]
+            while stack:
+                module = stack.pop()
+                self._tree_order[module] = len(self._tree_order)
+                stack.extend(reversed(module.children.values()))
+            for modules in self._core._get_modules_by_type().values():
+                modules.sort(key=self._tree_order.__getitem__)
+            self._tree_order_version = self._core._structure_version
+        return self._tree_order
+
     def to_grid(self) -> tuple[NDArray[TModuleNP], Vector3[np.int_]]:
         """
         Convert the tree structure to a grid.
@@ -98,7 +156,59 @@ class Body:
 
         :returns: The created grid with cells set to either a Module or None and a position vector of the core. The position Vector3 is dtype: int.
         """
-        return _GridMaker().make_grid(self)
+        lattice = self.lattice
+        return lattice.module_grid(), Vector3(lattice.core_position.copy())
+
+    @property
+    def lattice(self) -> BodyLattice:
+        """
+        Get the integer lattice representation of the body.
+
+        The lattice is cached and rebuilt only after modules have been attached to the body.
+        Bodies with module angles that are not multiples of 90 degrees do not fit on a lattice, and building it fails with a ValueError.
+
+        :returns: The lattice.
+        """
+        if (
+            self._lattice is None
+            or self._lattice_version != self._core._structure_version
+        ):
+            self._lattice = BodyLattice(self._core)
+            self._lattice_version = self._core._structure_version
+            self._module_graph = None
+            self._morphology_hash = None
+        return self._lattice
+
+    @property
+    def module_graph(self) -> ModuleGraph:
+        """
+        Get the graph of connections between the modules of the body.
+
+        Nodes of the graph are the module indices of `lattice`.
+        The graph is cached and rebuilt only after modules have been attached to the body.
+
+        :returns: The graph.
+        """
+        lattice = self.lattice
+        if self._module_graph is None:
+            self._module_graph = ModuleGraph(lattice.parents)
+        return self._module_graph
+
+    @property
+    def morphology_hash(self) -> str:
+        """
+        Get a hash of the morphology of the body that is invariant to rotating the body around the core.
+
+        See `BodyLattice.canonical_hash`.
+        The hash is cached and recomputed only after modules have been attached to the body.
+        Like `lattice`, it fails with a ValueError for bodies with module angles that are not multiples of 90 degrees.
+
+        :returns: The hash.
+        """
+        lattice = self.lattice
+        if self._morphology_hash is None:
+            self._morphology_hash = lattice.canonical_hash()
+        return self._morphology_hash
 
     @property
     def core(self) -> Core:
@@ -108,52 +218,3 @@ class Body:
         :return: The core.
         """
         return self._core
-
-
-class _GridMaker(Generic[TModuleNP]):
-    _x: list[int] = []
-    _y: list[int] = []
-    _z: list[int] = []
-    _modules: list[Module] = []
-
-    def make_grid(self, body: Body) -> tuple[NDArray[TModuleNP], Vector3[np.int_]]:
-
-        self._make_grid_recur(body._core, Vector3(), Quaternion())
-
-        minx, maxx = min(self._x), max(self._x)
-        miny, maxy = min(self._y), max(self._y)
-        minz, maxz = min(self._z), max(self._z)
-
-        depth = maxx - minx + 1
-        width = maxy - miny + 1
-        height = maxz - minz + 1
-
-        grid = np.empty(shape=(depth, width, height), dtype=Module)
-        grid.fill(None)
-        for x, y, z, module in zip(self._x, self._y, self._z, self._modules):
-            grid[x - minx, y - miny, z - minz] = module
-
-        return grid, Vector3([-minx, -miny, -minz])
-
-    def _make_grid_recur(
-        self, module: Module, position: Vector3, orientation: Quaternion
-    ) -> None:
-        self._add(position, module)
-
-        for child_index, attachment_point in module.attachment_points.items():
-            child = module.children.get(child_index)
-            if child is not None:
-                assert np.isclose(child.orientation.angle % (math.pi / 2.0), 0.0)
-                rotation = (
-                    orientation * attachment_point.orientation * child.orientation
-                )
-                self._make_grid_recur(
-                    child, position + rotation * Vector3([1.0, 0.0, 0.0]), rotation
-                )
-
-    def _add(self, position: Vector3, module: Module) -> None:
-        self._modules.append(module)
-        x, y, z = position
-        self._x.append(int(round(x)))
-        self._y.append(int(round(y)))
-        self._z.append(int(round(z)))
@@ -0,0 +1,275 @@
+import hashlib
+from enum import IntEnum
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._module import Module
+from .._right_angle_rotations import RightAngleRotations
+from ._active_hinge import ActiveHinge
+from ._attachment_face import AttachmentFace
+from ._brick import Brick
+from ._core import Core
+
+
+class ModuleTypeCode(IntEnum):
+    """Integer codes for module types, as used in the occupancy array of a `BodyLattice`."""
+
+    EMPTY = 0
+    CORE = 1
+    ACTIVE_HINGE = 2
+    BRICK = 3
+    ATTACHMENT_FACE = 4
+    OTHER = 5
+
+    @classmethod
+    def of(cls, module: Module) -> "ModuleTypeCode":
+        """
+        Get the type code of a module.
+
+        :param module: The module.
+        :returns: The type code.
+        """
+        match module:
+            case Core():
+                return cls.CORE
+            case ActiveHinge():
+                return cls.ACTIVE_HINGE
+            case Brick():
+                return cls.BRICK
+            case AttachmentFace():
+                return cls.ATTACHMENT_FACE
+            case _:
+                return cls.OTHER
+
+
+class BodyLattice:
+    """
+    Integer lattice representation of a body.
+
+    Every module is assigned a cell in a 3d grid with the core as origin, as well as its orientation as an index into `RightAngleRotations`.
+    The distance between all modules is assumed to be one grid cell.
+    All module angles must be multiples of 90 degrees.
+
+    Modules are stored in depth-first order, starting with the core.
+    If multiple modules occupy the same cell, the one that comes last in this order is stored in the dense arrays.
+    """
+
+    modules: list[Module]
+    """All modules in the body, in depth-first order."""
+
+    positions: NDArray[np.int_]
+    """Position of each module relative to the core. Shape (num_modules, 3)."""
+
+    orientations: NDArray[np.int8]
+    """Orientation of each module relative to the core, as index into `RightAngleRotations`. Shape (num_modules,)."""
+
+    type_codes: NDArray[np.uint8]
+    """`ModuleTypeCode` of each module. Shape (num_modules,)."""
+
+    parents: NDArray[np.int_]
+    """Index of the parent of each module, or -1 for the core. Shape (num_modules,)."""
+
+    core_position: NDArray[np.int_]
+    """Position of the core in the dense arrays."""
+
+    occupancy: NDArray[np.uint8]
+    """Dense grid of `ModuleTypeCode`s, indexed depth, width, height, or x, y, z, from the perspective of the core."""
+
+    module_indices: NDArray[np.int_]
+    """Dense grid of indices into `modules`, or -1 for empty cells. Same shape as `occupancy`."""
+
+    _index_of: dict[Module, int]
+
+    def __init__(self, core: Module) -> None:
+        """
+        Build the lattice in a single traversal of the module tree.
+
+        Fails with a ValueError from `RightAngleRotations.index_of` if not all module angles are multiples of 90 degrees.
+
+        :param core: The root of the module tree, normally the core of the body.
+        """
+        modules: list[Module] = []
+        positions: list[tuple[int, int, int]] = []
+        orientations: list[int] = []
+        parents: list[int] = []
+
+        products = RightAngleRotations.PRODUCTS.tolist()
+        x_axes = RightAngleRotations.X_AXES.tolist()
+
+        stack: list[tuple[Module, tuple[int, int, int], int, int]] = [
+            (core, (0, 0, 0), RightAngleRotations.IDENTITY, -1)
+        ]
+        while len(stack) > 0:
+            module, position, rotation, parent = stack.pop()
+            index = len(modules)
+            modules.append(module)
+            positions.append(position)
+            orientations.append(rotation)
+            parents.append(parent)
+
+            children: list[tuple[Module, tuple[int, int, int], int, int]] = []
+            for child_index, attachment_point in module.attachment_points.items():
+                child = module.children.get(child_index)
+                if child is not None:
+                    child_rotation = products[
+                        products[rotation][
+                            RightAngleRotations.index_of(attachment_point.orientation)
+                        ]
+                    ][RightAngleRotations.index_of(child.orientation)]
+                    dx, dy, dz = x_axes[child_rotation]
+                    children.append(
+                        (
+                            child,
+                            (
+                                position[0] + dx,
+                                position[1] + dy,
+                                position[2] + dz,
+                            ),
+                            child_rotation,
+                            index,
+                        )
+                    )
+            stack.extend(reversed(children))
+
+        self.modules = modules
+        self.positions = np.array(positions, dtype=np.int_).reshape(-1, 3)
+        self.orientations = np.array(orientations, dtype=np.int8)
+        self.parents = np.array(parents, dtype=np.int_)
+        self.type_codes = np.array(
+            [ModuleTypeCode.of(module) for module in modules], dtype=np.uint8
+        )
+        self._index_of = {module: i for i, module in enumerate(modules)}
+
+        minimum = self.positions.min(axis=0)
+        shape = self.positions.max(axis=0) - minimum + 1
+        self.core_position = -minimum
+        cells = tuple((self.positions - minimum).T)
+        self.module_indices = np.full(shape=tuple(shape), fill_value=-1, dtype=np.int_)
+        np.maximum.at(self.module_indices, cells, np.arange(len(modules)))
+        self.occupancy = np.zeros(shape=tuple(shape), dtype=np.uint8)
+        occupied = self.module_indices >= 0
+        self.occupancy[occupied] = self.type_codes[self.module_indices[occupied]]
+
+    def index_of(self, module: Module) -> int:
+        """
+        Get the index of a module in this lattice.
+
+        :param module: The module.
+        :returns: The index.
+        :raises KeyError: If the module is not part of the body.
+        """
+        index = self._index_of.get(module)
+        if index is None:
+            raise KeyError("Module is not part of this body.")
+        return index
+
+    def module_grid(self) -> NDArray[Any]:
+        """
+        Create a dense grid of modules.
+
+        :returns: A grid with the same shape as `occupancy`, with cells set to either a Module or None.
+        """
+        modules = np.empty(shape=len(self.modules) + 1, dtype=object)
+        modules[:-1] = self.modules
+        modules[-1] = None
+        return modules[self.module_indices]
+
+    def canonical_hash(self) -> str:
+        """
+        Create a hash of the morphology of the body that is invariant to rotating the body around the core.
+
+        Two bodies get the same hash if they consist of the same module types, attached to each other at the same attachment points and with the same orientations,
+        up to a rotation of the complete body around the core by a multiple of 90 degrees.
+        Such a rotation moves every subtree attached to the core to the next of the core's four attachment points.
+        Modules of the same type are only considered the same if their parameters, such as masses and bounding boxes, are equal up to 6 decimals.
+        This distinguishes for example bricks with a different bone length.
+        Colors and sensors are not taken into account.
+
+        :returns: The hash, as a hexadecimal string.
+        """
+        module_keys = [_module_key(m) for m in self.modules]
+        type_names = sorted(set(module_keys))
+        type_ids = {name: i for i, name in enumerate(type_names)}
+
+        # Every module is described by its type and parameters, its own orientation, the attachment point it is attached to
+        # and how many modules before it its parent is in depth-first order.
+        # Each subtree of the core is a contiguous block of rows that does not change when the subtree is moved to another attachment point of the core.
+        indices = np.arange(len(self.modules))
+        rows = np.column_stack(
+            [
+                [type_ids[key] for key in module_keys],
+                [RightAngleRotations.index_of(m.orientation) for m in self.modules],
+                [
+                    -1 if m.parent_child_index is None else m.parent_child_index
+                    for m in self.modules
+                ],
+                np.where(self.parents >= 0, indices - self.parents, 0),
+            ]
+        ).astype(np.int64)
+        rows[0, 1] = RightAngleRotations.IDENTITY
+
+        subtree_starts = np.nonzero(self.parents == 0)[0]
+        subtree_ends = np.append(subtree_starts[1:], len(self.modules))
+        subtree_points = rows[subtree_starts, 2].tolist()
+        rows[subtree_starts, 3] = 0
+
+        rotate = sorted(self.modules[0].attachment_points.keys()) == [0, 1, 2, 3]
+
+        canonical: bytes | None = None
+        for shift in range(4) if rotate else range(1):
+            subtrees = sorted(
+                zip(
+                    [(p + shift) % 4 if rotate else p for p in subtree_points],
+                    subtree_starts.tolist(),
+                    subtree_ends.tolist(),
+                )
+            )
+            blocks = [rows[:1]]
+            for point, begin, end in subtrees:
+                block = rows[begin:end].copy()
+                block[0, 2] = point
+                blocks.append(block)
+            candidate = np.concatenate(blocks).tobytes()
+            if canonical is None or candidate < canonical:
+                canonical = candidate
+        assert canonical is not None
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\n".join(type_names).encode())
+        digest.update(canonical)
+        return digest.hexdigest()
+
+
+_STRUCTURAL_SLOTS = frozenset(Module.__slots__)
+
+
+def _round_parameter(value: Any) -> Any:
+    if isinstance(value, (float, np.floating)):
+        return round(float(value), 6)
+    if isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.floating):
+        return tuple(round(float(v), 6) for v in value.flat)
+    return None
+
+
+def _module_key(module: Module) -> str:
+    """
+    Describe the type and parameters of a module.
+
+    Parameters are the floating point values and arrays in the slots the module type adds to `Module`, such as masses and bounding boxes.
+    Other slots, such as the occupancy of core attachment faces, depend on the structure of the body and are ignored.
+
+    :param module: The module.
+    :returns: The description.
+    """
+    parameters: list[tuple[str, Any]] = []
+    for cls in type(module).__mro__:
+        for slot in cls.__dict__.get("__slots__", ()):
+            if slot in _STRUCTURAL_SLOTS:
+                continue
+            value = _round_parameter(getattr(module, slot, None))
+            if value is not None:
+                parameters.append((slot, value))
+    parameters.sort()
+    return f"{type(module).__module__}.{type(module).__qualname__}{parameters!r}"
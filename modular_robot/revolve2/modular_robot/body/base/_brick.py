@@ -12,6 +12,8 @@ from ..sensors import Sensor
 class Brick(Module):
     """A Brick Module."""
 
+    __slots__ = ("_mass", "_bounding_box")
+
     FRONT = 0
     RIGHT = 1
     LEFT = 2
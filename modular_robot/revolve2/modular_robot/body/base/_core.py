@@ -12,6 +12,8 @@ from ..sensors import Sensor
 class Core(Module):
     """The core module of a modular robot."""
 
+    __slots__ = ("_bounding_box", "_mass")
+
     FRONT = 0
     RIGHT = 1
     BACK = 2
@@ -0,0 +1,79 @@
+import numpy as np
+from numpy.typing import NDArray
+
+
+class ModuleGraph:
+    """
+    Undirected graph of the parent-child connections between the modules of a body.
+
+    Nodes are module indices, such as those of a `BodyLattice`.
+    The edges are stored in compressed sparse row format:
+    the neighbours of node `i` are `indices[indptr[i]:indptr[i + 1]]`.
+    """
+
+    parents: NDArray[np.int_]
+    """Parent node of each node, or -1 for the root. Shape (num_modules,)."""
+
+    indptr: NDArray[np.int_]
+    """Row pointers into `indices`. Shape (num_modules + 1,)."""
+
+    indices: NDArray[np.int_]
+    """Neighbouring node of each edge. Every connection appears once in both directions. Shape (2 * (num_modules - 1),)."""
+
+    def __init__(self, parents: NDArray[np.int_]) -> None:
+        """
+        Initialize this object.
+
+        :param parents: The parent node of each node, or -1 for the root. For a body, use the `parents` of its lattice.
+        """
+        self.parents = parents
+
+        num_modules = len(parents)
+        children = np.nonzero(parents >= 0)[0]
+        child_parents = parents[children]
+
+        sources = np.concatenate([children, child_parents])
+        targets = np.concatenate([child_parents, children])
+        order = np.argsort(sources, kind="stable")
+
+        self.indices = targets[order]
+        self.indptr = np.zeros(num_modules + 1, dtype=np.int_)
+        np.cumsum(np.bincount(sources, minlength=num_modules), out=self.indptr[1:])
+
+    @property
+    def num_nodes(self) -> int:
+        """
+        Get the number of nodes in the graph.
+
+        :returns: The number of nodes.
+        """
+        return len(self.indptr) - 1
+
+    def ancestors(
+        self, within_range: int, nodes: NDArray[np.int_] | None = None
+    ) -> tuple[NDArray[np.int_], NDArray[np.int_]]:
+        """
+        Find all pairs of nodes where the second node is an ancestor of the first, at most a certain number of connections up.
+
+        :param within_range: The maximum number of connections between a node and its ancestors. Minimum is 1.
+        :param nodes: The nodes to find the ancestors of. All nodes if None.
+        :returns: Two arrays of the same length, with the node and the ancestor of every pair.
+        """
+        if nodes is None:
+            nodes = np.arange(self.num_nodes)
+
+        out_sources = []
+        out_ancestors = []
+
+        sources = nodes
+        current = nodes
+        for _ in range(within_range):
+            current = self.parents[current]
+            has_parent = current >= 0
+            sources = sources[has_parent]
+            current = current[has_parent]
+
+            out_sources.append(sources)
+            out_ancestors.append(current)
+
+        return np.concatenate(out_sources), np.concatenate(out_ancestors)
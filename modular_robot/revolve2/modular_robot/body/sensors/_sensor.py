@@ -3,11 +3,14 @@ from abc import ABC
 
 from pyrr import Quaternion, Vector3
 
+from .._object_id import next_object_id
+
 
 class Sensor(ABC):
     """An abstract Sensor Class."""
 
-    _uuid: uuid.UUID
+    _id: int
+    _uuid: uuid.UUID | None
     _orientation: Quaternion
     _position: Vector3
 
@@ -19,9 +22,19 @@ class Sensor(ABC):
         :param position: The position of the sensor.
         """
         self._orientation = orientation
-        self._uuid = uuid.uuid1()
+        self._id = next_object_id()
+        self._uuid = None
         self._position = position
 
+    @property
+    def id(self) -> int:
+        """
+        Get the id of the sensor.
+
+        :return: The id.
+        """
+        return self._id
+
     @property
     def uuid(self) -> uuid.UUID:
         """
@@ -29,6 +42,8 @@ class Sensor(ABC):
 
         :return: The uuid.
         """
+        if self._uuid is None:
+            self._uuid = uuid.UUID(int=self._id)
         return self._uuid
 
     @property
@@ -11,6 +11,8 @@ class ActiveHingeV1(ActiveHinge):
     This is a rotary joint.
     """
 
+    __slots__ = ()
+
     def __init__(self, rotation: float | RightAngles):
         """
         Initialize this object.
@@ -7,6 +7,8 @@ from ..base import Brick
 class BrickV1(Brick):
     """A brick module for a v1 modular robot."""
 
+    __slots__ = ()
+
     def __init__(self, rotation: float | RightAngles):
         """
         Initialize this object.
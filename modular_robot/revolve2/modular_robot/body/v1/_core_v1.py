@@ -7,6 +7,8 @@ from ..base import Core
 class CoreV1(Core):
     """The core module of a v1 modular robot."""
 
+    __slots__ = ()
+
     def __init__(self, rotation: float | RightAngles):
         """
         Initialize this object.
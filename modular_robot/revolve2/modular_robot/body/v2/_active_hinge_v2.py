@@ -12,6 +12,8 @@ class ActiveHingeV2(ActiveHinge):
     This is a rotary joint.
     """
 
+    __slots__ = ()
+
     def __init__(self, rotation: float | RightAngles):
         """
         Initialize this object.
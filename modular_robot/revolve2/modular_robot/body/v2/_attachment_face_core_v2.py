@@ -12,6 +12,8 @@ from ..base import AttachmentFace
 class AttachmentFaceCoreV2(AttachmentFace):
     """An AttachmentFace for the V2 Core."""
 
+    __slots__ = ("_check_matrix", "_child_offset")
+
     _check_matrix: NDArray[np.uint8]
     _child_offset: Vector3
     """
@@ -89,6 +91,7 @@ class AttachmentFaceCoreV2(AttachmentFace):
         if can_set := self.can_set_child(child_index):
             self._check_matrix[child_index // 3, child_index % 3] += 1
             self._children[child_index] = module
+            self._on_child_attached(module)
         else:
             raise KeyError(
                 f"Attachment point {'already populated' if can_set else 'occluded by other module'}"
@@ -7,6 +7,8 @@ from ..base import Brick
 class BrickV2Large(Brick):
     """A brick module for a modular robot."""
 
+    __slots__ = ()
+
     def __init__(self, rotation: float | RightAngles, bone_length: float):
         """
         Initialize this object.
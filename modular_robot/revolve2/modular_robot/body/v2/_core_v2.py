@@ -10,6 +10,8 @@ from ._attachment_face_core_v2 import AttachmentFaceCoreV2
 class CoreV2(Core):
     """The core module of a modular robot."""
 
+    __slots__ = ("_attachment_faces",)
+
     _BATTERY_MASS = 0.39712  # in kg
     _FRAME_MASS = 1.0644  # in kg
 
@@ -1,19 +1,26 @@
 """CPG brains for modular robots."""
 
-from ._brain_cpg_instance import BrainCpgInstance
+from ._brain_cpg_instance import BrainCpgInstance, CpgIntegration
+from ._brain_cpg_instance_group import BrainCpgInstanceGroup
 from ._brain_cpg_network_neighbor import BrainCpgNetworkNeighbor
 from ._brain_cpg_network_neighbor_random import BrainCpgNetworkNeighborRandom
 from ._brain_cpg_network_static import BrainCpgNetworkStatic
+from ._cpg_integrator import CpgIntegrator
 from ._cpg_network_structure import CpgNetworkStructure
+from ._csr_matrix import CsrMatrix
 from ._make_cpg_network_structure_neighbor import (
     active_hinges_to_cpg_network_structure_neighbor,
 )
 
 __all__ = [
     "BrainCpgInstance",
+    "BrainCpgInstanceGroup",
     "BrainCpgNetworkNeighbor",
     "BrainCpgNetworkNeighborRandom",
     "BrainCpgNetworkStatic",
+    "CpgIntegration",
+    "CpgIntegrator",
     "CpgNetworkStructure",
+    "CsrMatrix",
     "active_hinges_to_cpg_network_structure_neighbor",
 ]
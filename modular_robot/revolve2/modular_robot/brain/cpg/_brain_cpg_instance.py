@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
 import numpy as np
 import numpy.typing as npt
 
@@ -5,6 +9,11 @@ from ..._modular_robot_control_interface import ModularRobotControlInterface
 from ...body.base import ActiveHinge
 from ...sensor_state import ModularRobotSensorState
 from .._brain_instance import BrainInstance
+from ._cpg_integrator import CpgIntegrator
+from ._csr_matrix import CsrMatrix
+
+if TYPE_CHECKING:
+    from ._brain_cpg_instance_group import BrainCpgInstanceGroup
 
 
 class BrainCpgInstance(BrainInstance):
@@ -14,38 +23,75 @@ class BrainCpgInstance(BrainInstance):
     A state array that is integrated over time following the differential equation `X'=WX`.
     W is a weight matrix that is multiplied by the state array.
     The outputs of the controller are defined by the `outputs`, a list of indices for the state array.
+
+    Large weight matrices with few connections are stored as sparse matrices, see `CpgIntegration.select_storage`.
+    Instances can be merged into a `BrainCpgInstanceGroup` to integrate multiple robots as a single block diagonal system.
     """
 
     _initial_state: npt.NDArray[np.float_]
-    _weight_matrix: npt.NDArray[np.float_]  # nxn matrix matching number of neurons
+    _state: npt.NDArray[np.float_]
+    _weight_matrix: (
+        npt.NDArray[np.float_] | CsrMatrix
+    )  # nxn matrix matching number of neurons
     _output_mapping: list[tuple[int, ActiveHinge]]
+    _integration: CpgIntegration
+    _group: BrainCpgInstanceGroup | None
+    """The group this instance is integrated by, if any."""
 
     def __init__(
         self,
         initial_state: npt.NDArray[np.float_],
-        weight_matrix: npt.NDArray[np.float_],
+        weight_matrix: npt.NDArray[np.float_] | CsrMatrix,
         output_mapping: list[tuple[int, ActiveHinge]],
+        integrator: CpgIntegrator = CpgIntegrator.RK45,
     ) -> None:
         """
         Initialize this CPG Brain Instance.
 
         :param initial_state: The initial state of the neural network.
-        :param weight_matrix: The weight matrix used during integration.
+        :param weight_matrix: The weight matrix used during integration. Either dense or sparse.
         :param output_mapping: Marks neurons as controller outputs and map them to the correct active hinge.
+        :param integrator: The method used to integrate the state.
         """
+        if isinstance(weight_matrix, CsrMatrix):
+            size = weight_matrix.size
+        else:
+            assert weight_matrix.ndim == 2
+            assert weight_matrix.shape[0] == weight_matrix.shape[1]
+            size = weight_matrix.shape[0]
         assert initial_state.ndim == 1
-        assert weight_matrix.ndim == 2
-        assert weight_matrix.shape[0] == weight_matrix.shape[1]
-        assert initial_state.shape[0] == weight_matrix.shape[0]
+        assert initial_state.shape[0] == size
         assert all([i >= 0 and i < len(initial_state) for i, _ in output_mapping])
 
         self._state = initial_state
         self._weight_matrix = weight_matrix
         self._output_mapping = output_mapping
+        self._integration = CpgIntegration([weight_matrix], integrator)
+        self._group = None
+
+    @property
+    def integrator(self) -> CpgIntegrator:
+        """
+        Get the method used to integrate the state.
+
+        :returns: The integrator.
+        """
+        return self._integration.integrator
+
+    @property
+    def group(self) -> BrainCpgInstanceGroup | None:
+        """
+        Get the group this instance is integrated by.
+
+        :returns: The group, or None if this instance integrates its own state.
+        """
+        return self._group
 
     @staticmethod
     def _rk45(
-        state: npt.NDArray[np.float_], A: npt.NDArray[np.float_], dt: float
+        state: npt.NDArray[np.float_],
+        A: npt.NDArray[np.float_] | CsrMatrix,
+        dt: float,
     ) -> npt.NDArray[np.float_]:
         """
         Calculate the next state using the RK45 method.
@@ -59,13 +105,49 @@ class BrainCpgInstance(BrainInstance):
         :param dt: The step size (elapsed simulation time).
         :return: The new state.
         """
-        A1: npt.NDArray[np.float_] = np.matmul(A, state)
-        A2: npt.NDArray[np.float_] = np.matmul(A, (state + dt / 2 * A1))
-        A3: npt.NDArray[np.float_] = np.matmul(A, (state + dt / 2 * A2))
-        A4: npt.NDArray[np.float_] = np.matmul(A, (state + dt * A3))
+        A1: npt.NDArray[np.float_] = A @ state
+        A2: npt.NDArray[np.float_] = A @ (state + dt / 2 * A1)
+        A3: npt.NDArray[np.float_] = A @ (state + dt / 2 * A2)
+        A4: npt.NDArray[np.float_] = A @ (state + dt * A3)
         state = state + dt / 6 * (A1 + 2 * (A2 + A3) + A4)
         return np.clip(state, a_min=-1, a_max=1)
 
+    @staticmethod
+    def _make_propagator(
+        A: npt.NDArray[np.float_], dt: float, integrator: CpgIntegrator
+    ) -> npt.NDArray[np.float_]:
+        """
+        Calculate the matrix that advances the state of the linear system `X'=AX` by one step.
+
+        For `RK4_PROPAGATOR` this is the Runge-Kutta step of `_rk45` written as a matrix: `I + dtA + (dtA)^2/2 + (dtA)^3/6 + (dtA)^4/24`.
+        For `EXACT_PROPAGATOR` this is the matrix exponential `exp(dtA)`, calculated using scaling and squaring of its Taylor series.
+
+        :param A: The weights matrix of the network.
+        :param dt: The step size.
+        :param integrator: The propagator integrator.
+        :return: The propagator.
+        """
+        scaled = dt * A
+        identity = np.eye(A.shape[0])
+        if integrator is CpgIntegrator.RK4_PROPAGATOR:
+            return identity + scaled @ (
+                identity
+                + scaled @ (identity + scaled @ (identity + scaled / 4) / 3) / 2
+            )
+
+        # Scale so the norm is at most 1/2, where 18 Taylor terms are accurate to machine precision.
+        norm = float(np.linalg.norm(scaled, ord=1))
+        squarings = max(0, int(np.ceil(np.log2(norm))) + 1) if norm > 0.0 else 0
+        scaled = scaled / 2.0**squarings
+        propagator = identity.copy()
+        term = identity
+        for k in range(1, 19):
+            term = term @ scaled / k
+            propagator += term
+        for _ in range(squarings):
+            propagator = propagator @ propagator
+        return propagator
+
     def control(
         self,
         dt: float,
@@ -82,10 +164,114 @@ class BrainCpgInstance(BrainInstance):
         :param control_interface: Interface for controlling the robot.
         """
         # Integrate ODE to obtain new state.
-        self._state = self._rk45(self._state, self._weight_matrix, dt)
+        if self._group is None:
+            self._state = self._integration.step(self._state, dt)
+        else:
+            self._group.step(self, dt)
 
         # Set active hinge targets to match newly calculated state.
         for state_index, active_hinge in self._output_mapping:
             control_interface.set_active_hinge_target(
                 active_hinge, float(self._state[state_index]) * active_hinge.range
             )
+
+
+class CpgIntegration:
+    """
+    Integrates the state of one or more independent CPG networks.
+
+    The weight matrices of the networks are placed on the diagonal of a single block diagonal matrix,
+    and the state is the concatenation of the states of the networks.
+    """
+
+    SPARSE_MIN_SIZE = 128
+    """Minimum number of states for a matrix to be stored as a sparse matrix."""
+
+    SPARSE_MAX_DENSITY = 0.1
+    """Maximum fraction of nonzero values for a matrix to be stored as a sparse matrix."""
+
+    _MAX_PROPAGATORS = 8
+
+    integrator: CpgIntegrator
+    """The method used to integrate the state."""
+
+    _blocks: list[npt.NDArray[np.float_] | CsrMatrix]
+    _weights: npt.NDArray[np.float_] | CsrMatrix
+    _propagators: dict[float, npt.NDArray[np.float_] | CsrMatrix]
+    """Propagator matrices for each step size seen so far. Only used by the propagator integrators."""
+
+    def __init__(
+        self,
+        weight_matrices: Sequence[npt.NDArray[np.float_] | CsrMatrix],
+        integrator: CpgIntegrator,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param weight_matrices: The weight matrices of the networks, in the order their states are concatenated.
+        :param integrator: The method used to integrate the state.
+        """
+        self.integrator = integrator
+        self._blocks = list(weight_matrices)
+        self._weights = self._combine(self._blocks)
+        self._propagators = {}
+
+    @classmethod
+    def select_storage(
+        cls, matrix: npt.NDArray[np.float_] | CsrMatrix
+    ) -> npt.NDArray[np.float_] | CsrMatrix:
+        """
+        Convert a matrix to the storage that is fastest to multiply with.
+
+        Matrices with at least `SPARSE_MIN_SIZE` rows and at most `SPARSE_MAX_DENSITY` nonzero values are stored sparse, others dense.
+
+        :param matrix: The matrix.
+        :returns: The matrix, converted if needed.
+        """
+        if isinstance(matrix, CsrMatrix):
+            size, nnz = matrix.size, matrix.nnz
+        else:
+            size, nnz = matrix.shape[0], int(np.count_nonzero(matrix))
+        sparse = size >= cls.SPARSE_MIN_SIZE and nnz <= cls.SPARSE_MAX_DENSITY * size**2
+        if sparse and not isinstance(matrix, CsrMatrix):
+            return CsrMatrix.from_dense(matrix)
+        if not sparse and isinstance(matrix, CsrMatrix):
+            return matrix.to_dense()
+        return matrix
+
+    @classmethod
+    def _combine(
+        cls, blocks: list[npt.NDArray[np.float_] | CsrMatrix]
+    ) -> npt.NDArray[np.float_] | CsrMatrix:
+        if len(blocks) == 1:
+            return cls.select_storage(blocks[0])
+        return cls.select_storage(CsrMatrix.block_diagonal(blocks))
+
+    def step(self, state: npt.NDArray[np.float_], dt: float) -> npt.NDArray[np.float_]:
+        """
+        Calculate the next state.
+
+        :param state: The current state.
+        :param dt: The step size (elapsed simulation time).
+        :returns: The new state.
+        """
+        if self.integrator is CpgIntegrator.RK45:
+            return BrainCpgInstance._rk45(state, self._weights, dt)
+
+        propagator = self._propagators.get(dt)
+        if propagator is None:
+            if len(self._propagators) >= self._MAX_PROPAGATORS:
+                self._propagators.clear()
+            # Propagators fill in the blocks, so they are calculated per block and combined afterwards.
+            propagator = self._combine(
+                [
+                    BrainCpgInstance._make_propagator(
+                        block.to_dense() if isinstance(block, CsrMatrix) else block,
+                        dt,
+                        self.integrator,
+                    )
+                    for block in self._blocks
+                ]
+            )
+            self._propagators[dt] = propagator
+        return np.clip(propagator @ state, a_min=-1, a_max=1)
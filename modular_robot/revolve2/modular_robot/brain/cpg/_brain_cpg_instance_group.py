@@ -0,0 +1,73 @@
+import numpy as np
+import numpy.typing as npt
+
+from ._brain_cpg_instance import BrainCpgInstance, CpgIntegration
+
+
+class BrainCpgInstanceGroup:
+    """
+    Integrates the states of multiple CPG brain instances as a single block diagonal system.
+
+    After grouping, the instances are controlled as usual.
+    The first instance that is controlled in a step integrates the states of all instances in the group,
+    and the other instances only apply their part of the new state.
+    Therefore, all instances must be controlled exactly once per step, with the same step size, like in a simulation of a scene with multiple robots.
+    """
+
+    _instances: list[BrainCpgInstance]
+    _integration: CpgIntegration
+    _state: npt.NDArray[np.float_]
+    """The concatenated states of all instances."""
+
+    _slices: list[slice]
+    _indices: dict[int, int]
+    """Maps the id of every instance to its index in `_instances`."""
+
+    _pending: set[int]
+    """Indices of the instances that have not yet applied the most recent state."""
+
+    def __init__(self, instances: list[BrainCpgInstance]) -> None:
+        """
+        Initialize this object.
+
+        :param instances: The instances to integrate together.
+        :raises ValueError: If there are no instances, the instances use different integrators or an instance is already part of a group.
+        """
+        if len(instances) == 0:
+            raise ValueError("A group needs at least one instance.")
+        if len({instance.integrator for instance in instances}) > 1:
+            raise ValueError("All instances in a group must use the same integrator.")
+        if any(instance._group is not None for instance in instances):
+            raise ValueError("Instance is already part of a group.")
+
+        self._instances = instances
+        self._integration = CpgIntegration(
+            [instance._weight_matrix for instance in instances],
+            instances[0].integrator,
+        )
+        self._state = np.concatenate([instance._state for instance in instances])
+        offsets = np.cumsum([0] + [len(instance._state) for instance in instances])
+        self._slices = [
+            slice(int(begin), int(end)) for begin, end in zip(offsets[:-1], offsets[1:])
+        ]
+        self._indices = {id(instance): i for i, instance in enumerate(instances)}
+        self._pending = set()
+
+        for instance, part in zip(instances, self._slices):
+            instance._state = self._state[part]
+            instance._group = self
+
+    def step(self, instance: BrainCpgInstance, dt: float) -> None:
+        """
+        Advance the state of an instance in this group by one step.
+
+        :param instance: The instance. Must be part of this group.
+        :param dt: The step size (elapsed simulation time).
+        """
+        index = self._indices[id(instance)]
+        if index not in self._pending:
+            self._state = self._integration.step(self._state, dt)
+            for other, part in zip(self._instances, self._slices):
+                other._state = self._state[part]
+            self._pending = set(range(len(self._instances)))
+        self._pending.discard(index)
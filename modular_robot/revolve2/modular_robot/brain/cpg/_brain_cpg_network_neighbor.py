@@ -7,7 +7,9 @@ import numpy.typing as npt
 from ...body.base import ActiveHinge, Body
 from .._brain import Brain
 from .._brain_instance import BrainInstance
-from ._brain_cpg_instance import BrainCpgInstance
+from ._brain_cpg_instance import BrainCpgInstance, CpgIntegration
+from ._cpg_integrator import CpgIntegrator
+from ._csr_matrix import CsrMatrix
 from ._make_cpg_network_structure_neighbor import (
     active_hinges_to_cpg_network_structure_neighbor,
 )
@@ -21,20 +23,27 @@ class BrainCpgNetworkNeighbor(Brain):
     """
 
     _initial_state: npt.NDArray[np.float_]
-    _weight_matrix: npt.NDArray[np.float_]  # nxn matrix matching number of neurons
+    _weight_matrix: (
+        npt.NDArray[np.float_] | CsrMatrix
+    )  # nxn matrix matching number of neurons
     _output_mapping: list[tuple[int, ActiveHinge]]
+    _integrator: CpgIntegrator
 
-    def __init__(self, body: Body) -> None:
+    def __init__(
+        self, body: Body, integrator: CpgIntegrator = CpgIntegrator.RK45
+    ) -> None:
         """
         Initialize this object.
 
         :param body: The body to create the cpg network and brain for.
+        :param integrator: The method brain instances use to integrate the state.
         """
+        self._integrator = integrator
         active_hinges = body.find_modules_of_type(ActiveHinge)
         (
             cpg_network_structure,
             self._output_mapping,
-        ) = active_hinges_to_cpg_network_structure_neighbor(active_hinges)
+        ) = active_hinges_to_cpg_network_structure_neighbor(active_hinges, body)
         connections = [
             (
                 active_hinges[pair.cpg_index_lowest.index],
@@ -45,17 +54,19 @@ class BrainCpgNetworkNeighbor(Brain):
         (internal_weights, external_weights) = self._make_weights(
             active_hinges, connections, body
         )
-        self._weight_matrix = cpg_network_structure.make_connection_weights_matrix(
-            {
-                cpg: weight
-                for cpg, weight in zip(cpg_network_structure.cpgs, internal_weights)
-            },
-            {
-                pair: weight
-                for pair, weight in zip(
-                    cpg_network_structure.connections, external_weights
-                )
-            },
+        self._weight_matrix = CpgIntegration.select_storage(
+            cpg_network_structure.make_sparse_connection_weights_matrix(
+                {
+                    cpg: weight
+                    for cpg, weight in zip(cpg_network_structure.cpgs, internal_weights)
+                },
+                {
+                    pair: weight
+                    for pair, weight in zip(
+                        cpg_network_structure.connections, external_weights
+                    )
+                },
+            )
         )
         self._initial_state = cpg_network_structure.make_uniform_state(
             0.5 * math.sqrt(2)
@@ -71,6 +82,7 @@ class BrainCpgNetworkNeighbor(Brain):
             initial_state=self._initial_state,
             weight_matrix=self._weight_matrix,
             output_mapping=self._output_mapping,
+            integrator=self._integrator,
         )
 
     @abstractmethod
@@ -2,6 +2,7 @@ import numpy as np
 
 from ...body.base import ActiveHinge, Body
 from ._brain_cpg_network_neighbor import BrainCpgNetworkNeighbor
+from ._cpg_integrator import CpgIntegrator
 
 
 class BrainCpgNetworkNeighborRandom(BrainCpgNetworkNeighbor):
@@ -14,15 +15,21 @@ class BrainCpgNetworkNeighborRandom(BrainCpgNetworkNeighbor):
 
     _rng: np.random.Generator
 
-    def __init__(self, body: Body, rng: np.random.Generator) -> None:
+    def __init__(
+        self,
+        body: Body,
+        rng: np.random.Generator,
+        integrator: CpgIntegrator = CpgIntegrator.RK45,
+    ) -> None:
         """
         Initialize this object.
 
         :param body: The body to create the cpg network and brain for.
         :param rng: Random number generator used for generating the weights.
+        :param integrator: The method brain instances use to integrate the state.
         """
         self._rng = rng
-        super().__init__(body)
+        super().__init__(body, integrator)
 
     def _make_weights(
         self,
@@ -6,8 +6,10 @@ import numpy.typing as npt
 from ...body.base import ActiveHinge
 from .._brain import Brain
 from .._brain_instance import BrainInstance
-from ._brain_cpg_instance import BrainCpgInstance
+from ._brain_cpg_instance import BrainCpgInstance, CpgIntegration
+from ._cpg_integrator import CpgIntegrator
 from ._cpg_network_structure import CpgNetworkStructure
+from ._csr_matrix import CsrMatrix
 
 
 class BrainCpgNetworkStatic(Brain):
@@ -21,25 +23,29 @@ class BrainCpgNetworkStatic(Brain):
     """
 
     _initial_state: npt.NDArray[np.float_]
-    _weight_matrix: npt.NDArray[np.float_]
+    _weight_matrix: npt.NDArray[np.float_] | CsrMatrix
     _output_mapping: list[tuple[int, ActiveHinge]]
+    _integrator: CpgIntegrator
 
     def __init__(
         self,
         initial_state: npt.NDArray[np.float_],
-        weight_matrix: npt.NDArray[np.float_],
+        weight_matrix: npt.NDArray[np.float_] | CsrMatrix,
         output_mapping: list[tuple[int, ActiveHinge]],
+        integrator: CpgIntegrator = CpgIntegrator.RK45,
     ) -> None:
         """
         Initialize this object.
 
         :param initial_state: The initial state of the neural network.
-        :param weight_matrix: The weight matrix used during integration.
+        :param weight_matrix: The weight matrix used during integration. Either dense or sparse.
         :param output_mapping: Marks neurons as controller outputs and map them to the correct active hinge.
+        :param integrator: The method brain instances use to integrate the state.
         """
         self._initial_state = initial_state
         self._weight_matrix = weight_matrix
         self._output_mapping = output_mapping
+        self._integrator = integrator
 
     @classmethod
     def uniform_from_params(
@@ -48,6 +54,7 @@ class BrainCpgNetworkStatic(Brain):
         cpg_network_structure: CpgNetworkStructure,
         initial_state_uniform: float,
         output_mapping: list[tuple[int, ActiveHinge]],
+        integrator: CpgIntegrator = CpgIntegrator.RK45,
     ) -> BrainCpgNetworkStatic:
         """
         Create and initialize an instance of this brain from the provided parameters, assuming uniform initial state.
@@ -56,11 +63,12 @@ class BrainCpgNetworkStatic(Brain):
         :param cpg_network_structure: The cpg network structure.
         :param initial_state_uniform: Initial state to use for all neurons.
         :param output_mapping: Marks neurons as controller outputs and map them to the correct active hinge.
+        :param integrator: The method brain instances use to integrate the state.
         :returns: The created brain.
         """
         initial_state = cpg_network_structure.make_uniform_state(initial_state_uniform)
-        weight_matrix = (
-            cpg_network_structure.make_connection_weights_matrix_from_params(
+        weight_matrix = CpgIntegration.select_storage(
+            cpg_network_structure.make_sparse_connection_weights_matrix_from_params(
                 list(params)
             )
         )
@@ -68,6 +76,7 @@ class BrainCpgNetworkStatic(Brain):
             initial_state=initial_state,
             weight_matrix=weight_matrix,
             output_mapping=output_mapping,
+            integrator=integrator,
         )
 
     def make_instance(self) -> BrainInstance:
@@ -80,4 +89,5 @@ class BrainCpgNetworkStatic(Brain):
             initial_state=self._initial_state,
             weight_matrix=self._weight_matrix,
             output_mapping=self._output_mapping,
+            integrator=self._integrator,
         )
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class CpgIntegrator(Enum):
+    """
+    Enumerate the methods a CPG brain instance can use to integrate its state.
+
+    - "RK45": Four matrix-vector products per control step, as described in `BrainCpgInstance._rk45`.
+    - "RK4_PROPAGATOR": The same Runge-Kutta step, but precomputed as a single matrix per step size.
+    - "EXACT_PROPAGATOR": The exact solution of `X'=WX` over one step, `exp(W*dt)`, precomputed per step size.
+
+    The propagator methods make every control step a single matrix-vector product,
+    but compute a new matrix whenever the step size changes, so they are meant for a fixed control frequency.
+    """
+
+    RK45 = "rk45"
+    RK4_PROPAGATOR = "rk4_propagator"
+    EXACT_PROPAGATOR = "exact_propagator"
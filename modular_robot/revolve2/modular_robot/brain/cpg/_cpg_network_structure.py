@@ -3,6 +3,8 @@ from dataclasses import dataclass
 import numpy as np
 import numpy.typing as npt
 
+from ._csr_matrix import CsrMatrix
+
 
 @dataclass(frozen=True)
 class Cpg:
@@ -103,6 +105,42 @@ class CpgNetworkStructure:
 
         return weight_matrix
 
+    def make_sparse_connection_weights_matrix(
+        self,
+        internal_connection_weights: dict[Cpg, float],
+        external_connection_weights: dict[CpgPair, float],
+    ) -> CsrMatrix:
+        """
+        Create a sparse weight matrix from internal and external weights.
+
+        This is the same matrix as created by `make_connection_weights_matrix`, without allocating the dense matrix.
+
+        :param internal_connection_weights: The internal weights.
+        :param external_connection_weights: The external weights.
+        :returns: The created matrix.
+        """
+        assert set(internal_connection_weights.keys()) == set(self.cpgs)
+        assert set(external_connection_weights.keys()) == self.connections
+
+        sources = [cpg.index for cpg in internal_connection_weights.keys()] + [
+            pair.cpg_index_lowest.index for pair in external_connection_weights.keys()
+        ]
+        targets = [
+            self.num_cpgs + cpg.index for cpg in internal_connection_weights.keys()
+        ] + [
+            pair.cpg_index_highest.index for pair in external_connection_weights.keys()
+        ]
+        weights = list(internal_connection_weights.values()) + list(
+            external_connection_weights.values()
+        )
+
+        return CsrMatrix.from_coordinates(
+            np.array(sources + targets, dtype=np.int_),
+            np.array(targets + sources, dtype=np.int_),
+            np.concatenate([weights, np.negative(weights)]),
+            self.num_states,
+        )
+
     @property
     def num_connections(self) -> int:
         """
@@ -121,6 +159,26 @@ class CpgNetworkStructure:
         :param params: The connections to create the matrix from.
         :returns: The created matrix.
         """
+        return self.make_connection_weights_matrix(*self._weights_from_params(params))
+
+    def make_sparse_connection_weights_matrix_from_params(
+        self, params: list[float]
+    ) -> CsrMatrix:
+        """
+        Create a sparse connection weights matrix from a list if connections.
+
+        This is the same matrix as created by `make_connection_weights_matrix_from_params`, without allocating the dense matrix.
+
+        :param params: The connections to create the matrix from.
+        :returns: The created matrix.
+        """
+        return self.make_sparse_connection_weights_matrix(
+            *self._weights_from_params(params)
+        )
+
+    def _weights_from_params(
+        self, params: list[float]
+    ) -> tuple[dict[Cpg, float], dict[CpgPair, float]]:
         assert len(params) == self.num_connections
 
         internal_connection_weights = {
@@ -132,9 +190,7 @@ class CpgNetworkStructure:
             for pair, weight in zip(self.connections, params[self.num_cpgs :])
         }
 
-        return self.make_connection_weights_matrix(
-            internal_connection_weights, external_connection_weights
-        )
+        return internal_connection_weights, external_connection_weights
 
     @property
     def num_states(self) -> int:
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+class CsrMatrix:
+    """
+    A sparse square matrix in compressed sparse row format.
+
+    The nonzero values of row `i` are `data[indptr[i]:indptr[i + 1]]`, in the columns `indices[indptr[i]:indptr[i + 1]]`.
+    Only the operations needed to integrate CPG networks are implemented.
+    """
+
+    data: npt.NDArray[np.float_]
+    """The nonzero values."""
+
+    indices: npt.NDArray[np.int_]
+    """The column of each nonzero value."""
+
+    indptr: npt.NDArray[np.int_]
+    """Row pointers into `data` and `indices`. Shape (size + 1,)."""
+
+    _rows: npt.NDArray[np.int_]
+
+    def __init__(
+        self,
+        data: npt.NDArray[np.float_],
+        indices: npt.NDArray[np.int_],
+        indptr: npt.NDArray[np.int_],
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param data: The nonzero values.
+        :param indices: The column of each nonzero value.
+        :param indptr: Row pointers into `data` and `indices`.
+        """
+        assert data.ndim == 1 and indices.shape == data.shape
+        assert indptr.ndim == 1 and indptr[-1] == len(data)
+
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self._rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        rows: npt.NDArray[np.int_],
+        columns: npt.NDArray[np.int_],
+        values: npt.NDArray[np.float_],
+        size: int,
+    ) -> CsrMatrix:
+        """
+        Create a matrix from the coordinates of its nonzero values.
+
+        :param rows: The row of each value.
+        :param columns: The column of each value.
+        :param values: The values.
+        :param size: The number of rows and columns of the matrix.
+        :returns: The created matrix.
+        """
+        order = np.lexsort((columns, rows))
+        indptr = np.zeros(size + 1, dtype=np.int_)
+        np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+        return cls(
+            np.asarray(values, dtype=np.float_)[order],
+            np.asarray(columns, dtype=np.int_)[order],
+            indptr,
+        )
+
+    @classmethod
+    def from_dense(cls, matrix: npt.NDArray[np.float_]) -> CsrMatrix:
+        """
+        Create a matrix from the nonzero values of a dense matrix.
+
+        :param matrix: The dense matrix.
+        :returns: The created matrix.
+        """
+        assert matrix.ndim == 2 and matrix.shape[0] == matrix.shape[1]
+        rows, columns = np.nonzero(matrix)
+        return cls.from_coordinates(rows, columns, matrix[rows, columns], len(matrix))
+
+    @classmethod
+    def block_diagonal(
+        cls, blocks: Sequence[CsrMatrix | npt.NDArray[np.float_]]
+    ) -> CsrMatrix:
+        """
+        Create a block diagonal matrix.
+
+        :param blocks: The blocks on the diagonal, in order.
+        :returns: The created matrix.
+        """
+        sparse_blocks = [
+            block if isinstance(block, CsrMatrix) else cls.from_dense(block)
+            for block in blocks
+        ]
+        offsets = np.cumsum([0] + [block.size for block in sparse_blocks])
+        nonzero_offsets = np.cumsum([0] + [block.nnz for block in sparse_blocks])
+        return cls(
+            np.concatenate(
+                [block.data for block in sparse_blocks] + [np.zeros(0)],
+            ),
+            np.concatenate(
+                [
+                    block.indices + offset
+                    for block, offset in zip(sparse_blocks, offsets)
+                ]
+                + [np.zeros(0, dtype=np.int_)]
+            ),
+            np.concatenate(
+                [
+                    block.indptr[:-1] + offset
+                    for block, offset in zip(sparse_blocks, nonzero_offsets)
+                ]
+                + [nonzero_offsets[-1:]]
+            ),
+        )
+
+    @property
+    def size(self) -> int:
+        """
+        Get the number of rows and columns of the matrix.
+
+        :returns: The size.
+        """
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self) -> int:
+        """
+        Get the number of stored nonzero values.
+
+        :returns: The number of values.
+        """
+        return len(self.data)
+
+    def to_dense(self) -> npt.NDArray[np.float_]:
+        """
+        Convert to a dense matrix.
+
+        :returns: The dense matrix.
+        """
+        matrix = np.zeros((self.size, self.size))
+        matrix[self._rows, self.indices] = self.data
+        return matrix
+
+    def __matmul__(self, vector: npt.NDArray[np.float_]) -> npt.NDArray[np.float_]:
+        """
+        Multiply this matrix with a vector.
+
+        :param vector: The vector.
+        :returns: The product.
+        """
+        return np.bincount(
+            self._rows, weights=self.data * vector[self.indices], minlength=self.size
+        ).astype(np.float_, copy=False)
@@ -1,9 +1,14 @@
-from ...body.base import ActiveHinge
+import numpy as np
+from numpy.typing import NDArray
+
+from ...body import Module
+from ...body.base import ActiveHinge, Body, ModuleGraph
 from ._cpg_network_structure import CpgNetworkStructure, CpgPair
 
 
 def active_hinges_to_cpg_network_structure_neighbor(
     active_hinges: list[ActiveHinge],
+    body: Body | None = None,
 ) -> tuple[CpgNetworkStructure, list[tuple[int, ActiveHinge]]]:
     """
     Create the structure of a CPG network based on a list of active hinges.
@@ -12,28 +17,76 @@ def active_hinges_to_cpg_network_structure_neighbor(
     I.e. every active hinges has a corresponding CPG,
     and these are stored in the order the hinges are provided in.
 
+    Two CPGs are connected if their active hinges are within 2 jumps in the modular robot tree structure,
+    where one hinge is the parent or grandparent of the other, as found by `Module.neighbours`.
+
     :param active_hinges: The active hinges to base the structure on.
+    :param body: The body the active hinges are part of. If provided, its cached module graph is used. Otherwise a graph is built from the tree the hinges are part of.
     :returns: The created structure and a mapping between state indices and active hinges.
     """
     cpgs = CpgNetworkStructure.make_cpgs(len(active_hinges))
     connections: set[CpgPair] = set()
 
-    active_hinge_to_cpg = {
-        active_hinge: cpg for active_hinge, cpg in zip(active_hinges, cpgs)
-    }
+    if len(active_hinges) > 0:
+        graph: ModuleGraph | None = None
+        if body is not None:
+            try:
+                lattice = body.lattice
+            except ValueError:
+                pass  # Not all angles are multiples of 90 degrees, so the body has no lattice.
+            else:
+                graph = body.module_graph
+                hinge_nodes = np.array(
+                    [lattice.index_of(active_hinge) for active_hinge in active_hinges],
+                    dtype=np.int_,
+                )
+        if graph is None:
+            root: Module = active_hinges[0]
+            while root.parent is not None:
+                root = root.parent
+            modules, parents = _module_tree(root)
+            graph = ModuleGraph(parents)
+            index_of = {module: index for index, module in enumerate(modules)}
+            hinge_nodes = np.array(
+                [index_of[active_hinge] for active_hinge in active_hinges],
+                dtype=np.int_,
+            )
 
-    for active_hinge, cpg in zip(active_hinges, cpgs):
-        neighbours = [
-            n
-            for n in active_hinge.neighbours(within_range=2)
-            if isinstance(n, ActiveHinge)
-        ]
-        connections = connections.union(
-            [CpgPair(cpg, active_hinge_to_cpg[neighbour]) for neighbour in neighbours]
-        )
+        module_to_cpg = np.full(graph.num_nodes, -1, dtype=np.int_)
+        module_to_cpg[hinge_nodes] = np.arange(len(active_hinges))
+
+        sources, ancestors = graph.ancestors(within_range=2, nodes=hinge_nodes)
+        cpg_1 = module_to_cpg[sources]
+        cpg_2 = module_to_cpg[ancestors]
+        is_hinge = cpg_2 >= 0
+        connections = {
+            CpgPair(cpgs[lowest], cpgs[highest])
+            for lowest, highest in np.sort(
+                np.stack([cpg_1[is_hinge], cpg_2[is_hinge]], axis=1), axis=1
+            ).tolist()
+        }
 
     cpg_network_structure = CpgNetworkStructure(cpgs, connections)
 
     return cpg_network_structure, [
         mapping for mapping in zip(cpg_network_structure.output_indices, active_hinges)
     ]
+
+
+def _module_tree(root: Module) -> tuple[list[Module], NDArray[np.int_]]:
+    """
+    Walk a module tree depth-first.
+
+    :param root: The root of the tree.
+    :returns: The modules and the index of the parent of each module, or -1 for the root.
+    """
+    modules: list[Module] = []
+    parents: list[int] = []
+    stack: list[tuple[Module, int]] = [(root, -1)]
+    while len(stack) > 0:
+        module, parent = stack.pop()
+        index = len(modules)
+        modules.append(module)
+        parents.append(parent)
+        stack.extend((child, index) for child in module.children.values())
+    return modules, np.array(parents, dtype=np.int_)
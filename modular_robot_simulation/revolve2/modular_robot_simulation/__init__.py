@@ -1,6 +1,7 @@
 """Everything for the simulation of modular robots."""
 
 from ._modular_robot_scene import ModularRobotScene
+from ._modular_robot_simulation_handler import ModularRobotSimulationHandler
 from ._modular_robot_simulation_state import ModularRobotSimulationState
 from ._scene_simulation_state import SceneSimulationState
 from ._simulate_scenes import simulate_scenes
@@ -9,6 +10,7 @@ from ._test_robot import test_robot
 
 __all__ = [
     "ModularRobotScene",
+    "ModularRobotSimulationHandler",
     "ModularRobotSimulationState",
     "SceneSimulationState",
     "Terrain",
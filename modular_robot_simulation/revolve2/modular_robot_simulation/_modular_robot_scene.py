@@ -16,6 +16,9 @@ class ModularRobotScene:
     terrain: Terrain
     """The terrain of the scene."""
 
+    merge_cpg_brains: bool = False
+    """Whether to integrate the CPG brains of all robots as a single system. See `BrainCpgInstanceGroup`."""
+
     _robots: list[tuple[ModularRobot, Pose, bool]] = field(default_factory=list)
     """
     The robots in the scene.
@@ -59,7 +62,7 @@ class ModularRobotScene:
 
         :returns: The created scene.
         """
-        handler = ModularRobotSimulationHandler()
+        handler = ModularRobotSimulationHandler(merge_cpg_brains=self.merge_cpg_brains)
         scene = Scene(handler=handler)
         modular_robot_to_multi_body_system_mapping: dict[
             UUIDKey[ModularRobot], MultiBodySystem
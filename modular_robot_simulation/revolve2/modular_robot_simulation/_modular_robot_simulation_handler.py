@@ -1,4 +1,9 @@
 from revolve2.modular_robot.brain import BrainInstance
+from revolve2.modular_robot.brain.cpg import (
+    BrainCpgInstance,
+    BrainCpgInstanceGroup,
+    CpgIntegrator,
+)
 from revolve2.simulation.scene import (
     ControlInterface,
     SimulationHandler,
@@ -14,10 +19,18 @@ class ModularRobotSimulationHandler(SimulationHandler):
     """Implements the simulation handler for a modular robot scene."""
 
     _brains: list[tuple[BrainInstance, BodyToMultiBodySystemMapping]]
+    _merge_cpg_brains: bool
+    _cpg_brains_merged: bool
+
+    def __init__(self, merge_cpg_brains: bool = False) -> None:
+        """
+        Initialize this object.
 
-    def __init__(self) -> None:
-        """Initialize this object."""
+        :param merge_cpg_brains: Whether to integrate the CPG brains of all robots as a single system. See `BrainCpgInstanceGroup`.
+        """
         self._brains = []
+        self._merge_cpg_brains = merge_cpg_brains
+        self._cpg_brains_merged = False
 
     def add_robot(
         self,
@@ -32,6 +45,32 @@ class ModularRobotSimulationHandler(SimulationHandler):
         """
         self._brains.append((brain_instance, body_to_multi_body_system_mapping))
 
+    def replace_brain(self, robot_index: int, brain_instance: BrainInstance) -> None:
+        """
+        Replace the brain that controls a robot, for example to simulate a compiled scene again with a different controller.
+
+        Brain instances keep their state, so replace the brains of all robots to simulate a scene from the start again.
+
+        :param robot_index: The index of the robot, in the order the robots were added.
+        :param brain_instance: The new brain.
+        """
+        _, body_to_multi_body_system_mapping = self._brains[robot_index]
+        self._brains[robot_index] = (brain_instance, body_to_multi_body_system_mapping)
+        self._cpg_brains_merged = False
+
+    def _merge_cpg_brain_instances(self) -> None:
+        """Group the plain CPG brain instances of the robots by integrator, so each group is integrated as one system."""
+        groups: dict[CpgIntegrator, list[BrainCpgInstance]] = {}
+        for brain_instance, _ in self._brains:
+            if (
+                type(brain_instance) is BrainCpgInstance
+                and brain_instance.group is None
+            ):
+                groups.setdefault(brain_instance.integrator, []).append(brain_instance)
+        for instances in groups.values():
+            if len(instances) > 1:
+                BrainCpgInstanceGroup(instances)
+
     def handle(
         self,
         simulation_state: SimulationState,
@@ -45,6 +84,10 @@ class ModularRobotSimulationHandler(SimulationHandler):
         :param simulation_control: Interface for setting control targets.
         :param dt: The time since the last call to this function.
         """
+        if self._merge_cpg_brains and not self._cpg_brains_merged:
+            self._merge_cpg_brain_instances()
+            self._cpg_brains_merged = True
+
         for brain_instance, body_to_multi_body_system_mapping in self._brains:
             sensor_state = ModularRobotSensorStateImpl(
                 simulation_state=simulation_state,
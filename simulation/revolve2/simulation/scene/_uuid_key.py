@@ -24,6 +24,8 @@ class UUIDKey(Generic[_T]):
     """Wraps a value and implements __eq__ and __hash__ based purely on id(value)."""
 
     _value: _T
+    _id: int
+    """The uuid of the value as an integer, so hashing and comparing do not go through `UUID`."""
 
     def __init__(self, value: _T) -> None:
         """
@@ -32,6 +34,7 @@ class UUIDKey(Generic[_T]):
         :param value: The value to wrap.
         """
         self._value = value
+        self._id = value.uuid.int
 
     @property
     def value(self) -> _T:
@@ -54,7 +57,7 @@ class UUIDKey(Generic[_T]):
             other._value, type(self._value)
         ):
             raise ValueError()
-        return self._value.uuid == other._value.uuid
+        return self._id == other._id
 
     def __hash__(self) -> int:
         """
@@ -62,4 +65,4 @@ class UUIDKey(Generic[_T]):
 
         :returns: The hash.
         """
-        return hash(self._value.uuid)
+        return hash(self._id)
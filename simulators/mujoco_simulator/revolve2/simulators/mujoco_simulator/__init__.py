@@ -1,5 +1,6 @@
 """Physics simulator using the MuJoCo."""
 
+from ._compiled_scene import CompiledScene
 from ._local_simulator import LocalSimulator
 
-__all__ = ["LocalSimulator"]
+__all__ = ["CompiledScene", "LocalSimulator"]
@@ -0,0 +1,105 @@
+import mujoco
+from revolve2.simulation.scene import Scene, SimulationState
+from revolve2.simulation.simulator import BatchParameters
+
+from ._abstraction_to_mujoco_mapping import AbstractionToMujocoMapping
+from ._control_interface_impl import ControlInterfaceImpl
+from ._open_gl_vision import OpenGLVision
+from ._render_backend import RenderBackend
+from ._scene_to_model import scene_to_model
+from ._simulation_loop import simulation_loop
+
+
+class CompiledScene:
+    """
+    A scene that is converted to a MuJoCo model once, so it can be simulated many times without rebuilding the model.
+
+    Building the model takes a large part of the time of a short simulation.
+    When only the controller of a scene changes between simulations, such as when learning the brain of a robot,
+    replace the brains through the handler of the scene and call `simulate` again.
+    Every simulation starts from the initial state of the model. Simulation is always headless.
+    """
+
+    _scene: Scene
+    _control_step: float
+    _sample_step: float | None
+    _simulation_time: int | None
+    _model: mujoco.MjModel
+    _mapping: AbstractionToMujocoMapping
+    _data: mujoco.MjData
+    _control_interface: ControlInterfaceImpl
+    _camera_viewers: dict[int, OpenGLVision]
+
+    def __init__(
+        self,
+        scene: Scene,
+        batch_parameters: BatchParameters,
+        cast_shadows: bool = False,
+        fast_sim: bool = False,
+        render_backend: RenderBackend = RenderBackend.EGL,
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param scene: The scene. Its handler is used by every simulation.
+        :param batch_parameters: The simulation parameters.
+        :param cast_shadows: If shadows are cast.
+        :param fast_sim: If fancy rendering is disabled.
+        :param render_backend: The backend used to render the camera sensors.
+        """
+        self._scene = scene
+        self._control_step = 1.0 / batch_parameters.control_frequency
+        self._sample_step = (
+            None
+            if batch_parameters.sampling_frequency is None
+            else 1.0 / batch_parameters.sampling_frequency
+        )
+        self._simulation_time = batch_parameters.simulation_time
+
+        self._model, self._mapping = scene_to_model(
+            scene,
+            batch_parameters.simulation_timestep,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+        )
+        self._data = mujoco.MjData(self._model)
+        self._control_interface = ControlInterfaceImpl(
+            data=self._data, abstraction_to_mujoco_mapping=self._mapping
+        )
+        self._camera_viewers = {
+            camera.camera_id: OpenGLVision(
+                model=self._model,
+                camera=camera,
+                headless=True,
+                open_gl_lib=render_backend,
+            )
+            for camera in self._mapping.camera_sensor.values()
+        }
+
+    @property
+    def scene(self) -> Scene:
+        """
+        Get the scene.
+
+        :returns: The scene.
+        """
+        return self._scene
+
+    def simulate(self) -> list[SimulationState]:
+        """
+        Simulate the scene from its initial state.
+
+        :returns: The results of simulation. The number of returned states depends on the sampling frequency.
+        """
+        mujoco.mj_resetData(self._model, self._data)
+        return simulation_loop(
+            self._scene,
+            self._model,
+            self._data,
+            self._mapping,
+            self._control_interface,
+            self._camera_viewers,
+            self._control_step,
+            self._sample_step,
+            self._simulation_time,
+        )
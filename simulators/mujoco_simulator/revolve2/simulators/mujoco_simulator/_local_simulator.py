@@ -20,6 +20,7 @@ class LocalSimulator(Simulator):
     _fast_sim: bool
     _manual_control: bool
     _viewer_type: ViewerType
+    _executor: concurrent.futures.Executor | None
 
     def __init__(
         self,
@@ -30,6 +31,7 @@ class LocalSimulator(Simulator):
         fast_sim: bool = False,
         manual_control: bool = False,
         viewer_type: ViewerType | str = ViewerType.CUSTOM,
+        executor: concurrent.futures.Executor | None = None,
     ):
         """
         Initialize this object.
@@ -41,11 +43,17 @@ class LocalSimulator(Simulator):
         :param fast_sim: Whether more complex rendering prohibited.
         :param manual_control: Whether the simulation should be controlled manually.
         :param viewer_type: The viewer-implementation to use in the local simulator.
+        :param executor: Pool of worker processes to run the simulations in, for example `ParallelMap.executor` from `revolve2.experimentation.parallel`, so the workers can be shared with other work.
+                         If None, a pool of `num_simulators` processes is created for every batch.
         """
         assert (
             headless or num_simulators == 1
         ), "Cannot have parallel simulators when visualizing."
 
+        assert (
+            headless or executor is None
+        ), "Cannot use a pool of worker processes when visualizing."
+
         assert not (
             headless and start_paused
         ), "Cannot start simulation paused in headless mode."
@@ -61,6 +69,7 @@ class LocalSimulator(Simulator):
             if isinstance(viewer_type, str)
             else viewer_type
         )
+        self._executor = executor
 
     def simulate_batch(self, batch: Batch) -> list[list[SimulationState]]:
         """
@@ -92,29 +101,17 @@ class LocalSimulator(Simulator):
                 simulate_manual_scene(scene=scene)
             return [[]]
 
-        if self._num_simulators > 1:
+        if self._executor is not None:
+            results = self._simulate_in_executor(
+                self._executor, batch, control_step, sample_step
+            )
+        elif self._num_simulators > 1:
             with concurrent.futures.ProcessPoolExecutor(
                 max_workers=self._num_simulators
             ) as executor:
-                futures = [
-                    executor.submit(
-                        simulate_scene,  # This is the function to call, followed by the parameters of the function
-                        scene_index,
-                        scene,
-                        self._headless,
-                        batch.record_settings,
-                        self._start_paused,
-                        control_step,
-                        sample_step,
-                        batch.parameters.simulation_time,
-                        batch.parameters.simulation_timestep,
-                        self._cast_shadows,
-                        self._fast_sim,
-                        self._viewer_type,
-                    )
-                    for scene_index, scene in enumerate(batch.scenes)
-                ]
-                results = [future.result() for future in futures]
+                results = self._simulate_in_executor(
+                    executor, batch, control_step, sample_step
+                )
         else:
             results = [
                 simulate_scene(
@@ -137,3 +134,30 @@ class LocalSimulator(Simulator):
         logging.info("Finished batch.")
 
         return results
+
+    def _simulate_in_executor(
+        self,
+        executor: concurrent.futures.Executor,
+        batch: Batch,
+        control_step: float,
+        sample_step: float | None,
+    ) -> list[list[SimulationState]]:
+        futures = [
+            executor.submit(
+                simulate_scene,  # This is the function to call, followed by the parameters of the function
+                scene_index,
+                scene,
+                self._headless,
+                batch.record_settings,
+                self._start_paused,
+                control_step,
+                sample_step,
+                batch.parameters.simulation_time,
+                batch.parameters.simulation_timestep,
+                self._cast_shadows,
+                self._fast_sim,
+                self._viewer_type,
+            )
+            for scene_index, scene in enumerate(batch.scenes)
+        ]
+        return [future.result() for future in futures]
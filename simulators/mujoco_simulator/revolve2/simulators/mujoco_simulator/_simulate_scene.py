@@ -1,5 +1,4 @@
 import logging
-import math
 
 import cv2
 import mujoco
@@ -7,13 +6,13 @@ import numpy as np
 import numpy.typing as npt
 
 from revolve2.simulation.scene import Scene, SimulationState
-from revolve2.simulation.simulator import RecordSettings
+from revolve2.simulation.simulator import RecordSettings, Viewer
 
 from ._control_interface_impl import ControlInterfaceImpl
 from ._open_gl_vision import OpenGLVision
 from ._render_backend import RenderBackend
 from ._scene_to_model import scene_to_model
-from ._simulation_state_impl import SimulationStateImpl
+from ._simulation_loop import simulation_loop
 from .viewers import CustomMujocoViewer, NativeMujocoViewer, ViewerType
 
 
@@ -72,31 +71,29 @@ def simulate_scene(
     }
 
     """Define some additional control variables."""
-    last_control_time = 0.0
-    last_sample_time = 0.0
     last_video_time = 0.0  # time at which last video frame was saved
 
-    simulation_states: list[SimulationState] = (
-        []
-    )  # The measured states of the simulation
-
     """If we dont have cameras and the backend is not set we go to the default GLFW."""
     if len(mapping.camera_sensor.values()) == 0:
         render_backend = RenderBackend.GLFW
 
     """Initialize viewer object if we need to render the scene."""
+    viewer: Viewer
+    video: cv2.VideoWriter
+    video_step: float
     if not headless or record_settings is not None:
+        viewer_class: type[Viewer]
         match viewer_type:
             case viewer_type.CUSTOM:
-                viewer = CustomMujocoViewer
+                viewer_class = CustomMujocoViewer
             case viewer_type.NATIVE:
-                viewer = NativeMujocoViewer
+                viewer_class = NativeMujocoViewer
             case _:
                 raise ValueError(
                     f"Viewer of type {viewer_type} not defined in _simulate_scene."
                 )
 
-        viewer = viewer(
+        viewer = viewer_class(
             model,
             data,
             width=None if record_settings is None else record_settings.width,
@@ -123,57 +120,8 @@ def simulate_scene(
             viewer.current_viewport_size(),
         )
 
-    """
-    Compute forward dynamics without actually stepping forward in time.
-    This updates the data so we can read out the initial state.
-    """
-    mujoco.mj_forward(model, data)
-    images = {
-        camera_id: camera_viewer.process(model, data)
-        for camera_id, camera_viewer in camera_viewers.items()
-    }
-
-    # Sample initial state.
-    if sample_step is not None:
-        simulation_states.append(
-            SimulationStateImpl(
-                data=data, abstraction_to_mujoco_mapping=mapping, camera_views=images
-            )
-        )
-
-    """After rendering the initial state, we enter the rendering loop."""
-    while (time := data.time) < (
-        float("inf") if simulation_time is None else simulation_time
-    ):
-
-        # do control if it is time
-        if time >= last_control_time + control_step:
-            last_control_time = math.floor(time / control_step) * control_step
-
-            simulation_state = SimulationStateImpl(
-                data=data, abstraction_to_mujoco_mapping=mapping, camera_views=images
-            )
-            scene.handler.handle(simulation_state, control_interface, control_step)
-
-        # sample state if it is time
-        if sample_step is not None:
-            if time >= last_sample_time + sample_step:
-                last_sample_time = int(time / sample_step) * sample_step
-                simulation_states.append(
-                    SimulationStateImpl(
-                        data=data,
-                        abstraction_to_mujoco_mapping=mapping,
-                        camera_views=images,
-                    )
-                )
-
-        # step simulation
-        mujoco.mj_step(model, data)
-        # extract images from camera sensors.
-        images = {
-            camera_id: camera_viewer.process(model, data)
-            for camera_id, camera_viewer in camera_viewers.items()
-        }
+    def render(time: float) -> None:
+        nonlocal last_video_time
 
         # render if not headless. also render when recording and if it time for a new video frame.
         if not headless or (
@@ -201,6 +149,19 @@ def simulate_scene(
             img = np.flipud(img)[:, :, ::-1]
             video.write(img)
 
+    simulation_states = simulation_loop(
+        scene,
+        model,
+        data,
+        mapping,
+        control_interface,
+        camera_viewers,
+        control_step,
+        sample_step,
+        simulation_time,
+        after_step=render if not headless or record_settings is not None else None,
+    )
+
     """Once simulation is done we close the potential viewer and release the potential video."""
     if not headless or record_settings is not None:
         viewer.close_viewer()
@@ -208,13 +169,5 @@ def simulate_scene(
     if record_settings is not None:
         video.release()
 
-    # Sample one final time.
-    if sample_step is not None:
-        simulation_states.append(
-            SimulationStateImpl(
-                data=data, abstraction_to_mujoco_mapping=mapping, camera_views=images
-            )
-        )
-
     logging.info(f"Scene {scene_id} done.")
     return simulation_states
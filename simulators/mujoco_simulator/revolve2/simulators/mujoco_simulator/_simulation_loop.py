@@ -0,0 +1,112 @@
+import math
+from typing import Callable
+
+import mujoco
+import numpy as np
+import numpy.typing as npt
+from revolve2.simulation.scene import Scene, SimulationState
+
+from ._abstraction_to_mujoco_mapping import AbstractionToMujocoMapping
+from ._control_interface_impl import ControlInterfaceImpl
+from ._open_gl_vision import OpenGLVision
+from ._simulation_state_impl import SimulationStateImpl
+
+
+def simulation_loop(
+    scene: Scene,
+    model: mujoco.MjModel,
+    data: mujoco.MjData,
+    mapping: AbstractionToMujocoMapping,
+    control_interface: ControlInterfaceImpl,
+    camera_viewers: dict[int, OpenGLVision],
+    control_step: float,
+    sample_step: float | None,
+    simulation_time: int | None,
+    after_step: Callable[[float], None] | None = None,
+) -> list[SimulationState]:
+    """
+    Simulate a scene from the current state of the data, calling the handler of the scene at every control step.
+
+    :param scene: The scene. Its handler controls the simulation.
+    :param model: The model of the scene.
+    :param data: The data of the model, in the state to start from.
+    :param mapping: The mapping from the scene to the model.
+    :param control_interface: The control interface passed to the handler.
+    :param camera_viewers: The viewers of the camera sensors, by camera id.
+    :param control_step: The time between each call to the handle function of the scene handler. In seconds.
+    :param sample_step: The time between each state sample of the simulation. In seconds.
+    :param simulation_time: How long to simulate for. In seconds.
+    :param after_step: Called after every step of the simulation with the time before the step, for example to render the simulation.
+    :returns: The results of simulation. The number of returned states depends on `sample_step`.
+    """
+    last_control_time = 0.0
+    last_sample_time = 0.0
+
+    simulation_states: list[SimulationState] = []
+
+    """
+    Compute forward dynamics without actually stepping forward in time.
+    This updates the data so we can read out the initial state.
+    """
+    mujoco.mj_forward(model, data)
+    images = _camera_images(model, data, camera_viewers)
+
+    # Sample initial state.
+    if sample_step is not None:
+        simulation_states.append(
+            SimulationStateImpl(
+                data=data, abstraction_to_mujoco_mapping=mapping, camera_views=images
+            )
+        )
+
+    end_time = float("inf") if simulation_time is None else simulation_time
+    while (time := data.time) < end_time:
+        # do control if it is time
+        if time >= last_control_time + control_step:
+            last_control_time = math.floor(time / control_step) * control_step
+
+            simulation_state = SimulationStateImpl(
+                data=data, abstraction_to_mujoco_mapping=mapping, camera_views=images
+            )
+            scene.handler.handle(simulation_state, control_interface, control_step)
+
+        # sample state if it is time
+        if sample_step is not None:
+            if time >= last_sample_time + sample_step:
+                last_sample_time = int(time / sample_step) * sample_step
+                simulation_states.append(
+                    SimulationStateImpl(
+                        data=data,
+                        abstraction_to_mujoco_mapping=mapping,
+                        camera_views=images,
+                    )
+                )
+
+        # step simulation
+        mujoco.mj_step(model, data)
+        # extract images from camera sensors.
+        images = _camera_images(model, data, camera_viewers)
+
+        if after_step is not None:
+            after_step(time)
+
+    # Sample one final time.
+    if sample_step is not None:
+        simulation_states.append(
+            SimulationStateImpl(
+                data=data, abstraction_to_mujoco_mapping=mapping, camera_views=images
+            )
+        )
+
+    return simulation_states
+
+
+def _camera_images(
+    model: mujoco.MjModel,
+    data: mujoco.MjData,
+    camera_viewers: dict[int, OpenGLVision],
+) -> dict[int, npt.NDArray[np.uint8]]:
+    return {
+        camera_id: camera_viewer.process(model, data)
+        for camera_id, camera_viewer in camera_viewers.items()
+    }
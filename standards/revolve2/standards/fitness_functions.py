@@ -161,8 +161,8 @@ def combined_fitness(
     :param xy_weight: The weight for the XY displacement fitness.
     :returns: The calculated fitness.
     """
-    active_hinges = len(robot.body.find_modules_of_type(ActiveHinge))
-    modules = len(robot.body.find_modules_of_type(Module, exclude=[Core]))
+    active_hinges = robot.body.count_modules_of_type(ActiveHinge)
+    modules = robot.body.count_modules_of_type(Module, exclude=[Core])
 
     # Jan 21: added proportional penalty
     if modules <= 4:
@@ -3,3 +3,14 @@ CPPNWIN genotype.
 
 That is, Compositional Pattern-Producing Network With Innovation Numbers.
 """
+
+from ._genome_storage import GenomeStorage, migrate_genome_storage
+from ._multineat_innovation_database_pickle_wrapper import (
+    MultineatInnovationDatabasePickleWrapper,
+)
+
+__all__ = [
+    "GenomeStorage",
+    "MultineatInnovationDatabasePickleWrapper",
+    "migrate_genome_storage",
+]
@@ -0,0 +1,265 @@
+import math
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+import multineat
+import numpy as np
+import numpy.typing as npt
+
+_AF = multineat.ActivationFunction
+
+_SUPPORTED_ACTIVATIONS = {
+    _AF.SIGNED_SIGMOID,
+    _AF.UNSIGNED_SIGMOID,
+    _AF.TANH,
+    _AF.TANH_CUBIC,
+    _AF.SIGNED_STEP,
+    _AF.UNSIGNED_STEP,
+    _AF.SIGNED_GAUSS,
+    _AF.UNSIGNED_GAUSS,
+    _AF.ABS,
+    _AF.SIGNED_SINE,
+    _AF.UNSIGNED_SINE,
+    _AF.LINEAR,
+    _AF.RELU,
+    _AF.SOFTPLUS,
+}
+
+
+def _exp(x: float) -> float:
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return math.inf
+
+
+def _sin(x: float) -> float:
+    return math.nan if math.isinf(x) else math.sin(x)
+
+
+def _elementwise(
+    function: Callable[[float], float], x: npt.NDArray[np.float_]
+) -> npt.NDArray[np.float_]:
+    return np.fromiter(
+        map(function, x.ravel().tolist()), dtype=np.float_, count=x.size
+    ).reshape(x.shape)
+
+
+_Function = Callable[[npt.NDArray[np.float_]], npt.NDArray[np.float_]]
+
+
+@dataclass
+class _ActivationGroup:
+    """Neurons in a layer that share an activation function."""
+
+    function: multineat.ActivationFunction
+    rows: npt.NDArray[np.int_]
+    """Rows of the neurons in the layer."""
+
+    a: npt.NDArray[np.float_]
+    b: npt.NDArray[np.float_]
+
+
+@dataclass
+class _Layer:
+    """
+    Neurons that only depend on neurons in earlier layers.
+
+    Incoming connections are stored as a padded (num_neurons, max_incoming + 1) table, in the order multineat sums them.
+    The first column and the padding refer to an extra neuron whose activation is always zero, with weight zero.
+    Summing a row from left to right therefore starts at +0.0 and adds the signals in order, exactly like multineat.
+    """
+
+    neurons: npt.NDArray[np.int_]
+    sources: npt.NDArray[np.int_]
+    weights: npt.NDArray[np.float_]
+    activation_groups: list[_ActivationGroup]
+
+
+class CompiledCppn:
+    """
+    A multineat CPPN compiled to NumPy, to evaluate many inputs at once.
+
+    Neurons are evaluated layer by layer in topological order.
+    Incoming signals are summed in the same order as multineat does and the activation functions use the same formulas,
+    so with `exact` enabled the outputs are identical to those of multineat's `Input`, `ActivateAllLayers` and `Output`.
+    Only networks without recurrent connections, and with activation functions that are implemented here, are supported.
+    """
+
+    num_inputs: int
+    """Number of inputs of the network, including the bias input."""
+
+    num_outputs: int
+    """Number of outputs of the network."""
+
+    _num_neurons: int
+    _layers: list[_Layer]
+    _exp: _Function
+    _sin: _Function
+    _tanh: _Function
+    _log: _Function
+
+    def __init__(self, genotype: multineat.Genome, exact: bool = True) -> None:
+        """
+        Compile a genotype.
+
+        :param genotype: The genotype to compile.
+        :param exact: Calculate transcendental functions one value at a time using the C math library, like multineat does, giving bit-for-bit equal outputs.
+                      Otherwise NumPy's vectorized functions are used, which can differ in the last bit.
+        :raises ValueError: If the network has recurrent connections or an unsupported activation function.
+        """
+        network = multineat.NeuralNetwork()
+        genotype.BuildPhenotype(network)
+
+        neurons = network.neurons
+        self.num_inputs = network.NumInputs()
+        for neuron in neurons[self.num_inputs :]:
+            if neuron.activation_function_type not in _SUPPORTED_ACTIVATIONS:
+                raise ValueError(
+                    f"Unsupported activation function {neuron.activation_function_type}."
+                )
+        connections = [
+            (c.source_neuron_idx, c.target_neuron_idx, c.weight)
+            for c in network.connections
+        ]
+        self.num_outputs = network.NumOutputs()
+        self._num_neurons = len(neurons)
+        if exact:
+            self._exp = partial(_elementwise, _exp)
+            self._sin = partial(_elementwise, _sin)
+            self._tanh = partial(_elementwise, math.tanh)
+            self._log = partial(_elementwise, math.log)
+        else:
+            self._exp, self._sin, self._tanh, self._log = (
+                np.exp,
+                np.sin,
+                np.tanh,
+                np.log,
+            )
+
+        # Input neurons are never updated by multineat, so connections towards them have no effect.
+        connections = [c for c in connections if c[1] >= self.num_inputs]
+
+        # Assign every neuron to the layer after the last layer it depends on, using Kahn's algorithm.
+        incoming: list[list[tuple[int, float]]] = [[] for _ in neurons]
+        outgoing: list[list[int]] = [[] for _ in neurons]
+        for source, target, weight in connections:
+            incoming[target].append((source, weight))
+            outgoing[source].append(target)
+        depths = [0] * self._num_neurons
+        remaining = [len(c) for c in incoming]
+        ready = [i for i in range(self._num_neurons) if remaining[i] == 0]
+        num_visited = 0
+        while len(ready) > 0:
+            source = ready.pop()
+            num_visited += 1
+            for target in outgoing[source]:
+                depths[target] = max(depths[target], depths[source] + 1)
+                remaining[target] -= 1
+                if remaining[target] == 0:
+                    ready.append(target)
+        if num_visited != self._num_neurons:
+            raise ValueError(
+                "Only networks without recurrent connections can be compiled."
+            )
+        for i in range(self.num_inputs, self._num_neurons):
+            depths[i] = max(depths[i], 1)
+
+        self._layers = []
+        layers: dict[int, list[int]] = {}
+        for i in range(self.num_inputs, self._num_neurons):
+            layers.setdefault(depths[i], []).append(i)
+        for depth in sorted(layers.keys()):
+            layer_neurons = layers[depth]
+            width = 1 + max(len(incoming[i]) for i in layer_neurons)
+            sources = np.full((len(layer_neurons), width), self._num_neurons)
+            weights = np.zeros((len(layer_neurons), width))
+            for row, i in enumerate(layer_neurons):
+                for column, (source, weight) in enumerate(incoming[i], start=1):
+                    sources[row, column] = source
+                    weights[row, column] = weight
+
+            functions: dict[multineat.ActivationFunction, list[int]] = {}
+            for row, i in enumerate(layer_neurons):
+                functions.setdefault(neurons[i].activation_function_type, []).append(
+                    row
+                )
+            activation_groups = [
+                _ActivationGroup(
+                    function=function,
+                    rows=np.array(rows, dtype=np.int_),
+                    a=np.array([neurons[layer_neurons[r]].a for r in rows])[:, None],
+                    b=np.array([neurons[layer_neurons[r]].b for r in rows])[:, None],
+                )
+                for function, rows in functions.items()
+            ]
+            self._layers.append(
+                _Layer(
+                    neurons=np.array(layer_neurons, dtype=np.int_),
+                    sources=sources,
+                    weights=weights[:, :, None],
+                    activation_groups=activation_groups,
+                )
+            )
+
+    def evaluate(self, inputs: npt.NDArray[np.float_]) -> npt.NDArray[np.float_]:
+        """
+        Evaluate the network for many inputs.
+
+        :param inputs: The inputs. Shape (num_queries, num_inputs).
+        :returns: The outputs. Shape (num_queries, num_outputs).
+        """
+        assert inputs.ndim == 2 and inputs.shape[1] == self.num_inputs
+
+        # One row per neuron and an extra row that is always zero.
+        activations = np.zeros((self._num_neurons + 1, inputs.shape[0]))
+        activations[: self.num_inputs] = inputs.T
+        for layer in self._layers:
+            signals = activations[layer.sources] * layer.weights
+            sums = np.cumsum(signals, axis=1)[:, -1]
+            layer_activations = np.empty_like(sums)
+            for group in layer.activation_groups:
+                layer_activations[group.rows] = self._activate(group, sums[group.rows])
+            activations[layer.neurons] = layer_activations
+        return activations[self.num_inputs : self.num_inputs + self.num_outputs].T
+
+    def _activate(
+        self, group: _ActivationGroup, x: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        a = group.a
+        b = group.b
+        exp = self._exp
+        sin = self._sin
+        match group.function:
+            case _AF.SIGNED_SIGMOID:
+                return (1.0 / (1.0 + exp(-a * x - b)) - 0.5) * 2.0
+            case _AF.UNSIGNED_SIGMOID:
+                return 1.0 / (1.0 + exp(-a * x - b))
+            case _AF.TANH:
+                return self._tanh(x * a)
+            case _AF.TANH_CUBIC:
+                return self._tanh(x * x * x * a)
+            case _AF.SIGNED_STEP:
+                return np.where(x > b, 1.0, -1.0)
+            case _AF.UNSIGNED_STEP:
+                return np.where(x > 0.5 + b, 1.0, 0.0)
+            case _AF.SIGNED_GAUSS:
+                return (exp(-a * x * x + b) - 0.5) * 2.0
+            case _AF.UNSIGNED_GAUSS:
+                return exp(-a * x * x + b)
+            case _AF.ABS:
+                result: npt.NDArray[np.float_] = np.abs(x + b)
+                return result
+            case _AF.SIGNED_SINE:
+                return sin(x * a + b)
+            case _AF.UNSIGNED_SINE:
+                return (sin(x * a + b) + 1.0) / 2.0
+            case _AF.LINEAR:
+                return x + b
+            case _AF.RELU:
+                return np.where(x > 0, x, 0.0)
+            case _AF.SOFTPLUS:
+                return self._log(1 + exp(x))
+            case _:
+                raise ValueError(f"Unsupported activation function {group.function}.")
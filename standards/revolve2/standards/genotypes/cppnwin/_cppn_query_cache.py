@@ -0,0 +1,80 @@
+import multineat
+import numpy as np
+
+from ._compiled_cppn import CompiledCppn
+
+
+class CppnQueryCache:
+    """
+    Queries a multineat CPPN and remembers the outputs.
+
+    Queries that are known in advance can be prefetched.
+    Large batches are evaluated at once using a `CompiledCppn`, which gives the same outputs as querying multineat one by one.
+    Outputs are only remembered for networks without recurrent connections, because only those always give the same outputs for the same inputs.
+    Networks that cannot be compiled are always queried one by one.
+    """
+
+    COMPILE_MIN_QUERIES = 32
+    """Minimum number of new queries in a prefetch for which compiling the CPPN is faster than querying multineat directly."""
+
+    _genotype: multineat.Genome
+    _network: multineat.NeuralNetwork
+    _compiled: CompiledCppn | None
+    _compilable: bool
+    _memoize: bool
+    _outputs: dict[tuple[float, ...], list[float]]
+
+    def __init__(self, genotype: multineat.Genome) -> None:
+        """
+        Initialize this object.
+
+        :param genotype: The genotype of the CPPN.
+        """
+        self._genotype = genotype
+        self._network = multineat.NeuralNetwork()
+        genotype.BuildPhenotype(self._network)
+        self._compiled = None
+        self._compilable = True
+        self._memoize = not any(c.recur_flag for c in self._network.connections)
+        self._outputs = {}
+
+    def prefetch(self, queries: list[tuple[float, ...]]) -> None:
+        """
+        Evaluate queries ahead of time, so later calls to `query` for them are cheap.
+
+        Does nothing if there are too few new queries to benefit from evaluating them together, or if the CPPN cannot be compiled.
+
+        :param queries: The inputs of the queries.
+        """
+        if not self._memoize or not self._compilable:
+            return
+        new_queries = [
+            inputs for inputs in dict.fromkeys(queries) if inputs not in self._outputs
+        ]
+        if len(new_queries) < self.COMPILE_MIN_QUERIES:
+            return
+        if self._compiled is None:
+            try:
+                self._compiled = CompiledCppn(self._genotype)
+            except ValueError:
+                # Recurrent networks and unsupported activation functions cannot be compiled.
+                self._compilable = False
+                return
+        outputs = self._compiled.evaluate(np.array(new_queries, dtype=np.float_))
+        self._outputs.update(zip(new_queries, outputs.tolist()))
+
+    def query(self, inputs: tuple[float, ...]) -> list[float]:
+        """
+        Get the outputs of the CPPN for the given inputs.
+
+        :param inputs: The inputs.
+        :returns: The outputs.
+        """
+        outputs = self._outputs.get(inputs)
+        if outputs is None:
+            self._network.Input(list(inputs))
+            self._network.ActivateAllLayers()
+            outputs = list(self._network.Output())
+            if self._memoize:
+                self._outputs[inputs] = outputs
+        return outputs
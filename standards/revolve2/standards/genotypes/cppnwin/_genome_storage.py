@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import base64
+import zlib
+from enum import Enum, auto
+from typing import Any, cast
+
+import multineat
+import sqlalchemy
+import sqlalchemy.orm as orm
+from sqlalchemy.engine import Engine
+
+_COMPRESSED_PREFIX = "zlib:"
+
+
+class GenomeStorage(Enum):
+    """
+    Format in which a multineat genome is stored in a database column.
+
+    Both formats are stored as text, so they can be mixed in the same column and the database schema does not change.
+    Stored genomes are recognized by their content, so loading works for both formats regardless of the chosen format.
+    """
+
+    TEXT = auto()
+    """The output of `multineat.Genome.Serialize`."""
+
+    COMPRESSED = auto()
+    """The serialized genome without whitespace, compressed using zlib and encoded as base64. About fifteen times smaller than `TEXT`."""
+
+
+def serialize_genome(genome: multineat.Genome, storage: GenomeStorage) -> str:
+    """
+    Serialize a genome for storage in a database.
+
+    :param genome: The genome.
+    :param storage: The storage format.
+    :returns: The serialized genome.
+    """
+    return _encode(cast(str, genome.Serialize()), storage)
+
+
+def deserialize_genome(serialized: str) -> multineat.Genome:
+    """
+    Deserialize a genome stored in any of the storage formats.
+
+    :param serialized: The serialized genome.
+    :returns: The genome.
+    """
+    genome = multineat.Genome()
+    genome.Deserialize(_decode(serialized))
+    return genome
+
+
+def _encode(text: str, storage: GenomeStorage) -> str:
+    match storage:
+        case GenomeStorage.TEXT:
+            return text
+        case GenomeStorage.COMPRESSED:
+            compressed = zlib.compress("".join(text.split()).encode())
+            return _COMPRESSED_PREFIX + base64.b64encode(compressed).decode()
+
+
+def _decode(serialized: str) -> str:
+    if serialized.startswith(_COMPRESSED_PREFIX):
+        return zlib.decompress(
+            base64.b64decode(serialized[len(_COMPRESSED_PREFIX) :])
+        ).decode()
+    return serialized
+
+
+class LazyGenome:
+    """
+    Attribute of an SQLAlchemy model that holds a multineat genome, stored serialized in a mapped column.
+
+    Genomes of loaded models are only deserialized when the attribute is first accessed,
+    so loading many models, for example to read their fitness, does not pay for deserialization.
+    """
+
+    _serialized_attribute: str
+    _cache_attribute: str
+
+    def __init__(self, serialized_attribute: str) -> None:
+        """
+        Initialize this object.
+
+        :param serialized_attribute: Name of the mapped attribute that holds the serialized genome.
+        """
+        self._serialized_attribute = serialized_attribute
+        self._cache_attribute = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """
+        Choose the name under which the genome is cached in the model instances.
+
+        :param owner: The model class.
+        :param name: The name of this attribute.
+        """
+        self._cache_attribute = f"_{name}_genome"
+
+    def __get__(self, instance: Any, owner: type | None = None) -> multineat.Genome:
+        """
+        Get the genome, deserializing it if it has not been accessed before.
+
+        :param instance: The model instance.
+        :param owner: The model class.
+        :returns: The genome.
+        :raises AttributeError: If accessed on the class, which tells dataclasses that the attribute has no default.
+        """
+        if instance is None:
+            raise AttributeError(self._cache_attribute)
+        genome = instance.__dict__.get(self._cache_attribute)
+        if genome is None:
+            genome = deserialize_genome(getattr(instance, self._serialized_attribute))
+            instance.__dict__[self._cache_attribute] = genome
+        return genome
+
+    def __set__(self, instance: Any, genome: multineat.Genome) -> None:
+        """
+        Set the genome.
+
+        :param instance: The model instance.
+        :param genome: The genome.
+        """
+        instance.__dict__[self._cache_attribute] = genome
+
+
+def migrate_genome_storage(
+    dbengine: Engine,
+    model: type[orm.DeclarativeBase],
+    columns: list[str],
+    storage: GenomeStorage,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Convert the genomes stored in a table to a different storage format.
+
+    Genomes are converted as text, without deserializing them.
+    Rows are converted in batches, each in its own transaction, so the migration can be interrupted and run again.
+
+    For example, to compress the genomes of a model using both `BodyGenotypeOrmV2` and `BrainGenotypeCpgOrm`:
+    `migrate_genome_storage(dbengine, Genotype, ["serialized_body", "serialized_brain"], GenomeStorage.COMPRESSED)`.
+
+    :param dbengine: The database.
+    :param model: The model whose table has the genomes.
+    :param columns: Names of the columns with genomes.
+    :param storage: The storage format to convert to.
+    :param batch_size: Number of rows to convert per transaction.
+    :returns: The number of converted rows.
+    """
+    table = model.__table__
+    (key,) = orm.class_mapper(model).primary_key
+    update = (
+        sqlalchemy.update(model)
+        .where(key == sqlalchemy.bindparam("_key"))
+        .values({column: sqlalchemy.bindparam(f"_{column}") for column in columns})
+    )
+
+    num_converted = 0
+    last_key = None
+    while True:
+        with dbengine.begin() as connection:
+            select = (
+                sqlalchemy.select(key, *[table.c[column] for column in columns])
+                .order_by(key)
+                .limit(batch_size)
+            )
+            if last_key is not None:
+                select = select.where(key > last_key)
+            rows = connection.execute(select).all()
+            if len(rows) == 0:
+                return num_converted
+            last_key = rows[-1][0]
+
+            changed: list[dict[str, Any]] = []
+            for row in rows:
+                stored: list[str] = list(row[1:])
+                converted = [_encode(_decode(genome), storage) for genome in stored]
+                if converted != stored:
+                    changed.append(
+                        {"_key": row[0]}
+                        | {
+                            f"_{column}": genome
+                            for column, genome in zip(columns, converted)
+                        }
+                    )
+            if len(changed) > 0:
+                connection.execute(update, changed)
+            num_converted += len(changed)
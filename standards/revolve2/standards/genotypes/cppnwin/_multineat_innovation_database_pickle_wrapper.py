@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import cast
+
+import multineat
+
+
+@dataclass
+class MultineatInnovationDatabasePickleWrapper:
+    """
+    A wrapper about multineat.InnovationDatabase that provides pickling.
+
+    The innovation numbers and neuron ids that will be assigned next are pickled as well,
+    so mutating genotypes using an unpickled database gives the same results as using the original.
+    """
+
+    innovation_database: multineat.InnovationDatabase
+
+    def __getstate__(self) -> str:
+        """
+        Convert the innovation database to a string, serializing it.
+
+        :returns: The string.
+        """
+        return cast(str, self.innovation_database.Serialize()).replace(" ", "")
+
+    def __setstate__(self, serialized_innovation_database: str) -> None:
+        """
+        Convert a string obtained through __getstate__ to an innovation database and set it as the innovation database.
+
+        :param serialized_innovation_database: The string to convert.
+        """
+        innovation_database = multineat.InnovationDatabase()
+        innovation_database.Deserialize(serialized_innovation_database)
+        self.innovation_database = innovation_database
@@ -1,12 +1,15 @@
 from typing import cast
 
 import multineat
+import numpy as np
 
 from revolve2.modular_robot.body.base import ActiveHinge, Body
 from revolve2.modular_robot.brain.cpg import (
     BrainCpgNetworkNeighbor as ModularRobotBrainCpgNetworkNeighbor,
 )
 
+from .._compiled_cppn import CompiledCppn
+
 
 class BrainCpgNetworkNeighbor(ModularRobotBrainCpgNetworkNeighbor):
     """
@@ -15,8 +18,14 @@ class BrainCpgNetworkNeighbor(ModularRobotBrainCpgNetworkNeighbor):
     Weights are determined by querying the CPPN network with inputs:
     (hinge1_posx, hinge1_posy, hinge1_posz, hinge2_posx, hinge2_posy, hinge3_posz)
     If the weight in internal, hinge1 and hinge2 position will be the same.
+
+    Robots with many weights evaluate all queries at once using a `CompiledCppn`, which gives the same weights as querying multineat one by one.
+    Networks that cannot be compiled are always queried one by one.
     """
 
+    COMPILE_MIN_QUERIES = 80
+    """Minimum number of weights for which compiling the CPPN is faster than querying multineat directly."""
+
     _genotype: multineat.Genome
 
     def __init__(self, genotype: multineat.Genome, body: Body):
@@ -35,47 +44,42 @@ class BrainCpgNetworkNeighbor(ModularRobotBrainCpgNetworkNeighbor):
         connections: list[tuple[ActiveHinge, ActiveHinge]],
         body: Body,
     ) -> tuple[list[float], list[float]]:
-        brain_net = multineat.NeuralNetwork()
-        self._genotype.BuildPhenotype(brain_net)
-
-        internal_weights = [
-            self._evaluate_network(
-                brain_net,
-                [
-                    1.0,
-                    float(pos.x),
-                    float(pos.y),
-                    float(pos.z),
-                    float(pos.x),
-                    float(pos.y),
-                    float(pos.z),
-                ],
-            )
-            for pos in [
-                body.grid_position(active_hinge) for active_hinge in active_hinges
-            ]
-        ]
-
-        external_weights = [
-            self._evaluate_network(
-                brain_net,
-                [
-                    1.0,
-                    float(pos1.x),
-                    float(pos1.y),
-                    float(pos1.z),
-                    float(pos2.x),
-                    float(pos2.y),
-                    float(pos2.z),
-                ],
-            )
-            for (pos1, pos2) in [
-                (body.grid_position(active_hinge1), body.grid_position(active_hinge2))
+        lattice = body.lattice
+        positions = lattice.positions[
+            [lattice.index_of(active_hinge) for active_hinge in active_hinges]
+        ].astype(np.float_)
+        hinge_indices = {
+            active_hinge: i for i, active_hinge in enumerate(active_hinges)
+        }
+        pairs = np.array(
+            [
+                (hinge_indices[active_hinge1], hinge_indices[active_hinge2])
                 for (active_hinge1, active_hinge2) in connections
+            ],
+            dtype=np.int_,
+        ).reshape(-1, 2)
+
+        # All queries are evaluated at once, internal weights first.
+        # The inputs are (1.0, hinge1_posx, hinge1_posy, hinge1_posz, hinge2_posx, hinge2_posy, hinge2_posz).
+        first = np.concatenate([np.arange(len(active_hinges)), pairs[:, 0]])
+        second = np.concatenate([np.arange(len(active_hinges)), pairs[:, 1]])
+        inputs = np.column_stack(
+            [np.ones(len(first)), positions[first], positions[second]]
+        )
+        weights: list[float] | None = None
+        if len(inputs) >= self.COMPILE_MIN_QUERIES:
+            try:
+                weights = CompiledCppn(self._genotype).evaluate(inputs)[:, 0].tolist()
+            except ValueError:
+                pass  # Recurrent networks and unsupported activation functions cannot be compiled.
+        if weights is None:
+            brain_net = multineat.NeuralNetwork()
+            self._genotype.BuildPhenotype(brain_net)
+            weights = [
+                self._evaluate_network(brain_net, query) for query in inputs.tolist()
             ]
-        ]
 
-        return (internal_weights, external_weights)
+        return (weights[: len(active_hinges)], weights[len(active_hinges) :])
 
     @staticmethod
     def _evaluate_network(
@@ -9,6 +9,7 @@ from typing_extensions import Self
 
 from revolve2.modular_robot.body.base import Body
 
+from .._genome_storage import GenomeStorage, LazyGenome, serialize_genome
 from .._multineat_rng_from_random import multineat_rng_from_random
 from .._random_multineat_genotype import random_multineat_genotype
 from ._brain_cpg_network_neighbor import BrainCpgNetworkNeighbor
@@ -22,7 +23,10 @@ class BrainGenotypeCpgOrm(orm.MappedAsDataclass, kw_only=True):
 
     _NUM_INITIAL_MUTATIONS = 5
 
-    brain: multineat.Genome
+    GENOME_STORAGE = GenomeStorage.TEXT
+    """Format in which the genome is stored in the database. Subclasses can use `GenomeStorage.COMPRESSED` to save space."""
+
+    brain: multineat.Genome = LazyGenome("_serialized_brain")
 
     _serialized_brain: orm.Mapped[str] = orm.mapped_column(
         "serialized_brain", init=False, nullable=False
@@ -125,11 +129,4 @@ def _serialize_brain(
     connection: Connection,
     target: BrainGenotypeCpgOrm,
 ) -> None:
-    target._serialized_brain = target.brain.Serialize()
-
-
-@event.listens_for(BrainGenotypeCpgOrm, "load", propagate=True)
-def _deserialize_brain(target: BrainGenotypeCpgOrm, context: orm.QueryContext) -> None:
-    brain = multineat.Genome()
-    brain.Deserialize(target._serialized_brain)
-    target.brain = brain
+    target._serialized_brain = serialize_genome(target.brain, target.GENOME_STORAGE)
@@ -1,21 +1,24 @@
+import math
 from dataclasses import dataclass
-from queue import Queue
 from typing import Any
 
 import multineat
 import numpy as np
-from numpy.typing import NDArray
-from pyrr import Quaternion, Vector3
+from pyrr import Quaternion
 
 from revolve2.modular_robot.body import AttachmentPoint, Module
 from revolve2.modular_robot.body.v1 import ActiveHingeV1, BodyV1, BrickV1
 
+from ..._cppn_query_cache import CppnQueryCache
+
+_Vector3 = tuple[int, int, int]
+
 
 @dataclass
 class __Module:
-    position: Vector3[np.int_]
-    forward: Vector3[np.int_]
-    up: Vector3[np.int_]
+    position: _Vector3
+    forward: _Vector3
+    up: _Vector3
     chain_length: int
     module_reference: Module
 
@@ -33,46 +36,57 @@ def develop(
     """
     max_parts = 10
 
-    body_net = multineat.NeuralNetwork()
-    genotype.BuildPhenotype(body_net)
-
-    to_explore: Queue[__Module] = Queue()
-    grid = np.zeros(
-        shape=(max_parts * 2 + 1, max_parts * 2 + 1, max_parts * 2 + 1), dtype=np.uint8
-    )
+    body_net = CppnQueryCache(genotype)
 
     body = BodyV1()
 
-    core_position = Vector3(
-        [max_parts + 1, max_parts + 1, max_parts + 1], dtype=np.int_
-    )
-    to_explore.put(
-        __Module(
-            core_position,
-            Vector3([0, -1, 0], dtype=np.int_),
-            Vector3([0, 0, 1], dtype=np.int_),
-            0,
-            body.core,
-        )
-    )
-    grid[tuple(core_position)] = 1
+    core_position = (max_parts + 1, max_parts + 1, max_parts + 1)
+    frontier = [__Module(core_position, (0, -1, 0), (0, 0, 1), 0, body.core)]
+    occupied = {core_position}
     part_count = 1
 
-    while not to_explore.empty():
-        module = to_explore.get()
+    # Modules are added breadth first, so all children of the frontier are explored before their own children.
+    # The CPPN is queried for the free positions around the whole frontier at once.
+    while len(frontier) > 0 and part_count < max_parts:
+        candidates = []
+        for module in frontier:
+            attachment_points = module.module_reference.attachment_points
+            for attachment_point_tuple in attachment_points.items():
+                forward = __rotate(
+                    module.forward,
+                    module.up,
+                    __right_angle(attachment_point_tuple[1].orientation),
+                )
+                position = __add(module.position, forward)
+                candidates.append((module, attachment_point_tuple, forward, position))
+        body_net.prefetch(
+            [
+                (1.0, *position, module.chain_length + 1)
+                for module, _, _, position in candidates
+                if position not in occupied
+            ]
+        )
 
-        for attachment_point_tuple in module.module_reference.attachment_points.items():
+        frontier = []
+        for module, attachment_point_tuple, forward, position in candidates:
             if part_count < max_parts:
-                child = __add_child(body_net, module, attachment_point_tuple, grid)
+                child = __add_child(
+                    body_net,
+                    module,
+                    attachment_point_tuple,
+                    forward,
+                    position,
+                    occupied,
+                )
                 if child is not None:
-                    to_explore.put(child)
+                    frontier.append(child)
                     part_count += 1
     return body
 
 
 def __evaluate_cppn(
-    body_net: multineat.NeuralNetwork,
-    position: Vector3[np.int_],
+    body_net: CppnQueryCache,
+    position: _Vector3,
     chain_length: int,
 ) -> tuple[Any, int]:
     """
@@ -83,48 +97,41 @@ def __evaluate_cppn(
     :param chain_length: Tree distance of the module from the core.
     :returns: (module type, rotation_index)
     """
-    x, y, z = position
-    assert isinstance(
-        x, np.int_
-    ), f"Error: The position is not of type int. Type: {type(x)}."
-    body_net.Input([1.0, x, y, z, chain_length])  # 1.0 is the bias input
-    body_net.ActivateAllLayers()
-    outputs = body_net.Output()
+    outputs = body_net.query((1.0, *position, chain_length))  # 1.0 is the bias input
 
     # get module type from output probabilities
-    type_probs = list(outputs[:3])
+    type_probs = outputs[:3]
     types = [None, BrickV1, ActiveHingeV1]
     module_type = types[type_probs.index(min(type_probs))]
 
     # get rotation from output probabilities
-    rotation_probs = list(outputs[3:5])
+    rotation_probs = outputs[3:5]
     rotation_index = rotation_probs.index(min(rotation_probs))
 
     return module_type, rotation_index
 
 
 def __add_child(
-    body_net: multineat.NeuralNetwork,
+    body_net: CppnQueryCache,
     module: __Module,
     attachment_point_tuple: tuple[int, AttachmentPoint],
-    grid: NDArray[np.uint8],
+    forward: _Vector3,
+    position: _Vector3,
+    occupied: set[_Vector3],
 ) -> __Module | None:
-    attachment_index, attachment_point = attachment_point_tuple
-
-    forward = __rotate(module.forward, module.up, attachment_point.orientation)
-    position = __vec3_int(module.position + forward)
+    attachment_index, _ = attachment_point_tuple
     chain_length = module.chain_length + 1
 
     # if grid cell is occupied, don't make a child
-    if grid[tuple(position)] > 0:
+    if position in occupied:
         return None
-    grid[tuple(position)] += 1
+    occupied.add(position)
 
     child_type, child_rotation = __evaluate_cppn(body_net, position, chain_length)
     if child_type is None:
         return None
     angle = child_rotation * (np.pi / 2.0)
-    up = __rotate(module.up, forward, Quaternion.from_eulers([angle, 0, 0]))
+    up = __rotate(module.up, forward, __CHILD_ROTATIONS[child_rotation])
     child = child_type(angle)
     module.module_reference.set_child(child, attachment_index)
 
@@ -137,28 +144,42 @@ def __add_child(
     )
 
 
-def __rotate(a: Vector3, b: Vector3, rotation: Quaternion) -> Vector3:
+def __right_angle(rotation: Quaternion) -> tuple[int, int]:
+    """
+    Get the cosine and sine of the angle of a rotation, rounded to integers.
+
+    :param rotation: The quaternion for rotation.
+    :returns: (cosine, sine)
+    """
+    angle = rotation.angle
+    return int(round(math.cos(angle))), int(round(math.sin(angle)))
+
+
+def __rotate(a: _Vector3, b: _Vector3, rotation: tuple[int, int]) -> _Vector3:
     """
     Rotates vector a a given angle around b.
 
     :param a: Vector a.
     :param b: Vector b.
-    :param rotation: The quaternion for rotation.
+    :param rotation: The cosine and sine of the angle, see `__right_angle`.
     :returns: A copy of a, rotated.
     """
-    cosangle: int = int(round(np.cos(rotation.angle)))
-    sinangle: int = int(round(np.sin(rotation.angle)))
+    cosangle, sinangle = rotation
+    ax, ay, az = a
+    bx, by, bz = b
+    dot = (1 - cosangle) * (bx * ax + by * ay + bz * az)
+    return (
+        ax * cosangle + sinangle * (by * az - bz * ay) + dot * bx,
+        ay * cosangle + sinangle * (bz * ax - bx * az) + dot * by,
+        az * cosangle + sinangle * (bx * ay - by * ax) + dot * bz,
+    )
 
-    vec: Vector3 = a * cosangle + sinangle * b.cross(a) + (1 - cosangle) * b.dot(a) * b
-    return vec
 
+def __add(a: _Vector3, b: _Vector3) -> _Vector3:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
 
-def __vec3_int(vector: Vector3) -> Vector3[np.int_]:
-    """
-    Cast a Vector3 object to an integer only Vector3.
 
-    :param vector: The vector.
-    :return: The integer vector.
-    """
-    x, y, z = map(lambda v: int(round(v)), vector)
-    return Vector3([x, y, z], dtype=np.int64)
+__CHILD_ROTATIONS = [
+    __right_angle(Quaternion.from_eulers([i * (np.pi / 2.0), 0, 0])) for i in range(2)
+]
+"""The rotation of a child around its forward direction, for every rotation index."""
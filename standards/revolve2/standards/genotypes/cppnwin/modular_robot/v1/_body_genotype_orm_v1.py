@@ -9,6 +9,7 @@ from typing_extensions import Self
 
 from revolve2.modular_robot.body.v1 import BodyV1
 
+from ..._genome_storage import GenomeStorage, LazyGenome, serialize_genome
 from ..._multineat_rng_from_random import multineat_rng_from_random
 from ..._random_multineat_genotype import random_multineat_genotype
 from .._multineat_params import get_multineat_params
@@ -21,7 +22,10 @@ class BodyGenotypeOrmV1(orm.MappedAsDataclass, kw_only=True):
     _NUM_INITIAL_MUTATIONS = 5
     _MULTINEAT_PARAMS = get_multineat_params()
 
-    body: multineat.Genome
+    GENOME_STORAGE = GenomeStorage.TEXT
+    """Format in which the genome is stored in the database. Subclasses can use `GenomeStorage.COMPRESSED` to save space."""
+
+    body: multineat.Genome = LazyGenome("_serialized_body")
 
     _serialized_body: orm.Mapped[str] = orm.mapped_column(
         "serialized_body", init=False, nullable=False
@@ -123,11 +127,4 @@ def _update_serialized_body(
     connection: Connection,
     target: BodyGenotypeOrmV1,
 ) -> None:
-    target._serialized_body = target.body.Serialize()
-
-
-@event.listens_for(BodyGenotypeOrmV1, "load", propagate=True)
-def _deserialize_body(target: BodyGenotypeOrmV1, context: orm.QueryContext) -> None:
-    body = multineat.Genome()
-    body.Deserialize(target._serialized_body)
-    target.body = body
+    target._serialized_body = serialize_genome(target.body, target.GENOME_STORAGE)
@@ -1,20 +1,24 @@
+import math
 from dataclasses import dataclass
-from queue import Queue
 from typing import Any
 
 import multineat
 import numpy as np
-from numpy.typing import NDArray
-from pyrr import Quaternion, Vector3
+from pyrr import Quaternion
 
 from revolve2.modular_robot.body import AttachmentPoint, Module
 from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2Large, BrickV2
 
+from ..._cppn_query_cache import CppnQueryCache
+
+_Vector3 = tuple[int, int, int]
+
+
 @dataclass
 class __Module:
-    position: Vector3[np.int_]
-    forward: Vector3[np.int_]
-    up: Vector3[np.int_]
+    position: _Vector3
+    forward: _Vector3
+    up: _Vector3
     chain_length: int
     module_reference: Module
 
@@ -31,69 +35,61 @@ def develop(
     :returns: The create body.
     """
     max_parts = 20  # Determine the maximum parts available for a robots body.
-    body_net = (
-        multineat.NeuralNetwork()
-    )  # Instantiate the CPPN network for body construction.
-    genotype.BuildPhenotype(body_net)  # Build the CPPN from the genotype of the robot.
-
-    to_explore: Queue[__Module] = (
-        Queue()
-    )  # Here we have a queue that is used to build our robot.
-    grid = np.zeros(
-        shape=(max_parts * 2 + 1, max_parts * 2 + 1, max_parts * 2 + 1), dtype=np.uint8
-    )
+    body_net = CppnQueryCache(genotype)  # Build the CPPN from the genotype of the robot.
 
     body = BodyV2()
 
-    core_position = Vector3(
-        [max_parts + 1, max_parts + 1, max_parts + 1], dtype=np.int_
-    )
-    grid[tuple(core_position)] = 1
+    core_position = (max_parts + 1, max_parts + 1, max_parts + 1)
+    occupied = {core_position}  # The grid cells that contain a module.
     part_count = 1
 
-    for attachment_face in body.core_v2.attachment_faces.values():
-        to_explore.put(
-            __Module(
-                core_position,
-                Vector3([0, -1, 0]),
-                Vector3([0, 0, 1]),
-                0,
-                attachment_face,
-            )
-        )
+    frontier = [
+        __Module(core_position, (0, -1, 0), (0, 0, 1), 0, attachment_face)
+        for attachment_face in body.core_v2.attachment_faces.values()
+    ]
 
-    while not to_explore.empty():
-        module = to_explore.get()
+    """
+    Modules are added breadth first, so all children of the frontier are explored before their own children.
+    
+    The CPPN is queried for the free positions around the whole frontier at once.
+    """
+    while len(frontier) > 0 and part_count < max_parts:
+        candidates = []
+        for module in frontier:
+            for attachment_point_tuple in module.module_reference.attachment_points.items():
+                candidates.append(__make_candidate(module, attachment_point_tuple))
+        body_net.prefetch(
+            [
+                (1.0, *query_position, module.chain_length + 1)
+                for module, _, _, position, query_position in candidates
+                if position not in occupied
+            ]
+        )
 
-        for attachment_point_tuple in module.module_reference.attachment_points.items():
+        frontier = []
+        for candidate in candidates:
             if part_count < max_parts:
-                child = __add_child(body_net, module, attachment_point_tuple, grid)
+                child = __add_child(body_net, *candidate, occupied)
                 if child is not None:
-                    to_explore.put(child)
+                    frontier.append(child)
                     part_count += 1
     return body
 
 
 def __evaluate_cppn(
-    body_net: multineat.NeuralNetwork,
-    position: Vector3[np.int_],
+    body_net: CppnQueryCache,
+    position: _Vector3,
     chain_length: int,
-) -> tuple[Any, float, float]:
+) -> tuple[Any, int]:
     """
     Get module type and orientation from a multineat CPPN network.
 
     :param body_net: The CPPN network.
     :param position: Position of the module.
     :param chain_length: Tree distance of the module from the core.
-    :returns: (module type, angle)
+    :returns: (module type, rotation_index)
     """
-    x, y, z = position
-    assert isinstance(
-        x, np.int_
-    ), f"Error: The position is not of type int. Type: {type(x)}."
-    body_net.Input([1.0, x, y, z, chain_length])  # 1.0 is the bias input
-    body_net.ActivateAllLayers()
-    outputs = body_net.Output()
+    outputs = body_net.query((1.0, *position, chain_length))  # 1.0 is the bias input
 
     """We select the module type for the current position using the first output of the CPPN network."""
     types = [None, BrickV2, ActiveHingeV2] # TODO: Edit this to BrickV2
@@ -105,33 +101,64 @@ def __evaluate_cppn(
     
     The output ranges between [0,1] and we have 4 rotations available (0, 90, 180, 270).
     """
-    angle = max(0, int(outputs[1] * 4 - 1e-6)) * (np.pi / 2.0)
+    rotation_index = max(0, int(outputs[1] * 4 - 1e-6))
 
     # bone_length = max(0, 75 + int(outputs[2] * 150 - 1e-6))
 
-    return module_type, angle #, bone_length
+    return module_type, rotation_index #, bone_length
 
 
-def __add_child(
-    body_net: multineat.NeuralNetwork,
+def __make_candidate(
     module: __Module,
     attachment_point_tuple: tuple[int, AttachmentPoint],
-    grid: NDArray[np.uint8],
-) -> __Module | None:
-    attachment_index, attachment_point = attachment_point_tuple
+) -> tuple[__Module, tuple[int, AttachmentPoint], _Vector3, _Vector3, _Vector3]:
+    """
+    Get the direction and grid cell of a potential child, and the position the CPPN is queried with.
+
+    :param module: The parent module.
+    :param attachment_point_tuple: The attachment point on the parent.
+    :returns: (parent module, attachment point tuple, forward, grid position, query position)
+    """
+    _, attachment_point = attachment_point_tuple
 
     """Here we adjust the forward facing direction, and the position for the new potential module."""
-    forward = __rotate(module.forward, module.up, attachment_point.orientation)
-    position = __vec3_int(module.position + forward)
+    forward = __rotate(module.forward, module.up, __right_angle(attachment_point.orientation))
+    position = (
+        module.position[0] + forward[0],
+        module.position[1] + forward[1],
+        module.position[2] + forward[2],
+    )
+
+    """The CPPN is queried at the position adjusted to fit the attachment point of the parent."""
+    x, y, z = position
+    offset_x, offset_y, offset_z = attachment_point.offset
+    query_position = (
+        round(x + float(offset_x)),
+        round(y + float(offset_y)),
+        round(z + float(offset_z)),
+    )
+    return module, attachment_point_tuple, forward, position, query_position
+
+
+def __add_child(
+    body_net: CppnQueryCache,
+    module: __Module,
+    attachment_point_tuple: tuple[int, AttachmentPoint],
+    forward: _Vector3,
+    position: _Vector3,
+    query_position: _Vector3,
+    occupied: set[_Vector3],
+) -> __Module | None:
+    attachment_index, _ = attachment_point_tuple
     chain_length = module.chain_length + 1
 
     """If grid cell is occupied, we don't make a child."""
-    if grid[tuple(position)] > 0:
+    if position in occupied:
         return None
 
-    """Now we anjust the position for the potential new module to fit the attachment point of the parent, additionally we query the CPPN for child type and angle of the child."""
-    new_pos = np.array(np.round(position + attachment_point.offset), dtype=np.int64)
-    child_type, angle = __evaluate_cppn(body_net, new_pos, chain_length)
+    """Now we query the CPPN for child type and angle of the child."""
+    child_type, rotation_index = __evaluate_cppn(body_net, query_position, chain_length)
+    angle = rotation_index * (np.pi / 2.0)
     # TODO remove bone_length
 
     """Here we check whether the CPPN evaluated to place a module and if the module can be set on the parent."""
@@ -149,9 +176,9 @@ def __add_child(
         """
     else:
         child = child_type(angle)
-    grid[tuple(position)] += 1
+    occupied.add(position)
     # TODO: check if the current block overlaps with other grid cells. If so, also set that grid cell to 1
-    up = __rotate(module.up, forward, Quaternion.from_eulers([angle, 0, 0]))
+    up = __rotate(module.up, forward, __CHILD_ROTATIONS[rotation_index])
     module.module_reference.set_child(child, attachment_index)
 
     return __Module(
@@ -163,29 +190,38 @@ def __add_child(
     )
 
 
-def __rotate(a: Vector3, b: Vector3, rotation: Quaternion) -> Vector3:
+def __right_angle(rotation: Quaternion) -> tuple[int, int]:
+    """
+    Get the cosine and sine of the angle of a rotation, rounded to integers.
+
+    :param rotation: The quaternion for rotation.
+    :returns: (cosine, sine)
+    """
+    angle = rotation.angle
+    return int(round(math.cos(angle))), int(round(math.sin(angle)))
+
+
+def __rotate(a: _Vector3, b: _Vector3, rotation: tuple[int, int]) -> _Vector3:
     """
     Rotates vector a, a given angle around b.
 
     :param a: Vector a.
     :param b: Vector b.
-    :param rotation: The quaternion for rotation.
+    :param rotation: The cosine and sine of the angle, see `__right_angle`.
     :returns: A copy of a, rotated.
     """
-    cos_angle: int = int(round(np.cos(rotation.angle)))
-    sin_angle: int = int(round(np.sin(rotation.angle)))
-
-    vec: Vector3 = (
-        a * cos_angle + sin_angle * b.cross(a) + (1 - cos_angle) * b.dot(a) * b
+    cos_angle, sin_angle = rotation
+    ax, ay, az = a
+    bx, by, bz = b
+    dot = (1 - cos_angle) * (bx * ax + by * ay + bz * az)
+    return (
+        ax * cos_angle + sin_angle * (by * az - bz * ay) + dot * bx,
+        ay * cos_angle + sin_angle * (bz * ax - bx * az) + dot * by,
+        az * cos_angle + sin_angle * (bx * ay - by * ax) + dot * bz,
     )
-    return vec
-
 
-def __vec3_int(vector: Vector3) -> Vector3[np.int_]:
-    """
-    Cast a Vector3 object to an integer only Vector3.
 
-    :param vector: The vector.
-    :return: The integer vector.
-    """
-    return Vector3(list(map(lambda v: int(round(v)), vector)), dtype=np.int64)
+__CHILD_ROTATIONS = [
+    __right_angle(Quaternion.from_eulers([i * (np.pi / 2.0), 0, 0])) for i in range(4)
+]
+"""The rotation of a child around its forward direction, for every rotation index."""
@@ -5,8 +5,16 @@ Using the MorphologicalNoveltyMetric for evaluating a population of robots can b
 
  >>> robots: list[revolve2.modular_robot.ModularRobot]
  >>> novelties = get_novelty_from_population(robots)
+
+To score robots against an archive of earlier robots as well, keep a NoveltyArchive for the whole evolution.
+Only the robots that were not in the previously scored population are compared again.
+
+ >>> archive = NoveltyArchive()
+ >>> novelties = archive.novelty(robots)
+ >>> archive.add([robot for robot, novelty in zip(robots, novelties) if novelty > threshold])
 """
 
 from ._morphological_novelty_metric import get_novelty_from_population
+from ._novelty_archive import NoveltyArchive
 
-__all__ = ["get_novelty_from_population"]
+__all__ = ["NoveltyArchive", "get_novelty_from_population"]
@@ -1,4 +1,5 @@
 import os
+import sys
 from os.path import join
 
 import numpy
@@ -18,18 +19,30 @@ def build() -> None:
 
     include = numpy.get_include()
 
+    # Pairs of histograms are compared in parallel with OpenMP. Without it, they are compared one by one.
     match os.name:
         case "nt":  # Windows
             extra_compile_args = [
                 "/O2",
                 "-UNDEBUG",
+                "/openmp",
             ]
+            extra_link_args = []
+        case "posix" if sys.platform == "darwin":  # macOS compilers do not ship OpenMP
+            extra_compile_args = [
+                "-O3",
+                "-ffast-math",
+                "-UNDEBUG",
+            ]
+            extra_link_args = []
         case "posix":  # UNIX-based systems
             extra_compile_args = [
                 "-O3",
                 "-ffast-math",
                 "-UNDEBUG",
+                "-fopenmp",
             ]
+            extra_link_args = ["-fopenmp"]
         case _:
             raise OSError(
                 f"No build parameter set for operating systems of type {os.name}"
@@ -41,6 +54,7 @@ def build() -> None:
         include_dirs=[include],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
         extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
 
     ext_modules = cythonize(
@@ -1,7 +1,11 @@
 #cython: language_level=3
 cimport cython
 import numpy as np
+from cython.parallel cimport parallel, prange
 from libc.math cimport sqrt
+from libc.stdint cimport int64_t
+from libc.stdlib cimport abort, free, malloc
+from libc.string cimport memcmp, memcpy
 from numpy cimport ndarray
 
 
@@ -9,73 +13,132 @@ from numpy cimport ndarray
 @cython.wraparound(False)
 @cython.nonecheck(False)
 cdef double move_supply(
-        long[:,:] supply,
-        long[:,:] capacity,
+        int64_t* supply,
+        int64_t* capacity,
+        int hist_shape,
         (int, int) from_index,
         (int, int) to_index,
-):
+) noexcept nogil:
     cdef double distance
-    cdef long flow
-    cdef int zero_state = 0
-    if supply[from_index[0], from_index[1]] <= capacity[to_index[0], to_index[1]]:
-        flow = supply[from_index[0], from_index[1]]
-        capacity[to_index[0], to_index[1]] = capacity[to_index[0], to_index[1]]-flow
-        supply[from_index[0], from_index[1]] = zero_state
+    cdef int64_t flow
+    cdef int64_t* from_bin = &supply[from_index[0] * hist_shape + from_index[1]]
+    cdef int64_t* to_bin = &capacity[to_index[0] * hist_shape + to_index[1]]
+    if from_bin[0] <= to_bin[0]:
+        flow = from_bin[0]
+        to_bin[0] = to_bin[0] - flow
+        from_bin[0] = 0
     else:
-        flow = capacity[to_index[0], to_index[1]]
-        supply[from_index[0], from_index[1]] = supply[from_index[0], from_index[1]]-flow
-        capacity[to_index[0], to_index[1]] = zero_state
+        flow = to_bin[0]
+        from_bin[0] = from_bin[0] - flow
+        to_bin[0] = 0
     distance = sqrt((from_index[0]-to_index[0])**2 + (from_index[1]-to_index[1])**2)
     return flow*distance
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef (int, int) find_first_candidate(long[:,:] array, int hist_shape, (int, int) prev):
+cdef (int, int) find_first_candidate(int64_t* array, int hist_shape, (int, int) prev) noexcept nogil:
     cdef int ie, je
     cdef (int, int) neg_return = (-1, -1)
-    cdef int zero_state = 0
     for ie in range(prev[0], hist_shape):
         for je in range(prev[1], hist_shape):
-            if array[ie, je] > zero_state:
+            if array[ie * hist_shape + je] > 0:
                 return ie, je
     return neg_return
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef double wasserstein_distance(
-        long[:,:] supply,
-        long[:,:] capacity,
+        const int64_t* supply_histogram,
+        const int64_t* capacity_histogram,
+        int64_t* supply,
+        int64_t* capacity,
         int hist_shape,
-):
+) noexcept nogil:
+    """Only the two histograms are copied to the work buffers, as reshaping consumes them."""
     cdef double score = 0.0
     cdef int i, j
     cdef (int, int) from_index = (0, 0), to_index = (0, 0)
-    cdef int zero_state = 0
+    cdef size_t size = hist_shape * hist_shape * sizeof(int64_t)
 
+    memcpy(supply, supply_histogram, size)
+    memcpy(capacity, capacity_histogram, size)
     for i in range(hist_shape):
         from_index = find_first_candidate(supply, hist_shape, from_index)
         for j in range(hist_shape):
             to_index = find_first_candidate(capacity, hist_shape, to_index)
-            if from_index[0] < zero_state or to_index[0] < zero_state:
+            if from_index[0] < 0 or to_index[0] < 0:
                 return score
-            work = move_supply(supply, capacity, from_index, to_index)
-            score += work
+            score += move_supply(supply, capacity, hist_shape, from_index, to_index)
     return score
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef ndarray[double, ndim=1] calculate_novelty(ndarray[long, ndim=3, mode="c"] histograms, int amount_instances, int histogram_size):
-    cdef ndarray[double, ndim=1, mode="c"] novelty_scores = np.zeros(shape=amount_instances)
-    cdef int i, j
-    cdef long[:,:] supply, capacity
-    cdef ndarray[long, ndim=3, mode="c"] tmp_hist
+cdef double symmetric_distance(
+        const int64_t* histogram_a,
+        const int64_t* histogram_b,
+        int64_t* supply,
+        int64_t* capacity,
+        int hist_shape,
+) noexcept nogil:
+    """The greedy reshaping is not symmetric, so the histogram with the lexicographically smallest bytes is always the supply."""
+    if memcmp(histogram_a, histogram_b, hist_shape * hist_shape * sizeof(int64_t)) <= 0:
+        return wasserstein_distance(histogram_a, histogram_b, supply, capacity, hist_shape)
+    return wasserstein_distance(histogram_b, histogram_a, supply, capacity, hist_shape)
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void fill_distances(
+        const int64_t* histograms_a,
+        Py_ssize_t amount_a,
+        const int64_t* histograms_b,
+        Py_ssize_t amount_b,
+        int hist_shape,
+        bint upper_triangle,
+        double* distances,
+        int num_threads,
+) noexcept nogil:
+    cdef Py_ssize_t i, j, first
+    cdef Py_ssize_t size = hist_shape * hist_shape
+    cdef int64_t* buffer = NULL
+
+    with parallel(num_threads=num_threads):
+        # Every thread reshapes in its own buffers.
+        buffer = <int64_t*> malloc(2 * size * sizeof(int64_t))
+        if buffer == NULL:
+            abort()
+        # Pairs take different amounts of work, so rows are handed out dynamically.
+        for i in prange(amount_a, schedule="dynamic"):
+            first = i + 1 if upper_triangle else 0
+            for j in range(first, amount_b):
+                distances[i * amount_b + j] = symmetric_distance(
+                    &histograms_a[i * size], &histograms_b[j * size], buffer, &buffer[size], hist_shape
+                )
+        free(buffer)
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef ndarray[double, ndim=2] calculate_distances(const int64_t[:, :, ::1] histograms_a, const int64_t[:, :, ::1] histograms_b, int histogram_size, int num_threads):
+    cdef ndarray[double, ndim=2, mode="c"] distances = np.zeros(shape=(histograms_a.shape[0], histograms_b.shape[0]))
+    if histograms_a.shape[0] == 0 or histograms_b.shape[0] == 0:
+        return distances
+    fill_distances(
+        &histograms_a[0, 0, 0], histograms_a.shape[0], &histograms_b[0, 0, 0], histograms_b.shape[0],
+        histogram_size, False, &distances[0, 0], num_threads,
+    )
+    return distances
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef ndarray[double, ndim=2] calculate_pairwise_distances(const int64_t[:, :, ::1] histograms, int histogram_size, int num_threads):
+    cdef ndarray[double, ndim=2, mode="c"] distances = np.zeros(shape=(histograms.shape[0], histograms.shape[0]))
+    if histograms.shape[0] < 2:
+        return distances
+    # Distances do not depend on the order of the pair, so each pair is reshaped once.
+    fill_distances(
+        &histograms[0, 0, 0], histograms.shape[0], &histograms[0, 0, 0], histograms.shape[0],
+        histogram_size, True, &distances[0, 0], num_threads,
+    )
+    return distances + distances.T
 
-    for i in range(amount_instances-1):
-        for j in range(i+1, amount_instances):
-            tmp_hist = histograms.copy()
-            supply = tmp_hist[i]
-            capacity = tmp_hist[j]
-            score = wasserstein_distance(supply, capacity , histogram_size)
-            novelty_scores[i] += score
-            novelty_scores[j] += score
-    return novelty_scores
+cpdef ndarray[double, ndim=1] calculate_novelty(const int64_t[:, :, ::1] histograms, int amount_instances, int histogram_size, int num_threads=0):
+    return calculate_pairwise_distances(histograms[:amount_instances], histogram_size, num_threads).sum(axis=1)
@@ -1,11 +1,6 @@
-from itertools import product
-from typing import Any
-
 import numpy as np
 from numpy.typing import NDArray
-from pyrr import Vector3
 
-from revolve2.modular_robot.body import Module
 from revolve2.modular_robot.body.base import Body
 
 
@@ -37,16 +32,10 @@ def _body_to_adjusted_coordinates(bodies: list[Body]) -> list[NDArray[np.float64
     crds = [np.empty(shape=0, dtype=np.float64)] * len(bodies)
     i = 0
     for body in bodies:
-        tpl: tuple[NDArray[Any], Vector3] = body.to_grid()
-        body_array, core_position = tpl
-        x, y, z = body_array.shape
-
-        elements = []
-        for xe, ye, ze in product(range(x), range(y), range(z)):
-            target = body_array[xe, ye, ze]
-            if isinstance(target, Module):
-                elements.append(np.subtract((xe, ye, ze), core_position))
-        crds[i] = np.asarray(elements)
+        lattice = body.lattice
+        crds[i] = (
+            np.argwhere(lattice.module_indices >= 0) - lattice.core_position
+        ).astype(np.float64)
         i += 1
     return crds
 
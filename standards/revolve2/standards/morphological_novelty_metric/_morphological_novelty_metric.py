@@ -16,7 +16,10 @@ Magnitudes = list[list[float]]
 
 
 def get_novelty_from_population(
-    population: list[ModularRobot], cob_heuristic: bool = False, num_bins: int = 20
+    population: list[ModularRobot],
+    cob_heuristic: bool = False,
+    num_bins: int = 20,
+    num_threads: int = 0,
 ) -> NDArray[np.float64]:
     """
     Get the morphological novelty score for individuals in a population.
@@ -26,11 +29,38 @@ def get_novelty_from_population(
     A detailed description of the Algorithm can be found in:
     Oliver Weissl, and A.E. Eiben. "Morphological-Novelty in Modular Robot Evolution". 2023 IEEE Symposium Series on Computational Intelligence (SSCI)(pp. 1066-1071). IEEE, 2023.
 
+    The distance between two robots is the same in both directions: the histogram that is smaller by byte order is always reshaped into the other.
+    Before, the robot that came first in the population was reshaped into the later one, which is not symmetric,
+    so scores can differ from those of earlier versions, and no longer depend on the order of the population.
+
     :param population: The population of robots.
     :param cob_heuristic: Whether the heuristic approximation for change of basis is used.
     :param num_bins: The amount of bins in the histogram. Increasing this allows for more detail, but risks sparseness, while lower values generalize more.
+    :param num_threads: The number of threads that compare robots in parallel. If 0, all processors are used.
     :return: The novelty scores.
     """
+    int_histograms = histograms_from_population(population, cob_heuristic, num_bins)
+
+    novelty_scores: NDArray[np.float64] = calculate_novelty(
+        int_histograms, int_histograms.shape[0], num_bins, num_threads
+    )
+    return novelty_scores
+
+
+def histograms_from_population(
+    population: list[ModularRobot], cob_heuristic: bool, num_bins: int
+) -> NDArray[np.int64]:
+    """
+    Get the normalized integer histograms that represent the bodies of robots as distributions.
+
+    :param population: The robots.
+    :param cob_heuristic: Whether the heuristic approximation for change of basis is used.
+    :param num_bins: The amount of bins in the histogram.
+    :return: The histograms. Shape = (instances x num_bins x num_bins).
+    """
+    if len(population) == 0:
+        return np.zeros(shape=(0, num_bins, num_bins), dtype=np.int64)
+
     bodies = [robot.body for robot in population]
 
     coordinates = coords_from_bodies(bodies, cob_heuristics=cob_heuristic)
@@ -39,12 +69,7 @@ def get_novelty_from_population(
     histograms = _gen_gradient_histogram(
         orientations=orient, magnitudes=magn, num_bins=num_bins
     )
-    int_histograms = _normalize_cast_int(histograms)
-
-    novelty_scores: NDArray[np.float64] = calculate_novelty(
-        int_histograms, int_histograms.shape[0], num_bins
-    )
-    return novelty_scores
+    return _normalize_cast_int(histograms)
 
 
 def _coordinates_to_magnitudes_orientation(
@@ -0,0 +1,144 @@
+import numpy as np
+from numpy.typing import NDArray
+from revolve2.modular_robot import ModularRobot
+
+from ._morphological_novelty_metric import histograms_from_population
+from .calculate_novelty import calculate_distances, calculate_pairwise_distances
+
+
+class NoveltyArchive:
+    """
+    Scores the morphological novelty of robots against their population and an archive of earlier robots.
+
+    The novelty of a robot is the sum of its distances to the other robots in its population and to the robots in the archive,
+    so with an empty archive it is the same as `get_novelty_from_population`.
+    The distance between two robots does not depend on which of them comes first, so scores do not depend on the order of the population either.
+    The distances between the robots of the last scored population are kept,
+    so scoring the next population, such as the survivors together with their offspring, only compares the robots that are new.
+    Robots are recognized by their body, so a robot that is developed again from the same genotype is not new.
+
+    The archive only contains histograms, so it can be pickled, for example as part of a checkpoint.
+    """
+
+    _cob_heuristic: bool
+    _num_bins: int
+    _num_threads: int
+
+    _archive: NDArray[np.int64]
+    """The histograms of the archived robots."""
+
+    _known: dict[bytes, int]
+    """Maps the histograms of the last scored population to their index in `_histograms`."""
+    _histograms: NDArray[np.int64]
+    _distances: NDArray[np.float64]
+    """The distances between the histograms of the last scored population."""
+    _archive_distances: NDArray[np.float64]
+    """The sum of the distances of each histogram of the last scored population to the archive."""
+
+    def __init__(
+        self, cob_heuristic: bool = False, num_bins: int = 20, num_threads: int = 0
+    ) -> None:
+        """
+        Initialize this object.
+
+        :param cob_heuristic: Whether the heuristic approximation for change of basis is used.
+        :param num_bins: The amount of bins in the histogram. See `get_novelty_from_population`.
+        :param num_threads: The number of threads that compare robots in parallel. If 0, all processors are used.
+        """
+        self._cob_heuristic = cob_heuristic
+        self._num_bins = num_bins
+        self._num_threads = num_threads
+
+        empty = np.zeros(shape=(0, num_bins, num_bins), dtype=np.int64)
+        self._archive = empty
+        self._known = {}
+        self._histograms = empty
+        self._distances = np.zeros(shape=(0, 0))
+        self._archive_distances = np.zeros(shape=0)
+
+    def __len__(self) -> int:
+        """
+        Get the number of robots in the archive.
+
+        :returns: The number of robots.
+        """
+        return len(self._archive)
+
+    def novelty(self, population: list[ModularRobot]) -> NDArray[np.float64]:
+        """
+        Get the morphological novelty score for the robots in a population.
+
+        :param population: The population of robots.
+        :returns: The novelty scores.
+        """
+        indices = self._update(
+            histograms_from_population(population, self._cob_heuristic, self._num_bins)
+        )
+        novelty_scores: NDArray[np.float64] = (
+            self._distances[np.ix_(indices, indices)].sum(axis=1)
+            + self._archive_distances[indices]
+        )
+        return novelty_scores
+
+    def add(self, robots: list[ModularRobot]) -> None:
+        """
+        Add robots to the archive, for example the most novel robots of a population.
+
+        :param robots: The robots.
+        """
+        histograms = histograms_from_population(
+            robots, self._cob_heuristic, self._num_bins
+        )
+        self._archive_distances += calculate_distances(
+            self._histograms, histograms, self._num_bins, self._num_threads
+        ).sum(axis=1)
+        self._archive = np.concatenate([self._archive, histograms])
+
+    def _update(self, histograms: NDArray[np.int64]) -> NDArray[np.int64]:
+        """
+        Keep the distances of the given histograms, computing only those of histograms that are not known yet.
+
+        :param histograms: The histograms of a population.
+        :returns: For every histogram, its index in the known histograms.
+        """
+        keys = [histogram.tobytes() for histogram in histograms]
+        first_positions: dict[bytes, int] = {}
+        for position, key in enumerate(keys):
+            first_positions.setdefault(key, position)
+
+        kept_keys = sorted(
+            (key for key in first_positions if key in self._known),
+            key=self._known.__getitem__,
+        )
+        new_keys = [key for key in first_positions if key not in self._known]
+        kept = np.array([self._known[key] for key in kept_keys], dtype=np.int64)
+        kept_histograms = self._histograms[kept]
+        new_histograms = histograms[
+            np.array([first_positions[key] for key in new_keys], dtype=np.int64)
+        ]
+
+        cross_distances = calculate_distances(
+            kept_histograms, new_histograms, self._num_bins, self._num_threads
+        )
+        self._distances = np.block(
+            [
+                [self._distances[np.ix_(kept, kept)], cross_distances],
+                [
+                    cross_distances.T,
+                    calculate_pairwise_distances(
+                        new_histograms, self._num_bins, self._num_threads
+                    ),
+                ],
+            ]
+        )
+        self._archive_distances = np.concatenate(
+            [
+                self._archive_distances[kept],
+                calculate_distances(
+                    new_histograms, self._archive, self._num_bins, self._num_threads
+                ).sum(axis=1),
+            ]
+        )
+        self._histograms = np.concatenate([kept_histograms, new_histograms])
+        self._known = {key: index for index, key in enumerate(kept_keys + new_keys)}
+        return np.array([self._known[key] for key in keys], dtype=np.int64)
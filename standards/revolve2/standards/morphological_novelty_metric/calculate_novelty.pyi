@@ -3,6 +3,18 @@ from numpy.typing import NDArray
 
 """Allow mypy and sphinx to resolve the compiled cython module."""
 
+def calculate_distances(
+    histograms_a: NDArray[np.int64],
+    histograms_b: NDArray[np.int64],
+    histogram_size: int,
+    num_threads: int,
+) -> NDArray[np.float64]: ...
+def calculate_pairwise_distances(
+    histograms: NDArray[np.int64], histogram_size: int, num_threads: int
+) -> NDArray[np.float64]: ...
 def calculate_novelty(
-    histograms: NDArray[np.int64], amount_instances: int, histogram_size: int
+    histograms: NDArray[np.int64],
+    amount_instances: int,
+    histogram_size: int,
+    num_threads: int = 0,
 ) -> NDArray[np.float64]: ...
@@ -2,12 +2,10 @@
 
 import os
 import time
-from typing import Any
 
 import cairo
 import numpy as np
 from numpy.typing import NDArray
-from pyrr import Vector3
 
 from revolve2.modular_robot import ModularRobot
 from revolve2.modular_robot.body import Module
@@ -64,15 +62,14 @@ def draw_robot(
         path = __mk_path()
 
     body = robot if isinstance(robot, Body) else robot.body
-    tpl: tuple[NDArray[Any], Vector3[np.int_]] = body.to_grid()
-    body_grid, core_position = tpl
-    x, y, _ = body_grid.shape
+    lattice = body.lattice
+    x, y, _ = lattice.occupancy.shape
 
     image = cairo.ImageSurface(cairo.FORMAT_ARGB32, x * scale, y * scale)
     context = cairo.Context(image)
     context.scale(scale, scale)
 
-    cx, cy, _ = tuple(core_position)
+    cx, cy, _ = (int(v) for v in lattice.core_position)
     _draw_module(
         module=body.core,
         position=(cx, cy),
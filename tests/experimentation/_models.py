@@ -0,0 +1,68 @@
+"""SQLAlchemy models of a small experiment for unit tests."""
+
+import sqlalchemy
+import sqlalchemy.orm as orm
+from revolve2.experimentation.database import HasId
+from revolve2.experimentation.optimization.ea import (
+    GenerationStatistics as GenericGenerationStatistics,
+)
+from revolve2.experimentation.optimization.ea import Individual as GenericIndividual
+from revolve2.experimentation.optimization.ea import Population as GenericPopulation
+
+
+class Base(orm.MappedAsDataclass, orm.DeclarativeBase):
+    """Base class for all SQLAlchemy models in the unit tests."""
+
+    pass
+
+
+class Experiment(Base, HasId):
+    """An experiment."""
+
+    __tablename__ = "experiment"
+
+    rng_seed: orm.Mapped[int] = orm.mapped_column(nullable=False)
+
+
+class Genotype(Base, HasId):
+    """A genotype consisting of a single value."""
+
+    __tablename__ = "genotype"
+
+    value: orm.Mapped[float] = orm.mapped_column(nullable=False)
+
+
+class Individual(Base, GenericIndividual[Genotype], population_table="population"):
+    """An individual with an age."""
+
+    __tablename__ = "individual"
+
+    age: orm.Mapped[int] = orm.mapped_column(nullable=False)
+
+
+class Population(Base, GenericPopulation[Individual]):
+    """A population."""
+
+    __tablename__ = "population"
+
+
+class Generation(Base, HasId):
+    """A generation of an experiment."""
+
+    __tablename__ = "generation"
+
+    experiment_id: orm.Mapped[int] = orm.mapped_column(
+        sqlalchemy.ForeignKey("experiment.id"), nullable=False, init=False, index=True
+    )
+    experiment: orm.Mapped[Experiment] = orm.relationship()
+    generation_index: orm.Mapped[int] = orm.mapped_column(nullable=False, index=True)
+    population_id: orm.Mapped[int] = orm.mapped_column(
+        sqlalchemy.ForeignKey("population.id"), nullable=False, init=False, index=True
+    )
+    population: orm.Mapped[Population] = orm.relationship()
+
+
+class GenerationStatistics(Base, GenericGenerationStatistics[Generation]):
+    """Summary statistics of the individuals in a generation."""
+
+    __tablename__ = "generation_statistics"
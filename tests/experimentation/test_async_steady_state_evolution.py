@@ -0,0 +1,178 @@
+import concurrent.futures
+from typing import Any, Callable
+
+import pytest
+from revolve2.experimentation.evolution import AsyncSteadyStateEvolution
+from revolve2.experimentation.evolution.abstract_elements import (
+    Evaluator,
+    Reproducer,
+    Selector,
+)
+
+
+class _ImmediateExecutor(concurrent.futures.Executor):
+    """An executor that runs every function when it is submitted, so evaluations finish in the order they are submitted."""
+
+    def submit(
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> "concurrent.futures.Future[Any]":
+        """
+        Run a function.
+
+        :param fn: The function.
+        :param args: Positional arguments of the function.
+        :param kwargs: Keyword arguments of the function.
+        :returns: The finished future.
+        """
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class _AllParents(Selector):
+    """Selects the whole population as parents."""
+
+    def select(
+        self, population: list[int], **kwargs: Any
+    ) -> tuple[list[int], dict[str, Any]]:
+        """
+        Select the whole population.
+
+        :param population: The population.
+        :param kwargs: Ignored.
+        :returns: The population and no additional arguments.
+        """
+        return population, {}
+
+
+class _KeepChildren(Selector):
+    """Adds all children to the population."""
+
+    def select(
+        self, population: list[int], **kwargs: Any
+    ) -> tuple[list[int], dict[str, Any]]:
+        """
+        Add the children to a copy of the population.
+
+        :param population: The population.
+        :param kwargs: The children and their performance.
+        :returns: The new population and no additional arguments.
+        """
+        return population + kwargs["children"], {}
+
+
+class _NumberedChildren(Reproducer):
+    """Creates children numbered in the order they are created."""
+
+    def __init__(self, num_children: int) -> None:
+        """
+        Initialize this object.
+
+        :param num_children: The number of children created at once.
+        """
+        self._num_children = num_children
+        self._num_created = 0
+
+    def reproduce(self, population: list[int], **kwargs: Any) -> list[int]:
+        """
+        Create children.
+
+        :param population: Ignored.
+        :param kwargs: Ignored.
+        :returns: The numbers of the children.
+        """
+        children = list(
+            range(self._num_created, self._num_created + self._num_children)
+        )
+        self._num_created += self._num_children
+        return children
+
+
+class _RecordingEvaluator(Evaluator):
+    """Records which children are evaluated."""
+
+    def __init__(self) -> None:
+        """Initialize this object."""
+        self.evaluated: list[int] = []
+
+    def evaluate(self, population: list[int], generation_index: int) -> list[float]:
+        """
+        Record the children.
+
+        :param population: The children.
+        :param generation_index: Ignored.
+        :returns: The number of every child.
+        """
+        self.evaluated += population
+        return [float(child) for child in population]
+
+
+def _evolution(
+    evaluator: _RecordingEvaluator,
+    num_children: int,
+    max_pending: int,
+    max_staleness: int | None,
+) -> AsyncSteadyStateEvolution:
+    """
+    Create an evolution that evaluates immediately and integrates children one at a time.
+
+    :param evaluator: The evaluator.
+    :param num_children: The number of children created at once.
+    :param max_pending: Maximum number of children being evaluated at once.
+    :param max_staleness: Maximum staleness of integrated children.
+    :returns: The evolution.
+    """
+    return AsyncSteadyStateEvolution(
+        parent_selection=_AllParents(),
+        survivor_selection=_KeepChildren(),
+        evaluator=evaluator,
+        reproducer=_NumberedChildren(num_children),
+        executor=_ImmediateExecutor(),
+        max_pending=max_pending,
+        max_staleness=max_staleness,
+    )
+
+
+@pytest.mark.parametrize(
+    "max_staleness, expected", [(None, [0, 1, 2]), (2, [0, 1, 2]), (1, [0, 1])]
+)
+def test_stale_children_are_discarded_after_evaluation(
+    max_staleness: int | None, expected: list[int]
+) -> None:
+    """
+    Test that children whose parents were selected too many updates before they finished are evaluated but not integrated.
+
+    :param max_staleness: Maximum staleness of integrated children.
+    :param expected: The children that are integrated.
+    """
+    evaluator = _RecordingEvaluator()
+    evolution = _evolution(evaluator, 1, 3, max_staleness)
+
+    # All three children are created before the first one is integrated, so the third one is integrated two updates after its parents were selected.
+    population = evolution.step([])
+    evolution.close()
+
+    assert population == expected
+    assert evaluator.evaluated == [0, 1, 2]
+    assert evolution.num_evaluations == 3
+    assert evolution.num_updates == len(expected)
+    assert evolution.num_discarded == 3 - len(expected)
+
+
+def test_stale_children_are_discarded_before_evaluation() -> None:
+    """Test that children that become too stale while waiting to be submitted are not evaluated, and that no more than `max_pending` children are submitted at once."""
+    evaluator = _RecordingEvaluator()
+    evolution = _evolution(evaluator, 6, 2, 1)
+
+    population = evolution.step([])
+    assert population == [0, 1]
+    assert evaluator.evaluated == [0, 1]
+
+    # Children 2 to 5 were created before two updates, so they are discarded and new children are created.
+    population = evolution.step(population)
+    evolution.close()
+
+    assert population == [0, 1, 6, 7]
+    assert evaluator.evaluated == [0, 1, 6, 7]
+    assert evolution.num_evaluations == 4
+    assert evolution.num_discarded == 4
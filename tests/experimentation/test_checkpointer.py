@@ -0,0 +1,51 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from revolve2.experimentation.checkpoint import Checkpointer
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """
+    Test that a loaded checkpoint continues random number generation exactly where the saved state was.
+
+    :param tmp_path: Directory for the checkpoint.
+    """
+    checkpointer = Checkpointer(str(tmp_path / "checkpoint.pickle"))
+    assert checkpointer.load() is None
+
+    rng = np.random.Generator(np.random.PCG64(0))
+    rng.random(10)
+    checkpointer.save({"rng": rng, "generation_index": 3})
+    assert [path.name for path in tmp_path.iterdir()] == ["checkpoint.pickle"]
+
+    state = checkpointer.load()
+    assert state is not None
+    assert state["generation_index"] == 3
+    assert state["rng"].random(10).tolist() == rng.random(10).tolist()
+
+    checkpointer.remove()
+    assert checkpointer.load() is None
+    checkpointer.remove()
+
+
+def test_failed_save_keeps_previous_checkpoint(tmp_path: Path) -> None:
+    """
+    Test that a save that is interrupted while writing leaves the previous checkpoint intact.
+
+    :param tmp_path: Directory for the checkpoint.
+    """
+    checkpointer = Checkpointer(str(tmp_path / "checkpoint.pickle"))
+    checkpointer.save([1, 2, 3])
+
+    # A lambda cannot be pickled, so writing fails after part of the state is written.
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        checkpointer.save([4, 5, lambda: 6])
+    assert checkpointer.load() == [1, 2, 3]
+
+
+def test_is_due() -> None:
+    """Test that checkpoints are due every interval steps."""
+    checkpointer = Checkpointer("checkpoint.pickle", interval=3)
+    assert [step for step in range(10) if checkpointer.is_due(step)] == [0, 3, 6, 9]
@@ -0,0 +1,74 @@
+import numpy as np
+import sqlalchemy
+from revolve2.experimentation.optimization.ea import ColumnarPopulation
+from sqlalchemy.orm import Session
+
+from ._models import Base, Genotype, Individual, Population
+
+
+def _population(values: list[float]) -> ColumnarPopulation[Genotype]:
+    """
+    Create a population of unsaved genotypes, with fitnesses and ages that follow from the values of the genotypes.
+
+    :param values: The value of every genotype.
+    :returns: The population.
+    """
+    return ColumnarPopulation(
+        genotypes=[Genotype(value) for value in values],
+        fitnesses=[2.0 * value for value in values],
+        metrics={"age": [int(value) for value in values]},
+    )
+
+
+def test_take_and_concatenate() -> None:
+    """Test that individuals are taken and concatenated with all of their columns."""
+    first = _population([0.0, 1.0, 2.0])
+    second = _population([3.0, 4.0])
+
+    population = ColumnarPopulation.concatenate([first, second]).take([4, 0, 4, 2])
+
+    assert [genotype.value for genotype in population.genotypes] == [4, 0, 4, 2]
+    assert population.genotypes[0] is second.genotypes[1]
+    assert population.fitnesses.tolist() == [8.0, 0.0, 8.0, 4.0]
+    assert population.ids.tolist() == [-1] * 4
+    assert population.metrics["age"].tolist() == [4, 0, 4, 2]
+    assert len(population) == 4
+
+
+def test_orm_round_trip() -> None:
+    """Test that a population keeps its genotypes, fitnesses, ids and metrics when it is saved and loaded."""
+    population = _population([5.0, 3.0, 5.0, 1.0]).take([0, 1, 2, 3, 1])
+    population_orm = population.to_orm(Population, Individual, metrics=["age"])
+    assert [individual.age for individual in population_orm.individuals] == [
+        5,
+        3,
+        5,
+        1,
+        3,
+    ]
+    assert ColumnarPopulation.from_orm(population_orm).ids.tolist() == [-1] * 5
+
+    dbengine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(dbengine)
+    with Session(dbengine) as session:
+        session.add(population_orm)
+        session.commit()
+        population_id = population_orm.id
+
+    with Session(dbengine) as session:
+        loaded = ColumnarPopulation.from_orm(
+            session.get_one(Population, population_id), metrics=["age"]
+        )
+        assert [genotype.value for genotype in loaded.genotypes] == [
+            5.0,
+            3.0,
+            5.0,
+            1.0,
+            3.0,
+        ]
+        assert [genotype.id for genotype in loaded.genotypes] == loaded.ids.tolist()
+        # The same genotype is saved once, even if it is in the population more than once.
+        assert loaded.ids[1] == loaded.ids[4]
+        assert len(set(loaded.ids.tolist())) == 4
+        np.testing.assert_array_equal(loaded.fitnesses, population.fitnesses)
+        np.testing.assert_array_equal(loaded.metrics["age"], population.metrics["age"])
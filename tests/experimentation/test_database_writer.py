@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pytest
+import sqlalchemy
+from revolve2.experimentation.database import (
+    DatabaseWriter,
+    OpenMethod,
+    open_database_sqlite,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ._models import Base, Genotype
+
+
+def _open_database(tmp_path: Path) -> Engine:
+    """
+    Create a database with the test models.
+
+    :param tmp_path: Directory to create the database in.
+    :returns: The database.
+    """
+    dbengine = open_database_sqlite(
+        str(tmp_path / "database.sqlite"),
+        open_method=OpenMethod.NOT_EXISTS_AND_CREATE,
+        journal_mode="WAL",
+        synchronous="NORMAL",
+    )
+    Base.metadata.create_all(dbengine)
+    return dbengine
+
+
+def _saved_values(dbengine: Engine) -> list[float]:
+    """
+    Get the values of the saved genotypes.
+
+    :param dbengine: The database.
+    :returns: The values, in order of id.
+    """
+    with Session(dbengine) as session:
+        return list(
+            session.scalars(
+                sqlalchemy.select(Genotype.value).order_by(Genotype.id)
+            ).all()
+        )
+
+
+def test_flush_and_close(tmp_path: Path) -> None:
+    """
+    Test that instances are written in batches when the writer is flushed and closed, and can be used afterwards.
+
+    :param tmp_path: Directory for the database.
+    """
+    dbengine = _open_database(tmp_path)
+    with dbengine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+    with DatabaseWriter(dbengine, max_batch_size=3) as writer:
+        genotypes = [Genotype(float(value)) for value in range(10)]
+        writer.add_all(genotypes)
+        writer.flush()
+        assert _saved_values(dbengine) == [float(value) for value in range(10)]
+        assert [genotype.id for genotype in genotypes] == list(range(1, 11))
+
+        writer.add(Genotype(10.0))
+    writer.close()
+
+    assert _saved_values(dbengine) == [float(value) for value in range(11)]
+    with pytest.raises(AssertionError):
+        writer.add(Genotype(11.0))
+
+
+def test_errors_are_raised_by_following_calls(tmp_path: Path) -> None:
+    """
+    Test that an error while writing stops the writer and is raised by every following call.
+
+    :param tmp_path: Directory for the database.
+    """
+    dbengine = _open_database(tmp_path)
+    writer = DatabaseWriter(dbengine, max_batch_size=1)
+    writer.add(Genotype(0.0))
+    writer.add(Genotype(None))  # type: ignore[arg-type]
+    writer.add(Genotype(2.0))
+
+    with pytest.raises(sqlalchemy.exc.IntegrityError):
+        writer.flush()
+    with pytest.raises(sqlalchemy.exc.IntegrityError):
+        writer.add(Genotype(3.0))
+    with pytest.raises(sqlalchemy.exc.IntegrityError):
+        writer.close()
+    assert _saved_values(dbengine) == [0.0]
@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import pytest
+import sqlalchemy
+from revolve2.experimentation.database import OpenMethod, open_database_sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ._models import Base, Experiment, Generation, Genotype, Individual, Population
+
+pyarrow_dataset = pytest.importorskip("pyarrow.dataset")
+
+from revolve2.experimentation.database.parquet import (  # noqa: E402
+    export_parquet,
+    open_parquet_dataset,
+)
+
+
+def _create_database(directory: Path, num_experiments: int) -> Engine:
+    """
+    Create a database with experiments of a few generations of individuals.
+
+    :param directory: Directory to create the database in.
+    :param num_experiments: The number of experiments.
+    :returns: The database.
+    """
+    dbengine = open_database_sqlite(
+        str(directory / "database.sqlite"),
+        open_method=OpenMethod.NOT_EXISTS_AND_CREATE,
+    )
+    Base.metadata.create_all(dbengine)
+    with Session(dbengine) as session:
+        for experiment_index in range(num_experiments):
+            experiment = Experiment(rng_seed=experiment_index)
+            for generation_index in range(3):
+                population = Population(
+                    individuals=[
+                        Individual(
+                            genotype=Genotype(value=float(i)),
+                            fitness=100.0 * experiment_index
+                            + 10.0 * generation_index
+                            + i,
+                            age=generation_index,
+                        )
+                        for i in range(4)
+                    ]
+                )
+                session.add(Generation(experiment, generation_index, population))
+        session.commit()
+    return dbengine
+
+
+def _statement() -> sqlalchemy.Select:
+    """
+    Create a query for the fitness of every individual in every generation.
+
+    :returns: The query.
+    """
+    return (
+        sqlalchemy.select(
+            Experiment.id.label("experiment_id"),
+            Generation.generation_index,
+            Individual.fitness,
+        )
+        .join_from(Experiment, Generation, Experiment.id == Generation.experiment_id)
+        .join_from(Generation, Population, Generation.population_id == Population.id)
+        .join_from(Population, Individual, Population.id == Individual.population_id)
+        .order_by(Experiment.id, Generation.generation_index, Individual.fitness)
+    )
+
+
+def _rows(directory: Path, experiment_id: int) -> list[tuple[int, float]]:
+    """
+    Read the rows of an experiment from a dataset.
+
+    :param directory: Directory of the dataset.
+    :param experiment_id: Id of the experiment.
+    :returns: The generation index and fitness of every row.
+    """
+    table = open_parquet_dataset(str(directory)).to_table(
+        columns=["generation_index", "fitness"],
+        filter=pyarrow_dataset.field("experiment_id") == experiment_id,
+    )
+    return sorted(
+        zip(
+            table.column("generation_index").to_pylist(),
+            table.column("fitness").to_pylist(),
+        )
+    )
+
+
+def test_export_matches_database(tmp_path: Path) -> None:
+    """
+    Test that the dataset contains the rows of the query, partitioned by experiment, when rows are exported in small chunks.
+
+    :param tmp_path: Directory for the database and dataset.
+    """
+    dbengine = _create_database(tmp_path, 3)
+    with dbengine.connect() as connection:
+        expected = connection.execute(_statement()).all()
+    dataset = tmp_path / "dataset"
+
+    assert export_parquet(dbengine, _statement(), str(dataset), chunk_size=5) == 36
+    assert sorted(path.name for path in dataset.iterdir()) == [
+        "experiment_id=1",
+        "experiment_id=2",
+        "experiment_id=3",
+    ]
+    for experiment_id in [1, 2, 3]:
+        assert _rows(dataset, experiment_id) == sorted(
+            (row.generation_index, row.fitness)
+            for row in expected
+            if row.experiment_id == experiment_id
+        )
+
+
+def test_export_replaces_only_exported_partitions(tmp_path: Path) -> None:
+    """
+    Test that exporting again replaces the partitions the query returns rows for and keeps the others.
+
+    :param tmp_path: Directory for the database and dataset.
+    """
+    dbengine = _create_database(tmp_path, 2)
+    dataset = tmp_path / "dataset"
+    export_parquet(dbengine, _statement(), str(dataset))
+    experiment2_rows = _rows(dataset, 2)
+
+    with Session(dbengine) as session:
+        session.execute(sqlalchemy.update(Individual).values(fitness=-1.0))
+        session.commit()
+    export_parquet(dbengine, _statement().where(Experiment.id == 1), str(dataset))
+
+    assert _rows(dataset, 1) == [(i // 4, -1.0) for i in range(12)]
+    assert _rows(dataset, 2) == experiment2_rows
+
+
+def test_unsupported_column_type(tmp_path: Path) -> None:
+    """
+    Test that columns that cannot be stored in Parquet are refused.
+
+    :param tmp_path: Directory for the database and dataset.
+    """
+    statement = sqlalchemy.select(
+        Experiment.id.label("experiment_id"),
+        sqlalchemy.cast(Experiment.rng_seed, sqlalchemy.JSON).label("seed"),
+    )
+    with pytest.raises(ValueError):
+        export_parquet(
+            _create_database(tmp_path, 1), statement, str(tmp_path / "dataset")
+        )
@@ -0,0 +1,79 @@
+import concurrent.futures
+import time
+from pathlib import Path
+
+import pytest
+from revolve2.experimentation.parallel import FairPool
+
+
+def _task(label: str, duration: float) -> str:
+    """
+    Wait and return a label.
+
+    :param label: The label.
+    :param duration: Time to wait in seconds.
+    :returns: The label.
+    """
+    time.sleep(duration)
+    return label
+
+
+def _touch(file: Path) -> None:
+    """
+    Create a file.
+
+    :param file: The file.
+    """
+    file.touch()
+
+
+def _fail() -> None:
+    """
+    Raise an error.
+
+    :raises ValueError: Always.
+    """
+    raise ValueError("Task failed.")
+
+
+def test_lanes_take_turns() -> None:
+    """Test that waiting work of multiple lanes is sent to the workers in turn, instead of in the order it was submitted."""
+    finished: list[str] = []
+    with FairPool(num_workers=1, tasks_per_worker=1) as pool:
+        busy_lane = pool.lane()
+        other_lane = pool.lane()
+        # The first task keeps the worker busy until all other tasks are waiting in their lanes.
+        futures = [busy_lane.submit(_task, "a0", 0.5)]
+        futures += [busy_lane.submit(_task, f"a{i}", 0.0) for i in range(1, 6)]
+        futures += [other_lane.submit(_task, f"b{i}", 0.0) for i in range(2)]
+        for future in futures:
+            future.add_done_callback(lambda future: finished.append(future.result()))
+        concurrent.futures.wait(futures)
+
+    assert finished == ["a0", "a1", "b0", "a2", "b1", "a3", "a4", "a5"]
+
+
+def test_cancelled_and_failed_tasks(tmp_path: Path) -> None:
+    """
+    Test that cancelled tasks are not run, that errors are raised by the futures of failed tasks, and that tasks submitted after closing fail.
+
+    :param tmp_path: Directory for the file that the cancelled task would create.
+    """
+    pool = FairPool(num_workers=1, tasks_per_worker=1)
+    lane = pool.lane()
+    busy = lane.submit(_task, "busy", 0.5)
+    cancelled = lane.submit(_touch, tmp_path / "cancelled")
+    failed = lane.submit(_fail)
+    succeeded = lane.submit(_task, "succeeded", 0.0)
+    assert cancelled.cancel()
+    pool.close()
+
+    assert busy.result() == "busy"
+    assert cancelled.cancelled()
+    assert not (tmp_path / "cancelled").exists()
+    with pytest.raises(ValueError):
+        failed.result()
+    assert succeeded.result() == "succeeded"
+
+    with pytest.raises(RuntimeError):
+        lane.submit(_task, "closed", 0.0).result(timeout=10.0)
@@ -0,0 +1,98 @@
+from typing import Sequence
+
+import numpy as np
+import pytest
+import sqlalchemy
+from revolve2.experimentation.database import create_missing_indexes
+from revolve2.experimentation.optimization.ea import ColumnarPopulation
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from ._models import (
+    Base,
+    Experiment,
+    Generation,
+    GenerationStatistics,
+    Genotype,
+    Population,
+)
+
+
+def test_from_values() -> None:
+    """Test the statistics of a few values, with the standard deviation of the population."""
+    generation = Generation(Experiment(rng_seed=0), 0, Population(individuals=[]))
+    statistics = GenerationStatistics.from_values(
+        generation, "fitness", [4.0, 1.0, 3.0, 2.0]
+    )
+
+    assert statistics.generation is generation
+    assert statistics.metric == "fitness"
+    assert statistics.count == 4
+    assert statistics.minimum == 1.0
+    assert statistics.maximum == 4.0
+    assert statistics.mean == 2.5
+    assert statistics.std == pytest.approx(np.sqrt(1.25))
+    assert (statistics.quartile1, statistics.median, statistics.quartile3) == (
+        1.75,
+        2.5,
+        3.25,
+    )
+
+
+def test_from_population() -> None:
+    """Test that statistics are calculated for the fitness and the chosen metrics, in order, and can be saved."""
+    rng = np.random.Generator(np.random.PCG64(0))
+    population = ColumnarPopulation(
+        genotypes=[Genotype(value=0.0) for _ in range(50)],
+        fitnesses=rng.normal(size=50),
+        metrics={"age": rng.integers(0, 10, size=50), "novelty": rng.random(50)},
+    )
+    generation = Generation(Experiment(rng_seed=0), 0, Population(individuals=[]))
+
+    statistics = GenerationStatistics.from_population(generation, population)
+    assert [s.metric for s in statistics] == ["fitness", "age", "novelty"]
+    for s, values in zip(
+        statistics,
+        [
+            population.fitnesses,
+            population.metrics["age"],
+            population.metrics["novelty"],
+        ],
+    ):
+        assert s.count == 50
+        assert s.mean == pytest.approx(values.mean())
+        assert s.std == pytest.approx(values.std())
+        assert s.median == pytest.approx(np.median(values))
+
+    selected = GenerationStatistics.from_population(
+        generation, population, metrics=["novelty"]
+    )
+    assert [s.metric for s in selected] == ["fitness", "novelty"]
+
+    dbengine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(dbengine)
+    with Session(dbengine) as session:
+        session.add_all(statistics)
+        session.commit()
+        rows: Sequence[GenerationStatistics] = session.scalars(
+            sqlalchemy.select(GenerationStatistics).order_by(GenerationStatistics.id)
+        ).all()
+        assert [row.metric for row in rows] == ["fitness", "age", "novelty"]
+        assert {row.generation_id for row in rows} == {generation.id}
+
+
+def test_create_missing_indexes() -> None:
+    """Test that indexes declared after a database was created are added once."""
+    # All connections share a single in-memory database.
+    dbengine = sqlalchemy.create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(dbengine)
+    with dbengine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_individual_fitness")
+        connection.exec_driver_sql("DROP INDEX ix_generation_statistics_generation_id")
+
+    assert create_missing_indexes(dbengine, Base.metadata) == 2
+    assert create_missing_indexes(dbengine, Base.metadata) == 0
+    assert "ix_individual_fitness" in {
+        index["name"]
+        for index in sqlalchemy.inspect(dbengine).get_indexes("individual")
+    }
@@ -0,0 +1,163 @@
+import multiprocessing
+import multiprocessing.queues
+from typing import Any
+
+import numpy as np
+import pytest
+from revolve2.experimentation.evolution import (
+    Island,
+    IslandModel,
+    fully_connected_topology,
+    ring_topology,
+)
+from revolve2.experimentation.evolution._island_model import _migrate
+from revolve2.experimentation.optimization.ea import ColumnarPopulation
+
+
+class _StaticIsland(Island):
+    """An island whose population only changes through migration."""
+
+    def __init__(self, island_index: int) -> None:
+        """
+        Initialize this object.
+
+        :param island_index: The index of the island.
+        """
+        self._island_index = island_index
+
+    def initial_population(self) -> ColumnarPopulation[Any]:
+        """
+        Create a population of genotypes named after the island, with fitnesses that differ per island.
+
+        :returns: The population.
+        """
+        return ColumnarPopulation(
+            genotypes=[f"{self._island_index}.{i}" for i in range(4)],
+            fitnesses=[10.0 * self._island_index + i for i in range(4)],
+        )
+
+    def step(
+        self, population: ColumnarPopulation[Any], generation_index: int
+    ) -> ColumnarPopulation[Any]:
+        """
+        Keep the population.
+
+        :param population: The current population.
+        :param generation_index: Ignored.
+        :returns: The same population.
+        """
+        return population
+
+    def copy_migrant(self, genotype: Any) -> Any:
+        """
+        Copy the genotype of a migrant, marking it as copied.
+
+        :param genotype: The genotype.
+        :returns: The copy.
+        """
+        return f"copy of {genotype}"
+
+
+def _queue(
+    populations: list[ColumnarPopulation[Any]],
+) -> "multiprocessing.queues.Queue[ColumnarPopulation[Any]]":
+    """
+    Create a queue that holds populations.
+
+    :param populations: The populations to put in the queue.
+    :returns: The queue.
+    """
+    result: multiprocessing.queues.Queue[ColumnarPopulation[Any]] = (
+        multiprocessing.Queue()
+    )
+    for population in populations:
+        result.put(population)
+    return result
+
+
+def test_migrate() -> None:
+    """Test that the best individuals are sent as copies, and that received individuals replace the worst ones while the others keep their order."""
+    population = ColumnarPopulation(
+        genotypes=["a", "b", "c", "d", "e", "f"],
+        fitnesses=[3.0, 1.0, 5.0, 1.0, 4.0, 0.0],
+        ids=[1, 2, 3, 4, 5, 6],
+        metrics={"age": [0, 1, 2, 3, 4, 5]},
+    )
+    immigrants = [
+        ColumnarPopulation(["x", "y"], [9.0, 8.0], metrics={"age": [0, 0]}),
+        ColumnarPopulation(["z"], [7.0], metrics={"age": [0]}),
+    ]
+    outbox = _queue([])
+
+    migrated, num_immigrants = _migrate(
+        _StaticIsland(0),
+        population,
+        2,
+        [outbox],
+        [_queue([immigrants[0]]), _queue([immigrants[1]])],
+    )
+
+    emigrants = outbox.get(timeout=10.0)
+    assert emigrants.genotypes == ["copy of c", "copy of e"]
+    assert emigrants.fitnesses.tolist() == [5.0, 4.0]
+    assert emigrants.ids.tolist() == [-1, -1]
+    assert emigrants.metrics["age"].tolist() == [2, 4]
+
+    assert num_immigrants == 3
+    assert migrated.genotypes == ["a", "c", "e", "x", "y", "z"]
+    assert migrated.ids.tolist() == [1, 3, 5, -1, -1, -1]
+    assert migrated.metrics["age"].tolist() == [0, 2, 4, 0, 0, 0]
+    # The population itself is unchanged.
+    assert population.genotypes == ["a", "b", "c", "d", "e", "f"]
+
+
+def test_migrate_more_immigrants_than_population() -> None:
+    """Test that the population keeps its size when more individuals arrive than it has, and is unchanged when none arrive."""
+    population = ColumnarPopulation(["a", "b"], [1.0, 2.0])
+    immigrants = ColumnarPopulation(["x", "y", "z"], [0.0, 0.0, 0.0])
+
+    migrated, num_immigrants = _migrate(
+        _StaticIsland(0), population, 1, [], [_queue([immigrants])]
+    )
+    assert num_immigrants == 2
+    assert migrated.genotypes == ["x", "y"]
+
+    unchanged, num_immigrants = _migrate(_StaticIsland(0), population, 1, [], [])
+    assert num_immigrants == 0
+    assert unchanged is population
+
+
+def test_run_ring() -> None:
+    """Test that islands in a ring receive the best individual of the previous island every migration interval."""
+    model = IslandModel(
+        _StaticIsland, ring_topology(3), migration_interval=2, num_migrants=1
+    )
+    statistics = model.run(num_generations=3)
+
+    assert len(statistics) == 3 * 4
+    by_island = {
+        island_index: sorted(
+            (record for record in statistics if record.island_index == island_index),
+            key=lambda record: record.generation_index,
+        )
+        for island_index in range(3)
+    }
+    for island_index, records in by_island.items():
+        assert [record.num_immigrants for record in records] == [0, 1, 0, 1]
+        sender_best = 10.0 * ((island_index - 1) % 3) + 3.0
+        assert records[0].best_fitness == 10.0 * island_index + 3.0
+        # After two migrations, the best individual of island 2 has reached all islands.
+        assert records[-1].best_fitness == 23.0
+        assert np.isclose(
+            records[1].mean_fitness,
+            (sum(10.0 * island_index + i for i in range(1, 4)) + sender_best) / 4,
+        )
+
+
+def test_invalid_topology() -> None:
+    """Test that islands cannot send migrants to themselves or to islands that do not exist."""
+    assert fully_connected_topology(3) == [[1, 2], [0, 2], [0, 1]]
+    with pytest.raises(ValueError):
+        IslandModel(_StaticIsland, [[0]], migration_interval=1, num_migrants=1)
+    with pytest.raises(ValueError):
+        IslandModel(_StaticIsland, [[1], [2]], migration_interval=1, num_migrants=1)
@@ -0,0 +1,127 @@
+from pathlib import Path
+from typing import Sequence
+
+import pytest
+import sqlalchemy
+from revolve2.experimentation.database import (
+    OpenMethod,
+    merge_databases,
+    open_database_sqlite,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ._models import Base, Experiment, Generation, Genotype, Individual, Population
+
+
+def _create_database(file: Path, rng_seeds: list[int]) -> Engine:
+    """
+    Create a database with an experiment per seed, each with a few generations that share genotypes.
+
+    :param file: File of the database.
+    :param rng_seeds: The seeds of the experiments.
+    :returns: The database.
+    """
+    dbengine = open_database_sqlite(
+        str(file), open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+    )
+    Base.metadata.create_all(dbengine)
+    with Session(dbengine) as session:
+        for rng_seed in rng_seeds:
+            experiment = Experiment(rng_seed=rng_seed)
+            genotypes = [Genotype(value=rng_seed + i / 10.0) for i in range(4)]
+            for generation_index in range(3):
+                population = Population(
+                    individuals=[
+                        Individual(
+                            genotype=genotypes[(i + generation_index) % 4],
+                            fitness=rng_seed + generation_index + i / 10.0,
+                            age=generation_index,
+                        )
+                        for i in range(3)
+                    ]
+                )
+                session.add(Generation(experiment, generation_index, population))
+        session.commit()
+    return dbengine
+
+
+def _describe(dbengine: Engine) -> list[tuple[int, int, int, float, float]]:
+    """
+    Describe the individuals of every generation, by following the foreign keys.
+
+    :param dbengine: The database.
+    :returns: The experiment seed, generation index, population index, fitness and genotype value of every individual.
+    """
+    with Session(dbengine) as session:
+        generations: Sequence[Generation] = session.scalars(
+            sqlalchemy.select(Generation)
+        ).all()
+        return sorted(
+            (
+                generation.experiment.rng_seed,
+                generation.generation_index,
+                individual.population_index,
+                individual.fitness,
+                individual.genotype.value,
+            )
+            for generation in generations
+            for individual in generation.population.individuals
+        )
+
+
+def test_merge_keeps_references(tmp_path: Path) -> None:
+    """
+    Test that merged rows get new ids and still refer to the same rows, when the target database already has rows.
+
+    :param tmp_path: Directory for the databases.
+    """
+    target = _create_database(tmp_path / "target.sqlite", [0])
+    shards = [
+        _create_database(tmp_path / "shard1.sqlite", [10, 20]),
+        _create_database(tmp_path / "shard2.sqlite", [30]),
+    ]
+    expected = sorted(_describe(target) + _describe(shards[0]) + _describe(shards[1]))
+
+    merge_databases(target, shards, Base.metadata, chunk_size=5)
+
+    assert _describe(target) == expected
+    with Session(target) as session:
+        assert session.scalar(sqlalchemy.func.count(Genotype.id)) == 16
+        assert session.scalar(sqlalchemy.func.count(Individual.id)) == 36
+
+
+def test_merge_into_new_database(tmp_path: Path) -> None:
+    """
+    Test that tables are created in an empty target database.
+
+    :param tmp_path: Directory for the databases.
+    """
+    shard = _create_database(tmp_path / "shard.sqlite", [1])
+    target = open_database_sqlite(
+        str(tmp_path / "target.sqlite"), open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+    )
+
+    merge_databases(target, [shard], Base.metadata)
+
+    assert _describe(target) == _describe(shard)
+
+
+def test_tables_without_integer_key_are_refused(tmp_path: Path) -> None:
+    """
+    Test that tables whose ids cannot be shifted are refused.
+
+    :param tmp_path: Directory for the databases.
+    """
+    metadata = sqlalchemy.MetaData()
+    sqlalchemy.Table(
+        "named",
+        metadata,
+        sqlalchemy.Column("name", sqlalchemy.String, primary_key=True),
+    )
+    target = open_database_sqlite(
+        str(tmp_path / "target.sqlite"), open_method=OpenMethod.NOT_EXISTS_AND_CREATE
+    )
+
+    with pytest.raises(ValueError):
+        merge_databases(target, [], metadata)
@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+from revolve2.experimentation.evolution import MultiFidelityEvaluator
+from revolve2.experimentation.evolution._multi_fidelity_evaluator import _average_ranks
+from revolve2.experimentation.evolution.abstract_elements import Evaluator
+
+
+class _AffineEvaluator(Evaluator):
+    """Evaluates numbers using an affine function, recording what it evaluates."""
+
+    def __init__(self, slope: float, intercept: float) -> None:
+        """
+        Initialize this object.
+
+        :param slope: The slope of the function.
+        :param intercept: The intercept of the function.
+        """
+        self._slope = slope
+        self._intercept = intercept
+        self.evaluated: list[list[float]] = []
+
+    def evaluate(self, population: list[float], generation_index: int) -> list[float]:
+        """
+        Evaluate numbers.
+
+        :param population: The numbers.
+        :param generation_index: Ignored.
+        :returns: The value of the function for each number.
+        """
+        self.evaluated.append(list(population))
+        return [self._slope * x + self._intercept for x in population]
+
+
+class _TableEvaluator(Evaluator):
+    """Evaluates numbers by looking up their fitness."""
+
+    def __init__(self, fitnesses: dict[float, float]) -> None:
+        """
+        Initialize this object.
+
+        :param fitnesses: The fitness of every number.
+        """
+        self._fitnesses = fitnesses
+
+    def evaluate(self, population: list[float], generation_index: int) -> list[float]:
+        """
+        Look up the fitness of numbers.
+
+        :param population: The numbers.
+        :param generation_index: Ignored.
+        :returns: The fitness of each number.
+        """
+        return [self._fitnesses[x] for x in population]
+
+
+_CANDIDATES = [3.0, 1.0, 4.0, 1.0, 5.0]
+
+
+def test_promote_fraction_and_estimate() -> None:
+    """Test that the best fraction is evaluated fully, and that the others are estimated from a linear fit, at most as fit as the worst promoted candidate."""
+    full_evaluator = _AffineEvaluator(2.0, 1.0)
+    evaluator = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0), full_evaluator, promote_fraction=0.5
+    )
+
+    fitnesses = evaluator.evaluate(_CANDIDATES + [6.5], generation_index=2)
+
+    assert full_evaluator.evaluated == [[4.0, 5.0, 6.5]]
+    assert fitnesses == pytest.approx([7.0, 3.0, 9.0, 3.0, 11.0, 14.0])
+    statistics = evaluator.last_statistics
+    assert statistics is not None
+    assert (statistics.generation_index, statistics.num_candidates) == (2, 6)
+    assert statistics.num_promoted == 3
+    assert statistics.rank_correlation == pytest.approx(1.0)
+
+
+def test_estimate_is_limited() -> None:
+    """Test that screened-out candidates never get a higher fitness than a promoted candidate."""
+    full_fitnesses = {4.0: 10.0, 5.0: 0.0, 6.0: 12.0}
+    evaluator = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0),
+        _TableEvaluator(full_fitnesses),
+        promote_fraction=0.6,
+    )
+    # The fit of the promoted candidates estimates candidate 3 at 16/3, more than the full fitness of candidate 5.
+    assert evaluator.evaluate([3.0, 4.0, 5.0, 6.0, -10.0]) == pytest.approx(
+        [0.0, 10.0, 0.0, 12.0, -23.0 / 3.0]
+    )
+
+
+def test_promote_threshold() -> None:
+    """Test that candidates with a screening fitness at or above the threshold are promoted, together with the best fraction if given."""
+    full_evaluator = _AffineEvaluator(1.0, 0.0)
+    threshold_only = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0),
+        full_evaluator,
+        promote_fraction=None,
+        promote_threshold=4.0,
+    )
+    threshold_only.evaluate(_CANDIDATES)
+    assert full_evaluator.evaluated == [[4.0, 5.0]]
+
+    full_evaluator = _AffineEvaluator(1.0, 0.0)
+    both = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0),
+        full_evaluator,
+        promote_fraction=0.2,
+        promote_threshold=3.0,
+    )
+    both.evaluate(_CANDIDATES)
+    assert full_evaluator.evaluated == [[3.0, 4.0, 5.0]]
+
+
+def test_screened_out_fitness() -> None:
+    """Test that a given fitness is used for candidates that are not promoted."""
+    evaluator = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0),
+        _AffineEvaluator(2.0, 1.0),
+        promote_fraction=0.4,
+        screened_out_fitness=-100.0,
+    )
+    assert evaluator.evaluate(_CANDIDATES) == [-100.0, -100.0, 9.0, -100.0, 11.0]
+
+
+def test_estimate_without_useful_fit() -> None:
+    """Test that the difference between the screening and full fitness is used when the fit does not increase."""
+    evaluator = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0), _AffineEvaluator(-1.0, 20.0), promote_fraction=0.4
+    )
+    # Full fitnesses 16 and 15 of candidates 4 and 5 are on average 11 above their screening fitness.
+    assert evaluator.evaluate(_CANDIDATES) == pytest.approx(
+        [14.0, 12.0, 16.0, 12.0, 15.0]
+    )
+    statistics = evaluator.last_statistics
+    assert statistics is not None
+    assert statistics.rank_correlation == pytest.approx(-1.0)
+
+
+def test_estimate_from_last_promotion() -> None:
+    """Test that without promoted candidates, the candidates of the last evaluation that had any are used for the estimate."""
+    evaluator = MultiFidelityEvaluator(
+        _AffineEvaluator(1.0, 0.0),
+        _AffineEvaluator(2.0, 1.0),
+        promote_fraction=None,
+        promote_threshold=4.0,
+    )
+    # Nothing was promoted yet, so the screening fitness is used.
+    assert evaluator.evaluate([1.0, 2.0]) == [1.0, 2.0]
+    statistics = evaluator.last_statistics
+    assert statistics is not None
+    assert statistics.num_promoted == 0
+    assert statistics.rank_correlation is None
+
+    evaluator.evaluate([4.0, 5.0])
+    assert evaluator.evaluate([1.0, 2.0]) == pytest.approx([3.0, 5.0])
+
+
+def test_average_ranks() -> None:
+    """Test that tied values get the mean of the ranks they span."""
+    np.testing.assert_array_equal(
+        _average_ranks(np.array([2.0, 1.0, 2.0, 3.0, 2.0])),
+        [2.0, 0.0, 2.0, 4.0, 2.0],
+    )
+    np.testing.assert_array_equal(
+        _average_ranks(np.array([5.0, 5.0, -1.0])), [1.5, 1.5, 0.0]
+    )
@@ -0,0 +1,199 @@
+import math
+
+import numpy as np
+import pytest
+from revolve2.experimentation.optimization.ea.selection import (
+    non_dominated_sort,
+    pareto_frontier,
+)
+from revolve2.experimentation.optimization.ea.selection._pareto_frontier import (
+    _get_domination_orders,
+)
+
+
+def _reference_domination_orders(
+    values: list[list[float]], frontier_order: list[bool]
+) -> list[int]:
+    """
+    Count for every point how many points it is better than in at least one value, with the pairwise loop that preceded the vectorized comparison.
+
+    :param values: The values of every point.
+    :param frontier_order: The order of every value. True = ascending, False = descending.
+    :returns: The domination order of every point.
+    """
+    return [
+        sum(
+            any(
+                p[j] > point[j] if frontier_order[j] else p[j] < point[j]
+                for j in range(len(frontier_order))
+            )
+            for p in values
+        )
+        for point in values
+    ]
+
+
+def _reference_pareto_frontier(
+    frontier_values: list[list[float]], frontier_order: list[bool], to_take: int
+) -> list[int]:
+    """
+    Select individuals like `pareto_frontier`, using the reference domination orders.
+
+    :param frontier_values: Lists of values, one list per objective.
+    :param frontier_order: The order of every value. True = ascending, False = descending.
+    :param to_take: The amount of individuals to return.
+    :returns: The selected individuals.
+    """
+    orders = _reference_domination_orders(
+        [list(point) for point in zip(*frontier_values)], frontier_order
+    )
+    all_values = np.array([orders] + frontier_values, dtype=np.float64)
+    all_orders = [False] + frontier_order
+    keys = [
+        all_values[i] if all_orders[i] else -all_values[i]
+        for i in range(len(all_orders))
+    ]
+    return np.lexsort(keys[:-1])[:to_take].tolist()  # type: ignore[no-any-return]
+
+
+def _random_values(
+    rng: np.random.Generator, num_values: int, num_points: int, special: bool
+) -> list[list[float]]:
+    """
+    Create random values with many ties.
+
+    :param rng: Random number generator.
+    :param num_values: The number of values of every point.
+    :param num_points: The number of points.
+    :param special: Whether to include NaN and infinite values.
+    :returns: The values, one list per value.
+    """
+    values = rng.integers(0, 8, size=(num_values, num_points)).astype(np.float64)
+    if special:
+        mask = rng.random(size=values.shape)
+        values[mask < 0.05] = math.nan
+        values[(mask >= 0.05) & (mask < 0.1)] = math.inf
+        values[(mask >= 0.1) & (mask < 0.15)] = -math.inf
+    return values.tolist()  # type: ignore[no-any-return]
+
+
+@pytest.mark.parametrize("special", [False, True])
+@pytest.mark.parametrize("num_values", [1, 2, 3])
+def test_pareto_frontier_matches_pairwise_loop(num_values: int, special: bool) -> None:
+    """
+    Test that the domination orders and selections are those of the pairwise loop, including ties, NaN and infinity.
+
+    :param num_values: The number of values of every point.
+    :param special: Whether to include NaN and infinite values.
+    """
+    rng = np.random.Generator(np.random.PCG64(num_values))
+    for _ in range(20):
+        frontier_values = _random_values(rng, num_values, 60, special)
+        frontier_order = rng.random(num_values) < 0.5
+        frontier_order_list = [bool(order) for order in frontier_order]
+
+        assert _get_domination_orders(
+            np.array(frontier_values).T, frontier_order_list
+        ) == _reference_domination_orders(
+            [list(point) for point in zip(*frontier_values)], frontier_order_list
+        )
+        assert pareto_frontier(
+            frontier_values, frontier_order_list, 30
+        ) == _reference_pareto_frontier(frontier_values, frontier_order_list, 30)
+
+
+def test_comparing_in_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that comparing points in small blocks gives the same selections.
+
+    :param monkeypatch: Fixture to make the blocks small.
+    """
+    rng = np.random.Generator(np.random.PCG64(0))
+    frontier_values = _random_values(rng, 2, 50, special=False)
+    expected_pareto = pareto_frontier(frontier_values, [True, False], 50)
+    expected_nsga = non_dominated_sort(frontier_values, [True, False], 50)
+    for module in ["_pareto_frontier", "_non_dominated_sort"]:
+        monkeypatch.setattr(
+            f"revolve2.experimentation.optimization.ea.selection.{module}._BLOCK_ELEMENTS",
+            120,
+        )
+    assert pareto_frontier(frontier_values, [True, False], 50) == expected_pareto
+    assert non_dominated_sort(frontier_values, [True, False], 50) == expected_nsga
+
+
+def _reference_non_dominated_sort(
+    values: list[list[float]],
+) -> tuple[list[int], list[float]]:
+    """
+    Calculate pareto fronts and crowding distances as described by Deb et al., where smaller values are better.
+
+    :param values: The values of every point.
+    :returns: The front and crowding distance of every point.
+    """
+    num_points = len(values)
+
+    def dominates(p: list[float], q: list[float]) -> bool:
+        return all(a <= b for a, b in zip(p, q)) and any(a < b for a, b in zip(p, q))
+
+    dominated: list[list[int]] = [[] for _ in range(num_points)]
+    num_dominators = [0] * num_points
+    for p in range(num_points):
+        for q in range(num_points):
+            if dominates(values[p], values[q]):
+                dominated[p].append(q)
+            elif dominates(values[q], values[p]):
+                num_dominators[p] += 1
+
+    fronts = [-1] * num_points
+    current = [p for p in range(num_points) if num_dominators[p] == 0]
+    front = 0
+    while len(current) > 0:
+        following = []
+        for p in current:
+            fronts[p] = front
+            for q in dominated[p]:
+                num_dominators[q] -= 1
+                if num_dominators[q] == 0:
+                    following.append(q)
+        current = sorted(following)
+        front += 1
+
+    distances = [0.0] * num_points
+    for front in range(max(fronts) + 1):
+        members = [p for p in range(num_points) if fronts[p] == front]
+        for j in range(len(values[0])):
+            ordered = sorted(members, key=lambda p: values[p][j])
+            value_range = values[ordered[-1]][j] - values[ordered[0]][j]
+            distances[ordered[0]] = math.inf
+            distances[ordered[-1]] = math.inf
+            for i in range(1, len(ordered) - 1):
+                if value_range > 0.0:
+                    distances[ordered[i]] += (
+                        values[ordered[i + 1]][j] - values[ordered[i - 1]][j]
+                    ) / value_range
+    return fronts, distances
+
+
+@pytest.mark.parametrize("num_values", [2, 3])
+def test_non_dominated_sort_matches_reference(num_values: int) -> None:
+    """
+    Test that individuals are ordered by the fronts and crowding distances of the textbook algorithm.
+
+    :param num_values: The number of values of every point.
+    """
+    rng = np.random.Generator(np.random.PCG64(num_values))
+    for _ in range(20):
+        frontier_values = _random_values(rng, num_values, 80, special=False)
+        frontier_order = [bool(order) for order in rng.random(num_values) < 0.5]
+
+        minimized = [
+            [
+                value if ascending else -value
+                for value, ascending in zip(point, frontier_order)
+            ]
+            for point in zip(*frontier_values)
+        ]
+        fronts, distances = _reference_non_dominated_sort(minimized)
+        expected = sorted(range(len(fronts)), key=lambda p: (fronts[p], -distances[p]))
+
+        assert non_dominated_sort(frontier_values, frontier_order, 50) == expected[:50]
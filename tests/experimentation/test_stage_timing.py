@@ -0,0 +1,126 @@
+import csv
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+from revolve2.experimentation.evolution import (
+    ModularRobotEvolution,
+    StageTiming,
+    StageTimingCsvWriter,
+    measure_stage,
+)
+
+
+def _busy_wait(seconds: float) -> int:
+    """
+    Use the CPU for some time.
+
+    :param seconds: The time to use the CPU, in seconds.
+    :returns: The number of iterations.
+    """
+    end = time.perf_counter() + seconds
+    iterations = 0
+    while time.perf_counter() < end:
+        iterations += 1
+    return iterations
+
+
+def test_without_callback_nothing_is_measured(mocker: Mock) -> None:
+    """
+    Test that the function is only called when there is no callback.
+
+    :param mocker: The mock object.
+    """
+    resident_memory = mocker.patch(
+        "revolve2.experimentation.evolution._stage_timing._resident_memory"
+    )
+    assert measure_stage(None, "stage", 0, max, 1, 3, key=lambda x: -x) == 1
+    resident_memory.assert_not_called()
+
+
+def test_wall_and_cpu_time() -> None:
+    """Test that waiting takes wall time but no CPU time of the thread, and computing takes both."""
+    timings: list[StageTiming] = []
+
+    measure_stage(timings.append, "waiting", 3, time.sleep, 0.2)
+    assert measure_stage(timings.append, "computing", 4, _busy_wait, 0.2) > 0
+
+    waiting, computing = timings
+    assert (waiting.stage, waiting.generation_index) == ("waiting", 3)
+    assert (computing.stage, computing.generation_index) == ("computing", 4)
+    assert waiting.wall_seconds >= 0.2
+    assert waiting.cpu_seconds < 0.1
+    assert computing.wall_seconds >= 0.2
+    assert computing.cpu_seconds > 0.1
+
+
+def test_memory() -> None:
+    """Test that memory allocated and kept by the stage is measured."""
+    timings: list[StageTiming] = []
+
+    array = measure_stage(timings.append, "allocation", 0, np.ones, 2**25)
+
+    (timing,) = timings
+    assert timing.rss_bytes is not None and timing.rss_delta_bytes is not None
+    assert timing.rss_delta_bytes >= 0.9 * array.nbytes
+    assert timing.rss_bytes >= timing.rss_delta_bytes
+
+
+def test_evolution_step_stages(mocker: Mock) -> None:
+    """
+    Test that every stage of an evolution step is measured, in order.
+
+    :param mocker: The mock object.
+    """
+    parent_selection = mocker.Mock()
+    parent_selection.select.return_value = (["parent"], {"extra": 1})
+    reproducer = mocker.Mock()
+    reproducer.reproduce.return_value = ["child"]
+    evaluator = mocker.Mock()
+    evaluator.evaluate.return_value = [1.0]
+    survivor_selection = mocker.Mock()
+    survivor_selection.select.return_value = (["survivor"], {})
+    timings: list[StageTiming] = []
+    evolution = ModularRobotEvolution(
+        parent_selection=parent_selection,
+        survivor_selection=survivor_selection,
+        evaluator=evaluator,
+        reproducer=reproducer,
+        stage_callback=timings.append,
+    )
+
+    assert evolution.step(["individual"], generation_index=7) == ["survivor"]
+
+    assert [(timing.stage, timing.generation_index) for timing in timings] == [
+        ("parent_selection", 7),
+        ("reproduction", 7),
+        ("evaluation", 7),
+        ("survivor_selection", 7),
+    ]
+    reproducer.reproduce.assert_called_once_with(["parent"], extra=1)
+    evaluator.evaluate.assert_called_once_with(["child"], generation_index=7)
+    survivor_selection.select.assert_called_once_with(
+        ["individual"], children=["child"], child_task_performance=[1.0]
+    )
+
+
+def test_csv_writer(tmp_path: Path) -> None:
+    """
+    Test that timings are appended to a CSV file with a single header.
+
+    :param tmp_path: Directory for the file.
+    """
+    file = tmp_path / "timings.csv"
+    timings = [
+        StageTiming("evaluation", generation_index, 2.0, 0.5, 1000, None)
+        for generation_index in range(2)
+    ]
+    StageTimingCsvWriter(str(file))(timings[0])
+    StageTimingCsvWriter(str(file))(timings[1])
+
+    with open(file, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["generation_index"] for row in rows] == ["0", "1"]
+    assert rows[0]["wall_seconds"] == "2.0"
+    assert rows[0]["rss_delta_bytes"] == ""
@@ -0,0 +1,118 @@
+import itertools
+from collections import Counter
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from revolve2.experimentation.optimization.ea.selection import (
+    multiple_unique,
+    tournament,
+    tournaments,
+    unique_tournaments,
+)
+from revolve2.experimentation.optimization.ea.selection._unique_tournaments import (
+    _log_win_probabilities,
+)
+
+_FITNESSES = [3.0, 1.0, 3.0, 0.5, 2.0, 3.0, -1.0]
+
+
+@pytest.mark.parametrize("k", [1, 2, 5])
+def test_tournaments_match_repeated_tournament(k: int) -> None:
+    """
+    Test that batched tournaments have the same winners as consecutive single tournaments with the same random number generator.
+
+    :param k: Amount of individuals to participate in each tournament.
+    """
+    expected_rng = np.random.Generator(np.random.PCG64(k))
+    expected = [tournament(expected_rng, _FITNESSES, k) for _ in range(500)]
+
+    rng = np.random.Generator(np.random.PCG64(k))
+    assert tournaments(rng, _FITNESSES, k, 500).tolist() == expected
+    assert rng.integers(1 << 30) == expected_rng.integers(1 << 30)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_win_probabilities_match_enumeration(k: int) -> None:
+    """
+    Test the probabilities to win a single tournament against all possible draws of participants.
+
+    :param k: Amount of individuals to participate in a tournament.
+    """
+    wins = Counter(
+        max(participants, key=lambda i: _FITNESSES[i])
+        for participants in itertools.product(range(len(_FITNESSES)), repeat=k)
+    )
+    # Tied individuals win equally often over all draws, but not for each draw, so compare the totals of each fitness.
+    expected = Counter[float]()
+    for index, count in wins.items():
+        expected[_FITNESSES[index]] += count / len(_FITNESSES) ** k
+
+    probabilities = np.exp(_log_win_probabilities(np.array(_FITNESSES), k))
+    for fitness, probability in expected.items():
+        tied = [i for i, f in enumerate(_FITNESSES) if f == fitness]
+        np.testing.assert_allclose(probabilities[tied], probability / len(tied))
+    assert probabilities.sum() == pytest.approx(1.0)
+
+
+def _pair_frequencies(
+    pairs: npt.NDArray[np.int_], num_individuals: int
+) -> npt.NDArray[np.float_]:
+    """
+    Count how often each ordered pair of individuals is selected.
+
+    :param pairs: The selected pairs. Shape (num_selections, 2).
+    :param num_individuals: The number of individuals.
+    :returns: The fraction of selections of each pair. Shape (num_individuals, num_individuals).
+    """
+    frequencies = np.zeros((num_individuals, num_individuals))
+    np.add.at(frequencies, (pairs[:, 0], pairs[:, 1]), 1.0)
+    return frequencies / len(pairs)
+
+
+def test_unique_tournaments_distribution() -> None:
+    """Test that unique tournaments select pairs as often as repeating tournaments until a new individual wins."""
+    k = 3
+    fitnesses = [0.0, 2.0, 3.0, 1.0, 3.0]
+    rng = np.random.Generator(np.random.PCG64(0))
+    pairs = unique_tournaments(rng, fitnesses, k, 2, num_selections=200000)
+    assert all(first != second for first, second in pairs)
+    # The first individual is selected by a single tournament.
+    np.testing.assert_allclose(
+        np.bincount(pairs[:, 0], minlength=len(fitnesses)) / len(pairs),
+        np.exp(_log_win_probabilities(np.array(fitnesses), k)),
+        atol=0.005,
+    )
+
+    repeated = np.array(
+        [
+            multiple_unique(
+                2,
+                list(range(len(fitnesses))),
+                fitnesses,
+                lambda _, population_fitnesses: tournament(
+                    rng, population_fitnesses, k
+                ),
+            )
+            for _ in range(20000)
+        ]
+    )
+
+    np.testing.assert_allclose(
+        _pair_frequencies(pairs, len(fitnesses)),
+        _pair_frequencies(repeated, len(fitnesses)),
+        atol=0.01,
+    )
+
+
+def test_unique_tournaments_shapes() -> None:
+    """Test that a single selection gives a flat array and that every individual is selected once when all are selected."""
+    rng = np.random.Generator(np.random.PCG64(0))
+    single = unique_tournaments(rng, _FITNESSES, 2, 3)
+    assert single.shape == (3,)
+    assert len(set(single.tolist())) == 3
+
+    everything = unique_tournaments(rng, _FITNESSES, 2, len(_FITNESSES), 10)
+    assert everything.shape == (10, len(_FITNESSES))
+    for selection in everything:
+        assert sorted(selection.tolist()) == list(range(len(_FITNESSES)))
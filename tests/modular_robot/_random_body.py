@@ -0,0 +1,42 @@
+"""Random bodies for unit tests."""
+
+import numpy as np
+from revolve2.modular_robot.body import Module, RightAngles
+from revolve2.modular_robot.body.base import Body
+from revolve2.modular_robot.body.v1 import BodyV1
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2
+
+_ROTATIONS = [
+    RightAngles.DEG_0,
+    RightAngles.DEG_90,
+    RightAngles.DEG_180,
+    RightAngles.DEG_270,
+]
+
+
+def random_body(rng: np.random.Generator, num_modules: int, core_v2: bool) -> Body:
+    """
+    Create a body by attaching random bricks and active hinges with random rotations at random free attachment points.
+
+    :param rng: Random number generator.
+    :param num_modules: The number of modules to attach, if there are enough free attachment points.
+    :param core_v2: Whether to use the V2 core, which has attachment faces, instead of the V1 core, which has four attachment points.
+    :returns: The body.
+    """
+    body: Body = BodyV2() if core_v2 else BodyV1()
+    modules: list[Module] = [body.core, *body.core.children.values()]
+    for _ in range(num_modules):
+        free = [
+            (module, index)
+            for module in modules
+            for index in module.attachment_points.keys()
+            if index not in module.children and module.can_set_child(index)
+        ]
+        if len(free) == 0:
+            break
+        parent, index = free[rng.integers(len(free))]
+        rotation = _ROTATIONS[rng.integers(len(_ROTATIONS))]
+        child = BrickV2(rotation) if rng.random() < 0.5 else ActiveHingeV2(rotation)
+        parent.set_child(child, index)
+        modules.append(child)
+    return body
@@ -0,0 +1,118 @@
+from typing import Any
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+from pyrr import Quaternion, Vector3
+from revolve2.modular_robot.body import Module, RightAngleRotations
+from revolve2.modular_robot.body.base import Body
+from revolve2.modular_robot.body.v2 import BrickV2
+
+from ._random_body import random_body
+
+
+def _reference_walk(body: Body) -> list[tuple[Module, NDArray[np.int_], Quaternion]]:
+    """
+    Walk the body like the grid maker that preceded the lattice, composing quaternions along the way.
+
+    :param body: The body.
+    :returns: Every module with its position and orientation, in the order they are visited.
+    """
+    visited: list[tuple[Module, NDArray[np.int_], Quaternion]] = []
+
+    def recur(module: Module, position: Vector3, orientation: Quaternion) -> None:
+        visited.append(
+            (module, np.rint(np.asarray(position)).astype(np.int_), orientation)
+        )
+        for child_index, attachment_point in module.attachment_points.items():
+            child = module.children.get(child_index)
+            if child is not None:
+                rotation = (
+                    orientation * attachment_point.orientation * child.orientation
+                )
+                recur(child, position + rotation * Vector3([1.0, 0.0, 0.0]), rotation)
+
+    recur(body.core, Vector3(), Quaternion())
+    return visited
+
+
+def _reference_grid(body: Body) -> tuple[NDArray[Any], NDArray[np.int_]]:
+    """
+    Make the grid of a body like the grid maker that preceded the lattice.
+
+    :param body: The body.
+    :returns: The grid of modules and the position of the core in it.
+    """
+    visited = _reference_walk(body)
+    positions = np.array([position for _, position, _ in visited])
+    minimum = positions.min(axis=0)
+    grid = np.full(
+        shape=tuple(positions.max(axis=0) - minimum + 1), fill_value=None, dtype=object
+    )
+    for (module, _, _), position in zip(visited, positions):
+        grid[tuple(position - minimum)] = module
+    return grid, -minimum
+
+
+@pytest.mark.parametrize("core_v2", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_lattice_matches_reference_walk(seed: int, core_v2: bool) -> None:
+    """
+    Test that the lattice has the modules in depth-first order, with the positions and orientations of the quaternion walk.
+
+    :param seed: Seed of the random body.
+    :param core_v2: Whether the body has a V2 core.
+    """
+    body = random_body(np.random.Generator(np.random.PCG64(seed)), 40, core_v2)
+    visited = _reference_walk(body)
+    lattice = body.lattice
+
+    assert lattice.modules == [module for module, _, _ in visited]
+    np.testing.assert_array_equal(
+        lattice.positions, [position for _, position, _ in visited]
+    )
+    np.testing.assert_array_equal(
+        RightAngleRotations.MATRICES[lattice.orientations],
+        [
+            np.round(orientation.matrix33).astype(np.int8)
+            for _, _, orientation in visited
+        ],
+    )
+
+
+@pytest.mark.parametrize("core_v2", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_to_grid_matches_reference_grid(seed: int, core_v2: bool) -> None:
+    """
+    Test that the grid made from the lattice is the grid of the quaternion walk, including which module is kept when modules overlap.
+
+    :param seed: Seed of the random body.
+    :param core_v2: Whether the body has a V2 core.
+    """
+    body = random_body(np.random.Generator(np.random.PCG64(seed)), 40, core_v2)
+    grid: NDArray[Any]
+    grid, core_position = body.to_grid()
+    reference_grid, reference_core_position = _reference_grid(body)
+
+    assert grid.shape == reference_grid.shape
+    assert all(a is b for a, b in zip(grid.flat, reference_grid.flat))
+    np.testing.assert_array_equal(np.asarray(core_position), reference_core_position)
+
+
+def test_lattice_is_rebuilt_after_attaching() -> None:
+    """Test that the cached lattice is replaced after a module is attached to the body."""
+    body = random_body(np.random.Generator(np.random.PCG64(0)), 10, False)
+    lattice = body.lattice
+    assert body.lattice is lattice
+
+    parent = lattice.modules[-1]
+    free = next(
+        index
+        for index in parent.attachment_points.keys()
+        if index not in parent.children
+    )
+    parent.set_child(BrickV2(0.0), free)
+
+    assert body.lattice is not lattice
+    assert len(body.lattice.modules) == len(lattice.modules) + 1
+    assert body.lattice.modules == [module for module, _, _ in _reference_walk(body)]
@@ -0,0 +1,106 @@
+import math
+from typing import Callable
+
+import numpy as np
+import pytest
+from revolve2.modular_robot.body import Module
+from revolve2.modular_robot.body.base import Body, Brick
+from revolve2.modular_robot.body.v1 import BodyV1
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2, BrickV2Large
+
+from ._random_body import random_body
+
+
+def _copy_subtree(module: Module) -> Module:
+    """
+    Copy a module and everything attached to it.
+
+    :param module: The module. Must be a V2 brick or active hinge, like the modules of random bodies.
+    :returns: The copy.
+    """
+    rotation = 2.0 * math.atan2(module.orientation.x, module.orientation.w)
+    copy: Module
+    if isinstance(module, BrickV2):
+        copy = BrickV2(rotation)
+    else:
+        assert isinstance(module, ActiveHingeV2)
+        copy = ActiveHingeV2(rotation)
+    for index, child in module.children.items():
+        copy.set_child(_copy_subtree(child), index)
+    return copy
+
+
+def _rotated_copy(body: Body, shift: int) -> Body:
+    """
+    Copy a body, rotated around the core by moving every subtree of the core a number of attachment points further.
+
+    :param body: The body.
+    :param shift: The number of attachment points to move the subtrees.
+    :returns: The copy.
+    """
+    if isinstance(body, BodyV2):
+        copy_v2 = BodyV2()
+        for face_index, face in body.core_v2.attachment_faces.items():
+            target = copy_v2.core_v2.attachment_faces[(face_index + shift) % 4]
+            for index, child in face.children.items():
+                target.set_child(_copy_subtree(child), index)
+        return copy_v2
+    assert isinstance(body, BodyV1)
+    copy_v1 = BodyV1()
+    for index, child in body.core.children.items():
+        copy_v1.core.set_child(_copy_subtree(child), (index + shift) % 4)
+    return copy_v1
+
+
+@pytest.mark.parametrize("core_v2", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_hash_invariant_to_rotation_around_core(seed: int, core_v2: bool) -> None:
+    """
+    Test that rotating a body around its core by a multiple of 90 degrees keeps its hash.
+
+    :param seed: Seed of the random body.
+    :param core_v2: Whether the body has a V2 core.
+    """
+    body = random_body(np.random.Generator(np.random.PCG64(seed)), 20, core_v2)
+    hashes = {_rotated_copy(body, shift).morphology_hash for shift in range(4)}
+    assert hashes == {body.morphology_hash}
+
+
+@pytest.mark.parametrize("core_v2", [False, True])
+def test_hash_distinguishes_bodies(core_v2: bool) -> None:
+    """
+    Test that random bodies have different hashes, and that changing a single module changes the hash.
+
+    :param core_v2: Whether the bodies have a V2 core.
+    """
+    bodies = [
+        random_body(np.random.Generator(np.random.PCG64(seed)), 20, core_v2)
+        for seed in range(10)
+    ]
+    assert len({body.morphology_hash for body in bodies}) == len(bodies)
+
+    body = bodies[0]
+    original = body.morphology_hash
+    brick = next(
+        m
+        for m in body.lattice.modules
+        if isinstance(m, BrickV2) and BrickV2.FRONT not in m.children
+    )
+    brick.set_child(ActiveHingeV2(0.0), BrickV2.FRONT)
+    assert body.morphology_hash != original
+
+
+def test_hash_distinguishes_module_parameters() -> None:
+    """Test that modules of the same type with different parameters, or with a different rotation, give different hashes."""
+    make_bricks: list[Callable[[], Brick]] = [
+        lambda: BrickV2(0.0),
+        lambda: BrickV2(math.pi / 2.0),
+        lambda: BrickV2Large(0.0, bone_length=1.0),
+        lambda: BrickV2Large(0.0, bone_length=2.0),
+    ]
+    hashes = []
+    for make_brick in make_bricks:
+        body = BodyV2()
+        body.core_v2.front_face.bottom = make_brick()
+        hashes.append(body.morphology_hash)
+    assert len(set(hashes)) == len(hashes)
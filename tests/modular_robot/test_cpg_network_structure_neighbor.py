@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+from revolve2.modular_robot.body.base import ActiveHinge
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2
+from revolve2.modular_robot.brain.cpg import (
+    CpgNetworkStructure,
+    active_hinges_to_cpg_network_structure_neighbor,
+)
+
+from ._random_body import random_body
+
+
+def _reference_connections(active_hinges: list[ActiveHinge]) -> set[tuple[int, int]]:
+    """
+    Find the connected CPGs with the per-hinge neighbour walk that preceded the module graph.
+
+    :param active_hinges: The active hinges, in the order of their CPGs.
+    :returns: The indices of the CPGs of every connection, lowest first.
+    """
+    cpg_of = {active_hinge: index for index, active_hinge in enumerate(active_hinges)}
+    connections = set()
+    for active_hinge, cpg in cpg_of.items():
+        for neighbour in active_hinge.neighbours(within_range=2):
+            if isinstance(neighbour, ActiveHinge):
+                other = cpg_of[neighbour]
+                connections.add((min(cpg, other), max(cpg, other)))
+    return connections
+
+
+def _connections(structure: CpgNetworkStructure) -> set[tuple[int, int]]:
+    """
+    Get the connections of a CPG network structure.
+
+    :param structure: The structure.
+    :returns: The indices of the CPGs of every connection, lowest first.
+    """
+    return {
+        (pair.cpg_index_lowest.index, pair.cpg_index_highest.index)
+        for pair in structure.connections
+    }
+
+
+@pytest.mark.parametrize("core_v2", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_connections_match_neighbour_walk(seed: int, core_v2: bool) -> None:
+    """
+    Test that the module graph connects the same CPGs as the neighbour walk, with and without the cached graph of the body.
+
+    :param seed: Seed of the random body.
+    :param core_v2: Whether the body has a V2 core.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    body = random_body(rng, 40, core_v2)
+    active_hinges = body.find_modules_of_type(ActiveHinge)
+    rng.shuffle(active_hinges)  # type: ignore[arg-type]
+    expected = _reference_connections(active_hinges)
+
+    structure, output_mapping = active_hinges_to_cpg_network_structure_neighbor(
+        active_hinges, body
+    )
+    assert _connections(structure) == expected
+    assert [active_hinge for _, active_hinge in output_mapping] == active_hinges
+
+    structure, _ = active_hinges_to_cpg_network_structure_neighbor(active_hinges)
+    assert _connections(structure) == expected
+
+
+def test_connections_without_lattice() -> None:
+    """Test that bodies with angles that are not multiples of 90 degrees fall back to walking the tree."""
+    body = BodyV2()
+    brick = BrickV2(math.pi / 4.0)
+    body.core_v2.front_face.bottom = brick
+    brick.front = ActiveHingeV2(0.0)
+    brick.left = ActiveHingeV2(0.0)
+    body.core_v2.back_face.bottom = ActiveHingeV2(0.0)
+    active_hinges = body.find_modules_of_type(ActiveHinge)
+
+    with pytest.raises(ValueError):
+        body.lattice
+    structure, _ = active_hinges_to_cpg_network_structure_neighbor(active_hinges, body)
+    assert _connections(structure) == _reference_connections(active_hinges)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from revolve2.modular_robot.body import Module
+from revolve2.modular_robot.body.base import ActiveHinge, AttachmentFace, Body, Brick
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BrickV2
+
+from ._random_body import random_body
+
+_QUERIES: list[tuple[type[Module], list[type[Module]] | None]] = [
+    (Module, None),
+    (ActiveHinge, None),
+    (Brick, None),
+    (AttachmentFace, None),
+    (Module, [Brick]),
+    (Module, [ActiveHinge, AttachmentFace]),
+]
+
+
+def _reference_find(
+    module: Module, module_type: type[Module], exclude: list[type[Module]]
+) -> list[Module]:
+    """
+    Find modules with the recursive search that preceded the per-type index.
+
+    :param module: The root of the search.
+    :param module_type: The type.
+    :param exclude: Module types to be excluded in search.
+    :returns: The modules, in depth-first order.
+    """
+    modules = []
+    if isinstance(module, module_type) and not any(
+        isinstance(module, e) for e in exclude
+    ):
+        modules.append(module)
+    for child in module.children.values():
+        modules.extend(_reference_find(child, module_type, exclude))
+    return modules
+
+
+def _assert_matches_reference(body: Body) -> None:
+    """
+    Assert that finding and counting modules gives the results of the recursive search for all queries.
+
+    :param body: The body.
+    """
+    for module_type, exclude in _QUERIES:
+        expected = _reference_find(body.core, module_type, exclude or [])
+        assert body.find_modules_of_type(module_type, exclude) == expected
+        assert body.count_modules_of_type(module_type, exclude) == len(expected)
+
+
+@pytest.mark.parametrize("core_v2", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_find_matches_recursive_search(seed: int, core_v2: bool) -> None:
+    """
+    Test that modules are found in the order of the recursive search, also after more modules are attached.
+
+    :param seed: Seed of the random body.
+    :param core_v2: Whether the body has a V2 core.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    body = random_body(rng, 30, core_v2)
+    _assert_matches_reference(body)
+
+    # Attach a subtree to a module early in the tree, so its modules come before modules that were found before.
+    subtree = BrickV2(0.0)
+    subtree.set_child(ActiveHingeV2(0.0), BrickV2.FRONT)
+    subtree.set_child(BrickV2(0.0), BrickV2.LEFT)
+    parent, index = next(
+        (module, index)
+        for module in body.find_modules_of_type(Module)
+        for index in module.attachment_points.keys()
+        if index not in module.children and module.can_set_child(index)
+    )
+    parent.set_child(subtree, index)
+    _assert_matches_reference(body)
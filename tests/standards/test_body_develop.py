@@ -0,0 +1,155 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import multineat
+import numpy as np
+import pytest
+from pyrr import Quaternion, Vector3
+from revolve2.modular_robot.body import Module
+from revolve2.modular_robot.body.v2 import ActiveHingeV2, BodyV2, BrickV2
+from revolve2.standards.genotypes.cppnwin._cppn_query_cache import CppnQueryCache
+from revolve2.standards.genotypes.cppnwin.modular_robot.v2 import BodyGenotypeV2
+
+
+@dataclass
+class _ReferenceModule:
+    position: Vector3
+    forward: Vector3
+    up: Vector3
+    chain_length: int
+    module_reference: Module
+
+
+def _rotate(a: Vector3, b: Vector3, rotation: Quaternion) -> Vector3:
+    """
+    Rotate vector a around b, like the development that preceded batched queries.
+
+    :param a: Vector a.
+    :param b: Vector b.
+    :param rotation: The rotation.
+    :returns: The rotated vector.
+    """
+    cos_angle = int(round(np.cos(rotation.angle)))
+    sin_angle = int(round(np.sin(rotation.angle)))
+    rotated: Vector3 = (
+        a * cos_angle + sin_angle * b.cross(a) + (1 - cos_angle) * b.dot(a) * b
+    )
+    return rotated
+
+
+def _reference_develop(genotype: multineat.Genome) -> BodyV2:
+    """
+    Develop a body with the pyrr based development and one multineat query per module that preceded batched queries.
+
+    :param genotype: The genotype.
+    :returns: The body.
+    """
+    max_parts = 20
+    body_net = multineat.NeuralNetwork()
+    genotype.BuildPhenotype(body_net)
+    grid = np.zeros(shape=(max_parts * 2 + 1,) * 3, dtype=np.uint8)
+    body = BodyV2()
+    core_position = Vector3([max_parts + 1] * 3, dtype=np.int_)
+    grid[tuple(core_position)] = 1
+    part_count = 1
+
+    to_explore = deque(
+        _ReferenceModule(
+            core_position, Vector3([0, -1, 0]), Vector3([0, 0, 1]), 0, face
+        )
+        for face in body.core_v2.attachment_faces.values()
+    )
+    while len(to_explore) > 0:
+        module = to_explore.popleft()
+        for (
+            index,
+            attachment_point,
+        ) in module.module_reference.attachment_points.items():
+            if part_count >= max_parts:
+                continue
+            forward = _rotate(module.forward, module.up, attachment_point.orientation)
+            position = Vector3(
+                [int(round(v)) for v in module.position + forward], dtype=np.int64
+            )
+            chain_length = module.chain_length + 1
+            if grid[tuple(position)] > 0:
+                continue
+
+            x, y, z = np.array(
+                np.round(position + attachment_point.offset), dtype=np.int64
+            )
+            body_net.Input([1.0, x, y, z, chain_length])
+            body_net.ActivateAllLayers()
+            outputs = body_net.Output()
+            types: list[Any] = [None, BrickV2, ActiveHingeV2]
+            child_type = types[max(0, int(outputs[0] * len(types) - 1e-6))]
+            angle = max(0, int(outputs[1] * 4 - 1e-6)) * (np.pi / 2.0)
+
+            if child_type is None or not module.module_reference.can_set_child(index):
+                continue
+            child = child_type(angle)
+            grid[tuple(position)] += 1
+            up = _rotate(module.up, forward, Quaternion.from_eulers([angle, 0, 0]))
+            module.module_reference.set_child(child, index)
+            to_explore.append(
+                _ReferenceModule(position, forward, up, chain_length, child)
+            )
+            part_count += 1
+    return body
+
+
+def _describe(module: Module) -> tuple[Any, ...]:
+    """
+    Describe the structure of a module tree.
+
+    :param module: The root of the tree.
+    :returns: The type and orientation of every module, with its children by attachment point.
+    """
+    return (
+        type(module).__name__,
+        tuple(np.round(module.orientation, 9).tolist()),
+        tuple(
+            (index, _describe(child))
+            for index, child in sorted(module.children.items())
+        ),
+    )
+
+
+def _random_genotypes(amount: int) -> list[BodyGenotypeV2]:
+    """
+    Create a population of random genotypes, each mutated many times.
+
+    :param amount: The number of genotypes.
+    :returns: The genotypes.
+    """
+    rng = np.random.Generator(np.random.PCG64(0))
+    innov_db = multineat.InnovationDatabase()
+    genotypes = []
+    for _ in range(amount):
+        genotype = BodyGenotypeV2.random_body(innov_db, rng)
+        for _ in range(30):
+            genotype = genotype.mutate_body(innov_db, rng)
+        genotypes.append(genotype)
+    return genotypes
+
+
+@pytest.mark.parametrize("compile_min_queries", [1, CppnQueryCache.COMPILE_MIN_QUERIES])
+def test_develop_matches_reference(
+    monkeypatch: pytest.MonkeyPatch, compile_min_queries: int
+) -> None:
+    """
+    Test that bodies are developed exactly as before batched queries, both when every prefetch and when only large prefetches are compiled.
+
+    :param monkeypatch: Fixture to change the compile threshold.
+    :param compile_min_queries: Minimum number of queries for which the CPPN is compiled.
+    """
+    monkeypatch.setattr(CppnQueryCache, "COMPILE_MIN_QUERIES", compile_min_queries)
+    sizes = []
+    for genotype in _random_genotypes(40):
+        body = genotype.develop_body()
+        reference = _reference_develop(genotype.body.genotype)
+        assert _describe(body.core) == _describe(reference.core)
+        sizes.append(len(body.lattice.modules))
+    # Bodies stop growing at 20 parts, so some bodies must be large enough to be cut off.
+    assert max(sizes) >= 20
@@ -0,0 +1,163 @@
+import multineat
+import numpy as np
+import numpy.typing as npt
+import pytest
+from revolve2.standards.genotypes.cppnwin._compiled_cppn import CompiledCppn
+from revolve2.standards.genotypes.cppnwin._random_multineat_genotype import (
+    random_multineat_genotype,
+)
+from revolve2.standards.genotypes.cppnwin.modular_robot._multineat_params import (
+    get_multineat_params,
+)
+
+_AF = multineat.ActivationFunction
+_ACTIVATIONS = [
+    _AF.SIGNED_SIGMOID,
+    _AF.UNSIGNED_SIGMOID,
+    _AF.TANH,
+    _AF.TANH_CUBIC,
+    _AF.SIGNED_STEP,
+    _AF.UNSIGNED_STEP,
+    _AF.SIGNED_GAUSS,
+    _AF.UNSIGNED_GAUSS,
+    _AF.ABS,
+    _AF.SIGNED_SINE,
+    _AF.UNSIGNED_SINE,
+    _AF.LINEAR,
+    _AF.RELU,
+    _AF.SOFTPLUS,
+]
+_NUM_INPUTS = 5
+_NUM_OUTPUTS = 4
+
+
+def _params(recurrent: bool) -> multineat.Parameters:
+    """
+    Get parameters that grow large networks using varying activation functions, slopes and shifts.
+
+    Multineat cannot choose RELU and SOFTPLUS for hidden neurons, so those are only used as output activation function.
+
+    :param recurrent: Whether to allow recurrent connections.
+    :returns: The parameters.
+    """
+    params = get_multineat_params()
+    params.MutateAddNeuronProb = 0.2
+    params.MutateAddLinkProb = 0.3
+    params.MutateNeuronActivationTypeProb = 0.3
+    params.MutateActivationAProb = 0.3
+    params.MutateActivationBProb = 0.3
+    params.MinActivationB = -2.0
+    params.MaxActivationB = 2.0
+    params.ActivationFunction_SignedSigmoid_Prob = 1.0
+    params.ActivationFunction_UnsignedSigmoid_Prob = 1.0
+    params.ActivationFunction_TanhCubic_Prob = 1.0
+    params.ActivationFunction_UnsignedStep_Prob = 1.0
+    params.ActivationFunction_UnsignedGauss_Prob = 1.0
+    params.ActivationFunction_Abs_Prob = 1.0
+    params.ActivationFunction_UnsignedSine_Prob = 1.0
+    if recurrent:
+        params.RecurrentProb = 0.5
+        params.AllowLoops = True
+    return params
+
+
+def _random_genotype(
+    seed: int, output_activation: multineat.ActivationFunction, recurrent: bool
+) -> multineat.Genome:
+    """
+    Create a random genotype.
+
+    :param seed: Seed of the random number generator.
+    :param output_activation: Activation function of the outputs.
+    :param recurrent: Whether to allow recurrent connections.
+    :returns: The genotype.
+    """
+    rng = multineat.RNG()
+    rng.Seed(seed)
+    return random_multineat_genotype(
+        innov_db=multineat.InnovationDatabase(),
+        rng=rng,
+        multineat_params=_params(recurrent),
+        output_activation_func=output_activation,
+        num_inputs=_NUM_INPUTS,
+        num_outputs=_NUM_OUTPUTS,
+        num_initial_mutations=60,
+    )
+
+
+def _query_multineat(
+    genotype: multineat.Genome, inputs: npt.NDArray[np.float_]
+) -> npt.NDArray[np.float_]:
+    """
+    Query the network of a genotype one input at a time with multineat.
+
+    :param genotype: The genotype.
+    :param inputs: The inputs. Shape (num_queries, num_inputs).
+    :returns: The outputs. Shape (num_queries, num_outputs).
+    """
+    network = multineat.NeuralNetwork()
+    genotype.BuildPhenotype(network)
+    outputs = []
+    for row in inputs.tolist():
+        network.Input(row)
+        network.ActivateAllLayers()
+        outputs.append(list(network.Output()))
+    return np.array(outputs)
+
+
+def _random_inputs(seed: int, num_queries: int) -> npt.NDArray[np.float_]:
+    """
+    Create random inputs, including large values that saturate or overflow activation functions.
+
+    :param seed: Seed of the random number generator.
+    :param num_queries: The number of queries.
+    :returns: The inputs, with a bias of 1 as last input. Shape (num_queries, num_inputs).
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    inputs = rng.uniform(-3.0, 3.0, size=(num_queries, _NUM_INPUTS))
+    inputs[: num_queries // 10] *= 200.0
+    inputs[:, -1] = 1.0
+    return inputs
+
+
+@pytest.mark.parametrize("output_activation", _ACTIVATIONS)
+def test_outputs_equal_multineat(
+    output_activation: multineat.ActivationFunction,
+) -> None:
+    """
+    Test that compiled networks give bit-for-bit the outputs of multineat, and that the vectorized mode gives nearly the same outputs.
+
+    :param output_activation: Activation function of the outputs.
+    """
+    for seed in range(5):
+        genotype = _random_genotype(seed, output_activation, recurrent=False)
+        inputs = _random_inputs(seed, 200)
+        expected = _query_multineat(genotype, inputs)
+
+        np.testing.assert_array_equal(CompiledCppn(genotype).evaluate(inputs), expected)
+        # Large inputs overflow exp, which multineat and the exact mode handle silently.
+        with np.errstate(over="ignore"):
+            vectorized = CompiledCppn(genotype, exact=False).evaluate(inputs)
+        np.testing.assert_allclose(
+            vectorized,
+            expected,
+            rtol=1e-12,
+            atol=1e-12,
+        )
+
+
+def test_recurrent_networks_are_rejected() -> None:
+    """Test that networks with recurrent connections cannot be compiled."""
+    num_recurrent = 0
+    for seed in range(10):
+        genotype = _random_genotype(seed, _AF.TANH, recurrent=True)
+        network = multineat.NeuralNetwork()
+        genotype.BuildPhenotype(network)
+        if any(
+            c.recur_flag or c.source_neuron_idx == c.target_neuron_idx
+            for c in network.connections
+        ):
+            num_recurrent += 1
+            with pytest.raises(ValueError):
+                CompiledCppn(genotype)
+    assert num_recurrent > 0
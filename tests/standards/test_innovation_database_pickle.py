@@ -0,0 +1,43 @@
+import pickle
+
+import multineat
+import numpy as np
+from revolve2.standards.genotypes.cppnwin import (
+    MultineatInnovationDatabasePickleWrapper,
+)
+from revolve2.standards.genotypes.cppnwin.modular_robot.v2 import BodyGenotypeV2
+
+
+def _mutate_many(
+    genotype: BodyGenotypeV2, innov_db: multineat.InnovationDatabase, seed: int
+) -> list[str]:
+    """
+    Mutate a genotype many times in a row.
+
+    :param genotype: The genotype to start with.
+    :param innov_db: The innovation database.
+    :param seed: Seed of the random number generator.
+    :returns: Every mutated genotype, serialized.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    serialized = []
+    for _ in range(30):
+        genotype = genotype.mutate_body(innov_db, rng)
+        serialized.append(genotype.body.genotype.Serialize())
+    return serialized
+
+
+def test_unpickled_database_mutates_like_original() -> None:
+    """Test that mutating with an unpickled innovation database assigns the same innovation numbers and neuron ids as the original."""
+    innov_db = multineat.InnovationDatabase()
+    genotype = BodyGenotypeV2.random_body(
+        innov_db, np.random.Generator(np.random.PCG64(0))
+    )
+    _mutate_many(genotype, innov_db, 1)
+
+    unpickled = pickle.loads(
+        pickle.dumps(MultineatInnovationDatabasePickleWrapper(innov_db))
+    ).innovation_database
+    assert unpickled is not innov_db
+
+    assert _mutate_many(genotype, unpickled, 2) == _mutate_many(genotype, innov_db, 2)
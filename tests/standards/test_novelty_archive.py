@@ -0,0 +1,120 @@
+from unittest.mock import Mock
+
+import numpy as np
+from numpy.typing import NDArray
+from revolve2.experimentation.rng import make_rng
+from revolve2.modular_robot import ModularRobot
+from revolve2.modular_robot.brain.cpg import BrainCpgNetworkNeighborRandom
+from revolve2.standards import modular_robots_v2
+from revolve2.standards.morphological_novelty_metric import (
+    NoveltyArchive,
+    get_novelty_from_population,
+)
+from revolve2.standards.morphological_novelty_metric.calculate_novelty import (
+    calculate_distances,
+)
+
+_NUM_BINS = 20
+
+
+def _dense_histograms(amount: int) -> NDArray[np.int64]:
+    """
+    Create dense histograms with equal mass, on which the direction of reshaping matters most.
+
+    :param amount: The number of histograms.
+    :returns: The histograms.
+    """
+    rng = np.random.Generator(np.random.PCG64(0))
+    return (
+        rng.multinomial(10_000, np.full(_NUM_BINS**2, 1 / _NUM_BINS**2), size=amount)
+        .reshape(amount, _NUM_BINS, _NUM_BINS)
+        .astype(np.int64)
+    )
+
+
+def _make_robots(amount: int) -> list[ModularRobot]:
+    """
+    Create robots from the standard bodies.
+
+    :param amount: The number of robots.
+    :returns: The robots.
+    """
+    bodies = modular_robots_v2.all()
+    rng = make_rng(0)
+    robots = []
+    for index in range(amount):
+        body = bodies[index % len(bodies)]
+        robots.append(ModularRobot(body, BrainCpgNetworkNeighborRandom(body, rng)))
+    return robots
+
+
+def _patch_histograms(
+    mocker: Mock, robots: list[ModularRobot], histograms: NDArray[np.int64]
+) -> None:
+    """
+    Give every robot the histogram at its index, instead of the sparse histogram of its body.
+
+    :param mocker: The mock object.
+    :param robots: The robots.
+    :param histograms: The histograms of the robots.
+    """
+    indices = {id(robot): index for index, robot in enumerate(robots)}
+
+    def histograms_from_population(
+        population: list[ModularRobot], cob_heuristic: bool, num_bins: int
+    ) -> NDArray[np.int64]:
+        return histograms[[indices[id(robot)] for robot in population]].reshape(
+            -1, num_bins, num_bins
+        )
+
+    for module in ["_morphological_novelty_metric", "_novelty_archive"]:
+        mocker.patch(
+            f"revolve2.standards.morphological_novelty_metric.{module}.histograms_from_population",
+            histograms_from_population,
+        )
+
+
+def test_distances_are_symmetric() -> None:
+    """Test that the distance between two histograms does not depend on their order."""
+    histograms = _dense_histograms(8)
+    distances = calculate_distances(histograms, histograms, _NUM_BINS, 1)
+    np.testing.assert_array_equal(distances, distances.T)
+
+
+def test_novelty_independent_of_population_order(mocker: Mock) -> None:
+    """
+    Test that reordering a population reorders the novelty scores, without changing them.
+
+    :param mocker: The mock object.
+    """
+    population = _make_robots(8)
+    _patch_histograms(mocker, population, _dense_histograms(8))
+    order = [1, 3, 5, 7, 0, 2, 4, 6]
+    reordered = [population[index] for index in order]
+
+    np.testing.assert_allclose(
+        get_novelty_from_population(reordered, num_bins=_NUM_BINS, num_threads=1),
+        get_novelty_from_population(population, num_bins=_NUM_BINS, num_threads=1)[
+            order
+        ],
+    )
+
+
+def test_novelty_archive_matches_population_novelty(mocker: Mock) -> None:
+    """
+    Test that an empty archive gives the scores of get_novelty_from_population, also when offspring come before the survivors.
+
+    :param mocker: The mock object.
+    """
+    robots = _make_robots(8)
+    _patch_histograms(mocker, robots, _dense_histograms(8))
+    survivors = robots[:4]
+    offspring = robots[4:]
+
+    archive = NoveltyArchive(num_bins=_NUM_BINS, num_threads=1)
+    archive.novelty(survivors)
+    reordered = offspring + survivors
+    np.testing.assert_allclose(
+        archive.novelty(reordered),
+        get_novelty_from_population(reordered, num_bins=_NUM_BINS, num_threads=1),
+    )